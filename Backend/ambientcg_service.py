@@ -2,14 +2,13 @@ import httpx
 import random
 from typing import Dict, List, Any
 from fastapi import HTTPException
+from http_clients import http_clients
 
 class AmbientCGService:
     def __init__(self):
         # AmbientCG API for PBR textures and materials - completely free
         self.base_url = "https://ambientcg.com/api/v2/full_json"
         self.enabled = True  # Always enabled since it's free
-        # Create a shared client for better performance
-        self.client = httpx.AsyncClient(timeout=15.0)
     
     async def search_photos(
         self,
@@ -183,6 +182,7 @@ class AmbientCGService:
         
         return formatted_data
     
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client()
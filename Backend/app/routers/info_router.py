@@ -1,9 +1,9 @@
 
 from fastapi import APIRouter, Query, HTTPException
-import httpx
 from typing import Optional
 
 from geoapify_service import GeoapifyService
+from http_clients import http_clients
 
 info_router = APIRouter()
 
@@ -18,15 +18,15 @@ async def get_places(
     limit: int = Query(20, description="Maximum number of results"),
 ):
     try:
-        async with httpx.AsyncClient() as client:
-            places = await geoapify_service.get_places_by_category(
-                client=client,
-                categories=[categories],
-                lat=lat,
-                lon=lon,
-                radius=radius,
-                limit=limit,
-            )
-            return places
+        client = http_clients.client()
+        places = await geoapify_service.get_places_by_category(
+            client=client,
+            categories=[categories],
+            lat=lat,
+            lon=lon,
+            radius=radius,
+            limit=limit,
+        )
+        return places
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
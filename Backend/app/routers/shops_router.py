@@ -45,7 +45,7 @@ async def get_shops(
     Response: { results: [...], count: number }
     """
     try:
-        raw = search_places(lon=lon, lat=lat, radius=radius, categories=category, limit=limit)
+        raw = await search_places(lon=lon, lat=lat, radius=radius, categories=category, limit=limit)
         results = normalize_places(raw, city_hint=city_hint)
         return {"results": results, "count": len(results)}
     except GeoapifyError as e:
@@ -64,7 +64,7 @@ async def geocode(
     Response: { results: [{ lat, lon, formatted, city, state, country }], count }
     """
     try:
-        raw = geocode_place(text=text, limit=limit)
+        raw = await geocode_place(text=text, limit=limit)
         results = normalize_geocodes(raw)
         return {"results": results, "count": len(results)}
     except GeoapifyError as e:
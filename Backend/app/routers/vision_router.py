@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, Response
 import shutil
 import os
 import uuid
@@ -39,12 +39,12 @@ async def analyze_image(file: UploadFile = File(...)):
         # Calculate image hash for caching
         image_hash = calculate_image_hash(file_location)
         
-        # Check if we have a cached analysis
-        cached_result = await get_cached_vision_analysis(image_hash)
+        # Check if we have a cached analysis, kept as the stored JSON so it is not decoded and re-encoded
+        cached_result = await get_cached_vision_analysis(image_hash, encoded=True)
         if cached_result:
             # Clean up the uploaded file
             os.remove(file_location)
-            return {"analysis": cached_result, "cached": True}
+            return Response(content=b'{"analysis":' + cached_result + b',"cached":true}', media_type="application/json")
         
         # Perform vision analysis
         analysis_result = vision_service.analyze_image_with_fallback(file_location)
@@ -82,10 +82,10 @@ async def save_chat(data: Dict[str, Any]):
 async def load_chat_history(session_id: str):
     """Load chat history for a session"""
     try:
-        messages = await get_chat_history(session_id)
+        messages = await get_chat_history(session_id, encoded=True)
         if messages is None:
             raise HTTPException(status_code=404, detail="Chat history not found")
-        return {"messages": messages}
+        return Response(content=b'{"messages":' + messages + b'}', media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
@@ -4,11 +4,12 @@ Provides legitimate astrology data integration for Vastu analysis
 """
 
 import os
-import requests
 import json
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
+from http_clients import http_clients
+
 
 class ProkeralaAstrologyService:
     def __init__(self):
@@ -44,7 +45,7 @@ class ProkeralaAstrologyService:
             }
 
             print(f"[INFO] Requesting Prokerala access token from {auth_url}")
-            response = requests.post(auth_url, data=auth_data, timeout=15)
+            response = await http_clients.client().post(auth_url, data=auth_data, timeout=15)
 
             if response.status_code == 200:
                 result = response.json()
@@ -152,7 +153,7 @@ class ProkeralaAstrologyService:
             }
 
             print(f"[INFO] Requesting birth chart from Prokerala API...")
-            response = requests.get(
+            response = await http_clients.client().get(
                 chart_url, params=params, headers=headers, timeout=20
             )
 
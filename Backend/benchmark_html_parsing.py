@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark the HTML parser backends on the pages in fixtures/html.
+
+The fixtures are synthetic: generated pages shaped like each site's result
+markup (padded with repeated navigation and style boilerplate), not captured
+responses. They were written against the current selectors, so they show how
+the two backends compare on the same document and that both return the same
+items; they say nothing about how the selectors fare on live pages.
+
+Usage: python benchmark_html_parsing.py [rounds]
+"""
+import os
+import sys
+import time
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from html_parsing import (
+    PARSER_BACKENDS,
+    RETAILER_SELECTORS,
+    parse_houzz_page,
+    parse_pexels_search,
+    parse_pixabay_search,
+    parse_retailer_products,
+    parse_unsplash_page,
+    run_parser,
+)
+from enhanced_design_scraper import enhanced_design_scraper
+from pexels_direct_scraper import pexels_direct_scraper
+from pixabay_direct_scraper import pixabay_direct_scraper
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "html")
+
+# fixture file -> (parser, extra arguments), using the live scraper configs
+FIXTURE_CASES = {
+    "unsplash_search.html": (parse_unsplash_page, (40, enhanced_design_scraper.supported_sites["unsplash"]["selectors"])),
+    "houzz_photos.html": (parse_houzz_page, (40, enhanced_design_scraper.supported_sites["houzz"]["selectors"])),
+    "pexels_search.html": (parse_pexels_search, (40, pexels_direct_scraper.selectors)),
+    "pixabay_search.html": (parse_pixabay_search, (20, pixabay_direct_scraper.selectors)),
+    "pepperfry_search.html": (parse_retailer_products, (RETAILER_SELECTORS["pepperfry"],)),
+    "amazon_search.html": (parse_retailer_products, (RETAILER_SELECTORS["amazon"],)),
+    "generic_retailer.html": (parse_retailer_products, (RETAILER_SELECTORS["generic"],)),
+}
+
+
+def load_fixture(name: str) -> bytes:
+    with open(os.path.join(FIXTURE_DIR, name), "rb") as fixture:
+        return fixture.read()
+
+
+def benchmark(rounds: int = 20):
+    print(f"{'fixture':<24}{'KB':>6}{'items':>7}" + "".join(f"{name + ' ms':>11}" for name in PARSER_BACKENDS) + f"{'speedup':>9}")
+    for name, (parser, args) in FIXTURE_CASES.items():
+        html = load_fixture(name)
+        timings = {}
+        results = {}
+        for backend in PARSER_BACKENDS:
+            results[backend] = run_parser(parser, html, *args, backend=backend)  # Warm up selector caches
+            started = time.perf_counter()
+            for _ in range(rounds):
+                run_parser(parser, html, *args, backend=backend)
+            timings[backend] = (time.perf_counter() - started) / rounds * 1000
+
+        same = "" if results["lxml"] == results["bs4"] else "  (results differ!)"
+        print(
+            f"{name:<24}{len(html) // 1024:>6}{len(results['lxml']):>7}"
+            + "".join(f"{timings[backend]:>11.2f}" for backend in PARSER_BACKENDS)
+            + f"{timings['bs4'] / timings['lxml']:>8.1f}x{same}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-image classification in ImageCategorizationService: the
+Aho-Corasick matcher and memoized classify() against the previous
+per-keyword scans, regex alternations and repeated validation, over a few
+thousand feed items (the unlimited service's feed pages plus the items
+scraped from the synthetic pages in fixtures/html).
+
+Usage: python benchmark_image_categorization.py [rounds]
+"""
+import asyncio
+import os
+import random
+import re
+import sys
+import time
+from urllib.parse import urlparse
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_html_parsing import FIXTURE_CASES, load_fixture
+from html_parsing import run_parser
+from image_categorization_service import image_categorization_service
+from unlimited_design_service import unlimited_design_service
+
+# Candidates a provider page hands to the filter at once
+PAGE_SIZE = 200
+FEED_QUERIES = ["architecture interior design", "modern kitchen", "living room", "bedroom design", "office interior"]
+
+
+class PreviousMatching:
+    """The per-keyword loops and regex alternations the service used before the matcher"""
+
+    def __init__(self, service):
+        self.service = service
+        self.keyword_pattern = re.compile(
+            r"\b(" + "|".join(re.escape(kw) for kw in service.all_valid_keywords) + r")\b", re.IGNORECASE
+        )
+        self.non_design_regex = re.compile("|".join(re.escape(term) for term in service.non_design_terms), re.IGNORECASE)
+
+    def _extract_keywords_from_url(self, url):
+        parsed = urlparse(url)
+        path, domain = parsed.path.lower(), parsed.netloc.lower()
+        return [keyword for keyword in self.service.all_valid_keywords if keyword in path or keyword in domain]
+
+    def is_valid_design_image(self, image_data):
+        service = self.service
+        image_url = image_data.get("image", "") or image_data.get("url", "") or image_data.get("src", {}).get("large", "")
+        if self._extract_keywords_from_url(image_url):
+            return True
+        title = image_data.get("title", "")
+        description = image_data.get("description", "") if "description" in image_data else ""
+        tags = image_data.get("tags", [])
+        if title.lower() in service.generic_titles and not tags and not description:
+            return False
+        combined_text = " ".join([title, image_data.get("alt", ""), description] + tags).lower()
+        if self.non_design_regex.search(combined_text):
+            return False
+        if any(term in image_url for term in ["people", "person", "face", "human", "portrait", "selfie", "family", "beach", "nature", "mountain", "landscape"]):
+            return False
+        if self.keyword_pattern.search(combined_text):
+            return True
+        if "picsum.photos" in image_url and ("Photo #" in title or "Photo #" in image_data.get("alt", "")):
+            if not any(keyword in combined_text for keyword in service.all_valid_keywords):
+                return False
+        return False
+
+    def categorize_image(self, image_data):
+        if not self.is_valid_design_image(image_data):
+            return None
+        description = image_data.get("description", "").lower() if "description" in image_data else ""
+        combined_text = f"{image_data.get('title', '').lower()} {image_data.get('alt', '').lower()} {description} {' '.join(image_data.get('tags', []))}".lower()
+        for category, keywords in self.service.valid_categories.items():
+            for keyword in keywords:
+                if keyword.lower() in combined_text:
+                    return category
+        image_url = image_data.get("image", "") or image_data.get("url", "") or image_data.get("src", {}).get("large", "")
+        url_keywords = self._extract_keywords_from_url(image_url)
+        for category, keywords in self.service.valid_categories.items():
+            for keyword in keywords:
+                if keyword.lower() in url_keywords:
+                    return category
+        return None
+
+    def enhance_image_metadata(self, image_data):
+        service = self.service
+        if not self.is_valid_design_image(image_data):
+            return image_data
+        enhanced_data = image_data.copy()
+        category = self.categorize_image(image_data)
+        title = image_data.get("title", "")
+        alt_text = image_data.get("alt", "") or image_data.get("altText", "")
+        if category and not title:
+            category_title = service._generate_title_from_category(category)
+            enhanced_data["title"] = category_title
+            enhanced_data["alt"] = f"{category_title} - Interior Design"
+        elif category and not alt_text:
+            enhanced_data["alt"] = f"{title} - {service._generate_title_from_category(category)}"
+        if alt_text and any(generic in alt_text.lower() for generic in ["design image", "architecture design image", "photo", "image", "picture"]):
+            if category:
+                enhanced_data["alt"] = f"{service._generate_title_from_category(category)} - Professional interior design, high quality"
+            else:
+                enhanced_data["alt"] = title or "Interior design image"
+        if category and (not alt_text or len(alt_text.strip()) < 10):
+            enhanced_data["alt"] = f"{title or 'Interior design image'} - {service._get_style_info_from_category(category)} - Architectural photography"
+        if title.lower() in ["design", "architecture", "interior design", "image", "photo"] and category:
+            enhanced_data["title"] = service._generate_title_from_category(category)
+        if enhanced_data.get("alt", "").strip().lower() in ["", "image", "photo", "design image"]:
+            enhanced_data["alt"] = enhanced_data.get("title", "Interior design")
+        return enhanced_data
+
+    def filter_and_enhance(self, image_data):
+        """What the hybrid service does per provider result"""
+        return self.enhance_image_metadata(image_data) if self.is_valid_design_image(image_data) else None
+
+
+def filter_and_enhance(image_data):
+    classification = image_categorization_service.classify(image_data)
+    return classification.apply(image_data) if classification.valid else None
+
+
+def load_feed_items():
+    """Feed pages as the unlimited service serves them, plus every item scraped from the fixture pages"""
+    random.seed(0)
+    items = []
+    for query in FEED_QUERIES:
+        for page in range(1, 9):
+            items.extend(asyncio.run(unlimited_design_service.search_images(query, page, 60)))
+    for name, (parser, args) in FIXTURE_CASES.items():
+        for scraped in run_parser(parser, load_fixture(name), *args):
+            text = scraped.get("alt") or scraped.get("name") or ""
+            items.append({"image": scraped["image"], "title": text, "alt": text, "tags": []})
+    return items
+
+
+def time_per_item(function, items, rounds, cold=False):
+    """Mean microseconds per call; cold empties the classification memo before every round"""
+    elapsed = 0.0
+    for _ in range(rounds):
+        if cold:
+            image_categorization_service.classification_cache.clear()
+        started = time.perf_counter()
+        for item in items:
+            function(item)
+        elapsed += time.perf_counter() - started
+    return elapsed / (rounds * len(items)) * 1e6
+
+
+def benchmark(rounds: int = 5):
+    items = load_feed_items()
+    previous = PreviousMatching(image_categorization_service)
+    print(f"{len(items)} feed items, {len(image_categorization_service.all_valid_keywords)} keywords, "
+          f"{len(image_categorization_service.non_design_terms)} non-design terms")
+    cases = [
+        (name, getattr(previous, name), getattr(image_categorization_service, name))
+        for name in ("is_valid_design_image", "categorize_image", "enhance_image_metadata")
+    ]
+    cases.append(("validate + enhance", previous.filter_and_enhance, filter_and_enhance))
+    for cold in (True, False):
+        print(f"\n{'per image, ' + ('cold memo' if cold else 'memoized'):<24}{'before us':>11}{'after us':>11}{'speedup':>9}")
+        for name, before_fn, after_fn in cases:
+            image_categorization_service.classification_cache.clear()
+            same = "" if [before_fn(item) for item in items] == [after_fn(item) for item in items] else "  (results differ!)"
+            before = time_per_item(before_fn, items, rounds)
+            after = time_per_item(after_fn, items, rounds, cold=cold)
+            print(f"{name:<24}{before:>11.1f}{after:>11.1f}{before / after:>8.1f}x{same}")
+
+    # Whole provider pages through the filter loop vs one filter_design_images() call, cold memo
+    pages = [items[start:start + PAGE_SIZE] for start in range(0, len(items), PAGE_SIZE)]
+    before_fn = lambda page: [result for result in map(previous.filter_and_enhance, page) if result is not None]
+    after_fn = lambda page: image_categorization_service.filter_design_images(page, enhance=True)
+    same = "" if [before_fn(page) for page in pages] == [after_fn(page) for page in pages] else "  (results differ!)"
+    before = time_per_item(before_fn, pages, rounds)
+    after = time_per_item(after_fn, pages, rounds, cold=True)
+    print(f"\n{f'per {PAGE_SIZE}-image page':<24}{'before us':>11}{'after us':>11}{'speedup':>9}")
+    print(f"{'filter + enhance':<24}{before:>11.0f}{after:>11.0f}{before / after:>8.1f}x{same}")
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
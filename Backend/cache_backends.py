@@ -0,0 +1,196 @@
+import json
+import os
+from typing import Any, Dict, Iterable, List, Mapping
+
+from memory_cache import BoundedCache
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# "memory" keeps entries in each worker; "redis" shares them between workers
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/0")
+# Prefix for every key this app writes, so one Redis can serve several deployments
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "aiarch")
+# Keys scanned/deleted per round trip when a namespace is invalidated
+REDIS_SCAN_BATCH = 500
+
+_ABSENT = object()
+
+
+def encode_value(value: Any) -> bytes:
+    """Serialize a cache value to bytes: msgpack when installed, JSON otherwise"""
+    if MSGPACK_AVAILABLE:
+        return msgpack.packb(value, use_bin_type=True)
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(data: bytes) -> Any:
+    if MSGPACK_AVAILABLE:
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+
+class CacheBackend:
+    """
+    Storage behind CacheService. Keys arrive already namespaced
+    ("namespace:key"); every operation works on a batch so out-of-process
+    backends can answer it in one round trip.
+    """
+
+    name = "base"
+    # Whether every worker process sees the same entries
+    shared = False
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Values for the keys that are present; missing keys are left out"""
+        raise NotImplementedError
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None):
+        raise NotImplementedError
+
+    async def delete_many(self, keys: Iterable[str]):
+        raise NotImplementedError
+
+    async def invalidate_namespace(self, namespace: str) -> int:
+        """Drop every key under namespace; returns how many were removed"""
+        raise NotImplementedError
+
+    async def sweep(self):
+        """Drop expired entries, for backends that do not expire them on their own"""
+
+    async def close(self):
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Entries in a BoundedCache private to this worker process"""
+
+    name = "memory"
+
+    def __init__(self, cache_name: str = "cache_service"):
+        self.cache = BoundedCache(cache_name, ttl=300)
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        found = {}
+        for key in keys:
+            value = self.cache.get(key, _ABSENT)
+            if value is not _ABSENT:
+                found[key] = value
+        return found
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None):
+        for key, value in items.items():
+            self.cache.set(key, value, ttl=ttl)
+
+    async def delete_many(self, keys: Iterable[str]):
+        for key in keys:
+            self.cache.pop(key)
+
+    async def invalidate_namespace(self, namespace: str) -> int:
+        prefix = f"{namespace}:"
+        doomed = [key for key in self.cache.keys() if isinstance(key, str) and key.startswith(prefix)]
+        for key in doomed:
+            self.cache.pop(key)
+        return len(doomed)
+
+    async def sweep(self):
+        self.cache.sweep()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, **self.cache.get_stats()}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Entries in Redis (or anything speaking its protocol), shared by every
+    worker. Multi-get is a single MGET, multi-set a single pipelined
+    transaction, and values are stored as msgpack bytes. Namespace
+    invalidation walks the namespace with SCAN and UNLINKs in batches, so
+    it never blocks the server the way KEYS would.
+    """
+
+    name = "redis"
+    shared = True
+
+    def __init__(self, url: str = CACHE_REDIS_URL, prefix: str = CACHE_KEY_PREFIX, client=None):
+        if client is None:
+            if not REDIS_AVAILABLE:
+                raise RuntimeError("The redis package is required for the redis cache backend")
+            client = redis_asyncio.Redis.from_url(url)
+        self.client = client
+        self.prefix = prefix
+        self.stats = {"round_trips": 0, "keys_read": 0, "keys_written": 0, "bytes_read": 0, "bytes_written": 0}
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}:{key}"
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        if not keys:
+            return {}
+        raw = await self.client.mget([self._key(key) for key in keys])
+        self.stats["round_trips"] += 1
+        found = {}
+        for key, data in zip(keys, raw):
+            if data is not None:
+                found[key] = decode_value(data)
+                self.stats["keys_read"] += 1
+                self.stats["bytes_read"] += len(data)
+        return found
+
+    async def set_many(self, items: Mapping[str, Any], ttl: float | None):
+        if not items:
+            return
+        async with self.client.pipeline(transaction=True) as pipe:
+            for key, value in items.items():
+                data = encode_value(value)
+                pipe.set(self._key(key), data, px=int(ttl * 1000) if ttl else None)
+                self.stats["bytes_written"] += len(data)
+            await pipe.execute()
+        self.stats["round_trips"] += 1
+        self.stats["keys_written"] += len(items)
+
+    async def delete_many(self, keys: Iterable[str]):
+        names = [self._key(key) for key in keys]
+        if names:
+            await self.client.unlink(*names)
+            self.stats["round_trips"] += 1
+
+    async def invalidate_namespace(self, namespace: str) -> int:
+        removed = 0
+        batch = []
+        async for name in self.client.scan_iter(match=f"{self._key(namespace)}:*", count=REDIS_SCAN_BATCH):
+            batch.append(name)
+            if len(batch) >= REDIS_SCAN_BATCH:
+                removed += await self.client.unlink(*batch)
+                batch = []
+        if batch:
+            removed += await self.client.unlink(*batch)
+        return removed
+
+    async def close(self):
+        await self.client.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "prefix": self.prefix, **self.stats}
+
+
+def create_cache_backend(kind: str = CACHE_BACKEND) -> CacheBackend:
+    """Backend named by CACHE_BACKEND, falling back to memory when Redis is unavailable"""
+    if kind == "redis":
+        if REDIS_AVAILABLE:
+            return RedisCacheBackend()
+        print("CACHE_BACKEND=redis but the redis package is not installed; using the in-process cache")
+    return MemoryCacheBackend()
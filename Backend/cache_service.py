@@ -1,57 +1,173 @@
 import json
 import asyncio
-from typing import Any, Optional
+import os
 import time
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple
+
+from cache_backends import CacheBackend, create_cache_backend
+from fan_out import fan_out
+
+DEFAULT_NAMESPACE = "default"
+# Feed pages fetched at once by pre_cache_next_pages, so warming never crowds out live traffic
+PRE_CACHE_MAX_CONCURRENCY = int(os.getenv("PRE_CACHE_MAX_CONCURRENCY", "4"))
 
 class CacheService:
-    def __init__(self):
-        # In-memory cache for demo purposes
-        # In production, use Redis: self.redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
-        self.cache = {}
-        self.expire_times = {}
+    """
+    Key/value cache with per-entry expiry and namespaces. Storage is a
+    pluggable CacheBackend picked by CACHE_BACKEND: in-process by default,
+    or Redis so every uvicorn worker shares one warm cache. Backend failures
+    are counted and treated as misses; the cache is never load-bearing.
+    """
+
+    def __init__(self, backend: CacheBackend | None = None):
+        self.backend = backend or create_cache_backend()
+        self.stats = {"hits": 0, "misses": 0, "sets": 0, "invalidations": 0, "errors": 0}
+        self.last_warm_report: Dict[str, Any] | None = None
+
+    @property
+    def shared(self) -> bool:
+        """Whether entries are visible to every worker, not just this process"""
+        return self.backend.shared
+
+    @staticmethod
+    def _key(key: str, namespace: str) -> str:
+        return f"{namespace}:{key}"
     
-    async def get(self, key: str) -> Optional[Any]:
+    async def get(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> Optional[Any]:
         """Get value from cache"""
-        # Check if key has expired
-        if key in self.expire_times and time.time() > self.expire_times[key]:
-            await self.delete(key)
-            return None
-            
-        if key in self.cache:
-            return self.cache[key]
-        return None
+        return (await self.get_many([key], namespace)).get(key)
+
+    async def get_many(self, keys: Iterable[str], namespace: str = DEFAULT_NAMESPACE) -> Dict[str, Any]:
+        """Values for the keys found in one backend round trip; missing keys are left out"""
+        keys = list(keys)
+        try:
+            found = await self.backend.get_many([self._key(key, namespace) for key in keys])
+        except Exception as e:
+            print(f"Cache backend read failed: {e}")
+            self.stats["errors"] += 1
+            self.stats["misses"] += len(keys)
+            return {}
+        values = {key: found[self._key(key, namespace)] for key in keys if self._key(key, namespace) in found}
+        self.stats["hits"] += len(values)
+        self.stats["misses"] += len(keys) - len(values)
+        return values
     
-    async def set(self, key: str, value: Any, expiry: int = 300) -> bool:  # 5 minutes default
+    async def set(self, key: str, value: Any, expiry: int = 300, namespace: str = DEFAULT_NAMESPACE) -> bool:  # 5 minutes default
         """Set value in cache"""
+        return await self.set_many({key: value}, expiry, namespace)
+
+    async def set_many(self, items: Mapping[str, Any], expiry: int = 300, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        """Set several values with the same expiry in one backend round trip"""
         try:
-            self.cache[key] = value
-            self.expire_times[key] = time.time() + expiry
+            await self.backend.set_many({self._key(key, namespace): value for key, value in items.items()}, expiry)
+            self.stats["sets"] += len(items)
             return True
-        except:
+        except Exception as e:
+            print(f"Cache backend write failed: {e}")
+            self.stats["errors"] += 1
             return False
     
-    async def delete(self, key: str) -> bool:
+    async def delete(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> bool:
         """Delete key from cache"""
         try:
-            self.cache.pop(key, None)
-            self.expire_times.pop(key, None)
+            await self.backend.delete_many([self._key(key, namespace)])
             return True
-        except:
+        except Exception as e:
+            print(f"Cache backend delete failed: {e}")
+            self.stats["errors"] += 1
             return False
+
+    async def invalidate(self, namespace: str) -> int:
+        """Drop every entry in a namespace, in every worker sharing the backend"""
+        try:
+            removed = await self.backend.invalidate_namespace(namespace)
+        except Exception as e:
+            print(f"Cache backend invalidation failed: {e}")
+            self.stats["errors"] += 1
+            return 0
+        self.stats["invalidations"] += 1
+        return removed
     
     async def clear_expired(self):
-        """Clear expired cache entries"""
-        current_time = time.time()
-        expired_keys = [key for key, expiry in self.expire_times.items() if current_time > expiry]
-        for key in expired_keys:
-            await self.delete(key)
-
-    async def pre_cache_next_pages(self, query: str, max_pages: int = 5):
-        """Pre-cache the next few pages for a query to improve loading speed"""
-        print(f"Pre-caching {max_pages} pages for query: {query}")
-        for page in range(1, max_pages + 1):
-            # Create a cache key that matches what the database cache function would use
-            cache_key = f"search_{query}_page_{page}"
-            # We'll let the regular caching happen during actual requests
-            # For now, we'll just note that pre-caching was requested for this query
-            await self.set(cache_key, f"pre_cached_{query}_page_{page}", expiry=300)  # 5 minutes
\ No newline at end of file
+        """Clear expired cache entries (Redis expires its own; the in-process cache is also swept periodically)"""
+        await self.backend.sweep()
+
+    async def close(self):
+        await self.backend.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters across namespaces and the backend's own stats"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+            "backend": self.backend.get_stats(),
+            "last_warm": self.last_warm_report,
+        }
+
+    async def pre_cache_next_pages(
+        self,
+        image_service,
+        queries: str | Iterable[str],
+        pages: Iterable[int] = range(1, 6),
+        per_page: int = 60,
+        max_concurrency: int = PRE_CACHE_MAX_CONCURRENCY,
+        deadline: float | None = None,
+    ) -> Dict[str, Any]:
+        """
+        Warm the feed cache for every query and page by fetching through
+        image_service (a HybridImageService), at most max_concurrency pages
+        at a time. The payloads are stored in the feed's own cache tiers, so
+        /feed serves them directly. Pages still running when `deadline`
+        seconds have passed are cancelled. Returns a coverage report.
+        """
+        queries = [queries] if isinstance(queries, str) else list(queries)
+        pages = list(pages)
+        total = len(queries) * len(pages)
+        slots = asyncio.Semaphore(max(1, max_concurrency))
+        started = time.monotonic()
+        finished = 0
+        print(f"Pre-caching pages {pages} for {len(queries)} queries")
+
+        async def warm(query: str, page: int) -> Tuple[bool, int]:
+            nonlocal finished
+            async with slots:
+                was_cached, count = await image_service.warm_page(query, page, per_page)
+            finished += 1
+            state = "already cached" if was_cached else f"fetched {count} results"
+            print(f"Pre-caching [{finished}/{total}] page {page} of '{query[:60]}': {state}")
+            return was_cached, count
+
+        outcome = await fan_out(
+            [
+                (f"{index}:{page}", lambda query=query, page=page: warm(query, page))
+                for index, query in enumerate(queries)
+                for page in pages
+            ],
+            deadline=deadline,
+            label="pre_cache",
+        )
+
+        report = {"already_cached": 0, "warmed": 0, "empty": 0, "failed": len(outcome.errors), "unfinished": len(outcome.cancelled)}
+        per_query = {query: 0 for query in queries}
+        for name, (was_cached, count) in outcome.results.items():
+            if not count:
+                report["empty"] += 1
+                continue
+            report["already_cached" if was_cached else "warmed"] += 1
+            per_query[queries[int(name.split(":")[0])]] += 1
+        for name, error in outcome.errors.items():
+            print(f"Pre-caching {name} failed: {error}")
+
+        covered = report["already_cached"] + report["warmed"]
+        report.update({
+            "queries": len(queries),
+            "pages": total,
+            "coverage": covered / total if total else 1.0,
+            "per_query": {query: f"{count}/{len(pages)}" for query, count in per_query.items()},
+            "elapsed_s": round(time.monotonic() - started, 2),
+            "finished_at": time.time(),
+        })
+        self.last_warm_report = report
+        print(f"Pre-cached {covered}/{total} pages ({report['warmed']} fetched, {report['already_cached']} already cached) in {report['elapsed_s']}s")
+        return report
@@ -0,0 +1,121 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+from database import get_popular_cached_queries
+from hybrid_service import normalize_query_key
+
+# Startup warm-up of the feed cache; readiness waits for it, bounded by the time budget
+FEED_WARMUP_ENABLED = os.getenv("FEED_WARMUP_ENABLED", "true").lower() in ("1", "true", "yes")
+FEED_WARMUP_PAGES = int(os.getenv("FEED_WARMUP_PAGES", "3"))
+# Most popular recently cached queries warmed alongside the default feed query
+FEED_WARMUP_POPULAR_QUERIES = int(os.getenv("FEED_WARMUP_POPULAR_QUERIES", "5"))
+FEED_WARMUP_BUDGET = float(os.getenv("FEED_WARMUP_BUDGET", "30"))
+FEED_WARMUP_PER_PAGE = int(os.getenv("FEED_WARMUP_PER_PAGE", "60"))
+
+
+class FeedWarmup:
+    """
+    Warms the first pages of the default feed query and of the most popular
+    queries found in recent image_cache rows, so the first requests after a
+    deploy are not all cold. Runs in the background from the app lifespan;
+    `ready` turns true once it has finished or run out of its time budget,
+    which is what the readiness probe reports.
+    """
+
+    def __init__(
+        self,
+        cache_service,
+        image_service,
+        default_queries: List[str],
+        pages: int = FEED_WARMUP_PAGES,
+        popular_queries: int = FEED_WARMUP_POPULAR_QUERIES,
+        budget: float = FEED_WARMUP_BUDGET,
+        per_page: int = FEED_WARMUP_PER_PAGE,
+        enabled: bool = FEED_WARMUP_ENABLED,
+    ):
+        self.cache_service = cache_service
+        self.image_service = image_service
+        self.default_queries = default_queries
+        self.pages = pages
+        self.popular_queries = popular_queries
+        self.budget = budget
+        self.per_page = per_page
+        self.enabled = enabled
+        self._task: asyncio.Task | None = None
+        self._done = asyncio.Event()
+        self.started_at: float | None = None
+        self.report: Dict[str, Any] | None = None
+        self.error: str | None = None
+
+    async def collect_queries(self) -> List[str]:
+        """Default queries first, then popular ones, skipping queries that normalize to the same key"""
+        popular = await get_popular_cached_queries(limit=self.popular_queries) if self.popular_queries > 0 else []
+        queries, seen = [], set()
+        for query in [*self.default_queries, *popular]:
+            key = normalize_query_key(query)
+            if key and key not in seen:
+                seen.add(key)
+                queries.append(query)
+        return queries
+
+    async def run(self) -> Dict[str, Any]:
+        self.started_at = time.time()
+        try:
+            queries = await self.collect_queries()
+            print(f"Feed warm-up: {len(queries)} queries x {self.pages} pages, budget {self.budget:.0f}s")
+            remaining = max(0.0, self.budget - (time.time() - self.started_at))
+            self.report = await self.cache_service.pre_cache_next_pages(
+                self.image_service, queries, range(1, self.pages + 1), self.per_page, deadline=remaining
+            )
+            if self.report["unfinished"]:
+                print(f"Feed warm-up budget exhausted with {self.report['unfinished']} pages unfinished")
+            return self.report
+        except Exception as e:
+            self.error = str(e)
+            print(f"Feed warm-up failed: {e}")
+            return {}
+        finally:
+            self._done.set()
+
+    def start(self):
+        """Begin warming in the background; with warm-up disabled the app is ready at once"""
+        if not self.enabled or self.pages <= 0:
+            self._done.set()
+            return
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(), name="feed-warmup")
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._done.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Wait for the warm-up to finish; returns whether it did within timeout"""
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "pages": self.pages,
+            "popular_queries": self.popular_queries,
+            "budget_s": self.budget,
+            "elapsed_s": round(time.time() - self.started_at, 2) if self.started_at else None,
+            "report": self.report,
+            "error": self.error,
+        }
@@ -1,14 +1,527 @@
 import aiosqlite
+import asyncio
 import os
+import re
 import hashlib
-from typing import List, Dict, Any
+import json
+import time
+import zlib
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 
+from feed_image import pack_page, unpack_page
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 DATABASE_PATH = os.path.join(os.path.dirname(__file__), "cache.db")
 
+# Number of long-lived reader connections kept open by the pool
+SQLITE_READER_CONNECTIONS = int(os.getenv("SQLITE_READER_CONNECTIONS", "4"))
+
+# Applied to every pooled connection. WAL lets the readers run while the
+# single writer commits; synchronous=NORMAL is safe under WAL and avoids an
+# fsync per commit.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+    f"PRAGMA mmap_size={256 * 1024 * 1024}",  # 256 MB memory-mapped I/O
+    "PRAGMA cache_size=-16000",  # ~16 MB page cache per connection
+)
+
+# Codec for payloads written to image_cache.data, vision_cache.analysis_result
+# and chat_history.message_data: "json" (orjson when installed) or "msgpack"
+SQLITE_PAYLOAD_CODEC = os.getenv("SQLITE_PAYLOAD_CODEC", "json").lower()
+# Payloads at least this large are compressed (zstd when installed, zlib otherwise); 0 disables compression
+SQLITE_COMPRESS_MIN_BYTES = int(os.getenv("SQLITE_COMPRESS_MIN_BYTES", "8192"))
+SQLITE_ZSTD_LEVEL = int(os.getenv("SQLITE_ZSTD_LEVEL", "3"))
+
+# First byte of every stored payload: the codec in the low nibble, the
+# compression in the high nibble. Rows written before the header existed are
+# JSON text and are still read as such.
+PAYLOAD_JSON = 0x01
+PAYLOAD_MSGPACK = 0x02
+PAYLOAD_ZLIB = 0x10
+PAYLOAD_ZSTD = 0x20
+
+
+def encode_json(value: Any) -> bytes:
+    """Compact UTF-8 JSON: orjson when installed, the json module otherwise"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits, which the json module still handles
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def decode_json(data: bytes | str) -> Any:
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN written by json.dumps in older rows
+    return json.loads(data)
+
+
+def _encode_msgpack(value: Any) -> bytes:
+    return msgpack.packb(value, use_bin_type=True)
+
+
+def _decode_msgpack(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+
+_PAYLOAD_ENCODERS = {PAYLOAD_JSON: encode_json, PAYLOAD_MSGPACK: _encode_msgpack}
+_PAYLOAD_DECODERS = {PAYLOAD_JSON: decode_json, PAYLOAD_MSGPACK: _decode_msgpack}
+_PAYLOAD_HEADERS = frozenset(
+    codec | compression for codec in _PAYLOAD_DECODERS for compression in (0, PAYLOAD_ZLIB, PAYLOAD_ZSTD)
+)
+
+
+def encode_payload(value: Any, codec: str = SQLITE_PAYLOAD_CODEC) -> bytes:
+    """Serialize a value for a payload column: header byte, then the (possibly compressed) body"""
+    header = PAYLOAD_MSGPACK if codec == "msgpack" and MSGPACK_AVAILABLE else PAYLOAD_JSON
+    body = _PAYLOAD_ENCODERS[header](value)
+    if SQLITE_COMPRESS_MIN_BYTES and len(body) >= SQLITE_COMPRESS_MIN_BYTES:
+        if ZSTD_AVAILABLE:
+            body, header = zstandard.compress(body, SQLITE_ZSTD_LEVEL), header | PAYLOAD_ZSTD
+        else:
+            body, header = zlib.compress(body, 1), header | PAYLOAD_ZLIB
+    return bytes((header,)) + body
+
+
+def _payload_body(data: bytes | str) -> Tuple[int, bytes | str]:
+    """(codec, uncompressed body) of a stored payload; header-less rows are JSON"""
+    if isinstance(data, str) or not data or data[0] not in _PAYLOAD_HEADERS:
+        return PAYLOAD_JSON, data
+    header, body = data[0], data[1:]
+    if header & PAYLOAD_ZSTD:
+        body = zstandard.decompress(body)
+    elif header & PAYLOAD_ZLIB:
+        body = zlib.decompress(body)
+    return header & 0x0F, body
+
+
+def decode_payload(data: bytes | str) -> Any:
+    """Value of a payload column, whichever codec and compression wrote it"""
+    codec, body = _payload_body(data)
+    return _PAYLOAD_DECODERS[codec](body)
+
+
+def payload_json(data: bytes | str) -> bytes:
+    """A payload column as JSON bytes, parsed and re-encoded only when it was not stored as JSON"""
+    codec, body = _payload_body(data)
+    if codec == PAYLOAD_JSON:
+        return body.encode("utf-8") if isinstance(body, str) else body
+    return encode_json(_PAYLOAD_DECODERS[codec](body))
+
+
+class SQLiteConnectionPool:
+    """
+    Long-lived aiosqlite connections shared by every database helper.
+
+    Reads are spread over a small set of reader connections; all writes go
+    through a single connection guarded by a lock so they are serialized.
+    """
+
+    def __init__(self, path: str, readers: int = SQLITE_READER_CONNECTIONS):
+        self.path = path
+        self.reader_count = max(1, readers)
+        self.is_open = False
+        self._readers: asyncio.Queue | None = None
+        self._reader_connections = []
+        self._writer = None
+        self._write_lock: asyncio.Lock | None = None
+        self.stats = {
+            "reader_acquires": 0,
+            "writer_acquires": 0,
+            "reader_wait_total_ms": 0.0,
+            "writer_wait_total_ms": 0.0,
+            "reader_wait_max_ms": 0.0,
+            "writer_wait_max_ms": 0.0,
+        }
+
+    async def _connect(self):
+        db = await aiosqlite.connect(self.path)
+        for pragma in SQLITE_PRAGMAS:
+            await db.execute(pragma)
+        return db
+
+    async def open(self):
+        """Open the writer and reader connections"""
+        if self.is_open:
+            return
+        # Open the writer first so WAL mode is set before any reader attaches
+        self._writer = await self._connect()
+        self._write_lock = asyncio.Lock()
+        self._readers = asyncio.Queue()
+        for _ in range(self.reader_count):
+            db = await self._connect()
+            self._reader_connections.append(db)
+            self._readers.put_nowait(db)
+        self.is_open = True
+
+    async def close(self):
+        """Close all pooled connections"""
+        if not self.is_open:
+            return
+        self.is_open = False
+        for db in self._reader_connections:
+            await db.close()
+        self._reader_connections = []
+        if self._writer is not None:
+            async with self._write_lock:
+                await self._writer.close()
+            self._writer = None
+
+    def _record_wait(self, kind: str, started: float):
+        waited_ms = (time.perf_counter() - started) * 1000
+        self.stats[f"{kind}_acquires"] += 1
+        self.stats[f"{kind}_wait_total_ms"] += waited_ms
+        if waited_ms > self.stats[f"{kind}_wait_max_ms"]:
+            self.stats[f"{kind}_wait_max_ms"] = waited_ms
+
+    @asynccontextmanager
+    async def reader(self):
+        """Borrow a reader connection for the duration of the block"""
+        started = time.perf_counter()
+        db = await self._readers.get()
+        self._record_wait("reader", started)
+        try:
+            yield db
+        finally:
+            self._readers.put_nowait(db)
+
+    @asynccontextmanager
+    async def writer(self):
+        """Hold the single writer connection; rolls back if the block fails"""
+        started = time.perf_counter()
+        async with self._write_lock:
+            self._record_wait("writer", started)
+            try:
+                yield self._writer
+            except Exception:
+                await self._writer.rollback()
+                raise
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size and wait-time metrics"""
+        reader_acquires = self.stats["reader_acquires"]
+        writer_acquires = self.stats["writer_acquires"]
+        return {
+            "open": self.is_open,
+            "readers_total": self.reader_count,
+            "readers_idle": self._readers.qsize() if self._readers else 0,
+            "writer_busy": self._write_lock.locked() if self._write_lock else False,
+            **self.stats,
+            "reader_wait_avg_ms": self.stats["reader_wait_total_ms"] / reader_acquires if reader_acquires else 0.0,
+            "writer_wait_avg_ms": self.stats["writer_wait_total_ms"] / writer_acquires if writer_acquires else 0.0,
+        }
+
+
+_pool: SQLiteConnectionPool | None = None
+
+
+async def init_pool(readers: int = SQLITE_READER_CONNECTIONS) -> SQLiteConnectionPool:
+    """Open the shared connection pool (called from the app lifespan)"""
+    global _pool
+    if _pool is None or not _pool.is_open:
+        _pool = SQLiteConnectionPool(DATABASE_PATH, readers)
+        await _pool.open()
+    return _pool
+
+
+async def close_pool():
+    """Close the shared connection pool"""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def get_pool_stats() -> Dict[str, Any]:
+    """Metrics for the shared connection pool"""
+    if _pool is None:
+        return {"open": False}
+    return _pool.get_stats()
+
+
+@asynccontextmanager
+async def _read_connection():
+    """Pooled reader connection, or a one-off connection before the pool is open"""
+    if _pool is not None and _pool.is_open:
+        async with _pool.reader() as db:
+            yield db
+    else:
+        async with aiosqlite.connect(DATABASE_PATH) as db:
+            yield db
+
+
+@asynccontextmanager
+async def _write_connection():
+    """Pooled writer connection, or a one-off connection before the pool is open"""
+    if _pool is not None and _pool.is_open:
+        async with _pool.writer() as db:
+            yield db
+    else:
+        async with aiosqlite.connect(DATABASE_PATH) as db:
+            yield db
+
+
+# Write-behind batching for high-volume inserts (image cache, vision cache,
+# analytics). Rows are buffered in memory and committed in one transaction
+# when the batch fills up or the flush interval elapses.
+WRITE_BEHIND_BATCH_SIZE = int(os.getenv("WRITE_BEHIND_BATCH_SIZE", "200"))
+WRITE_BEHIND_FLUSH_INTERVAL = float(os.getenv("WRITE_BEHIND_FLUSH_INTERVAL", "0.5"))
+WRITE_BEHIND_MAX_QUEUE = int(os.getenv("WRITE_BEHIND_MAX_QUEUE", "10000"))
+# A failed flush (e.g. "database is locked") is retried this many times, waiting
+# WRITE_BEHIND_RETRY_BACKOFF seconds and doubling after each attempt
+WRITE_BEHIND_MAX_RETRIES = int(os.getenv("WRITE_BEHIND_MAX_RETRIES", "3"))
+WRITE_BEHIND_RETRY_BACKOFF = float(os.getenv("WRITE_BEHIND_RETRY_BACKOFF", "0.1"))
+
+IMAGE_CACHE_UPSERT_SQL = """
+    INSERT OR REPLACE INTO image_cache
+    (provider, query, page, data, created_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+VISION_CACHE_UPSERT_SQL = """
+    INSERT OR REPLACE INTO vision_cache
+    (image_hash, analysis_result, created_at)
+    VALUES (?, ?, ?)
+"""
+ANALYTICS_INSERT_SQL = """
+    INSERT INTO analytics_metrics (metric_type, metric_value, user_id, project_id, created_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+
+
+def _statement_table(sql: str) -> str:
+    """Table an INSERT writes to, for reporting lost rows"""
+    match = re.search(r"\bINTO\s+(\w+)", sql, re.IGNORECASE)
+    return match.group(1) if match else "unknown"
+
+
+class WriteBehindQueue:
+    """
+    In-memory queue of pending INSERTs flushed in grouped transactions.
+
+    Image cache rows that are still queued stay readable through
+    `pending_images`, so a lookup right after a write does not miss. A batch
+    that fails is retried with backoff; if it still fails, its rows are
+    written one by one so only the rows that fail themselves are lost, and
+    those are counted per table.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = WRITE_BEHIND_BATCH_SIZE,
+        flush_interval: float = WRITE_BEHIND_FLUSH_INTERVAL,
+        max_queue: int = WRITE_BEHIND_MAX_QUEUE,
+        max_retries: int = WRITE_BEHIND_MAX_RETRIES,
+        retry_backoff: float = WRITE_BEHIND_RETRY_BACKOFF,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.max_retries = max(0, max_retries)
+        self.retry_backoff = retry_backoff
+        self.is_running = False
+        self._pending = []
+        self._pending_images = {}
+        self._sequence = 0
+        self._wake: asyncio.Event | None = None
+        self._flush_lock: asyncio.Lock | None = None
+        self._task: asyncio.Task | None = None
+        self.stats = {
+            "enqueued": 0,
+            "rejected": 0,
+            "flushes": 0,
+            "flushed_rows": 0,
+            "failed_rows": 0,
+            "retries": 0,
+            "lost_rows_by_table": {},
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "total_flush_ms": 0.0,
+        }
+
+    async def start(self):
+        """Start the background flush loop"""
+        if self.is_running:
+            return
+        self._wake = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self.is_running = True
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush loop and write out everything still queued"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._wake.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+    def enqueue(self, sql: str, params: tuple, image_key: tuple | None = None, image_data: Any = None) -> bool:
+        """Queue a write; returns False if the caller should write directly"""
+        if not self.is_running or len(self._pending) >= self.max_queue:
+            self.stats["rejected"] += 1
+            return False
+        self._sequence += 1
+        self._pending.append((sql, params, image_key, self._sequence))
+        if image_key is not None:
+            self._pending_images[image_key] = (self._sequence, image_data)
+        self.stats["enqueued"] += 1
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+        return True
+
+    def pending_images(self, query: str, page: int, provider: str | None = None) -> List[Dict[str, Any]] | None:
+        """Image cache rows written but not yet flushed"""
+        if provider is not None:
+            entry = self._pending_images.get((provider, query, page))
+            return entry[1] if entry else None
+        latest = None
+        for (_, pending_query, pending_page), entry in self._pending_images.items():
+            if pending_query == query and pending_page == page and (latest is None or entry[0] > latest[0]):
+                latest = entry
+        return latest[1] if latest else None
+
+    async def _run(self):
+        while self.is_running:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Commit all queued writes in a single transaction"""
+        if self._flush_lock is None:
+            return 0
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            started = time.perf_counter()
+            try:
+                await self._write_with_retries(batch)
+            finally:
+                for _, _, image_key, sequence in batch:
+                    entry = self._pending_images.get(image_key) if image_key is not None else None
+                    if entry is not None and entry[0] == sequence:
+                        del self._pending_images[image_key]
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.stats["flushes"] += 1
+            self.stats["last_flush_ms"] = elapsed_ms
+            self.stats["total_flush_ms"] += elapsed_ms
+            if elapsed_ms > self.stats["max_flush_ms"]:
+                self.stats["max_flush_ms"] = elapsed_ms
+            return len(batch)
+
+    async def _write_with_retries(self, batch: list):
+        """Commit a batch, retrying with backoff, then row by row so one bad row cannot sink the rest"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                await self._write_batch(batch)
+                self.stats["flushed_rows"] += len(batch)
+                return
+            except Exception as e:
+                error = e
+            if attempt < self.max_retries:
+                delay = self.retry_backoff * (2 ** attempt)
+                print(f"Write-behind flush of {len(batch)} rows failed ({error}); retrying in {delay:.2f}s")
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+
+        lost = {}
+        for row in batch:
+            try:
+                await self._write_batch([row])
+                self.stats["flushed_rows"] += 1
+            except Exception as e:
+                error = e
+                table = _statement_table(row[0])
+                lost[table] = lost.get(table, 0) + 1
+        if lost:
+            lost_by_table = self.stats["lost_rows_by_table"]
+            for table, count in lost.items():
+                lost_by_table[table] = lost_by_table.get(table, 0) + count
+            self.stats["failed_rows"] += sum(lost.values())
+            print(f"Error flushing write-behind queue, dropped rows per table {lost}: {error}")
+
+    async def _write_batch(self, batch: list):
+        """Write rows in one transaction, grouping consecutive rows for the same statement into executemany calls"""
+        async with _write_connection() as db:
+            group_sql, group_rows = None, []
+            for sql, params, _, _ in batch:
+                if sql != group_sql and group_rows:
+                    await db.executemany(group_sql, group_rows)
+                    group_rows = []
+                group_sql = sql
+                group_rows.append(params)
+            if group_rows:
+                await db.executemany(group_sql, group_rows)
+            await db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth and flush latency metrics"""
+        flushes = self.stats["flushes"]
+        return {
+            "running": self.is_running,
+            "depth": len(self._pending),
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+            **self.stats,
+            "lost_rows_by_table": dict(self.stats["lost_rows_by_table"]),
+            "avg_flush_ms": self.stats["total_flush_ms"] / flushes if flushes else 0.0,
+        }
+
+
+_write_queue = WriteBehindQueue()
+
+
+async def start_write_behind():
+    """Start the write-behind queue (called from the app lifespan)"""
+    await _write_queue.start()
+
+
+async def stop_write_behind():
+    """Flush and stop the write-behind queue"""
+    await _write_queue.stop()
+
+
+def get_write_queue_stats() -> Dict[str, Any]:
+    """Metrics for the write-behind queue"""
+    return _write_queue.get_stats()
+
 async def init_db():
     """Initialize the database with the required tables"""
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with _write_connection() as db:
         # Create image cache table
         await db.execute("""
             CREATE TABLE IF NOT EXISTS image_cache (
@@ -94,6 +607,10 @@ async def init_db():
             CREATE INDEX IF NOT EXISTS idx_provider_query_page
             ON image_cache(provider, query, page)
         """)
+        await db.execute("""
+            CREATE INDEX IF NOT EXISTS idx_query_page
+            ON image_cache(query, page)
+        """)
         await db.execute("""
             CREATE INDEX IF NOT EXISTS idx_created_at
             ON image_cache(created_at)
@@ -145,13 +662,11 @@ async def init_db():
 async def cache_images(provider: str, query: str, page: int, data: List[Dict[str, Any]]) -> bool:
     """Cache images in the database"""
     try:
-        import json
-        async with aiosqlite.connect(DATABASE_PATH) as db:
-            await db.execute("""
-                INSERT OR REPLACE INTO image_cache
-                (provider, query, page, data, created_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (provider, query, page, json.dumps(data), datetime.now()))
+        params = (provider, query, page, encode_payload(pack_page(data)), datetime.now())
+        if _write_queue.enqueue(IMAGE_CACHE_UPSERT_SQL, params, (provider, query, page), data):
+            return True
+        async with _write_connection() as db:
+            await db.execute(IMAGE_CACHE_UPSERT_SQL, params)
             await db.commit()
         return True
     except Exception as e:
@@ -161,21 +676,22 @@ async def cache_images(provider: str, query: str, page: int, data: List[Dict[str
 async def cache_images_batch(caches: List[Dict[str, any]]) -> bool:
     """Cache multiple image sets in the database at once"""
     try:
-        import json
-        async with aiosqlite.connect(DATABASE_PATH) as db:
-            for cache in caches:
-                await db.execute("""
-                    INSERT OR REPLACE INTO image_cache
-                    (provider, query, page, data, created_at)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    cache['provider'], 
-                    cache['query'], 
-                    cache['page'], 
-                    json.dumps(cache['data']), 
-                    datetime.now()
-                ))
-            await db.commit()
+        direct_rows = []
+        for cache in caches:
+            params = (
+                cache['provider'],
+                cache['query'],
+                cache['page'],
+                encode_payload(pack_page(cache['data'])),
+                datetime.now()
+            )
+            image_key = (cache['provider'], cache['query'], cache['page'])
+            if not _write_queue.enqueue(IMAGE_CACHE_UPSERT_SQL, params, image_key, cache['data']):
+                direct_rows.append(params)
+        if direct_rows:
+            async with _write_connection() as db:
+                await db.executemany(IMAGE_CACHE_UPSERT_SQL, direct_rows)
+                await db.commit()
         return True
     except Exception as e:
         print(f"Error caching images batch: {e}")
@@ -184,8 +700,10 @@ async def cache_images_batch(caches: List[Dict[str, any]]) -> bool:
 async def get_cached_images(provider: str, query: str, page: int, max_age_hours: int = 24) -> List[Dict[str, Any]] | None:
     """Retrieve cached images from the database"""
     try:
-        import json
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        pending = _write_queue.pending_images(query, page, provider)
+        if pending is not None:
+            return pending
+        async with _read_connection() as db:
             # Calculate the expiration time
             expiration_time = datetime.now() - timedelta(hours=max_age_hours)
             
@@ -197,65 +715,75 @@ async def get_cached_images(provider: str, query: str, page: int, max_age_hours:
             """, (provider, query, page, expiration_time)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    return json.loads(row[0])
+                    return unpack_page(decode_payload(row[0]))
         return None
     except Exception as e:
         print(f"Error retrieving cached images: {e}")
         return None
 
-async def get_cached_images_multi_provider(query: str, page: int, max_age_hours: int = 24) -> List[Dict[str, Any]] | None:
-    """Retrieve cached images from any provider (for hybrid approach)"""
+async def get_cached_images_for_keys(queries: List[str], page: int, max_age_hours: float = 24) -> Tuple[str, List[Dict[str, Any]], datetime] | None:
+    """Retrieve the first cached page stored under any of the given query keys, in order of preference.
+
+    Returns (query key, data, created_at) so callers can tell how fresh the entry is.
+    """
     try:
-        import json
-        async with aiosqlite.connect(DATABASE_PATH) as db:
-            # Calculate the expiration time
+        for query in queries:
+            pending = _write_queue.pending_images(query, page)
+            if pending is not None:
+                return query, pending, datetime.now()
+        async with _read_connection() as db:
             expiration_time = datetime.now() - timedelta(hours=max_age_hours)
-            
-            async with db.execute("""
-                SELECT data FROM image_cache
-                WHERE query = ? AND page = ? AND created_at > ?
+            placeholders = ", ".join("?" for _ in queries)
+            async with db.execute(f"""
+                SELECT query, data, created_at FROM image_cache
+                WHERE query IN ({placeholders}) AND page = ? AND created_at > ?
                 ORDER BY created_at DESC
-                LIMIT 1
-            """, (query, page, expiration_time)) as cursor:
-                row = await cursor.fetchone()
-                if row:
-                    return json.loads(row[0])
+            """, (*queries, page, expiration_time)) as cursor:
+                rows = await cursor.fetchall()
+        # Newest row per key wins; keys are then tried in the caller's order
+        latest = {}
+        for query, data, created_at in rows:
+            latest.setdefault(query, (data, created_at))
+        for query in queries:
+            if query in latest:
+                data, created_at = latest[query]
+                if not isinstance(created_at, datetime):
+                    created_at = datetime.fromisoformat(str(created_at))
+                return query, unpack_page(decode_payload(data)), created_at
         return None
     except Exception as e:
-        print(f"Error retrieving cached images: {e}")
+        print(f"Error retrieving cached images for keys: {e}")
         return None
 
-async def get_cached_images_multi_provider_extended(query: str, page_range: tuple = (1, 5), max_age_hours: int = 24) -> Dict[int, List[Dict[str, Any]]]:
-    """Retrieve cached images for a range of pages to support infinite scrolling"""
+async def get_popular_cached_queries(key_types: Tuple[str, ...] = ("aggregated", "prefetch"), limit: int = 5, max_age_hours: float = 24) -> List[str]:
+    """Normalized feed queries with the most distinct pages cached recently, most popular first.
+
+    Pages cached under any of the key types ("<type>:<normalized query>") count
+    towards the same query; how deep users scrolled stands in for popularity.
+    """
     try:
-        import json
-        results = {}
-        async with aiosqlite.connect(DATABASE_PATH) as db:
-            # Calculate the expiration time
+        async with _read_connection() as db:
             expiration_time = datetime.now() - timedelta(hours=max_age_hours)
-            
-            # Get all pages within the requested range
-            for page in range(page_range[0], page_range[1] + 1):
-                async with db.execute("""
-                    SELECT data FROM image_cache
-                    WHERE query = ? AND page = ? AND created_at > ?
-                    ORDER BY created_at DESC
-                    LIMIT 1
-                """, (query, page, expiration_time)) as cursor:
-                    row = await cursor.fetchone()
-                    if row:
-                        results[page] = json.loads(row[0])
-                    else:
-                        results[page] = []
-        return results
+            prefixes = " OR ".join("query LIKE ?" for _ in key_types)
+            async with db.execute(f"""
+                SELECT substr(query, instr(query, ':') + 1) AS normalized,
+                       COUNT(DISTINCT page) AS pages, MAX(created_at) AS latest
+                FROM image_cache
+                WHERE ({prefixes}) AND created_at > ?
+                GROUP BY normalized
+                ORDER BY pages DESC, latest DESC
+                LIMIT ?
+            """, (*(f"{key_type}:%" for key_type in key_types), expiration_time, limit)) as cursor:
+                rows = await cursor.fetchall()
+        return [row[0] for row in rows if row[0]]
     except Exception as e:
-        print(f"Error retrieving cached images for multiple pages: {e}")
-        return {}
+        print(f"Error retrieving popular cached queries: {e}")
+        return []
 
 async def cleanup_old_cache(max_age_hours: int = 168) -> bool:
     """Remove cache entries older than max_age_hours"""
     try:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _write_connection() as db:
             expiration_time = datetime.now() - timedelta(hours=max_age_hours)
             await db.execute("""
                 DELETE FROM image_cache
@@ -271,24 +799,25 @@ async def cleanup_old_cache(max_age_hours: int = 168) -> bool:
 async def cache_vision_analysis(image_hash: str, analysis_result: Dict[str, Any]) -> bool:
     """Cache vision analysis result in the database"""
     try:
-        import json
-        async with aiosqlite.connect(DATABASE_PATH) as db:
-            await db.execute("""
-                INSERT OR REPLACE INTO vision_cache
-                (image_hash, analysis_result, created_at)
-                VALUES (?, ?, ?)
-            """, (image_hash, json.dumps(analysis_result), datetime.now()))
+        params = (image_hash, encode_payload(analysis_result), datetime.now())
+        if _write_queue.enqueue(VISION_CACHE_UPSERT_SQL, params):
+            return True
+        async with _write_connection() as db:
+            await db.execute(VISION_CACHE_UPSERT_SQL, params)
             await db.commit()
         return True
     except Exception as e:
         print(f"Error caching vision analysis: {e}")
         return False
 
-async def get_cached_vision_analysis(image_hash: str, max_age_hours: int = 1) -> Dict[str, Any] | None:
-    """Retrieve cached vision analysis result from the database"""
+async def get_cached_vision_analysis(image_hash: str, max_age_hours: int = 1, encoded: bool = False) -> Dict[str, Any] | bytes | None:
+    """Retrieve cached vision analysis result from the database
+
+    With encoded=True the result is returned as JSON bytes, ready to be written
+    into a response without decoding it.
+    """
     try:
-        import json
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _read_connection() as db:
             # Calculate the expiration time
             expiration_time = datetime.now() - timedelta(hours=max_age_hours)
             
@@ -300,7 +829,7 @@ async def get_cached_vision_analysis(image_hash: str, max_age_hours: int = 1) ->
             """, (image_hash, expiration_time)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    return json.loads(row[0])
+                    return payload_json(row[0]) if encoded else decode_payload(row[0])
         return None
     except Exception as e:
         print(f"Error retrieving cached vision analysis: {e}")
@@ -318,7 +847,7 @@ def calculate_image_hash(image_path: str) -> str:
 async def save_chat_session(session_id: str, title: str) -> bool:
     """Save or update a chat session"""
     try:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _write_connection() as db:
             await db.execute("""
                 INSERT OR REPLACE INTO chat_sessions
                 (id, title, updated_at)
@@ -333,8 +862,7 @@ async def save_chat_session(session_id: str, title: str) -> bool:
 async def save_chat_history(session_id: str, messages: List[Dict[str, Any]]) -> bool:
     """Save chat history for a session"""
     try:
-        import json
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _write_connection() as db:
             # First, delete existing history for this session
             await db.execute("""
                 DELETE FROM chat_history WHERE session_id = ?
@@ -345,7 +873,7 @@ async def save_chat_history(session_id: str, messages: List[Dict[str, Any]]) ->
                 INSERT INTO chat_history
                 (session_id, message_data, created_at)
                 VALUES (?, ?, ?)
-            """, (session_id, json.dumps(messages), datetime.now()))
+            """, (session_id, encode_payload(messages), datetime.now()))
             
             await db.commit()
         return True
@@ -353,11 +881,10 @@ async def save_chat_history(session_id: str, messages: List[Dict[str, Any]]) ->
         print(f"Error saving chat history: {e}")
         return False
 
-async def get_chat_history(session_id: str) -> List[Dict[str, Any]] | None:
-    """Retrieve chat history for a session"""
+async def get_chat_history(session_id: str, encoded: bool = False) -> List[Dict[str, Any]] | bytes | None:
+    """Retrieve chat history for a session (as JSON bytes with encoded=True)"""
     try:
-        import json
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _read_connection() as db:
             async with db.execute("""
                 SELECT message_data FROM chat_history
                 WHERE session_id = ?
@@ -365,7 +892,7 @@ async def get_chat_history(session_id: str) -> List[Dict[str, Any]] | None:
             """, (session_id,)) as cursor:
                 row = await cursor.fetchone()
                 if row:
-                    return json.loads(row[0])
+                    return payload_json(row[0]) if encoded else decode_payload(row[0])
         return None
     except Exception as e:
         print(f"Error retrieving chat history: {e}")
@@ -374,7 +901,7 @@ async def get_chat_history(session_id: str) -> List[Dict[str, Any]] | None:
 async def get_chat_sessions(limit: int = 30) -> List[Dict[str, Any]]:
     """Retrieve recent chat sessions"""
     try:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _read_connection() as db:
             async with db.execute("""
                 SELECT id, title, created_at, updated_at
                 FROM chat_sessions
@@ -399,11 +926,12 @@ async def get_chat_sessions(limit: int = 30) -> List[Dict[str, Any]]:
 async def record_analytics_event(metric_type: str, metric_value: int = 1, user_id: str = None, project_id: str = None) -> bool:
     """Record an analytics event"""
     try:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
-            await db.execute("""
-                INSERT INTO analytics_metrics (metric_type, metric_value, user_id, project_id)
-                VALUES (?, ?, ?, ?)
-            """, (metric_type, metric_value, user_id, project_id))
+        # Stamped now rather than by the column default, which would record when the queue flushed
+        params = (metric_type, metric_value, user_id, project_id, datetime.now())
+        if _write_queue.enqueue(ANALYTICS_INSERT_SQL, params):
+            return True
+        async with _write_connection() as db:
+            await db.execute(ANALYTICS_INSERT_SQL, params)
             await db.commit()
         return True
     except Exception as e:
@@ -413,7 +941,7 @@ async def record_analytics_event(metric_type: str, metric_value: int = 1, user_i
 async def get_analytics_summary() -> Dict[str, Any]:
     """Get aggregated analytics summary"""
     try:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _read_connection() as db:
             # Get total counts for each metric type
             async with db.execute("""
                 SELECT 
@@ -475,7 +1003,7 @@ async def get_analytics_summary() -> Dict[str, Any]:
 async def get_project_analytics(limit: int = 10) -> List[Dict[str, Any]]:
     """Get project analytics data"""
     try:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _read_connection() as db:
             async with db.execute("""
                 SELECT 
                     project_id,
@@ -509,7 +1037,7 @@ async def get_project_analytics(limit: int = 10) -> List[Dict[str, Any]]:
 async def get_activity_data(days: int = 30) -> List[Dict[str, Any]]:
     """Get activity data for charts"""
     try:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _read_connection() as db:
             # Get daily aggregates for the specified period
             start_date = datetime.now() - timedelta(days=days)
             
@@ -546,7 +1074,7 @@ async def get_activity_data(days: int = 30) -> List[Dict[str, Any]]:
 async def update_project_analytics(project_id: str, category: str, views: int = None, likes: int = None, collaborators: int = None) -> bool:
     """Update project analytics data"""
     try:
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with _write_connection() as db:
             # Get current values
             async with db.execute("""
                 SELECT views, likes, collaborators FROM project_analytics
@@ -7,17 +7,27 @@ import os
 import httpx
 import asyncio
 import random
-import time
 import json
 from typing import Dict, List, Any, Optional, Tuple
 from urllib.parse import urlencode, urlparse, parse_qs
-from bs4 import BeautifulSoup
-import re
 from fake_useragent import UserAgent
 
 # Import the image categorization service
 from image_categorization_service import image_categorization_service
 
+from fan_out import fan_out
+from http_cache import http_response_cache
+from http_clients import http_clients
+from memory_cache import BoundedCache
+from rate_limiter import scraper_rate_limiter
+from html_parsing import (
+    html_parse_executor,
+    parse_archdigest_page,
+    parse_houzz_page,
+    parse_unsplash_page,
+    precompile_selectors,
+)
+
 class EnhancedDesignScraper:
     """
     Enhanced scraper that directly scrapes design websites for high-quality images.
@@ -25,49 +35,59 @@ class EnhancedDesignScraper:
     """
 
     def __init__(self):
-        # Initialize HTTP client with realistic headers
+        # Rotating user agents for realistic request headers
         self.ua = UserAgent()
-        self.session = httpx.AsyncClient(
-            timeout=30.0,
-            follow_redirects=True,
-            headers=self._get_random_headers(),
-            http2=True  # Enable HTTP/2 for better compatibility
-        )
-
-        # Rate limiting per domain with adaptive adjustment
-        self.rate_limits = {
-            "unsplash.com": {"last_request": 0, "min_interval": 2.0, "blocked_count": 0},
-            "houzz.com": {"last_request": 0, "min_interval": 3.0, "blocked_count": 0},
-            "archdigest.com": {"last_request": 0, "min_interval": 3.0, "blocked_count": 0},
-            "pexels.com": {"last_request": 0, "min_interval": 1.5, "blocked_count": 0},
-            "pixabay.com": {"last_request": 0, "min_interval": 2.0, "blocked_count": 0},
-        }
 
         # Cache for storing requests temporarily
-        self.cache = {}
         self.cache_timeout = 600  # 10 minutes cache timeout
+        self.cache = BoundedCache("enhanced_design_scraper", max_entries=500, ttl=self.cache_timeout)
+        # Upper bound for one multi-site search; sites still running are cancelled
+        self.search_deadline = float(os.getenv("DESIGN_SCRAPER_DEADLINE", "12"))
 
         # Supported design websites
         self.supported_sites = {
             "unsplash": {
                 "base_url": "https://unsplash.com",
                 "search_url": "https://unsplash.com/s/photos/{query}",
-                "image_selector": "img[data-test='photo-grid-image']",
+                "selectors": {
+                    "images": [
+                        "img[data-test='photo-grid-image']",
+                        "img[data-testid='photo-grid-image']",
+                        "figure img",
+                        ".photo-grid img",
+                    ],
+                    "fallback_images": ["img[src*='unsplash']"],
+                    "credit": ["span[class*='credit']"],
+                },
                 "parser": self._parse_unsplash_page
             },
             "houzz": {
                 "base_url": "https://www.houzz.com",
                 "search_url": "https://www.houzz.com/photos/query/{query}",
-                "image_selector": "img.hz-photo-grid-image",
+                "selectors": {
+                    # All of these are collected, not just the first that matches
+                    "images": [
+                        "img.hz-photo",
+                        "img.hz-photo-grid-image",
+                        ".photo-item img",
+                        ".gallery-item img",
+                    ],
+                    # Filtered to houzz/hzcdn image URLs
+                    "fallback_images": ["img[src]"],
+                },
                 "parser": self._parse_houzz_page
             },
             "archdigest": {
                 "base_url": "https://www.architecturaldigest.com",
                 "search_url": "https://www.architecturaldigest.com/search?q={query}",
-                "image_selector": "img.responsive-img",
+                "selectors": {
+                    "images": ["img[class*='responsive-img']"],
+                },
                 "parser": self._parse_archdigest_page
             }
         }
+        for site_config in self.supported_sites.values():
+            precompile_selectors(site_config["selectors"])
 
         print("Enhanced Design Scraper initialized with support for:", list(self.supported_sites.keys()))
 
@@ -101,30 +121,6 @@ class EnhancedDesignScraper:
         """Generate a cache key for the request"""
         return f"{site}:{query}:{page}:{per_page}"
 
-    def _is_cache_valid(self, timestamp: float) -> bool:
-        """Check if cache entry is still valid"""
-        return (time.time() - timestamp) < self.cache_timeout
-
-    async def _rate_limit(self, domain: str):
-        """Implement adaptive rate limiting per domain"""
-        if domain in self.rate_limits:
-            limiter = self.rate_limits[domain]
-            
-            # Adaptive rate limiting - increase wait time if we're being blocked
-            if limiter["blocked_count"] > 0:
-                # Increase interval exponentially based on block count
-                adjusted_interval = limiter["min_interval"] * (2 ** limiter["blocked_count"])
-                adjusted_interval = min(adjusted_interval, 30.0)  # Cap at 30 seconds
-            else:
-                adjusted_interval = limiter["min_interval"]
-            
-            elapsed = time.time() - limiter["last_request"]
-            if elapsed < adjusted_interval:
-                wait_time = adjusted_interval - elapsed
-                await asyncio.sleep(wait_time)
-            
-            limiter["last_request"] = time.time()
-
     async def search_design_images(
         self,
         query: str,
@@ -143,20 +139,24 @@ class EnhancedDesignScraper:
 
         # Check cache first
         cache_key = f"multi_site:{query}:{page}:{per_page}:{','.join(sorted(sites))}"
-        if cache_key in self.cache:
-            cached_result, timestamp = self.cache[cache_key]
-            if self._is_cache_valid(timestamp):
-                print(f"Returning cached multi-site results for query: {query}")
-                return cached_result
-
-        # Search all sites concurrently
-        tasks = []
-        for site in sites:
-            if site in self.supported_sites:
-                tasks.append(self._search_single_site(site, query, page, per_page))
-
-        # Execute all searches concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            print(f"Returning cached multi-site results for query: {query}")
+            return cached_result
+
+        # Search all sites concurrently; slow sites are cancelled at the deadline
+        outcome = await fan_out(
+            [
+                (site, lambda site=site: self._search_single_site(site, query, page, per_page))
+                for site in dict.fromkeys(sites)
+                if site in self.supported_sites
+            ],
+            deadline=self.search_deadline,
+            label="design_scraper_sites",
+        )
+        if outcome.timed_out:
+            print(f"Design site search deadline hit, skipped: {outcome.cancelled}")
+        results = outcome.values()
 
         # Combine and filter results
         all_images = []
@@ -164,11 +164,11 @@ class EnhancedDesignScraper:
 
         for result in results:
             if isinstance(result, list):
-                for img in result:
+                for img, classification in zip(result, image_categorization_service.classify_batch(result)):
                     img_url = img.get("image", "")
                     if img_url and img_url not in processed_urls:
                         # Validate it's a design image
-                        if image_categorization_service.is_valid_design_image(img):
+                        if classification.valid:
                             all_images.append(img)
                             processed_urls.add(img_url)
 
@@ -185,7 +185,7 @@ class EnhancedDesignScraper:
         final_results = all_images[start_idx:end_idx]
 
         # Cache the results
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
 
         print(f"Found {len(all_images)} total images, returning {len(final_results)} for page {page}")
         return final_results
@@ -204,16 +204,13 @@ class EnhancedDesignScraper:
 
         # Check site-specific cache
         cache_key = self._get_cache_key(site, query, page, per_page)
-        if cache_key in self.cache:
-            cached_result, timestamp = self.cache[cache_key]
-            if self._is_cache_valid(timestamp):
-                print(f"Returning cached results for {site}: {query}")
-                return cached_result
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            print(f"Returning cached results for {site}: {query}")
+            return cached_result
 
         try:
-            # Apply rate limiting
             domain = urlparse(site_config["base_url"]).netloc
-            await self._rate_limit(domain)
 
             # Build search URL
             search_url = site_config["search_url"].format(query=query.replace(" ", "-"))
@@ -233,18 +230,23 @@ class EnhancedDesignScraper:
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    response = await self.session.get(
+                    # Shared per-domain budget, spent only when the request leaves the cache;
+                    # slows down further after every 403/429
+                    response = await http_response_cache.get(
+                        self.session,
                         search_url,
                         headers=self._get_random_headers(),
-                        timeout=15.0
+                        timeout=15.0,
+                        before_send=lambda: scraper_rate_limiter.acquire(domain),
                     )
+                    if response.extensions.get("from_cache") != "fresh":
+                        await scraper_rate_limiter.record_response(
+                            domain, response.status_code, response.headers.get("Retry-After")
+                        )
                     
                     if response.status_code == 403:
                         print(f"{site} returned 403 Forbidden, site may be blocking requests")
                         if attempt < max_retries - 1:
-                            wait_time = 5 * (attempt + 1)  # Exponential backoff
-                            print(f"Waiting {wait_time}s before retry...")
-                            await asyncio.sleep(wait_time)
                             continue
                         else:
                             return []
@@ -263,10 +265,10 @@ class EnhancedDesignScraper:
                         raise e
 
             # Parse the page using site-specific parser
-            images = await site_config["parser"](response.text, query, page, per_page)
+            images = await site_config["parser"](response.content, query, page, per_page)
 
             # Cache the results
-            self.cache[cache_key] = (images, time.time())
+            self.cache.set(cache_key, images)
 
             return images
 
@@ -276,73 +278,34 @@ class EnhancedDesignScraper:
 
     async def _parse_unsplash_page(
         self,
-        html: str,
+        html: bytes,
         query: str,
         page: int,
         per_page: int
     ) -> List[Dict[str, Any]]:
         """Parse Unsplash search results page"""
-        soup = BeautifulSoup(html, 'html.parser')
-        images = []
-
         # Check if we got a blocked page
-        if "403" in html or "blocked" in html.lower() or "cloudflare" in html.lower():
+        if b"403" in html or b"blocked" in html.lower() or b"cloudflare" in html.lower():
             print("Unsplash returned blocked page, skipping...")
             return []
 
-        # Find image containers - Unsplash has multiple selectors
-        img_selectors = [
-            "img[data-test='photo-grid-image']",
-            "img[data-testid='photo-grid-image']",
-            "figure img",
-            ".photo-grid img"
-        ]
-
-        for selector in img_selectors:
-            img_elements = soup.select(selector)
-            if img_elements:
-                break
-
-        if not img_elements:
-            # Try a broader search
-            img_elements = soup.find_all('img', {'src': lambda x: x and ('images.unsplash.com' in x or 'unsplash' in x)})
-
-        for img in img_elements[:per_page * 2]:  # Get extra for filtering
-            img_url = img.get('src', '')
-            if not img_url:
-                continue
-
-            # Skip small/thumbnail images
-            if 'w=32' in img_url or 'h=32' in img_url or 'thumb' in img_url:
-                continue
-
-            # Get full resolution URL
-            if 'w=' in img_url and '&' in img_url:
-                # Replace width parameter for higher quality
-                img_url = re.sub(r'w=\d+', 'w=800', img_url)
+        parsed = await html_parse_executor.run(
+            parse_unsplash_page, html, per_page * 2, self.supported_sites["unsplash"]["selectors"]  # Get extra for filtering
+        )
 
-            # Get image metadata from data attributes or alt text
-            alt_text = img.get('alt', '')
+        images = []
+        for item in parsed:
+            img_url = item["image"]
+            alt_text = item["alt"]
             title = alt_text if alt_text else f"{query.title()} Design"
-
-            # Extract photographer info if available
-            photographer = ""
-            try:
-                # Look for photographer link or credit
-                photo_link = img.find_parent('a') if img.find_parent('a') else img.find_parent('figure')
-                if photo_link:
-                    credit = photo_link.find('span', class_=re.compile(r'credit'))
-                    if credit:
-                        photographer = credit.get_text(strip=True)
-            except:
-                pass
+            photographer = item["photographer"]
 
             # Create formatted image object
             formatted_img = {
                 "id": f"unsplash_{hash(img_url) % 1000000}_{page}",
                 "width": 800,
                 "height": 600,
-                "url": img.get('data-permalink', img_url),
+                "url": item["permalink"],
                 "photographer": photographer or "",
                 "photographer_url": "",
                 "photographer_id": 0,
@@ -371,59 +334,23 @@ class EnhancedDesignScraper:
 
     async def _parse_houzz_page(
         self,
-        html: str,
+        html: bytes,
         query: str,
         page: int,
         per_page: int
     ) -> List[Dict[str, Any]]:
         """Parse Houzz search results page"""
-        soup = BeautifulSoup(html, 'html.parser')
-        images = []
-
         # Check if we got a blocked page
-        if "403" in html or "blocked" in html.lower() or "access denied" in html.lower():
+        if b"403" in html or b"blocked" in html.lower() or b"access denied" in html.lower():
             print("Houzz returned blocked page, skipping...")
             return []
 
-        # Find image containers (Houzz uses multiple selectors)
-        img_selectors = [
-            "img.hz-photo",
-            "img.hz-photo-grid-image",
-            ".photo-item img",
-            ".gallery-item img"
-        ]
+        parsed = await html_parse_executor.run(parse_houzz_page, html, per_page * 2, self.supported_sites["houzz"]["selectors"])
 
-        img_elements = []
-        for selector in img_selectors:
-            elements = soup.select(selector)
-            if elements:
-                img_elements.extend(elements)
-
-        # Also try broader search
-        if not img_elements:
-            img_elements = soup.find_all('img', {'src': lambda x: x and ('houzz' in x.lower() or 'hzcdn' in x.lower())})
-
-        print(f"Found {len(img_elements)} potential images on Houzz page")
-
-        for img in img_elements[:per_page * 2]:
-            img_url = img.get('src', '')
-            if not img_url or 'data:image' in img_url or 'placeholder' in img_url.lower():
-                # Try data-src for lazy loading
-                img_url = img.get('data-src', img.get('data-lazy-src', ''))
-                if not img_url or 'data:image' in img_url or 'placeholder' in img_url.lower():
-                    continue
-
-            # Clean up URL
-            if img_url.startswith('//'):
-                img_url = 'https:' + img_url
-            elif not img_url.startswith('http'):
-                continue  # Skip relative URLs that aren't images
-
-            # Skip very small images
-            if '32x32' in img_url or 'w=32' in img_url:
-                continue
-
-            alt_text = img.get('alt', '')
+        images = []
+        for item in parsed:
+            img_url = item["image"]
+            alt_text = item["alt"]
             title = alt_text if alt_text else f"{query.title()} Design by Houzz"
 
             formatted_img = {
@@ -459,27 +386,20 @@ class EnhancedDesignScraper:
 
     async def _parse_archdigest_page(
         self,
-        html: str,
+        html: bytes,
         query: str,
         page: int,
         per_page: int
     ) -> List[Dict[str, Any]]:
         """Parse Architectural Digest search results page"""
-        soup = BeautifulSoup(html, 'html.parser')
-        images = []
-
-        # Find article images
-        img_elements = soup.find_all('img', class_=re.compile(r'responsive-img'))
-
-        for img in img_elements[:per_page * 2]:
-            img_url = img.get('data-src', img.get('src', ''))
-            if not img_url or 'data:image' in img_url:
-                continue
-
-            if img_url.startswith('//'):
-                img_url = 'https:' + img_url
+        parsed = await html_parse_executor.run(
+            parse_archdigest_page, html, per_page * 2, self.supported_sites["archdigest"]["selectors"]
+        )
 
-            alt_text = img.get('alt', '')
+        images = []
+        for item in parsed:
+            img_url = item["image"]
+            alt_text = item["alt"]
             title = alt_text if alt_text else f"{query.title()} Design - Architectural Digest"
 
             formatted_img = {
@@ -554,9 +474,10 @@ class EnhancedDesignScraper:
 
         return all_images[start_idx:end_idx]
 
-    async def close(self):
-        """Close the HTTP session"""
-        await self.session.aclose()
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Shared scraping client from the process-wide registry"""
+        return http_clients.client("scraper")
 
 # Global instance
 enhanced_design_scraper = EnhancedDesignScraper()
@@ -0,0 +1,168 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Sequence, Tuple
+
+# Per-label counters for every fan-out, exposed at /metrics/concurrency
+_fan_out_stats: Dict[str, Dict[str, int]] = {}
+
+
+def _new_stats() -> Dict[str, int]:
+    return {
+        "fan_outs": 0,
+        "tasks_started": 0,
+        "completed": 0,
+        "failed": 0,
+        "cancelled_after_enough": 0,
+        "cancelled_by_deadline": 0,
+        "deadline_hits": 0,
+        # Tasks that were asked to cancel but ran to completion anyway
+        "orphaned": 0,
+    }
+
+
+@dataclass
+class FanOutResult:
+    """Outcome of a fan-out: results and errors by name, in completion order"""
+    results: Dict[str, Any] = field(default_factory=dict)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+    cancelled: List[str] = field(default_factory=list)
+    timed_out: bool = False
+
+    def values(self) -> List[Any]:
+        return list(self.results.values())
+
+
+async def fan_out(
+    calls: Sequence[Tuple[str, Callable[[], Awaitable[Any]]]],
+    deadline: float | None = None,
+    min_results: int | None = None,
+    is_result: Callable[[Any], bool] = bool,
+    label: str = "default",
+    cancel_message: str | None = None,
+) -> FanOutResult:
+    """
+    Run named calls concurrently inside a TaskGroup and return once all have
+    finished, `min_results` calls produced a result accepted by `is_result`,
+    or `deadline` seconds have passed. Whatever is still running at that point
+    is cancelled and awaited before returning, so no task outlives the caller.
+    A failing call is recorded in `errors` and does not cancel the others.
+    Calls cancelled because enough results arrived receive `cancel_message`.
+    """
+    stats = _fan_out_stats.setdefault(label, _new_stats())
+    stats["fan_outs"] += 1
+    outcome = FanOutResult()
+    tasks: Dict[str, asyncio.Task] = {}
+    enough = False
+
+    async def run(name: str, call: Callable[[], Awaitable[Any]]):
+        nonlocal enough
+        try:
+            value = await call()
+        except asyncio.CancelledError:
+            outcome.cancelled.append(name)
+            stats["cancelled_after_enough" if enough else "cancelled_by_deadline"] += 1
+            raise
+        except Exception as e:
+            outcome.errors[name] = e
+            stats["failed"] += 1
+            return
+
+        if asyncio.current_task().cancelling():
+            stats["orphaned"] += 1
+        outcome.results[name] = value
+        stats["completed"] += 1
+        if min_results and not enough and sum(1 for v in outcome.results.values() if is_result(v)) >= min_results:
+            enough = True
+            for other in tasks.values():
+                if not other.done() and other is not asyncio.current_task():
+                    other.cancel(cancel_message)
+
+    try:
+        async with asyncio.timeout(deadline):
+            async with asyncio.TaskGroup() as group:
+                for name, call in calls:
+                    tasks[name] = group.create_task(run(name, call))
+                    stats["tasks_started"] += 1
+    except TimeoutError:
+        outcome.timed_out = True
+        stats["deadline_hits"] += 1
+
+    return outcome
+
+
+class FanOutStream:
+    """
+    Streaming form of fan_out: iterate it inside `async with` to receive
+    (name, result) pairs as calls finish, and stop iterating once the caller
+    has enough. Leaving the block cancels whatever is still running and waits
+    for it, with `cancel_message` if the caller stopped early or
+    `deadline_message` if `deadline` passed first. Failing calls are recorded
+    in `errors` and not yielded.
+    """
+
+    def __init__(
+        self,
+        calls: Sequence[Tuple[str, Callable[[], Awaitable[Any]]]],
+        deadline: float | None = None,
+        label: str = "default",
+        cancel_message: str | None = None,
+        deadline_message: str | None = None,
+    ):
+        self.calls = calls
+        self.deadline = deadline
+        self.cancel_message = cancel_message
+        self.deadline_message = deadline_message
+        self.errors: Dict[str, BaseException] = {}
+        self.cancelled: List[str] = []
+        self.timed_out = False
+        self._stats = _fan_out_stats.setdefault(label, _new_stats())
+        self._tasks: Dict[asyncio.Task, str] = {}
+
+    async def __aenter__(self) -> "FanOutStream":
+        self._stats["fan_outs"] += 1
+        for name, call in self.calls:
+            self._tasks[asyncio.ensure_future(call())] = name
+            self._stats["tasks_started"] += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        running = [task for task in self._tasks if not task.done()]
+        message = self.deadline_message if self.timed_out else self.cancel_message
+        for task in running:
+            task.cancel(message)
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        for task in running:
+            if task.cancelled():
+                self.cancelled.append(self._tasks[task])
+                self._stats["cancelled_by_deadline" if self.timed_out else "cancelled_after_enough"] += 1
+            else:
+                self._stats["orphaned"] += 1
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[str, Any]]:
+        loop = asyncio.get_running_loop()
+        end = None if self.deadline is None else loop.time() + self.deadline
+        pending = set(self._tasks)
+        while pending:
+            timeout = None if end is None else max(0.0, end - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                self.timed_out = True
+                self._stats["deadline_hits"] += 1
+                return
+            for task in done:
+                name = self._tasks[task]
+                if task.cancelled():
+                    continue
+                error = task.exception()
+                if error is not None:
+                    self.errors[name] = error
+                    self._stats["failed"] += 1
+                    continue
+                self._stats["completed"] += 1
+                yield name, task.result()
+
+
+def get_fan_out_stats() -> Dict[str, Dict[str, int]]:
+    """Counters per fan-out label"""
+    return {label: dict(stats) for label, stats in _fan_out_stats.items()}
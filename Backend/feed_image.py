@@ -0,0 +1,183 @@
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Tuple
+
+# Size names of the `src` object every feed image carries, in wire order
+SRC_SIZES = ("original", "large2x", "large", "medium", "small", "portrait", "landscape", "tiny")
+# Marks a page stored as FeedImage rows rather than a plain list of dicts
+FEED_PAGE_FORMAT = "feed_image/1"
+
+_WIRE_KEYS = (
+    "id", "width", "height", "url", "photographer", "photographer_url", "photographer_id",
+    "avg_color", "src", "alt", "image", "title", "author", "likes", "saves",
+)
+_WIRE_KEY_SET = frozenset(_WIRE_KEYS)
+
+
+def _shared_prefix_length(a: str, b: str) -> int:
+    """Length of the longest common prefix, by binary search over slice comparisons"""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+@dataclass(slots=True)
+class FeedImage:
+    """
+    One stored feed image in the shape every provider formatter produces.
+
+    Formatters keep building plain dicts; pages are only converted to
+    FeedImage rows by pack_page() on the way into the cache.
+
+    The eight `src` URLs are kept as a template: size i is
+    src_prefix + src_parts[i] + src_suffix, or just src_prefix for every
+    size when src_parts is None (most providers serve one URL for all
+    sizes). A `src` that is not exactly the eight sizes is kept verbatim in
+    src_raw, keys beyond the standard ones in extra and standard keys the
+    item did not have in absent, so to_wire() reproduces what from_wire()
+    was given.
+    """
+    id: Any
+    image: str = ""
+    title: str = ""
+    alt: str = ""
+    width: int = 0
+    height: int = 0
+    url: str = ""
+    avg_color: str = "#ffffff"
+    likes: int = 0
+    saves: int = 0
+    author: str = ""
+    photographer: str = ""
+    photographer_url: str = ""
+    photographer_id: Any = 0
+    src_prefix: str = ""
+    src_suffix: str = ""
+    src_parts: Tuple[str, ...] | None = None
+    src_raw: Dict[str, Any] | None = None
+    extra: Dict[str, Any] | None = None
+    absent: Tuple[str, ...] | None = None
+
+    def set_src(self, src: Dict[str, Any]):
+        """Store a size -> URL mapping as a prefix/suffix template when it has exactly the standard sizes"""
+        self.src_prefix, self.src_suffix, self.src_parts, self.src_raw = "", "", None, None
+        urls = [src.get(size) for size in SRC_SIZES]
+        if len(src) != len(SRC_SIZES) or not all(isinstance(url, str) for url in urls):
+            self.src_raw = dict(src)
+            return
+        first = urls[0]
+        if all(url == first for url in urls):
+            self.src_prefix = first
+            return
+        # The lexicographic extremes share exactly the prefix common to all URLs
+        start = _shared_prefix_length(min(urls), max(urls))
+        rests = [url[start:] for url in urls]
+        # ...and reversed, the same holds for the suffix of what follows the prefix
+        reversed_rests = [rest[::-1] for rest in rests]
+        end = _shared_prefix_length(min(reversed_rests), max(reversed_rests))
+        self.src_prefix, self.src_suffix = first[:start], first[len(first) - end:] if end else ""
+        self.src_parts = tuple(rest[:len(rest) - end] for rest in rests)
+
+    @property
+    def src(self) -> Dict[str, Any]:
+        if self.src_raw is not None:
+            return dict(self.src_raw)
+        if self.src_parts is None:
+            return dict.fromkeys(SRC_SIZES, self.src_prefix)
+        prefix, suffix = self.src_prefix, self.src_suffix
+        return {size: prefix + part + suffix for size, part in zip(SRC_SIZES, self.src_parts)}
+
+    @classmethod
+    def from_wire(cls, item: Dict[str, Any]) -> "FeedImage":
+        """A FeedImage from a formatter's dict; missing standard keys take the field defaults"""
+        image = cls(
+            item.get("id"),
+            item.get("image", ""),
+            item.get("title", ""),
+            item.get("alt", ""),
+            item.get("width", 0),
+            item.get("height", 0),
+            item.get("url", ""),
+            item.get("avg_color", "#ffffff"),
+            item.get("likes", 0),
+            item.get("saves", 0),
+            item.get("author", ""),
+            item.get("photographer", ""),
+            item.get("photographer_url", ""),
+            item.get("photographer_id", 0),
+        )
+        if len(item) != len(_WIRE_KEYS) or not _WIRE_KEY_SET.issuperset(item):
+            image.extra = {key: value for key, value in item.items() if key not in _WIRE_KEY_SET} or None
+            image.absent = tuple(key for key in _WIRE_KEYS if key not in item) or None
+        src = item.get("src")
+        if isinstance(src, dict):
+            image.set_src(src)
+        elif "src" in item:
+            # Served as given; the wire dict takes it from extra
+            image.extra = {**(image.extra or {}), "src": src}
+        return image
+
+    def to_wire(self) -> Dict[str, Any]:
+        """The dict the feed endpoints serve, in the formatters' key order"""
+        wire = {
+            "id": self.id,
+            "width": self.width,
+            "height": self.height,
+            "url": self.url,
+            "photographer": self.photographer,
+            "photographer_url": self.photographer_url,
+            "photographer_id": self.photographer_id,
+            "avg_color": self.avg_color,
+            "src": self.src,
+            "alt": self.alt,
+            "image": self.image,
+            "title": self.title,
+            "author": self.author,
+            "likes": self.likes,
+            "saves": self.saves,
+        }
+        if self.extra:
+            wire.update(self.extra)
+        if self.absent:
+            for key in self.absent:
+                del wire[key]
+        return wire
+
+    def to_row(self) -> List[Any]:
+        """Positional field values with trailing defaults dropped, for compact storage"""
+        row = [getattr(self, name) for name in _FIELD_NAMES]
+        while len(row) > 1 and row[-1] == _FIELD_DEFAULTS[len(row) - 1]:
+            row.pop()
+        return row
+
+    @classmethod
+    def from_row(cls, row: List[Any]) -> "FeedImage":
+        image = cls(*row)
+        # JSON brings tuples back as lists
+        if isinstance(image.src_parts, list):
+            image.src_parts = tuple(image.src_parts)
+        if isinstance(image.absent, list):
+            image.absent = tuple(image.absent)
+        return image
+
+
+_FIELD_NAMES = tuple(field.name for field in fields(FeedImage))
+_FIELD_DEFAULTS = tuple(field.default for field in fields(FeedImage))
+
+
+def pack_page(items: List[Any]) -> Any:
+    """Storage form of a feed page: FeedImage rows, or the items unchanged if any is not a dict"""
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        return items
+    return {"format": FEED_PAGE_FORMAT, "rows": [FeedImage.from_wire(item).to_row() for item in items]}
+
+
+def unpack_page(payload: Any) -> Any:
+    """Feed page dicts from pack_page() output; anything else (e.g. rows stored as plain lists) is returned as is"""
+    if isinstance(payload, dict) and payload.get("format") == FEED_PAGE_FORMAT:
+        return [FeedImage.from_row(row).to_wire() for row in payload["rows"]]
+    return payload
@@ -3,6 +3,7 @@ import httpx
 from fastapi import HTTPException
 from dotenv import load_dotenv
 from typing import Dict, List, Any
+from http_clients import http_clients
 
 load_dotenv()
 
@@ -17,7 +18,6 @@ class FlickrService:
     def __init__(self):
         self.api_key = FLICKR_API_KEY
         self.enabled = bool(self.api_key and self.api_key != "your_flickr_api_key_here")
-        self.client = httpx.AsyncClient(timeout=15.0)
 
     async def search_photos(
         self,
@@ -111,5 +111,7 @@ class FlickrService:
         items = photos.get("photo", [])
         return [self.format_photo(p) for p in items]
 
-    async def close(self):
-        await self.client.aclose()
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client()
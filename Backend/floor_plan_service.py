@@ -1,8 +1,10 @@
-import requests
+import httpx
 import os
 import logging
 import time
 
+from http_clients import http_clients
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,7 +29,7 @@ MODELS = {
     "floorplan-lora": "h94/IP-Adapter-FaceID/ip-adapter-faceid_sdxl_lora"
 }
 
-def generate_floor_plan(prompt: str, model_name: str = "default"):
+async def generate_floor_plan(prompt: str, model_name: str = "default"):
     if not API_TOKEN:
         logger.error("HUGGING_FACE_API_TOKEN environment variable not set")
         logger.error("Please check that:")
@@ -79,7 +81,7 @@ def generate_floor_plan(prompt: str, model_name: str = "default"):
                 "negative_prompt": "blurry, low quality, distorted, wrong proportions, unrealistic dimensions, poor architectural standards, messy lines, unprofessional, cartoon style, colored, decorative elements, furniture details, textures, shadows, 3D perspective, perspective view, isometric view"
             }
 
-            response = requests.post(api_url, headers=headers, json=test_payload, timeout=60)
+            response = await http_clients.client().post(api_url, headers=headers, json=test_payload, timeout=60)
             logger.info(f"Model {attempt_model}: HTTP {response.status_code}")
 
             if response.status_code == 200:
@@ -96,7 +98,7 @@ def generate_floor_plan(prompt: str, model_name: str = "default"):
                 logger.info(f"❌ Model {attempt_model} returned {response.status_code}: {error_content}")
                 continue
 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.info(f"⏰ Model {attempt_model} timed out, trying next...")
             continue
         except Exception as e:
@@ -1,8 +1,10 @@
 import os
-import requests
+import httpx
 from typing import List, Dict, Any
 from urllib.parse import quote_plus
 
+from http_clients import http_clients
+
 GEOAPIFY_API_KEY = os.getenv("GEOAPIFY_API_KEY")
 
 class GeoapifyError(Exception):
@@ -13,7 +15,7 @@ def ensure_api_key():
         raise GeoapifyError("GEOAPIFY_API_KEY is not configured on the server")
 
 
-def search_places(lon: float, lat: float, radius: int, categories: str, limit: int = 20) -> Dict[str, Any]:
+async def search_places(lon: float, lat: float, radius: int, categories: str, limit: int = 20) -> Dict[str, Any]:
     """
     Calls Geoapify Places API and returns raw JSON.
     """
@@ -27,11 +29,8 @@ def search_places(lon: float, lat: float, radius: int, categories: str, limit: i
         "apiKey": GEOAPIFY_API_KEY,
     }
     try:
-        # Build full URL for debugging
-        request_url = requests.Request('GET', url, params=params).prepare().url
-        print(f"[Geoapify] Request URL: {request_url}")
-        
-        resp = requests.get(url, params=params, timeout=10)
+        resp = await http_clients.client().get(url, params=params, timeout=10)
+        print(f"[Geoapify] Request URL: {resp.request.url}")
         print(f"[Geoapify] Response status: {resp.status_code}")
         
         if resp.status_code == 403:
@@ -46,9 +45,9 @@ def search_places(lon: float, lat: float, radius: int, categories: str, limit: i
         
         resp.raise_for_status()
         return resp.json()
-    except requests.Timeout as e:
+    except httpx.TimeoutException as e:
         raise GeoapifyError("Geoapify request timed out") from e
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise GeoapifyError(f"Geoapify request failed: {str(e)}") from e
 
 
@@ -88,7 +87,7 @@ def normalize_places(geojson: Dict[str, Any], city_hint: str | None = None) -> L
     return results
 
 
-def geocode_place(text: str, limit: int = 1) -> Dict[str, Any]:
+async def geocode_place(text: str, limit: int = 1) -> Dict[str, Any]:
     """
     Use Geoapify Geocoding API to convert text to coordinates.
     Returns raw JSON GeoJSON result.
@@ -102,16 +101,16 @@ def geocode_place(text: str, limit: int = 1) -> Dict[str, Any]:
         "apiKey": GEOAPIFY_API_KEY,
     }
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        resp = await http_clients.client().get(url, params=params, timeout=10)
         if resp.status_code == 403:
             raise GeoapifyError("Geoapify access forbidden - check API key or quotas")
         if resp.status_code == 429:
             raise GeoapifyError("Rate limit exceeded for Geoapify free plan")
         resp.raise_for_status()
         return resp.json()
-    except requests.Timeout as e:
+    except httpx.TimeoutException as e:
         raise GeoapifyError("Geoapify request timed out") from e
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise GeoapifyError(f"Geoapify request failed: {str(e)}") from e
 
 
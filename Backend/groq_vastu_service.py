@@ -5,7 +5,6 @@ Provides legitimate Vastu analysis using AI and traditional astrology
 
 import os
 import json
-import requests
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from groq import Groq
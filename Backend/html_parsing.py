@@ -0,0 +1,508 @@
+import asyncio
+import json
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+import lxml.html
+import soupsieve
+from bs4 import BeautifulSoup
+from lxml import etree
+
+# Worker processes used for HTML parsing; 0 parses on a thread instead
+HTML_PARSE_WORKERS = int(os.getenv("HTML_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# Recent parse timings kept for the metrics endpoint
+PARSE_TIMING_WINDOW = 200
+
+
+# ---------------------------------------------------------------------------
+# Parser backends. Site parsers are written once against this small node API;
+# lxml is the fast path and BeautifulSoup is used only when lxml fails. CSS
+# selectors come from the scraper configs and are compiled once per process
+# (to XPath for lxml, to soupsieve patterns for BeautifulSoup).
+# ---------------------------------------------------------------------------
+
+_COMPOUND_SELECTOR = re.compile(r"([a-zA-Z][\w-]*|\*)?((?:\.[\w-]+|\[[^\]]+\])*)")
+_SELECTOR_CONDITION = re.compile(r"\.([\w-]+)|\[([\w-]+)(?:([*^]?=)['\"]?([^'\"\]]*)['\"]?)?\]")
+
+
+def css_to_xpath(css: str) -> str:
+    """
+    Translate the CSS subset used by the scraper configs (tags, classes,
+    [attr], [attr=v], [attr*=v], [attr^=v] and descendant combinators) into
+    a relative XPath expression.
+    """
+    steps = []
+    for compound in css.split():
+        match = _COMPOUND_SELECTOR.fullmatch(compound)
+        if not match or not compound:
+            raise ValueError(f"Unsupported CSS selector: {css!r}")
+        conditions = []
+        for cls, attr, op, value in _SELECTOR_CONDITION.findall(match.group(2)):
+            if cls:
+                conditions.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')")
+            elif not op:
+                conditions.append(f"@{attr}")
+            elif op == "=":
+                conditions.append(f"@{attr}='{value}'")
+            elif op == "*=":
+                conditions.append(f"contains(@{attr}, '{value}')")
+            else:
+                conditions.append(f"starts-with(@{attr}, '{value}')")
+        steps.append((match.group(1) or "*") + "".join(f"[{condition}]" for condition in conditions))
+    return ".//" + "//".join(steps)
+
+
+@lru_cache(maxsize=512)
+def _compiled_xpath(css: str) -> etree.XPath:
+    return etree.XPath(css_to_xpath(css))
+
+
+@lru_cache(maxsize=512)
+def _compiled_soupsieve(css: str):
+    return soupsieve.compile(css)
+
+
+class LxmlBackend:
+    """Fast path: libxml2 HTML parser with precompiled XPath"""
+
+    name = "lxml"
+
+    def parse(self, html: bytes):
+        try:
+            # Decode UTF-8 up front; undeclared bytes would otherwise be read as Latin-1
+            return lxml.html.document_fromstring(html.decode("utf-8"))
+        except UnicodeDecodeError:
+            return lxml.html.document_fromstring(html)
+
+    def select(self, node, css: str) -> list:
+        return _compiled_xpath(css)(node)
+
+    def select_one(self, node, css: str):
+        matches = _compiled_xpath(css)(node)
+        return matches[0] if matches else None
+
+    def attr(self, node, name: str, default=None):
+        return node.get(name, default)
+
+    def text(self, node, strip: bool = False) -> str:
+        if strip:
+            return "".join(part.strip() for part in node.itertext())
+        return "".join(node.itertext())
+
+    def string(self, node):
+        return node.text
+
+    def ancestor(self, node, tag: str):
+        return next(node.iterancestors(tag), None)
+
+
+class SoupBackend:
+    """Fallback: BeautifulSoup with precompiled soupsieve selectors"""
+
+    name = "bs4"
+
+    def parse(self, html: bytes):
+        return BeautifulSoup(html, 'html.parser')
+
+    def select(self, node, css: str) -> list:
+        return _compiled_soupsieve(css).select(node)
+
+    def select_one(self, node, css: str):
+        return _compiled_soupsieve(css).select_one(node)
+
+    def attr(self, node, name: str, default=None):
+        return node.get(name, default)
+
+    def text(self, node, strip: bool = False) -> str:
+        return node.get_text(strip=strip)
+
+    def string(self, node):
+        return node.string
+
+    def ancestor(self, node, tag: str):
+        return node.find_parent(tag)
+
+
+PARSER_BACKENDS = {backend.name: backend for backend in (LxmlBackend(), SoupBackend())}
+FALLBACK_BACKEND = "bs4"
+
+# Backend tried first; bs4 disables the fast path
+HTML_PARSER_BACKEND = os.getenv("HTML_PARSER_BACKEND", "lxml")
+
+
+def precompile_selectors(selectors: Dict[str, Any]):
+    """Compile every CSS selector in a config block, failing early on unsupported syntax"""
+    for value in selectors.values():
+        if isinstance(value, (list, tuple)):
+            for css in value:
+                _compiled_xpath(css)
+                _compiled_soupsieve(css)
+
+
+def _first_nonempty(backend, node, selectors) -> list:
+    for css in selectors:
+        matches = backend.select(node, css)
+        if matches:
+            return matches
+    return []
+
+
+def _first_match(backend, node, selectors):
+    for css in selectors:
+        match = backend.select_one(node, css)
+        if match is not None:
+            return match
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Site parsers. They run in worker processes: each takes a backend, the parsed
+# document and plain arguments, and returns compact, picklable dicts. Anything
+# that depends on process state (hash ids, random mock fields) stays with the
+# caller.
+# ---------------------------------------------------------------------------
+
+def parse_unsplash_page(b, doc, limit: int, selectors: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Image URL, alt text, permalink and photographer for each Unsplash grid image"""
+    img_elements = _first_nonempty(b, doc, selectors["images"])
+    if not img_elements:
+        # Try a broader search
+        img_elements = _first_nonempty(b, doc, selectors["fallback_images"])
+
+    images = []
+    for img in img_elements[:limit]:
+        img_url = b.attr(img, 'src', '')
+        if not img_url:
+            continue
+
+        # Skip small/thumbnail images
+        if 'w=32' in img_url or 'h=32' in img_url or 'thumb' in img_url:
+            continue
+
+        # Replace width parameter for higher quality
+        if 'w=' in img_url and '&' in img_url:
+            img_url = re.sub(r'w=\d+', 'w=800', img_url)
+
+        photographer = ""
+        photo_link = b.ancestor(img, 'a')
+        if photo_link is None:
+            photo_link = b.ancestor(img, 'figure')
+        if photo_link is not None:
+            credit = _first_match(b, photo_link, selectors["credit"])
+            if credit is not None:
+                photographer = b.text(credit, strip=True)
+
+        images.append({
+            "image": img_url,
+            "alt": b.attr(img, 'alt', ''),
+            "permalink": b.attr(img, 'data-permalink', img_url),
+            "photographer": photographer,
+        })
+    return images
+
+
+def parse_houzz_page(b, doc, limit: int, selectors: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Absolute image URL and alt text for each Houzz photo"""
+    img_elements = []
+    for css in selectors["images"]:
+        img_elements.extend(b.select(doc, css))
+
+    if not img_elements:
+        img_elements = [
+            img for css in selectors["fallback_images"] for img in b.select(doc, css)
+            if 'houzz' in b.attr(img, 'src', '').lower() or 'hzcdn' in b.attr(img, 'src', '').lower()
+        ]
+
+    images = []
+    for img in img_elements[:limit]:
+        img_url = b.attr(img, 'src', '')
+        if not img_url or 'data:image' in img_url or 'placeholder' in img_url.lower():
+            # Try data-src for lazy loading
+            img_url = b.attr(img, 'data-src', b.attr(img, 'data-lazy-src', ''))
+            if not img_url or 'data:image' in img_url or 'placeholder' in img_url.lower():
+                continue
+
+        if img_url.startswith('//'):
+            img_url = 'https:' + img_url
+        elif not img_url.startswith('http'):
+            continue
+
+        # Skip very small images
+        if '32x32' in img_url or 'w=32' in img_url:
+            continue
+
+        images.append({"image": img_url, "alt": b.attr(img, 'alt', '')})
+    return images
+
+
+def parse_archdigest_page(b, doc, limit: int, selectors: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Image URL and alt text for each Architectural Digest article image"""
+    images = []
+    for img in _first_nonempty(b, doc, selectors["images"])[:limit]:
+        img_url = b.attr(img, 'data-src', b.attr(img, 'src', ''))
+        if not img_url or 'data:image' in img_url:
+            continue
+        if img_url.startswith('//'):
+            img_url = 'https:' + img_url
+        images.append({"image": img_url, "alt": b.attr(img, 'alt', '')})
+    return images
+
+
+def parse_pexels_search(b, doc, limit: int, selectors: Dict[str, Any]) -> List[Dict[str, str]]:
+    """High-quality image URL, alt text and photographer for each Pexels result"""
+    # Pexels uses article tags for photos
+    photo_elements = _first_nonempty(b, doc, selectors["photos"])
+    if not photo_elements:
+        photo_elements = _first_nonempty(b, doc, selectors["fallback_photos"])
+
+    images = []
+    for element in photo_elements[:limit]:
+        img = _first_match(b, element, selectors["image"])
+        if img is None:
+            continue
+
+        img_url = b.attr(img, 'src') or b.attr(img, 'data-src') or b.attr(img, 'data-lazy-src')
+        if not img_url or 'placeholder' in img_url.lower():
+            continue
+
+        # Skip very small images
+        if any(x in img_url for x in ['w=50', 'h=50', 'auto=compress&cs=tinysrgb&dpr=1&w=50']):
+            continue
+
+        # Get higher quality version
+        if 'auto=compress' in img_url:
+            img_url = re.sub(r'w=\d+', 'w=1200', img_url)
+            img_url = re.sub(r'h=\d+', 'h=800', img_url)
+
+        photographer = ""
+        if _first_match(b, element, selectors["photo_link"]) is not None:
+            photographer_elem = _first_match(b, element, selectors["photographer"])
+            if photographer_elem is not None:
+                photographer = b.text(photographer_elem, strip=True)
+
+        images.append({"image": img_url, "alt": b.attr(img, 'alt', ''), "photographer": photographer})
+    return images
+
+
+def parse_pixabay_search(b, doc, limit: int, selectors: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Pixabay results from the embedded JSON-LD ImageObjects, falling back to
+    lazy-loaded img tags. Missing alt/author are None so the caller can apply
+    its own defaults.
+    """
+    images = []
+    for script in _first_nonempty(b, doc, selectors["ld_json"]):
+        try:
+            data = json.loads(b.string(script))
+        except (TypeError, ValueError):
+            continue
+        if isinstance(data, dict) and data.get('@type') == 'ImageObject':
+            img_url = data.get('contentUrl') or data.get('url')
+            if img_url:
+                author = data.get('author')
+                images.append({
+                    "image": img_url,
+                    "alt": data.get('name'),
+                    "author": author.get('name') if isinstance(author, dict) else None,
+                })
+
+    if not images:
+        for img in _first_nonempty(b, doc, selectors["lazy_images"])[:limit]:
+            img_url = b.attr(img, 'data-lazy')
+            if img_url and 'cdn.pixabay.com' in img_url:
+                images.append({"image": img_url, "alt": b.attr(img, 'alt'), "author": None})
+    return images
+
+
+# Product card selectors per retailer layout; retailer tables name their layout
+# and anything without one uses "generic"
+RETAILER_SELECTORS: Dict[str, Dict[str, Any]] = {
+    "urbanladder": {
+        "products": ["div.product"],
+        "name": ["div.product-title"],
+        "price": ["span.price"],
+        "image": ["img"],
+        "lazy_image": True,
+        "limit": None,
+        "name_length": None,
+    },
+    "pepperfry": {
+        "products": ["div.productContainer"],
+        "name": ["div.productTitle"],
+        "price": ["span.finalPrice"],
+        "image": ["img"],
+        "lazy_image": True,
+        "limit": None,
+        "name_length": None,
+    },
+    "amazon": {
+        "products": ["div[data-component-type='s-search-result']"],
+        "name": ["span.a-text-normal", "h2.a-size-mini"],
+        "price": ["span.a-price-whole", "span.a-offscreen"],
+        "image": ["img.s-image"],
+        "lazy_image": False,
+        "limit": 10,
+        "name_length": 100,
+    },
+    "flipkart": {
+        "products": ["div._1AtVbE"],
+        "name": ["div._4rR01T", "a.IRpwTa"],
+        "price": ["div._30jeq3"],
+        "image": ["img._396cs4"],
+        "lazy_image": False,
+        "limit": 10,
+        "name_length": 100,
+    },
+    "generic": {
+        "products": ['div.product', 'div.product-item', 'div.product-card', 'div.item', 'div.card', 'div.list-item'],
+        "name": ['h3', 'h4', 'h5', '.title', '.name', '.product-title', '.product-name'],
+        "price": ['.price', '.cost', '.amount', '.value'],
+        "image": ['img'],
+        "lazy_image": True,
+        "limit": 10,
+        "name_length": 100,
+    },
+}
+
+
+def parse_retailer_products(b, doc, selectors: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Name, raw price text and image URL of each product card with a name and price"""
+    products = []
+    for elem in _first_nonempty(b, doc, selectors["products"])[:selectors["limit"]]:
+        name_elem = _first_match(b, elem, selectors["name"])
+        price_elem = _first_match(b, elem, selectors["price"])
+        if name_elem is None or price_elem is None:
+            continue
+
+        image_elem = _first_match(b, elem, selectors["image"])
+        image = ''
+        if image_elem is not None:
+            image = (selectors["lazy_image"] and b.attr(image_elem, 'data-src')) or b.attr(image_elem, 'src', '')
+
+        products.append({
+            "name": b.text(name_elem, strip=True)[:selectors["name_length"]],
+            "price_text": b.text(price_elem),
+            "image": image,
+        })
+    return products
+
+
+def _run_parser(parser: Callable[..., Any], html: bytes, args: Tuple[Any, ...], backend_name: str) -> Tuple[Any, float, str]:
+    """Parse with the preferred backend, retrying with BeautifulSoup if it fails"""
+    started = time.perf_counter()
+    backend = PARSER_BACKENDS.get(backend_name, PARSER_BACKENDS[FALLBACK_BACKEND])
+    try:
+        result = parser(backend, backend.parse(html), *args)
+    except Exception:
+        if backend.name == FALLBACK_BACKEND:
+            raise
+        backend = PARSER_BACKENDS[FALLBACK_BACKEND]
+        result = parser(backend, backend.parse(html), *args)
+    return result, time.perf_counter() - started, backend.name
+
+
+def run_parser(parser: Callable[..., Any], html: bytes, *args, backend: str = HTML_PARSER_BACKEND) -> Any:
+    """Run a site parser in the current process"""
+    return _run_parser(parser, html, args, backend)[0]
+
+
+def _percentile(samples, percentile: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(percentile / 100 * len(ordered)))]
+
+
+class HtmlParseExecutor:
+    """
+    Runs the site parsers above in a process pool so that building large
+    document trees never blocks the event loop. The pool is created on first
+    use and recreated if a worker dies.
+    """
+
+    def __init__(self, workers: int = HTML_PARSE_WORKERS, backend: str = HTML_PARSER_BACKEND):
+        self.workers = max(0, workers)
+        self.backend = backend
+        self._pool: ProcessPoolExecutor | None = None
+        self.queue_depth = 0  # Parses submitted and not yet finished
+        self._parse_times = deque(maxlen=PARSE_TIMING_WINDOW)
+        self._wait_times = deque(maxlen=PARSE_TIMING_WINDOW)
+        self.stats = {"parsed": 0, "failed": 0, "pool_restarts": 0, "max_queue_depth": 0, "bytes_parsed": 0, "backend_fallbacks": 0}
+        self.backend_counts = {name: 0 for name in PARSER_BACKENDS}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    async def run(self, parser: Callable[..., Any], html: bytes, *args) -> Any:
+        """Parse html with parser(backend, document, *args) off the event loop"""
+        submitted = time.perf_counter()
+        self.queue_depth += 1
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.queue_depth)
+        try:
+            if self.workers == 0:
+                result, parse_time, used = await asyncio.to_thread(_run_parser, parser, html, args, self.backend)
+            else:
+                loop = asyncio.get_running_loop()
+                try:
+                    result, parse_time, used = await loop.run_in_executor(
+                        self._get_pool(), _run_parser, parser, html, args, self.backend
+                    )
+                except BrokenProcessPool:
+                    # A worker died; start a fresh pool for the next parse
+                    self.stats["pool_restarts"] += 1
+                    broken, self._pool = self._pool, None
+                    if broken is not None:
+                        broken.shutdown(wait=False, cancel_futures=True)
+                    raise
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+        finally:
+            self.queue_depth -= 1
+
+        self.stats["parsed"] += 1
+        self.backend_counts[used] = self.backend_counts.get(used, 0) + 1
+        if used != self.backend:
+            self.stats["backend_fallbacks"] += 1
+        self.stats["bytes_parsed"] += len(html)
+        self._parse_times.append(parse_time)
+        # Time spent queued for a worker plus transferring HTML and results
+        self._wait_times.append(max(0.0, time.perf_counter() - submitted - parse_time))
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker count, queue depth and recent parse/queue time percentiles in ms"""
+        def ms(value):
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "workers": self.workers,
+            "backend": self.backend,
+            "backend_counts": dict(self.backend_counts),
+            "queue_depth": self.queue_depth,
+            **self.stats,
+            "parse_ms_p50": ms(_percentile(self._parse_times, 50)),
+            "parse_ms_p90": ms(_percentile(self._parse_times, 90)),
+            "parse_ms_max": ms(max(self._parse_times, default=None)),
+            "queue_ms_p50": ms(_percentile(self._wait_times, 50)),
+            "queue_ms_p90": ms(_percentile(self._wait_times, 90)),
+        }
+
+    def shutdown(self):
+        """Stop the worker processes"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Global instance shared by the scrapers
+html_parse_executor = HtmlParseExecutor()
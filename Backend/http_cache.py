@@ -0,0 +1,235 @@
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict
+
+import httpx
+
+HTTP_CACHE_PATH = os.getenv("HTTP_CACHE_PATH", os.path.join(os.path.dirname(__file__), "http_cache.db"))
+# Total compressed body bytes kept on disk before least recently used pages are evicted
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# Upper bound on how long a page is served without revalidating, whatever max-age says
+HTTP_CACHE_MAX_FRESHNESS = float(os.getenv("HTTP_CACHE_MAX_FRESHNESS", "600"))
+HTTP_CACHE_COMPRESSION_LEVEL = 6
+
+# Response headers worth keeping with a cached body
+STORED_HEADERS = ("content-type", "etag", "last-modified", "cache-control", "expires", "date")
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*(?:s-maxage|max-age)\s*=\s*(\d+)", re.IGNORECASE)
+
+
+def _freshness_lifetime(headers: httpx.Headers) -> float:
+    """Seconds a response may be reused without asking the origin (RFC 9111, simplified)"""
+    cache_control = headers.get("cache-control", "")
+    if "no-cache" in cache_control.lower():
+        return 0.0
+    match = _MAX_AGE.search(cache_control)
+    if match:
+        return min(float(match.group(1)), HTTP_CACHE_MAX_FRESHNESS)
+    expires, date = headers.get("expires"), headers.get("date")
+    if expires and date:
+        try:
+            lifetime = (parsedate_to_datetime(expires) - parsedate_to_datetime(date)).total_seconds()
+            return max(0.0, min(lifetime, HTTP_CACHE_MAX_FRESHNESS))
+        except (TypeError, ValueError):
+            pass
+    return 0.0
+
+
+def _is_storable(response: httpx.Response) -> bool:
+    cache_control = response.headers.get("cache-control", "").lower()
+    if response.status_code != 200 or "no-store" in cache_control or "private" in cache_control:
+        return False
+    # Without a validator or a freshness lifetime the copy could never be reused
+    return bool(
+        response.headers.get("etag") or response.headers.get("last-modified") or _freshness_lifetime(response.headers)
+    )
+
+
+class HttpResponseCache:
+    """
+    On-disk cache of GET responses for scraped pages, keyed by full URL.
+
+    Bodies are stored zlib-compressed in SQLite together with their ETag and
+    Last-Modified validators. A fresh entry (per max-age/Expires, capped at
+    HTTP_CACHE_MAX_FRESHNESS) is served without touching the network; a stale
+    one is revalidated with If-None-Match/If-Modified-Since and a 304 answer
+    is served from disk. Once the stored bytes exceed max_bytes the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, path: str = HTTP_CACHE_PATH, max_bytes: int = HTTP_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._ready = False
+        self.stats = {
+            "fresh_hits": 0,
+            "revalidated": 0,
+            "misses": 0,
+            "stored": 0,
+            "evictions": 0,
+            "bytes_downloaded": 0,
+            "bytes_served_from_cache": 0,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS http_responses (
+                    url TEXT PRIMARY KEY,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    fresh_until REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_http_responses_last_access ON http_responses (last_access)")
+            conn.commit()
+            self._ready = True
+        return conn
+
+    def _load(self, url: str):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT headers, body, fresh_until FROM http_responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE http_responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            conn.commit()
+            return json.loads(row[0]), zlib.decompress(row[1]), row[2]
+        finally:
+            conn.close()
+
+    def _store(self, url: str, headers: Dict[str, str], body: bytes, fresh_until: float) -> int:
+        compressed = zlib.compress(body, HTTP_CACHE_COMPRESSION_LEVEL)
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO http_responses (url, headers, body, size, stored_at, fresh_until, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, json.dumps(headers), compressed, len(compressed), now, fresh_until, now),
+            )
+            evicted = self._evict(conn)
+            conn.commit()
+            return evicted
+        finally:
+            conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_responses").fetchone()[0]
+        evicted = 0
+        if total <= self.max_bytes:
+            return evicted
+        for url, size in conn.execute("SELECT url, size FROM http_responses ORDER BY last_access").fetchall():
+            conn.execute("DELETE FROM http_responses WHERE url = ?", (url,))
+            evicted += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+        return evicted
+
+    def _refresh(self, url: str, headers: Dict[str, str], fresh_until: float):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE http_responses SET headers = ?, fresh_until = ?, stored_at = ?, last_access = ? WHERE url = ?",
+                (json.dumps(headers), fresh_until, time.time(), time.time(), url),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _usage(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_responses").fetchone()
+            return {"entries": entries, "stored_bytes": size}
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _kept_headers(headers: httpx.Headers) -> Dict[str, str]:
+        return {name: headers[name] for name in STORED_HEADERS if name in headers}
+
+    async def get(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        params=None,
+        headers=None,
+        timeout=httpx.USE_CLIENT_DEFAULT,
+        before_send: Callable[[], Awaitable[Any]] | None = None,
+    ) -> httpx.Response:
+        """
+        GET through the cache and return an httpx.Response, as client.get()
+        would. A response served from disk carries the extension "from_cache"
+        set to "fresh" or "revalidated". before_send (e.g. a rate limiter's
+        acquire) is awaited only when the request actually goes to the network,
+        so fresh hits never wait on it.
+        """
+        request = client.build_request("GET", url, params=params, headers=headers, timeout=timeout)
+        key = str(request.url)
+        entry = await asyncio.to_thread(self._load, key)
+
+        if entry is not None:
+            stored_headers, body, fresh_until = entry
+            if time.time() < fresh_until:
+                self.stats["fresh_hits"] += 1
+                self.stats["bytes_served_from_cache"] += len(body)
+                return httpx.Response(200, headers=stored_headers, content=body, request=request, extensions={"from_cache": "fresh"})
+            if "etag" in stored_headers:
+                request.headers["If-None-Match"] = stored_headers["etag"]
+            if "last-modified" in stored_headers:
+                request.headers["If-Modified-Since"] = stored_headers["last-modified"]
+
+        if before_send is not None:
+            await before_send()
+        response = await client.send(request)
+
+        if response.status_code == 304 and entry is not None:
+            stored_headers, body, _ = entry
+            # A 304 may carry updated validators or freshness
+            stored_headers.update(self._kept_headers(response.headers))
+            fresh_until = time.time() + _freshness_lifetime(httpx.Headers(stored_headers))
+            await asyncio.to_thread(self._refresh, key, stored_headers, fresh_until)
+            self.stats["revalidated"] += 1
+            self.stats["bytes_served_from_cache"] += len(body)
+            return httpx.Response(200, headers=stored_headers, content=body, request=request, extensions={"from_cache": "revalidated"})
+
+        self.stats["misses"] += 1
+        self.stats["bytes_downloaded"] += len(response.content)
+        if _is_storable(response):
+            fresh_until = time.time() + _freshness_lifetime(response.headers)
+            evicted = await asyncio.to_thread(self._store, key, self._kept_headers(response.headers), response.content, fresh_until)
+            self.stats["stored"] += 1
+            self.stats["evictions"] += evicted
+        return response
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Hit/revalidation counters, bandwidth saved and on-disk usage"""
+        usage = await asyncio.to_thread(self._usage)
+        lookups = self.stats["fresh_hits"] + self.stats["revalidated"] + self.stats["misses"]
+        return {
+            **self.stats,
+            **usage,
+            "max_bytes": self.max_bytes,
+            "hit_rate": (self.stats["fresh_hits"] + self.stats["revalidated"]) / lookups if lookups else 0.0,
+        }
+
+
+# Global instance shared by the scrapers
+http_response_cache = HttpResponseCache()
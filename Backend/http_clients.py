@@ -0,0 +1,350 @@
+import asyncio
+import ipaddress
+import os
+import random
+import socket
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, List, Tuple
+
+import aiohttp
+import httpcore
+import httpx
+
+try:
+    import h2  # noqa: F401  (httpx only negotiates HTTP/2 when h2 is installed)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Connection pool shared by every outbound client
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "40"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "60"))
+# In-flight requests allowed against a single host
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "10"))
+# Seconds a resolved address is reused before asking the resolver again
+DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))
+
+# Client profiles: default timeout and redirect handling. Headers stay per request
+# so every profile can share one connection pool.
+CLIENT_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {"timeout": 15.0, "follow_redirects": False},
+    "redirects": {"timeout": 15.0, "follow_redirects": True},
+    "quick": {"timeout": 10.0, "follow_redirects": False},
+    "scraper": {"timeout": 30.0, "follow_redirects": True},
+}
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0, retry_after: str | None = None) -> float:
+    """
+    Seconds to wait before retry number `attempt` (0-based): the server's
+    Retry-After seconds when it sent one, otherwise full-jitter exponential
+    backoff. Callers await asyncio.sleep() on it, never time.sleep().
+    """
+    if retry_after:
+        try:
+            return min(cap, max(0.0, float(retry_after)))
+        except ValueError:
+            pass  # HTTP-date form; fall back to our own schedule
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class DnsCache:
+    """TTL cache of resolved addresses per (host, port)"""
+
+    def __init__(self, ttl: float = DNS_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self.stats = {"hits": 0, "misses": 0, "failures": 0, "evictions": 0}
+
+    async def resolve(self, host: str, port: int) -> List[str]:
+        """Addresses for host, from cache when fresh; IP literals pass straight through"""
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        entry = self._entries.get((host, port))
+        if entry is not None and entry[0] > time.monotonic():
+            self.stats["hits"] += 1
+            return entry[1]
+
+        self.stats["misses"] += 1
+        infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._entries[(host, port)] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def forget(self, host: str, port: int):
+        """Drop an entry whose addresses all refused connections"""
+        if self._entries.pop((host, port), None) is not None:
+            self.stats["evictions"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "ttl": self.ttl, **self.stats}
+
+
+class _DnsCachingBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that connects to cached addresses. TLS still
+    uses the request's hostname for SNI and certificate checks, because
+    httpcore passes the origin host to start_tls separately.
+    """
+
+    def __init__(self, dns_cache: DnsCache):
+        self._backend = httpcore.AnyIOBackend()
+        self._dns_cache = dns_cache
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            async with asyncio.timeout(timeout):
+                addresses = await self._dns_cache.resolve(host, port)
+        except (OSError, TimeoutError):
+            # Let the regular connect path produce the usual httpcore error
+            self._dns_cache.stats["failures"] += 1
+            addresses = [host]
+
+        last_error = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        self._dns_cache.forget(host, port)
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float):
+        await self._backend.sleep(seconds)
+
+
+# httpcore errors raised as their httpx counterparts, most specific first, so callers
+# catching httpx.TimeoutException, httpx.ConnectError etc. keep working
+_HTTPCORE_ERRORS = (
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+)
+
+
+@contextmanager
+def _as_httpx_errors(request: httpx.Request):
+    try:
+        yield
+    except Exception as e:
+        for core_error, httpx_error in _HTTPCORE_ERRORS:
+            if isinstance(e, core_error):
+                raise httpx_error(str(e), request=request) from e
+        raise
+
+
+class _PooledResponseStream(httpx.AsyncByteStream):
+    """Body of a pooled response; closing it returns the connection and frees the host slot"""
+
+    def __init__(self, response: httpcore.Response, request: httpx.Request, release):
+        self._response = response
+        self._request = request
+        self._release = release
+
+    async def __aiter__(self):
+        with _as_httpx_errors(self._request):
+            async for chunk in self._response.aiter_stream():
+                yield chunk
+
+    async def aclose(self):
+        try:
+            with _as_httpx_errors(self._request):
+                await self._response.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class SharedTransport(httpx.AsyncBaseTransport):
+    """
+    One keep-alive connection pool for every client, with HTTP/2 where the
+    server negotiates it, cached DNS and a cap on in-flight requests per host.
+    The httpcore pool is built and owned here, since httpx's own transport
+    offers no way to plug in a network backend.
+    """
+
+    def __init__(self, dns_cache: DnsCache, max_per_host: int = HTTP_MAX_PER_HOST):
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+            http1=True,
+            http2=HTTP2_AVAILABLE,
+            network_backend=_DnsCachingBackend(dns_cache),
+        )
+        self.max_per_host = max(1, max_per_host)
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, int] = {}
+        self.stats = {"requests": 0, "host_waits": 0}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        slots = self._host_slots.setdefault(host, asyncio.Semaphore(self.max_per_host))
+        if slots.locked():
+            self.stats["host_waits"] += 1
+        await slots.acquire()
+        self._in_flight[host] = self._in_flight.get(host, 0) + 1
+
+        def release():
+            self._in_flight[host] -= 1
+            slots.release()
+
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            with _as_httpx_errors(request):
+                core_response = await self._pool.handle_async_request(core_request)
+        except BaseException:
+            release()
+            raise
+        self.stats["requests"] += 1
+        return httpx.Response(
+            status_code=core_response.status,
+            headers=core_response.headers,
+            stream=_PooledResponseStream(core_response, request, release),
+            extensions=core_response.extensions,
+        )
+
+    async def aclose(self):
+        await self._pool.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        connections = self._pool.connections
+        return {
+            **self.stats,
+            "http2_enabled": HTTP2_AVAILABLE,
+            "connections": len(connections),
+            "idle_connections": sum(1 for c in connections if c.is_idle()),
+            "max_connections": HTTP_MAX_CONNECTIONS,
+            "max_per_host": self.max_per_host,
+            "in_flight_by_host": {host: count for host, count in self._in_flight.items() if count},
+        }
+
+
+class _BorrowedTransport(httpx.AsyncBaseTransport):
+    """A client's handle on the shared transport; closing the client leaves the pool open"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+
+class HttpClientRegistry:
+    """
+    Process-wide outbound HTTP clients. httpx clients for each profile share
+    one SharedTransport; aiohttp callers share one session whose connector
+    applies the same per-host limit and DNS cache TTL. Clients are created on
+    first use and all of them are closed together by close() at shutdown.
+    """
+
+    def __init__(self):
+        self.dns_cache = DnsCache()
+        self._transport: httpx.AsyncBaseTransport | None = None
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._aiohttp_session: aiohttp.ClientSession | None = None
+
+    def client(self, profile: str = "default") -> httpx.AsyncClient:
+        """Shared httpx client for a profile in CLIENT_PROFILES"""
+        client = self._clients.get(profile)
+        if client is None or client.is_closed:
+            if self._transport is None:
+                self._transport = SharedTransport(self.dns_cache)
+            client = httpx.AsyncClient(transport=_BorrowedTransport(self._transport), **CLIENT_PROFILES[profile])
+            self._clients[profile] = client
+        return client
+
+    @asynccontextmanager
+    async def transport_override(self, transport: httpx.AsyncBaseTransport):
+        """
+        Route every httpx profile through `transport` (e.g. httpx.MockTransport
+        in tests) inside the block, then put the previous clients and pool back
+        untouched.
+        """
+        saved = self._transport, self._clients
+        self._transport, self._clients = transport, {}
+        try:
+            yield self
+        finally:
+            clients = list(self._clients.values())
+            self._transport, self._clients = saved
+            for client in clients:
+                await client.aclose()
+
+    def aiohttp_session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session; must be called from a running event loop"""
+        if self._aiohttp_session is None or self._aiohttp_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_MAX_CONNECTIONS,
+                limit_per_host=HTTP_MAX_PER_HOST,
+                ttl_dns_cache=int(DNS_CACHE_TTL),
+                keepalive_timeout=HTTP_KEEPALIVE_EXPIRY,
+            )
+            self._aiohttp_session = aiohttp.ClientSession(connector=connector)
+        return self._aiohttp_session
+
+    async def start(self):
+        """Open the common clients up front so the first requests skip setup"""
+        for profile in CLIENT_PROFILES:
+            self.client(profile)
+        self.aiohttp_session()
+
+    async def close(self):
+        """Close every client, then the shared pool once"""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+        if self._transport is not None:
+            await self._transport.aclose()
+            self._transport = None
+        if self._aiohttp_session is not None:
+            await self._aiohttp_session.close()
+            self._aiohttp_session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool, per-host and DNS cache counters"""
+        return {
+            "httpx_profiles": sorted(self._clients),
+            "transport": self._transport.get_stats() if isinstance(self._transport, SharedTransport) else None,
+            "aiohttp_open": self._aiohttp_session is not None and not self._aiohttp_session.closed,
+            "dns_cache": self.dns_cache.get_stats(),
+        }
+
+
+# Global instance
+http_clients = HttpClientRegistry()
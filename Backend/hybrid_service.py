@@ -1,6 +1,9 @@
 import asyncio
-import random
-from typing import List, Dict, Any, Tuple
+import os
+import re
+import sys
+import time
+from typing import List, Dict, Any, Tuple, AsyncIterator
 from pexels_service import PexelsService
 from unsplash_service import UnsplashService
 from pixabay_service import PixabayService
@@ -24,11 +27,70 @@ from unlimited_design_service import unlimited_design_service
 from pexels_direct_scraper import pexels_direct_scraper
 from pixabay_direct_scraper import pixabay_direct_scraper
 
-from database import cache_images, get_cached_images, get_cached_images_multi_provider
+from cache_service import CacheService
+from database import cache_images, get_cached_images_for_keys
+from feed_image import pack_page, unpack_page
+from prefetch_scheduler import PrefetchScheduler
+from memory_cache import BoundedCache, approx_size
+from provider_health import ProviderHealthTracker
+from fan_out import FanOutStream, fan_out
 from fastapi import HTTPException
 
+# Entry types sharing the image_cache keyspace. Keys are "<type>:<normalized query>".
+CACHE_KEY_TYPES = ("search", "aggregated", "prefetch", "trending")
+
+# Soft/hard TTLs in seconds. Pages older than the soft TTL are still served but
+# refreshed in the background; pages older than the hard TTL are not served.
+FEED_CACHE_SOFT_TTL = int(os.getenv("FEED_CACHE_SOFT_TTL", "3600"))
+FEED_CACHE_HARD_TTL = int(os.getenv("FEED_CACHE_HARD_TTL", str(24 * 3600)))
+TRENDING_CACHE_SOFT_TTL = int(os.getenv("TRENDING_CACHE_SOFT_TTL", "900"))
+TRENDING_CACHE_HARD_TTL = int(os.getenv("TRENDING_CACHE_HARD_TTL", "3600"))
+
+# Feed pages kept in process memory in front of the SQLite image_cache
+PAGE_CACHE_MAX_ENTRIES = int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "512"))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Items measured per page when estimating its size; the rest are assumed alike
+PAGE_SIZE_SAMPLE = 5
+# CacheService namespace of the feed pages shared between workers
+SHARED_PAGE_NAMESPACE = "feed_pages"
+
+# Hedged requests: wait this long on a provider with no latency history before
+# asking the next-best one, and fire at most this many extra requests per search
+HEDGE_DEFAULT_DELAY = float(os.getenv("HEDGE_DEFAULT_DELAY", "0.8"))
+HEDGE_MAX_EXTRA = int(os.getenv("HEDGE_MAX_EXTRA", "2"))
+
+# Cancellation messages telling _search_provider why a provider call was abandoned
+CANCEL_DEADLINE = "provider deadline exceeded"
+CANCEL_LOST_RACE = "another provider answered first"
+
+
+def normalize_query_key(query: str) -> str:
+    """Lower-case and sort the query terms so equivalent filter combinations share cache entries"""
+    terms = re.split(r"[\s,]+", (query or "").lower())
+    return " ".join(sorted(set(term for term in terms if term)))
+
+
+def cache_query_key(query: str, key_type: str) -> str:
+    """Build the image_cache query key for an entry type"""
+    return f"{key_type}:{normalize_query_key(query)}"
+
+
+def _shared_page_key(key: str, page: int) -> str:
+    return f"{key}|{page}"
+
+
+def _page_entry_size(entry: Tuple[float, List[Dict[str, Any]]]) -> int:
+    """Approximate size of a (stored_at, page) entry from a sample of its items"""
+    stored_at, data = entry
+    size = sys.getsizeof(entry) + sys.getsizeof(stored_at) + sys.getsizeof(data)
+    sample = data[:PAGE_SIZE_SAMPLE]
+    if not sample:
+        return size
+    return size + (approx_size(sample) - sys.getsizeof(sample)) * len(data) // len(sample)
+
+
 class HybridImageService:
-    def __init__(self):
+    def __init__(self, shared_cache: CacheService | None = None):
         self.pexels = PexelsService()
         self.unsplash = UnsplashService()
         self.pixabay = PixabayService()
@@ -85,8 +147,220 @@ class HybridImageService:
         # Track last provider used for each query to rotate providers
         self.last_provider_index = {}
         
+        # Latency/success statistics per provider drive routing, fan-out and timeouts
+        self.provider_health = ProviderHealthTracker([name for name, _ in self.providers])
+        self.hedge_stats = {
+            "searches": 0,
+            "hedges_fired": 0,
+            "primary_wins": 0,
+            "hedge_wins": 0,
+            "no_result": 0,
+            "losers_cancelled": 0,
+        }
+        
+        # Cache hit/miss counters per key type, plus infinite-scroll pages (page > 1)
+        self.cache_stats = {key_type: {"hits": 0, "misses": 0} for key_type in CACHE_KEY_TYPES}
+        self.cache_stats["after_page_1"] = {"hits": 0, "misses": 0}
+        
+        # In-flight searches keyed by (mode, normalized query, page, per_page) so
+        # concurrent identical requests share one provider fan-out
+        self._inflight_searches: Dict[Tuple[Any, ...], asyncio.Task] = {}
+        self.coalescing_stats = {"leaders": 0, "coalesced": 0}
+        
+        # In-process LRU in front of the SQLite image_cache, with stale-while-revalidate.
+        # Entries are (stored_at, page) so the soft TTL can be applied to promoted pages.
+        self.page_cache = BoundedCache("feed_pages", PAGE_CACHE_MAX_ENTRIES, PAGE_CACHE_MAX_BYTES, sizeof=_page_entry_size)
+        self._refresh_tasks = set()
+        self.swr_stats = {"fresh_served": 0, "stale_served": 0, "refreshes": 0, "refresh_failures": 0}
+        # Optional tier shared by every worker (CacheService on Redis) between page_cache and SQLite
+        self.shared_cache = shared_cache
+        
         # Debug: Print available providers
         print(f"Available providers: {[name for name, _ in self.providers]}")
+        
+        # Background prefetching of upcoming infinite-scroll pages
+        self.prefetch_scheduler = PrefetchScheduler(self.prefetch_page, normalize_query=normalize_query_key)
+    
+    async def _get_cached_page(
+        self,
+        query: str,
+        page: int,
+        key_types: Tuple[str, ...],
+        max_age: float = FEED_CACHE_HARD_TTL
+    ) -> Tuple[List[Dict[str, Any]], float] | None:
+        """Look up a page under each cache key type in order: memory, the shared tier, then SQLite.
+
+        Returns (data, age in seconds) and records hits and misses per key type.
+        """
+        keys = [cache_query_key(query, key_type) for key_type in key_types]
+        found = None
+        for key in keys:
+            cached = self._recall_page(key, page, max_age)
+            if cached is not None:
+                found = (key, cached[0], cached[1])
+                break
+        if found is None and self.shared_cache is not None:
+            found = await self._recall_shared_page(keys, page, max_age)
+        if found is None:
+            row = await get_cached_images_for_keys(keys, page, max_age / 3600)
+            if row is not None:
+                key, data, created_at = row
+                stored_at = created_at.timestamp()
+                self._remember_page(key, page, data, stored_at)
+                await self._share_page(key, page, data, stored_at)
+                found = (key, data, max(0.0, time.time() - stored_at))
+        hit_type = key_types[keys.index(found[0])] if found else None
+        
+        for key_type in key_types:
+            if key_type == hit_type:
+                self.cache_stats[key_type]["hits"] += 1
+                break
+            self.cache_stats[key_type]["misses"] += 1
+        if page > 1:
+            self.cache_stats["after_page_1"]["hits" if found else "misses"] += 1
+        
+        if found:
+            print(f"Cache hit ({hit_type}) for query '{query}' page {page}")
+            return found[1], found[2]
+        return None
+    
+    @staticmethod
+    def _remaining_ttl(key: str, stored_at: float) -> float:
+        """Seconds until a page stored at stored_at passes its hard TTL"""
+        hard_ttl = TRENDING_CACHE_HARD_TTL if key.startswith("trending:") else FEED_CACHE_HARD_TTL
+        return stored_at + hard_ttl - time.time()
+    
+    def _remember_page(self, key: str, page: int, data: List[Dict[str, Any]], stored_at: float | None = None):
+        """Keep a page in memory until its hard TTL, remembering when it was originally stored"""
+        stored_at = time.time() if stored_at is None else stored_at
+        remaining = self._remaining_ttl(key, stored_at)
+        if remaining > 0:
+            self.page_cache.set((key, page), (stored_at, data), ttl=remaining)
+    
+    async def _share_page(self, key: str, page: int, data: List[Dict[str, Any]], stored_at: float):
+        """Offer a page to the other workers through the shared tier, until its hard TTL"""
+        if self.shared_cache is None:
+            return
+        remaining = self._remaining_ttl(key, stored_at)
+        if remaining > 0:
+            await self.shared_cache.set_many(
+                {_shared_page_key(key, page): [stored_at, pack_page(data)]}, remaining, SHARED_PAGE_NAMESPACE
+            )
+    
+    async def _recall_shared_pages(self, keys_pages: List[Tuple[str, int]]) -> Dict[Tuple[str, int], Tuple[float, List[Dict[str, Any]]]]:
+        """(stored_at, data) of the (key, page) entries found in the shared tier, fetched in one round trip
+        and kept in memory so the next lookups stay in process"""
+        shared = await self.shared_cache.get_many(
+            [_shared_page_key(key, page) for key, page in keys_pages], SHARED_PAGE_NAMESPACE
+        )
+        found = {}
+        for key, page in keys_pages:
+            entry = shared.get(_shared_page_key(key, page))
+            if entry is None:
+                continue
+            stored_at, payload = entry
+            data = unpack_page(payload)
+            self._remember_page(key, page, data, stored_at)
+            found[(key, page)] = (stored_at, data)
+        return found
+    
+    async def _recall_shared_page(self, keys: List[str], page: int, max_age: float) -> Tuple[str, List[Dict[str, Any]], float] | None:
+        """(key, data, age) of the first key, in order, whose page the shared tier holds younger than max_age"""
+        found = await self._recall_shared_pages([(key, page) for key in keys])
+        for key in keys:
+            if (key, page) in found:
+                stored_at, data = found[(key, page)]
+                age = max(0.0, time.time() - stored_at)
+                if age <= max_age:
+                    return key, data, age
+        return None
+    
+    def _recall_page(self, key: str, page: int, max_age: float) -> Tuple[List[Dict[str, Any]], float] | None:
+        """(data, age in seconds) of a page held in memory, if younger than max_age"""
+        entry = self.page_cache.get((key, page))
+        if entry is None:
+            return None
+        stored_at, data = entry
+        age = time.time() - stored_at
+        return (data, age) if age <= max_age else None
+    
+    async def _store_page(self, provider_name: str, key_type: str, query: str, page: int, data: List[Dict[str, Any]]) -> bool:
+        """Write a page to every cache tier"""
+        key = cache_query_key(query, key_type)
+        stored_at = time.time()
+        self._remember_page(key, page, data, stored_at)
+        await self._share_page(key, page, data, stored_at)
+        return await cache_images(provider_name, key, page, data)
+    
+    async def _serve_cached(
+        self,
+        query: str,
+        page: int,
+        key_types: Tuple[str, ...],
+        flight_key: Tuple[Any, ...],
+        fetch,
+        soft_ttl: float,
+        hard_ttl: float
+    ) -> List[Dict[str, Any]] | None:
+        """Return a cached page, triggering a background refresh when it is past the soft TTL"""
+        cached = await self._get_cached_page(query, page, key_types, hard_ttl)
+        if cached is None:
+            return None
+        data, age = cached
+        if age > soft_ttl:
+            self.swr_stats["stale_served"] += 1
+            self._revalidate(flight_key, fetch)
+        else:
+            self.swr_stats["fresh_served"] += 1
+        return data
+    
+    def _revalidate(self, flight_key: Tuple[Any, ...], fetch):
+        """Refresh a stale page in the background unless the same search is already running"""
+        if flight_key in self._inflight_searches:
+            return
+        self.swr_stats["refreshes"] += 1
+        task = asyncio.ensure_future(self._single_flight(flight_key, fetch))
+        self._refresh_tasks.add(task)
+        
+        def _refresh_done(done_task):
+            self._refresh_tasks.discard(done_task)
+            if not done_task.cancelled() and done_task.exception() is not None:
+                self.swr_stats["refresh_failures"] += 1
+                print(f"Background refresh for {flight_key} failed: {done_task.exception()}")
+        task.add_done_callback(_refresh_done)
+    
+    async def _single_flight(self, key: Tuple[Any, ...], search) -> List[Dict[str, Any]]:
+        """Run the search once per key; concurrent callers with the same key await the same task"""
+        task = self._inflight_searches.get(key)
+        if task is not None:
+            self.coalescing_stats["coalesced"] += 1
+        else:
+            self.coalescing_stats["leaders"] += 1
+            task = asyncio.ensure_future(search())
+            self._inflight_searches[key] = task
+            
+            def _forget(done_task, key=key):
+                if self._inflight_searches.get(key) is done_task:
+                    del self._inflight_searches[key]
+            task.add_done_callback(_forget)
+        
+        # Shield so one caller disconnecting does not cancel the search for the others
+        results = await asyncio.shield(task)
+        return list(results) if isinstance(results, list) else results
+    
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Leader and coalesced search counts"""
+        return {**self.coalescing_stats, "in_flight": len(self._inflight_searches)}
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and hit rates per cache key type"""
+        stats = {}
+        for key_type, counts in self.cache_stats.items():
+            lookups = counts["hits"] + counts["misses"]
+            stats[key_type] = {**counts, "hit_rate": counts["hits"] / lookups if lookups else 0.0}
+        stats["memory"] = self.page_cache.get_stats()
+        stats["stale_while_revalidate"] = {**self.swr_stats, "refreshing": len(self._refresh_tasks)}
+        return stats
     
     async def search_photos(
         self,
@@ -95,13 +369,26 @@ class HybridImageService:
         per_page: int = 20
     ) -> List[Dict[str, Any]]:
         """Search for photos using hybrid approach with caching"""
-        print(f"Searching for photos with query: '{query}', page: {page}, per_page: {per_page}")
+        key = ("search", normalize_query_key(query), page, per_page)
+        fetch = lambda: self._search_photos(query, page, per_page)
         
-        # First check if we have cached results
-        cached_results = await get_cached_images_multi_provider(query, page)
+        # First check if we have cached results (direct, aggregated or prefetched)
+        cached_results = await self._serve_cached(
+            query, page, ("search", "aggregated", "prefetch"), key, fetch,
+            FEED_CACHE_SOFT_TTL, FEED_CACHE_HARD_TTL
+        )
         if cached_results is not None:
-            print(f"Returning cached results for query '{query}' page {page}")
-            return cached_results
+            return cached_results[:per_page]
+        
+        return await self._single_flight(key, fetch)
+    
+    async def _search_photos(
+        self,
+        query: str,
+        page: int,
+        per_page: int
+    ) -> List[Dict[str, Any]]:
+        print(f"Searching for photos with query: '{query}', page: {page}, per_page: {per_page}")
         
         # Get the next provider to use (rotate between providers)
         provider_name, provider = self.get_next_provider(query)
@@ -111,43 +398,12 @@ class HybridImageService:
             # Try to fetch from the selected provider
             print(f"Fetching from {provider_name} for query '{query}', page {page}, per_page {per_page}")
             
-            # Handle different service interfaces
-            if provider_name == "unlimited":
-                raw_data = await provider.search_images(query, page, per_page)
-            elif provider_name == "enhanced_scraper":
-                raw_data = await provider.search_design_images(query, page, per_page)
-            elif provider_name == "web_scraping":
-                raw_data = await provider.search_all_sources(query, page, per_page)
-            elif provider_name in ["pexels_direct", "pixabay_direct"]:
-                # Direct scrapers use standard search_photos interface
-                raw_data = await provider.search_photos(query, page, per_page)
-            else:
-                raw_data = await provider.search_photos(query, page, per_page)
-            
-            print(f"Raw data from {provider_name}: {type(raw_data)}")
-            
-            # Handle different response formats
-            if isinstance(raw_data, list):
-                # Service returned [...] format directly (Picsum, web_scraping, etc.)
-                formatted_data = raw_data
-            elif provider_name == "web_scraping":
-                # Web scraping service already returns properly formatted data
-                formatted_data = raw_data if isinstance(raw_data, list) else []
-            elif isinstance(raw_data, dict) and "results" in raw_data:
-                # Service returned {results: [...]} format (Unsplash, Pexels, etc.)
-                formatted_data = provider.format_photos_response(raw_data)
-            elif isinstance(raw_data, dict) and "foundAssets" in raw_data:
-                # AmbientCG format
-                formatted_data = provider.format_photos_response(raw_data)
-            else:
-                # Fallback - treat as results format
-                formatted_data = provider.format_photos_response({"results": raw_data})
+            # Handle different service interfaces and response formats
+            formatted_data = await self._search_provider(provider_name, provider, query, page, per_page)
             
             # If the service returned empty results, try another provider
             if not formatted_data or len(formatted_data) == 0:
                 print(f"Provider {provider_name} returned empty results, trying fallback...")
-                print(f"Formatted data: {formatted_data}")
-                print(f"Raw data: {raw_data}")
                 return await self.search_photos_fallback(query, page, per_page, provider_name)
             
             # Ensure formatted_data is a list before returning
@@ -155,20 +411,12 @@ class HybridImageService:
                 print(f"Provider {provider_name} returned non-list data: {type(formatted_data)}")
                 formatted_data = []  # Fallback to empty list if not a list
             
-            # Filter results to only include valid design images and enhance metadata with early exit
-            filtered_data = []
-            target_count = per_page * 2  # Get extra to compensate for filtering
-            for result in formatted_data:
-                if image_categorization_service.is_valid_design_image(result):
-                    # Enhance the metadata of the image
-                    enhanced_result = image_categorization_service.enhance_image_metadata(result)
-                    filtered_data.append(enhanced_result)
-                    # Early exit if we have enough results
-                    if len(filtered_data) >= target_count:
-                        break
+            # Filter results to only include valid design images and enhance metadata, keeping
+            # extra to compensate for filtering
+            filtered_data = image_categorization_service.filter_design_images(formatted_data, limit=per_page * 2, enhance=True)
             
             # Cache the results
-            await cache_images(provider_name, query, page, filtered_data)
+            await self._store_page(provider_name, "search", query, page, filtered_data)
             
             return filtered_data[:per_page]  # Return only requested amount
         except HTTPException as e:
@@ -183,6 +431,272 @@ class HybridImageService:
             # Try another provider
             return await self.search_photos_fallback(query, page, per_page, provider_name)
 
+    def _aggregation_groups(self) -> Tuple[List[Tuple[str, Any]], List[Tuple[str, Any]], List[Tuple[str, Any]]]:
+        """Split providers into the aggregation tiers: unlimited, direct scrapers and the rest.
+
+        picsum and the two multi-site scrapers (enhanced_scraper, web_scraping)
+        are slow and rate-limited, so aggregation never races them.
+        """
+        unlimited_providers = []
+        direct_scrapers = []
+        other_providers = []
+        for provider_name, provider in self.providers:
+            if provider_name == "unlimited":
+                unlimited_providers.append((provider_name, provider))
+            elif provider_name in ["pexels_direct", "pixabay_direct"]:
+                direct_scrapers.append((provider_name, provider))
+            elif provider_name not in ["picsum", "enhanced_scraper", "web_scraping"]:
+                other_providers.append((provider_name, provider))
+        return unlimited_providers, direct_scrapers, other_providers
+    
+    def _rank_providers(self, providers: List[Tuple[str, Any]]) -> List[Tuple[str, Any]]:
+        """Available providers ordered by health score, best first"""
+        by_name = dict(providers)
+        return [(name, by_name[name]) for name in self.provider_health.rank(list(by_name))]
+    
+    def _route_providers(self, providers: List[Tuple[str, Any]], max_width: int = 5) -> List[Tuple[str, Any]]:
+        """Pick the healthiest providers, as many as needed for a usable result with high probability"""
+        ranked = self._rank_providers(providers)
+        width = self.provider_health.fan_out_width([name for name, _ in ranked], max_width=max_width)
+        return ranked[:width]
+    
+    def _fan_out_timeout(self, providers: List[Tuple[str, Any]], default: float) -> float:
+        """Wait long enough for the slowest selected provider's typical response"""
+        if not providers:
+            return default
+        return max(self.provider_health.timeout_for(name, default) for name, _ in providers)
+    
+    def get_provider_scoreboard(self) -> Dict[str, Any]:
+        """Live provider health statistics"""
+        return self.provider_health.snapshot()
+    
+    def get_hedge_stats(self) -> Dict[str, Any]:
+        """Hedged request counters"""
+        return dict(self.hedge_stats)
+    
+    async def _cancel_tasks(self, tasks, reason: str = CANCEL_DEADLINE):
+        """Cancel tasks and wait for them to unwind so none outlive the request"""
+        tasks = [task for task in tasks if not task.done()]
+        for task in tasks:
+            task.cancel(reason)
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _hedged_search(
+        self,
+        candidates: List[Tuple[str, Any]],
+        query: str,
+        page: int,
+        per_page: int,
+        deadline: float,
+        initial: int = 1,
+    ) -> Tuple[str, List[Dict[str, Any]]] | None:
+        """
+        Query the best `initial` candidates, and each time the newest request
+        has run past its provider's p90 latency without an answer, fire the
+        same query at the next-best candidate. The first non-empty answer wins
+        and every other request is cancelled.
+        """
+        loop = asyncio.get_running_loop()
+        end = loop.time() + deadline
+        waiting = list(candidates)
+        running: Dict[asyncio.Task, Tuple[str, bool]] = {}
+        next_hedge_at = end
+        hedges = 0
+        won = False
+        
+        def launch(is_hedge: bool):
+            nonlocal next_hedge_at
+            name, provider = waiting.pop(0)
+            task = asyncio.create_task(self._search_provider(name, provider, query, page, per_page))
+            running[task] = (name, is_hedge)
+            next_hedge_at = loop.time() + self.provider_health.hedge_delay(name, HEDGE_DEFAULT_DELAY)
+        
+        self.hedge_stats["searches"] += 1
+        for _ in range(min(max(1, initial), len(waiting))):
+            launch(is_hedge=False)
+        
+        try:
+            while running:
+                now = loop.time()
+                if now >= end:
+                    break
+                can_hedge = bool(waiting) and hedges < HEDGE_MAX_EXTRA
+                wake_at = min(end, next_hedge_at) if can_hedge else end
+                done, _ = await asyncio.wait(running, timeout=max(0.0, wake_at - now), return_when=asyncio.FIRST_COMPLETED)
+                
+                for task in done:
+                    name, is_hedge = running.pop(task)
+                    try:
+                        results = task.result()
+                    except Exception as e:
+                        print(f"❌ Provider {name} failed: {e}")
+                        continue
+                    if results:
+                        won = True
+                        self.hedge_stats["hedge_wins" if is_hedge else "primary_wins"] += 1
+                        return name, results
+                
+                if waiting and (not running or (can_hedge and loop.time() >= next_hedge_at)):
+                    # Hedge a slow request, or move on once every request came back empty
+                    if running:
+                        hedges += 1
+                        self.hedge_stats["hedges_fired"] += 1
+                    launch(is_hedge=bool(running))
+            
+            self.hedge_stats["no_result"] += 1
+            return None
+        finally:
+            if running:
+                self.hedge_stats["losers_cancelled"] += len(running)
+                await self._cancel_tasks(running, CANCEL_LOST_RACE if won else CANCEL_DEADLINE)
+    
+    def _add_unique_results(
+        self,
+        items: List[Dict[str, Any]],
+        all_results: List[Dict[str, Any]],
+        processed_urls: set,
+        validate: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Append items not seen before to all_results; returns the newly added items"""
+        added = []
+        items = [item for item in items if item and isinstance(item, dict)]
+        # Classify the whole page in one call rather than per item
+        classifications = image_categorization_service.classify_batch(items) if validate else None
+        for position, item in enumerate(items):
+            item_id = item.get("id") or item.get("image") or item.get("url") or ""
+            if not item_id or item_id in processed_urls:
+                continue
+            if classifications is not None:
+                # Only add if it's a valid design image
+                classification = classifications[position]
+                if not classification.valid:
+                    continue
+                item = classification.apply(item)
+            all_results.append(item)
+            added.append(item)
+            processed_urls.add(item_id)
+        return added
+    
+    async def _search_provider(self, provider_name: str, provider: Any, query: str, page: int, per_page: int) -> List[Dict[str, Any]]:
+        """Call a provider and record its latency and outcome in the health tracker"""
+        started = time.perf_counter()
+        try:
+            results = await self._call_provider(provider_name, provider, query, page, per_page)
+        except asyncio.CancelledError as e:
+            if e.args and e.args[0] == CANCEL_LOST_RACE:
+                self.provider_health.record_cancelled(provider_name)
+            else:
+                # Cancelled by a caller's deadline: count it against the provider as a timeout
+                self.provider_health.record_failure(provider_name, time.perf_counter() - started, timed_out=True)
+            raise
+        except Exception as e:
+            status_code = getattr(e, "status_code", None) or getattr(getattr(e, "response", None), "status_code", None)
+            self.provider_health.record_failure(provider_name, time.perf_counter() - started, status_code)
+            raise
+        self.provider_health.record_success(provider_name, time.perf_counter() - started, len(results or []))
+        return results
+    
+    async def _call_provider(self, provider_name: str, provider: Any, query: str, page: int, per_page: int) -> List[Dict[str, Any]]:
+        """Call a provider through its own search interface and return formatted results"""
+        if provider_name == "unlimited":
+            raw_data = await provider.search_images(query, page, per_page)
+        elif provider_name == "enhanced_scraper":
+            raw_data = await provider.search_design_images(query, page, per_page)
+        elif provider_name == "web_scraping":
+            raw_data = await provider.search_all_sources(query, page, per_page)
+        else:
+            raw_data = await provider.search_photos(query, page, per_page)
+        
+        # Handle different response formats
+        if isinstance(raw_data, list):
+            return raw_data
+        if provider_name == "web_scraping" or not hasattr(provider, "format_photos_response"):
+            return []
+        if isinstance(raw_data, dict) and ("results" in raw_data or "foundAssets" in raw_data):
+            return provider.format_photos_response(raw_data)
+        return provider.format_photos_response({"results": raw_data})
+    
+    async def stream_photos_aggregated(
+        self,
+        query: str,
+        page: int = 1,
+        per_page: int = 20,
+        timeout: float = 3.0
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Progressive variant of search_photos_aggregated.
+
+        Yields a "batch" frame with the new, deduplicated results as each provider
+        finishes, then a final "summary" frame.
+        """
+        started = time.perf_counter()
+        provider_counts = {}
+        
+        cached_results = await self._serve_cached(
+            query, page, ("aggregated", "prefetch", "search"),
+            ("aggregated", normalize_query_key(query), page, per_page, 2),
+            lambda: self._search_photos_aggregated(query, page, per_page, 2),
+            FEED_CACHE_SOFT_TTL, FEED_CACHE_HARD_TTL
+        )
+        if cached_results:
+            results = cached_results[:per_page]
+            provider_counts["cache"] = len(results)
+            yield {"type": "batch", "provider": "cache", "results": results}
+            yield {
+                "type": "summary",
+                "total": len(results),
+                "providers": provider_counts,
+                "cached": True,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+            }
+            return
+        
+        unlimited_providers, direct_scrapers, other_providers = self._aggregation_groups()
+        # Same filtering rules as the buffered path: unlimited and direct scraper
+        # results are used as-is, everything else must pass categorization
+        validate_by_provider = {name: False for name, _ in unlimited_providers + direct_scrapers}
+        direct_scrapers = [(name, provider) for name, provider in direct_scrapers if self.provider_health.is_available(name)]
+        other_providers = self._route_providers(other_providers)
+        validate_by_provider.update({name: True for name, _ in other_providers})
+        
+        all_results = []
+        processed_urls = set()
+        # Providers still running once the page fills lost the race and are not held against them
+        async with FanOutStream(
+            [
+                (provider_name, lambda provider_name=provider_name, provider=provider: self._search_provider(provider_name, provider, query, page, per_page))
+                for provider_name, provider in unlimited_providers + direct_scrapers + other_providers
+            ],
+            deadline=timeout,
+            label="hybrid_stream",
+            cancel_message=CANCEL_LOST_RACE,
+            deadline_message=CANCEL_DEADLINE,
+        ) as stream:
+            async for provider_name, result in stream:
+                added = self._add_unique_results(result, all_results, processed_urls, validate_by_provider[provider_name])
+                emitted = added[:max(0, per_page - (len(all_results) - len(added)))]
+                provider_counts[provider_name] = len(emitted)
+                if emitted:
+                    yield {"type": "batch", "provider": provider_name, "results": emitted}
+                if len(all_results) >= per_page:
+                    break
+        for provider_name, error in stream.errors.items():
+            print(f"❌ Streaming provider {provider_name} failed: {error}")
+            provider_counts[provider_name] = 0
+        if stream.timed_out:
+            print("⏱️ Streaming aggregation hit its deadline, sending what we have")
+        
+        results = all_results[:per_page]
+        if results:
+            await self._store_page("aggregated", "aggregated", query, page, results)
+        yield {
+            "type": "summary",
+            "total": len(results),
+            "providers": provider_counts,
+            "cached": False,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+    
     async def search_photos_mobile_optimized(
         self,
         query: str,
@@ -237,6 +751,26 @@ class HybridImageService:
         max_pages: int = 5  # Increase max_pages to ensure we have enough results
     ) -> List[Dict[str, Any]]:
         """Search for photos from multiple providers and aggregate results to support unlimited scrolling"""
+        key = ("aggregated", normalize_query_key(query), page, per_page, max_pages)
+        fetch = lambda: self._search_photos_aggregated(query, page, per_page, max_pages)
+        
+        # Serve aggregated or prefetched pages from cache before going to any provider
+        cached_results = await self._serve_cached(
+            query, page, ("aggregated", "prefetch", "search"), key, fetch,
+            FEED_CACHE_SOFT_TTL, FEED_CACHE_HARD_TTL
+        )
+        if cached_results:
+            return cached_results[:per_page]
+        
+        return await self._single_flight(key, fetch)
+    
+    async def _search_photos_aggregated(
+        self,
+        query: str,
+        page: int,
+        per_page: int,
+        max_pages: int
+    ) -> List[Dict[str, Any]]:
         print(f"Aggregating photos with query: '{query}', page: {page}, per_page: {per_page}, max_pages: {max_pages}")
         
         all_results = []
@@ -259,102 +793,62 @@ class HybridImageService:
                 formatted_data = raw_data if isinstance(raw_data, list) else raw_data
                 
                 if formatted_data and isinstance(formatted_data, list):
-                    for item in formatted_data[:per_page]:  # Take all unlimited results
-                        if item and isinstance(item, dict):
-                            item_id = item.get("id") or item.get("image") or item.get("url") or ""
-                            if item_id and item_id not in processed_urls:
-                                all_results.append(item)
-                                processed_urls.add(item_id)
+                    # Take all unlimited results
+                    self._add_unique_results(formatted_data[:per_page], all_results, processed_urls)
                     print(f"Fast path: Got {len(all_results)} guaranteed results from unlimited service")
             except Exception as e:
                 print(f"Fast path unlimited service failed: {e}")
         
         # Try other providers in parallel but with short timeout for speed
-        enhanced_scraper_provider = None
-        web_scraping_provider = None
-        direct_scrapers = []
-        other_providers = []
-        
-        for provider_name, provider in self.providers:
-            if provider_name == "enhanced_scraper":
-                enhanced_scraper_provider = (provider_name, provider)
-            elif provider_name == "web_scraping":
-                web_scraping_provider = (provider_name, provider)
-            elif provider_name in ["pexels_direct", "pixabay_direct"]:
-                direct_scrapers.append((provider_name, provider))
-            elif provider_name not in ["unlimited", "picsum"]:
-                other_providers.append((provider_name, provider))
+        _, direct_scrapers, other_providers = self._aggregation_groups()
         
-        # Try direct scrapers quickly (high success rate, no API limits)
+        # Try direct scrapers quickly (high success rate, no API limits), skipping cooled-down ones
+        direct_scrapers = [(name, provider) for name, provider in direct_scrapers if self.provider_health.is_available(name)]
         if len(all_results) < per_page and direct_scrapers:
-            try:
-                # Try direct scrapers with very short timeout for speed
-                direct_tasks = [
-                    (name, asyncio.create_task(provider.search_photos(query, page, per_page)))
+            # Try direct scrapers with a short timeout derived from their observed latency;
+            # the first one with results wins and the others are cancelled
+            outcome = await fan_out(
+                [
+                    (name, lambda name=name, provider=provider: self._search_provider(name, provider, query, page, per_page))
                     for name, provider in direct_scrapers
-                ]
-                
-                done, pending = await asyncio.wait([task for _, task in direct_tasks], timeout=1.5, return_when=asyncio.FIRST_COMPLETED)
-                
-                for task in done:
-                    provider_name = next(name for name, t in direct_tasks if t == task)
-                    try:
-                        result = await task
-                        if result and isinstance(result, list) and len(result) > 0:
-                            print(f"✅ Direct scraper {provider_name} returned {len(result)} additional results")
-                            
-                            # Add unique results
-                            for item in result:
-                                item_id = item.get("id") or item.get("image") or item.get("url") or ""
-                                if item_id and item_id not in processed_urls:
-                                    all_results.append(item)
-                                    processed_urls.add(item_id)
-                                    
-                            # If we have enough results, break
-                            if len(all_results) >= per_page:
-                                break
-                    except Exception as e:
-                        print(f"❌ Direct scraper {provider_name} failed: {e}")
-                        
-            except asyncio.TimeoutError:
+                ],
+                deadline=self._fan_out_timeout(direct_scrapers, 1.5),
+                min_results=1,
+                label="hybrid_direct_scrapers",
+                cancel_message=CANCEL_LOST_RACE,
+            )
+            if outcome.timed_out:
                 print("⏱️ Direct scraper search timed out, using unlimited results")
+            for provider_name, error in outcome.errors.items():
+                print(f"❌ Direct scraper {provider_name} failed: {error}")
+            
+            for provider_name, result in outcome.results.items():
+                if result and isinstance(result, list):
+                    print(f"✅ Direct scraper {provider_name} returned {len(result)} additional results")
+                    
+                    # Add unique results
+                    self._add_unique_results(result, all_results, processed_urls)
+                    
+                    # If we have enough results, stop
+                    if len(all_results) >= per_page:
+                        break
         # Try other providers only if we need more results (with very short timeout)
         if len(all_results) < per_page:
             try:
-                # Try a few other providers quickly with short timeout
-                other_tasks = []
-                for provider_name, provider in other_providers[:3]:  # Only try first 3 for speed
-                    if provider_name == "enhanced_scraper":
-                        other_tasks.append((provider_name, asyncio.create_task(provider.search_design_images(query, page, per_page))))
-                    elif provider_name == "web_scraping":
-                        other_tasks.append((provider_name, asyncio.create_task(provider.search_all_sources(query, page, per_page))))
-                    else:
-                        other_tasks.append((provider_name, asyncio.create_task(provider.search_photos(query, page, per_page))))
+                # Start with as many of the healthiest providers as their stats say we
+                # need, hedging onto the next-best whenever one runs past its p90
+                ranked_providers = self._rank_providers(other_providers)
+                initial = self.provider_health.fan_out_width([name for name, _ in ranked_providers])
+                deadline = self._fan_out_timeout(ranked_providers[:initial + HEDGE_MAX_EXTRA], 2.0)
                 
-                done, pending = await asyncio.wait([task for _, task in other_tasks], timeout=2.0, return_when=asyncio.FIRST_COMPLETED)
-                
-                for task in done:
-                    provider_name = next(name for name, t in other_tasks if t == task)
-                    try:
-                        result = await task
-                        if result and isinstance(result, list) and len(result) > 0:
-                            print(f"✅ Additional provider {provider_name} returned {len(result)} results")
-                            
-                            # Add unique results
-                            for item in result:
-                                item_id = item.get("id") or item.get("image") or item.get("url") or ""
-                                if item_id and item_id not in processed_urls:
-                                    # Only add if it's a valid design image
-                                    if image_categorization_service.is_valid_design_image(item):
-                                        enhanced_item = image_categorization_service.enhance_image_metadata(item)
-                                        all_results.append(enhanced_item)
-                                        processed_urls.add(item_id)
-                                    
-                            # If we have enough results, break
-                            if len(all_results) >= per_page:
-                                break
-                    except Exception as e:
-                        print(f"❌ Additional provider {provider_name} failed: {e}")
+                hedged = await self._hedged_search(ranked_providers, query, page, per_page, deadline, initial=initial)
+                if hedged:
+                    provider_name, result = hedged
+                    if isinstance(result, list):
+                        print(f"✅ Additional provider {provider_name} returned {len(result)} results")
+                        
+                        # Add unique results, only if they are valid design images
+                        self._add_unique_results(result, all_results, processed_urls, validate=True)
                         
             except asyncio.TimeoutError:
                 print("⏱️ Additional provider search timed out, using unlimited results")
@@ -369,7 +863,7 @@ class HybridImageService:
         # Always return unlimited results if we have them (guaranteed to work)
         if paginated_results:
             # Cache the results with a special key for aggregated results
-            await cache_images("aggregated", f"{query}_aggregated", page, paginated_results)
+            await self._store_page("aggregated", "aggregated", query, page, paginated_results)
             print(f"Returning {len(paginated_results)} results for page {page}")
             return paginated_results
         else:
@@ -377,7 +871,7 @@ class HybridImageService:
             try:
                 print(f"Using unlimited design service as final fallback")
                 fallback_results = await self.unlimited_service.search_images(query, page, per_page)
-                await cache_images("aggregated", f"{query}_aggregated", page, fallback_results)
+                await self._store_page("aggregated", "aggregated", query, page, fallback_results)
                 return fallback_results
             except Exception as e:
                 print(f"Final unlimited fallback failed: {e}")
@@ -389,11 +883,24 @@ class HybridImageService:
         per_page: int = 20
     ) -> List[Dict[str, Any]]:
         """Get trending photos using hybrid approach with caching"""
-        # First check if we have cached results
-        cached_results = await get_cached_images_multi_provider("", page, max_age_hours=1)  # 1 hour cache for trending
+        key = ("trending", page, per_page)
+        fetch = lambda: self._get_trending_photos(page, per_page)
+        
+        # First check if we have cached results (shorter TTLs for trending)
+        cached_results = await self._serve_cached(
+            "", page, ("trending",), key, fetch,
+            TRENDING_CACHE_SOFT_TTL, TRENDING_CACHE_HARD_TTL
+        )
         if cached_results is not None:
             return cached_results
         
+        return await self._single_flight(key, fetch)
+    
+    async def _get_trending_photos(
+        self,
+        page: int,
+        per_page: int
+    ) -> List[Dict[str, Any]]:
         # Get the next provider to use (rotate between providers)
         provider_name, provider = self.get_next_provider("")
         print(f"Using provider for trending: {provider_name}")
@@ -425,13 +932,10 @@ class HybridImageService:
                 return await self.get_trending_photos_fallback(page, per_page, provider_name)
             
             # Filter results to only include valid design images
-            filtered_data = []
-            for result in formatted_data:
-                if image_categorization_service.is_valid_design_image(result):
-                    filtered_data.append(result)
+            filtered_data = image_categorization_service.filter_design_images(formatted_data)
             
             # Cache the results
-            await cache_images(provider_name, "", page, filtered_data)
+            await self._store_page(provider_name, "trending", "", page, filtered_data)
             
             return filtered_data
         except HTTPException as e:
@@ -469,25 +973,22 @@ class HybridImageService:
                 if any(name == p_name for p_name, _ in self.providers)
             ]
             
-            # If we have enabled search-capable providers, rotate through them
-            if enabled_search_providers:
-                # Find the index of the last used provider in our search-capable list
-                last_search_index = -1
-                if last_index >= 0 and last_index < len(self.providers):
-                    last_provider_name = self.providers[last_index][0]
-                    for i, (name, _) in enumerate(enabled_search_providers):
-                        if name == last_provider_name:
-                            last_search_index = i
-                            break
-                
-                next_search_index = (last_search_index + 1) % len(enabled_search_providers)
+            # Rotate through the healthiest few so load spreads and their stats stay current
+            ranked = self.provider_health.rank([name for name, _ in enabled_search_providers])[:3]
+            if ranked:
+                next_search_index = (last_index + 1) % len(ranked)
                 self.last_provider_index[key] = next_search_index
-                provider_name, provider = enabled_search_providers[next_search_index]
+                provider_name = ranked[next_search_index]
+                provider = dict(enabled_search_providers)[provider_name]
                 print(f"Provider selection for query '{query}': provider={provider_name}")
                 return provider_name, provider
         
-        # For trending or when no query, use the original rotation logic
+        # For trending or when no query, rotate through providers whose circuit is closed
         next_index = (last_index + 1) % len(self.providers)
+        for _ in range(len(self.providers)):
+            if self.provider_health.is_available(self.providers[next_index][0]):
+                break
+            next_index = (next_index + 1) % len(self.providers)
         self.last_provider_index[key] = next_index
         provider_name, provider = self.providers[next_index]
         print(f"Provider rotation: key={key}, last_index={last_index}, next_index={next_index}, provider={provider_name}")
@@ -501,16 +1002,15 @@ class HybridImageService:
         failed_provider: str
     ) -> List[Dict[str, Any]]:
         """Try other providers when one fails"""
-        # Prioritize unlimited service, then shuffle others, keep Picsum at the end
+        # Prioritize unlimited service, then others by health, keep Picsum at the end
         unlimited_providers = [p for p in self.providers if p[0] == "unlimited" and p[0] != failed_provider]
         non_picsum_providers = [p for p in self.providers if p[0] != "picsum" and p[0] != "unlimited" and p[0] != failed_provider]
         picsum_providers = [p for p in self.providers if p[0] == "picsum"]
         
-        # Build fallback order: unlimited first, then randomized others, then picsum
+        # Build fallback order: unlimited first, then healthiest others, then picsum
         shuffled_providers = unlimited_providers.copy()  # Start with unlimited (most reliable)
-        other_providers = non_picsum_providers.copy()
-        random.shuffle(other_providers)  # Randomize other providers
-        shuffled_providers.extend(other_providers)
+        by_name = dict(non_picsum_providers)
+        shuffled_providers.extend((name, by_name[name]) for name in self.provider_health.rank(list(by_name)))
         shuffled_providers.extend(picsum_providers)  # Add Picsum at the end as last resort
         
         for provider_name, provider in shuffled_providers:
@@ -518,38 +1018,15 @@ class HybridImageService:
                 continue  # Skip the provider that just failed
             
             try:
-                # Handle different service interfaces
-                if provider_name == "unlimited":
-                    raw_data = await provider.search_images(query, page, per_page)
-                elif provider_name == "enhanced_scraper":
-                    raw_data = await provider.search_design_images(query, page, per_page)
-                elif provider_name == "web_scraping":
-                    raw_data = await provider.search_all_sources(query, page, per_page)
-                else:
-                    raw_data = await provider.search_photos(query, page, per_page)
-                    
-                    # Handle different response formats
-                    if isinstance(raw_data, dict) and "results" in raw_data:
-                        formatted_data = provider.format_photos_response(raw_data)
-                    elif isinstance(raw_data, list):
-                        formatted_data = raw_data
-                    else:
-                        formatted_data = provider.format_photos_response({"results": raw_data})
+                # Handle different service interfaces and response formats
+                formatted_data = await self._search_provider(provider_name, provider, query, page, per_page)
                 
-                # Filter results to only include valid design images and enhance metadata with early exit
-                filtered_data = []
-                target_count = per_page * 2  # Get extra to compensate for filtering
-                for result in formatted_data:
-                    if image_categorization_service.is_valid_design_image(result):
-                        # Enhance the metadata of the image
-                        enhanced_result = image_categorization_service.enhance_image_metadata(result)
-                        filtered_data.append(enhanced_result)
-                        # Early exit if we have enough results
-                        if len(filtered_data) >= target_count:
-                            break
+                # Filter results to only include valid design images and enhance metadata, keeping
+                # extra to compensate for filtering
+                filtered_data = image_categorization_service.filter_design_images(formatted_data, limit=per_page * 2, enhance=True)
                 
                 # Cache the results
-                await cache_images(provider_name, query, page, filtered_data)
+                await self._store_page(provider_name, "search", query, page, filtered_data)
                 
                 return filtered_data[:per_page]  # Return only requested amount
             except Exception:
@@ -565,12 +1042,11 @@ class HybridImageService:
         failed_provider: str
     ) -> List[Dict[str, Any]]:
         """Try other providers when one fails for trending photos"""
-        # Shuffle providers to randomize fallback order, but keep Picsum at the end
-        non_picsum_providers = [p for p in self.providers if p[0] != "picsum" and p[0] != failed_provider]
+        # Order providers by health, skipping cooled-down ones, but keep Picsum at the end
+        non_picsum_providers = dict(p for p in self.providers if p[0] != "picsum" and p[0] != failed_provider)
         picsum_providers = [p for p in self.providers if p[0] == "picsum"]
         
-        shuffled_providers = non_picsum_providers.copy()
-        random.shuffle(shuffled_providers)  # Randomize non-Picsum providers
+        shuffled_providers = [(name, non_picsum_providers[name]) for name in self.provider_health.rank(list(non_picsum_providers))]
         shuffled_providers.extend(picsum_providers)  # Add Picsum at the end as last resort
         
         for provider_name, provider in shuffled_providers:
@@ -589,15 +1065,10 @@ class HybridImageService:
                     formatted_data = provider.format_photos_response({"results": raw_data})
                 
                 # Filter results to only include valid design images and enhance metadata
-                filtered_data = []
-                for result in formatted_data:
-                    if image_categorization_service.is_valid_design_image(result):
-                        # Enhance the metadata of the image
-                        enhanced_result = image_categorization_service.enhance_image_metadata(result)
-                        filtered_data.append(enhanced_result)
+                filtered_data = image_categorization_service.filter_design_images(formatted_data, enhance=True)
                 
                 # Cache the results
-                await cache_images(provider_name, "", page, filtered_data)
+                await self._store_page(provider_name, "trending", "", page, filtered_data)
                 
                 return filtered_data
             except Exception:
@@ -606,138 +1077,80 @@ class HybridImageService:
         # If all providers fail, raise an error
         raise HTTPException(status_code=502, detail="All image providers are temporarily unavailable. Please try again later.")
     
-    async def cache_next_pages(self, query: str, current_page: int, per_page: int, num_pages_to_cache: int = 3):
-        """Cache the next few pages in the background to improve loading performance"""
-        print(f"Caching {num_pages_to_cache} additional pages for query: {query}, starting from page {current_page + 1}")
-        
-        import asyncio
-        from database import cache_images_batch
+    async def _fetch_prefetch_page(self, query: str, page_num: int, per_page: int) -> Tuple[str, List[Dict[str, Any]]] | None:
+        """Fetch one page for prefetching; returns (provider name, filtered results) or None"""
+        # Prioritize fast providers (web scraping, Picsum) first to avoid rate limits
+        fast_providers = []
+        rate_limited_providers = []
         
-        # Prepare cache entries for the next few pages
-        cache_batches = []
+        for provider_name, provider in self.providers:
+            if provider_name == "web_scraping":
+                fast_providers.insert(0, (provider_name, provider))  # Priority
+            elif provider_name == "picsum":
+                fast_providers.append((provider_name, provider))  # Fast, no rate limits
+            else:
+                rate_limited_providers.append((provider_name, provider))
         
-        for page_offset in range(1, num_pages_to_cache + 1):
-            page_num = current_page + page_offset
+        # Only try rate-limited providers if fast providers didn't work
+        for provider_name, provider in fast_providers + rate_limited_providers:
             try:
-                # Prioritize fast providers (web scraping, Picsum) first to avoid rate limits
-                fast_providers = []
-                rate_limited_providers = []
-                
-                for provider_name, provider in self.providers:
-                    if provider_name == "web_scraping":
-                        fast_providers.insert(0, (provider_name, provider))  # Priority
-                    elif provider_name == "picsum":
-                        fast_providers.append((provider_name, provider))  # Fast, no rate limits
-                    else:
-                        rate_limited_providers.append((provider_name, provider))
+                formatted_data = await self._search_provider(provider_name, provider, query, page_num, per_page)
                 
-                # Try fast providers first
-                for provider_name, provider in fast_providers:
-                    try:
-                        if provider_name == "web_scraping":
-                            # For web scraping, just get data since it aggregates from multiple sources
-                            try:
-                                raw_data = await provider.search_all_sources(query, page_num, per_page)
-                                # Web scraping service already returns properly formatted data
-                                if isinstance(raw_data, list):
-                                    formatted_data = raw_data
-                                else:
-                                    formatted_data = []
-                            except Exception as e:
-                                print(f"Error in web scraping service cache prefetch: {e}")
-                                formatted_data = []
-                        elif provider_name == "picsum":
-                            # Get Picsum results for the specific page
-                            raw_data = await provider.search_photos(query, page_num, per_page)
-                            if isinstance(raw_data, list):
-                                formatted_data = raw_data
-                            else:
-                                formatted_data = provider.format_photos_response({"results": raw_data})
-                        else:
-                            raw_data = await provider.search_photos(query, page_num, per_page)
-                            
-                            # Handle different response formats
-                            if isinstance(raw_data, list):
-                                formatted_data = raw_data
-                            elif isinstance(raw_data, dict) and "results" in raw_data:
-                                formatted_data = provider.format_photos_response(raw_data)
-                            elif isinstance(raw_data, dict) and "foundAssets" in raw_data:
-                                formatted_data = provider.format_photos_response(raw_data)
-                            else:
-                                formatted_data = provider.format_photos_response({"results": raw_data})
-                        
-                        if formatted_data:
-                            # Filter results to only include valid design images
-                            filtered_data = []
-                            for result in formatted_data:
-                                if image_categorization_service.is_valid_design_image(result):
-                                    filtered_data.append(result)
-                            
-                            cache_entry = {
-                                "provider": provider_name,
-                                "query": f"{query}_prefetch",
-                                "page": page_num,
-                                "data": filtered_data
-                            }
-                            cache_batches.append(cache_entry)
-                            break  # Move to next page after first successful provider
-                            
-                    except Exception as e:
-                        print(f"Error prefetching page {page_num} from {provider_name}: {e}")
-                        continue  # Try next provider
-                
-                # Only try rate-limited providers if fast providers didn't work
-                if not cache_batches or len([cb for cb in cache_batches if cb["page"] == page_num]) == 0:
-                    for provider_name, provider in rate_limited_providers:
-                        try:
-                            raw_data = await provider.search_photos(query, page_num, per_page)
-                            
-                            # Handle different response formats
-                            if isinstance(raw_data, list):
-                                formatted_data = raw_data
-                            elif isinstance(raw_data, dict) and "results" in raw_data:
-                                formatted_data = provider.format_photos_response(raw_data)
-                            elif isinstance(raw_data, dict) and "foundAssets" in raw_data:
-                                formatted_data = provider.format_photos_response(raw_data)
-                            else:
-                                formatted_data = provider.format_photos_response({"results": raw_data})
-                            
-                            if formatted_data:
-                                # Filter results to only include valid design images
-                                filtered_data = []
-                                for result in formatted_data:
-                                    if image_categorization_service.is_valid_design_image(result):
-                                        filtered_data.append(result)
-                                
-                                cache_entry = {
-                                    "provider": provider_name,
-                                    "query": f"{query}_prefetch",
-                                    "page": page_num,
-                                    "data": filtered_data
-                                }
-                                cache_batches.append(cache_entry)
-                                break  # Move to next page after first successful provider
-                                
-                        except Exception as e:
-                            print(f"Error prefetching page {page_num} from {provider_name}: {e}")
-                            continue  # Try next provider
-                        
+                if formatted_data:
+                    # Filter results to only include valid design images
+                    filtered_data = image_categorization_service.filter_design_images(formatted_data, enhance=True)
+                    return provider_name, filtered_data
             except Exception as e:
-                print(f"Error in prefetching loop: {e}")
-                continue
+                print(f"Error prefetching page {page_num} from {provider_name}: {e}")
+                continue  # Try next provider
+        return None
+    
+    async def prefetch_page(self, query: str, page_num: int, per_page: int) -> bool:
+        """Fetch and cache a single page unless it is already cached; used by the prefetch scheduler"""
+        keys = [cache_query_key(query, key_type) for key_type in ("prefetch", "aggregated")]
+        if await get_cached_images_for_keys(keys, page_num):
+            return True
         
-        # Cache all collected batches
-        if cache_batches:
-            await cache_images_batch(cache_batches)
-            print(f"Cached {len(cache_batches)} pages for query: {query}")
+        fetched = await self._fetch_prefetch_page(query, page_num, per_page)
+        if not fetched:
+            return False
+        provider_name, filtered_data = fetched
+        return await self._store_page(provider_name, "prefetch", query, page_num, filtered_data)
+    
+    async def warm_page(self, query: str, page: int, per_page: int, max_pages: int = 2) -> Tuple[bool, int]:
+        """Make sure an aggregated feed page is cached and fresh; returns (already cached, result count).
+
+        The lookup bypasses the hit/miss counters so warming does not skew feed hit rates.
+        """
+        keys = [cache_query_key(query, key_type) for key_type in ("aggregated", "prefetch", "search")]
+        row = await get_cached_images_for_keys(keys, page, FEED_CACHE_SOFT_TTL / 3600)
+        if row is not None:
+            key, data, created_at = row
+            self._remember_page(key, page, data, created_at.timestamp())
+            await self._share_page(key, page, data, created_at.timestamp())
+            return True, len(data)
+        # Same flight key as search_photos_aggregated, so a live /feed request for the page joins this fetch
+        flight_key = ("aggregated", normalize_query_key(query), page, per_page, max_pages)
+        results = await self._single_flight(flight_key, lambda: self._search_photos_aggregated(query, page, per_page, max_pages))
+        return False, len(results)
 
+    def schedule_prefetch(self, query: str, current_page: int, per_page: int, num_pages_to_cache: int = 3, client: Any = None) -> int:
+        """Queue the next pages for background prefetching (deduplicated and bounded) on behalf of a client"""
+        return self.prefetch_scheduler.schedule(query, current_page, per_page, num_pages_to_cache, client)
+    
     async def get_extended_cached_results(self, query: str, start_page: int, end_page: int, per_page: int) -> List[Dict[str, Any]]:
         """Get cached results across multiple pages to support unlimited scrolling"""
-        from database import get_cached_images_multi_provider_extended
-        import json
+        key_types = ("aggregated", "prefetch", "search")
+        if self.shared_cache is not None:
+            # Pull the whole range from the shared tier in one round trip; lookups below then hit memory
+            keys = [cache_query_key(query, key_type) for key_type in key_types]
+            await self._recall_shared_pages([(key, page_num) for page_num in range(start_page, end_page + 1) for key in keys])
         
         # Get cached results for the page range
-        cached_results = await get_cached_images_multi_provider_extended(query, (start_page, end_page))
+        cached_results = {}
+        for page_num in range(start_page, end_page + 1):
+            cached = await self._get_cached_page(query, page_num, key_types)
+            cached_results[page_num] = cached[0] if cached else []
         
         # Combine all results in order
         all_results = []
@@ -745,13 +1158,14 @@ class HybridImageService:
         
         for page_num in range(start_page, end_page + 1):
             if page_num in cached_results and cached_results[page_num]:
-                for item in cached_results[page_num]:
+                page_items = cached_results[page_num]
+                for item, classification in zip(page_items, image_categorization_service.classify_batch(page_items)):
                     image_url = item.get("image", "")
                     # Use the unique ID as primary key, fallback to URL
                     item_id = item.get("id", image_url)  # Use ID if available, else URL
                     if item_id and item_id not in processed_urls:
                         # Only add if it's a valid design image
-                        if image_categorization_service.is_valid_design_image(item):
+                        if classification.valid:
                             all_results.append(item)
                             processed_urls.add(item_id)  # Store the item_id to prevent duplicates
         
@@ -761,11 +1175,5 @@ class HybridImageService:
         return all_results[start_idx:end_idx]
 
     async def close(self):
-        """Close all provider clients"""
-        await self.pexels.close()
-        await self.unsplash.close()
-        await self.pixabay.close()
-        await self.picsum.close()
-        await self.openverse.close()
-        await self.rawpixel.close()
-        await self.ambientcg.close()
\ No newline at end of file
+        """Stop background prefetching; provider HTTP clients are closed by http_clients"""
+        await self.prefetch_scheduler.close()
\ No newline at end of file
@@ -2,10 +2,41 @@
 Image categorization service for design feed
 Filters and validates images to ensure they match the specified design categories
 """
-import re
-from typing import List, Dict, Any, Optional
+import os
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterable, Sequence, Tuple
 from urllib.parse import urlparse
 
+from keyword_matcher import KeywordMatcher
+from memory_cache import BoundedCache
+
+# Classification results memoized per image (identity plus text fields)
+CLASSIFICATION_CACHE_MAX_ENTRIES = int(os.getenv("CLASSIFICATION_CACHE_MAX_ENTRIES", "20000"))
+CLASSIFICATION_CACHE_TTL = float(os.getenv("CLASSIFICATION_CACHE_TTL", "3600"))
+
+# Terms in an image URL that mark it as non-design content
+NON_DESIGN_URL_TERMS = ('people', 'person', 'face', 'human', 'portrait', 'selfie', 'family', 'beach', 'nature', 'mountain', 'landscape')
+
+
+@dataclass(frozen=True)
+class ImageClassification:
+    """Everything the feed needs to know about one image, computed once by classify()"""
+    valid: bool
+    category: Optional[str]
+    # Design keywords found in the image's text and URL
+    keywords: Tuple[str, ...] = ()
+    # (field, value) replacements for title/alt, applied by apply()
+    enhanced: Tuple[Tuple[str, str], ...] = ()
+
+    def apply(self, image_data: Dict[str, Any]) -> Dict[str, Any]:
+        """A copy of image_data with the enhanced fields; non-design images are returned unchanged"""
+        if not self.valid:
+            return image_data
+        enhanced_data = image_data.copy()
+        enhanced_data.update(self.enhanced)
+        return enhanced_data
+
+
 class ImageCategorizationService:
     def __init__(self):
         # Define all the categories that should be included in the design feed
@@ -211,9 +242,15 @@ class ImageCategorizationService:
         for category_keywords in self.valid_categories.values():
             self.all_valid_keywords.update([kw.lower() for kw in category_keywords])
         
-        # Precompile regex patterns for faster matching
-        self.valid_keywords_pattern = r'|'.join(re.escape(kw) for kw in self.all_valid_keywords)
-        self.keyword_pattern = re.compile(r'\b(' + self.valid_keywords_pattern + r')\b', re.IGNORECASE)
+        # Earliest category (in valid_categories order) each keyword belongs to, for categorize_image
+        self.category_order = list(self.valid_categories)
+        self.keyword_category_rank = {}
+        for rank, category_keywords in enumerate(self.valid_categories.values()):
+            for kw in category_keywords:
+                self.keyword_category_rank.setdefault(kw.lower(), rank)
+        
+        # One Aho-Corasick automaton finds every keyword in a text in a single pass
+        self.keyword_matcher = KeywordMatcher(self.all_valid_keywords)
         
         # Precompile non-design terms pattern for faster matching
         # STRICT filtering - reject anything that's not architecture/interior design
@@ -253,132 +290,175 @@ class ImageCategorizationService:
             # Body parts
             "hand", "hands", "feet", "leg", "arm", "finger"
         ]
-        self.non_design_pattern = r'|'.join(re.escape(term) for term in self.non_design_terms)
-        self.non_design_regex = re.compile(self.non_design_pattern, re.IGNORECASE)
+        self.non_design_term_set = frozenset(term.lower() for term in self.non_design_terms)
+        # Design keywords and non-design terms in one automaton, so image text is scanned once
+        self.text_matcher = KeywordMatcher(self.all_valid_keywords.union(self.non_design_term_set))
         
         # Set of generic titles to identify placeholders
         self.generic_titles = {
             "design image", "architecture design image", "architecture design", 
             "design", "interior design", "random design", "random image", "photo"
         }
+        
+        # Memoized classify() results; the same image is checked again on every cache write and read
+        self.classification_cache = BoundedCache(
+            "image_classification", max_entries=CLASSIFICATION_CACHE_MAX_ENTRIES, ttl=CLASSIFICATION_CACHE_TTL
+        )
     
-    def is_valid_design_image(self, image_data: Dict[str, Any]) -> bool:
+    def _classification_key(self, image_data: Dict[str, Any]) -> Optional[Tuple]:
         """
-        Determine if an image is valid for the design feed based on our categories
-        Optimized for performance with early-exit strategies
+        Memo key: the image URL (or id) plus the text fields the result
+        depends on, so a re-titled copy of the same image is classified anew.
+        None when the image has no identity or its text is not hashable.
         """
-        # Check if the image URL contains any relevant keywords first (fastest check)
-        image_url = image_data.get('image', '') or image_data.get('url', '') or image_data.get('src', {}).get('large', '')
-        url_keywords = self._extract_keywords_from_url(image_url)
-        if url_keywords:
-            return True  # If URL has design keywords, it's valid
-        
+        identity = self._image_url(image_data) or image_data.get('id')
+        if not identity:
+            return None
+        tags = image_data.get('tags', [])
+        key = (
+            identity, image_data.get('title', ''), image_data.get('alt', ''), image_data.get('altText', ''),
+            image_data.get('description', ''), tuple(tags) if isinstance(tags, list) else tags,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    @staticmethod
+    def _image_url(image_data: Dict[str, Any]) -> str:
+        return image_data.get('image', '') or image_data.get('url', '') or image_data.get('src', {}).get('large', '')
+
+    def classify(self, image_data: Dict[str, Any]) -> ImageClassification:
+        """
+        Validity, category, matched keywords and enhanced metadata for an
+        image, computed in one pass and memoized by image identity
+        """
+        key = self._classification_key(image_data)
+        if key is not None:
+            cached = self.classification_cache.get(key)
+            if cached is not None:
+                return cached
+        result = self._classify(image_data)
+        if key is not None:
+            self.classification_cache.set(key, result)
+        return result
+
+    def classify_batch(self, items: Sequence[Dict[str, Any]]) -> List[ImageClassification]:
+        """
+        classify() for a whole provider page at once: memo hits are served in
+        one pass, and images repeated within the page are classified once.
+        Returns one result per item, in order, so [c.valid for c in results]
+        is the page's keep-mask and [c.category for c in results] its categories.
+        """
+        results: List[Optional[ImageClassification]] = [None] * len(items)
+        # Memo key -> positions of the uncached items sharing it, so duplicates are classified once;
+        # images without a key are classified on their own and not memoized
+        pending: Dict[Tuple, List[int]] = {}
+        groups: List[Tuple[Optional[Tuple], List[int]]] = []
+        for index, image_data in enumerate(items):
+            key = self._classification_key(image_data)
+            if key is None:
+                groups.append((None, [index]))
+                continue
+            cached = self.classification_cache.get(key)
+            if cached is not None:
+                results[index] = cached
+            elif key in pending:
+                pending[key].append(index)
+            else:
+                pending[key] = [index]
+                groups.append((key, pending[key]))
+
+        for key, indices in groups:
+            result = self._classify(items[indices[0]])
+            if key is not None:
+                self.classification_cache.set(key, result)
+            for index in indices:
+                results[index] = result
+        return results
+
+    def filter_design_images(
+        self, items: Sequence[Dict[str, Any]], limit: Optional[int] = None, enhance: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Valid design images among items, in order (enhanced if asked), stopping at limit"""
+        kept = []
+        for image_data, classification in zip(items, self.classify_batch(items)):
+            if classification.valid:
+                kept.append(classification.apply(image_data) if enhance else image_data)
+                if limit is not None and len(kept) >= limit:
+                    break
+        return kept
+
+    def _classify(self, image_data: Dict[str, Any]) -> ImageClassification:
+        image_url = self._image_url(image_data)
+        parsed = urlparse(image_url)
+        # Scan path and domain in one pass; the NUL separator keeps matches from spanning both
+        url_keywords = self.keyword_matcher.find(f"{parsed.path.lower()}\0{parsed.netloc.lower()}")
+
         # Extract text elements
         title = image_data.get('title', '')
         alt_text = image_data.get('alt', '')
         description = image_data.get('description', '') if 'description' in image_data else ''
         tags = image_data.get('tags', [])
-        
-        # Quick check: if title is generic and no tags/description, likely placeholder
-        title_lower = title.lower()
-        if title_lower in self.generic_titles and not tags and not description:
-            return False  # Likely a generic placeholder
-        
-        # Combine all text for analysis (avoid creating unnecessary strings)
-        all_text_parts = [title, alt_text, description] + tags
-        combined_text = ' '.join(all_text_parts).lower()
-        
-        # Quick check for non-design terms (most efficient first)
-        if self.non_design_regex.search(combined_text):
-            return False
-        
-        # Additional check for URLs containing non-design content
-        if any(term in image_url for term in ['people', 'person', 'face', 'human', 'portrait', 'selfie', 'family', 'beach', 'nature', 'mountain', 'landscape']):
-            return False
-        
-        # Check for valid design keywords
-        if self.keyword_pattern.search(combined_text):
-            return True
-        
-        # Check if this is a Picsum-generated image that may be generic
-        # Picsum images without meaningful alt descriptions are likely generic placeholders
-        if 'picsum.photos' in image_url:
-            title = str(image_data.get('title', ''))
-            alt_text = str(image_data.get('alt', ''))
-            # If the title/alt only contains generic content like "Photo #123", it's likely a placeholder
-            if 'Photo #' in title or 'Photo #' in alt_text:
-                # Only accept if there are other meaningful design-related terms
-                combined_text = f"{title} {alt_text} {description} {' '.join(tags)}".lower()
-                if not any(keyword in combined_text for keyword in self.all_valid_keywords):
-                    return False
-        
-        return False
 
-    def _extract_keywords_from_url(self, url: str) -> List[str]:
+        # Combine all text for analysis; one scan finds design keywords (anywhere and as whole words)
+        # and non-design terms together
+        combined_text = ' '.join([title, alt_text, description] + tags).lower()
+        found, words = self.text_matcher.find_all(combined_text)
+        text_keywords = found & self.all_valid_keywords
+        keywords = tuple(sorted(text_keywords.union(url_keywords)))
+
+        if url_keywords:
+            valid = True  # If URL has design keywords, it's valid
+        elif title.lower() in self.generic_titles and not tags and not description:
+            valid = False  # Likely a generic placeholder
+        elif not found.isdisjoint(self.non_design_term_set):
+            valid = False
+        elif any(term in image_url for term in NON_DESIGN_URL_TERMS):
+            # URLs containing non-design content
+            valid = False
+        else:
+            # Valid design keywords (whole words only); anything else, including
+            # Picsum "Photo #123" placeholders, is rejected
+            valid = not words.isdisjoint(self.all_valid_keywords)
+
+        if not valid:
+            return ImageClassification(False, None, keywords)
+
+        # First category any keyword in the text belongs to, else one from the URL
+        category = self._first_category(text_keywords) or self._first_category(url_keywords)
+        enhanced = self._enhanced_fields(image_data, category)
+        return ImageClassification(True, category, keywords, tuple(enhanced.items()))
+
+    def is_valid_design_image(self, image_data: Dict[str, Any]) -> bool:
         """
-        Extract potential keywords from the image URL that might indicate design categories
+        Determine if an image is valid for the design feed based on our categories
         """
-        parsed = urlparse(url)
-        path = parsed.path.lower()
-        domain = parsed.netloc.lower()
-        
-        # Check for keywords in the path and domain
-        matches = []
-        for keyword in self.all_valid_keywords:
-            if keyword in path or keyword in domain:
-                matches.append(keyword)
-        
-        return matches if matches else []
+        return self.classify(image_data).valid
+
+    def _first_category(self, keywords: Iterable[str]) -> Optional[str]:
+        """The earliest category in valid_categories order that any of the keywords belongs to"""
+        ranks = [self.keyword_category_rank[keyword] for keyword in keywords if keyword in self.keyword_category_rank]
+        return self.category_order[min(ranks)] if ranks else None
 
     def categorize_image(self, image_data: Dict[str, Any]) -> Optional[str]:
         """
-        Categorize an image into one of the design feed categories
+        Categorize an image into one of the design feed categories (None for non-design images)
         """
-        # Only categorize if the image is valid (to avoid categorizing non-design images)
-        if not self.is_valid_design_image(image_data):
-            return None
-        
-        # Extract text elements that might indicate category
-        title = image_data.get('title', '').lower()
-        alt_text = image_data.get('alt', '').lower()
-        description = image_data.get('description', '').lower() if 'description' in image_data else ''
-        tags = image_data.get('tags', [])
-        
-        # Combine text for analysis
-        combined_text = f"{title} {alt_text} {description} {' '.join(tags)}".lower()
-        
-        # Check each category for matches
-        for category, keywords in self.valid_categories.items():
-            for keyword in keywords:
-                if keyword.lower() in combined_text:
-                    return category
-        
-        # If no category match found from text, try URL
-        image_url = image_data.get('image', '') or image_data.get('url', '') or image_data.get('src', {}).get('large', '')
-        url_keywords = self._extract_keywords_from_url(image_url)
-        
-        if url_keywords:
-            # Try to map URL keywords back to categories
-            for category, keywords in self.valid_categories.items():
-                for keyword in keywords:
-                    if keyword.lower() in url_keywords:
-                        return category
-        
-        return None  # No matching category found
+        return self.classify(image_data).category
     
     def enhance_image_metadata(self, image_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Enhance image metadata with better captions and descriptions based on detected content
         """
-        # If image is not valid design content, don't enhance it
-        if not self.is_valid_design_image(image_data):
-            return image_data
+        return self.classify(image_data).apply(image_data)
 
-        # Create a copy to avoid modifying original
-        enhanced_data = image_data.copy()
-
-        # Get category for better description
-        category = self.categorize_image(image_data)
+    def _enhanced_fields(self, image_data: Dict[str, Any], category: Optional[str]) -> Dict[str, str]:
+        """
+        Title/alt replacements for a valid design image, based on its category
+        """
+        enhanced_data = {}
         
         # Extract existing text elements
         title = image_data.get('title', '')
@@ -416,8 +496,9 @@ class ImageCategorizationService:
                 enhanced_data['title'] = self._generate_title_from_category(category)
 
         # Remove completely empty or placeholder alt text
-        if enhanced_data.get('alt', '').strip().lower() in ['', 'image', 'photo', 'design image']:
-            enhanced_data['alt'] = enhanced_data.get('title', 'Interior design')
+        final_alt = enhanced_data['alt'] if 'alt' in enhanced_data else image_data.get('alt', '')
+        if final_alt.strip().lower() in ['', 'image', 'photo', 'design image']:
+            enhanced_data['alt'] = enhanced_data['title'] if 'title' in enhanced_data else image_data.get('title', 'Interior design')
 
         return enhanced_data
 
@@ -1,5 +1,4 @@
-import asyncio
-import aiohttp
+import httpx
 from typing import List, Dict, Any, Optional
 from fastapi import HTTPException
 import random
@@ -7,18 +6,22 @@ from datetime import datetime
 import json
 import re
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
 import logging
+from fan_out import fan_out
+from http_cache import http_response_cache
+from http_clients import http_clients
+from html_parsing import RETAILER_SELECTORS, html_parse_executor, parse_retailer_products
 
 class IndianEcommerceService:
     def __init__(self):
-        self.session = None
         self._logger = logging.getLogger(__name__)
         # Track which retailers have already emitted a warning to avoid repeating
         self._warned: set[str] = set()
+        # Upper bound for one search across all retailers; stragglers are cancelled
+        self.search_deadline = 12.0
         self.retailers = [
-            {"name": "Urban Ladder", "url": "https://www.urbanladder.com", "api": None},
-            {"name": "Pepperfry", "url": "https://www.pepperfry.com", "api": None},
+            {"name": "Urban Ladder", "url": "https://www.urbanladder.com", "layout": "urbanladder", "api": None},
+            {"name": "Pepperfry", "url": "https://www.pepperfry.com", "layout": "pepperfry", "api": None},
             {"name": "Nilkamal", "url": "https://www.nilkamal.com", "api": None},
             {"name": "Godrej Interio", "url": "https://www.godrejinterio.com", "api": None},
             {"name": "Wood Street", "url": "https://www.woodstreet.co.in", "api": None},
@@ -30,25 +33,27 @@ class IndianEcommerceService:
         ]
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Requests go through the shared clients, so there is nothing to open or close
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        pass
     
     async def search_products(self, query: str, category: str = None, price_min: int = None, price_max: int = None, room_type: str = None, style: str = None, budget_range: str = None) -> List[Dict[str, Any]]:
         """Search products across all Indian retailers"""
-        tasks = []
-        for retailer in self.retailers:
-            tasks.append(self._search_retailer(retailer, query, category, price_min, price_max, room_type, style, budget_range))
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        outcome = await fan_out(
+            [
+                (retailer["name"], lambda retailer=retailer: self._search_retailer(retailer, query, category, price_min, price_max, room_type, style, budget_range))
+                for retailer in self.retailers
+            ],
+            deadline=self.search_deadline,
+            label="indian_ecommerce",
+        )
         
         # Flatten and filter results
         all_products = []
-        for result in results:
-            if not isinstance(result, Exception) and result:
+        for result in outcome.values():
+            if result:
                 all_products.extend(result)
         
         # Sort by relevance (for now, just randomize to simulate)
@@ -73,9 +78,6 @@ class IndianEcommerceService:
     
     async def _fetch_real_retailer_products(self, retailer: Dict, query: str, category: str, price_min: int, price_max: int, room_type: str = None, style: str = None, budget_range: str = None) -> List[Dict[str, Any]]:
         """Fetch real products from retailer using web scraping or API"""
-        if not self.session:
-            return []
-        
         # Construct search URL based on retailer
         search_url = await self._construct_search_url(retailer, query)
         
@@ -97,53 +99,51 @@ class IndianEcommerceService:
                 'Cache-Control': 'max-age=0',
             }
             
-            # Add timeout and handle connection issues
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with self.session.get(search_url, headers=headers, timeout=timeout) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    products = await self._parse_retailer_html(retailer, html, query)
-                    
-                    # Filter by price range if specified
-                    if price_min is not None:
-                        products = [p for p in products if p["price"] >= price_min]
-                    if price_max is not None:
-                        products = [p for p in products if p["price"] <= price_max]
-                    
-                    # Add retailer-specific information
-                    for product in products:
-                        product["retailer"] = retailer["name"]
-                        product["currency"] = "INR"
-                        product["deliveryTime"] = f"{random.randint(3, 15)} days"
-                        product["warranty"] = f"{random.randint(1, 5)} year warranty"
-                        product["returnPolicy"] = f"{random.randint(7, 30)} days return"
-                    
-                    return products
-                elif response.status == 403:
-                    key = f"403::{retailer['name']}"
-                    if key not in self._warned:
-                        self._logger.warning("Access forbidden for %s: HTTP %s", retailer['name'], response.status)
-                        self._warned.add(key)
-                    return []
-                elif response.status == 404:
-                    key = f"404::{retailer['name']}"
-                    if key not in self._warned:
-                        self._logger.info("Page not found for %s: HTTP %s", retailer['name'], response.status)
-                        self._warned.add(key)
-                    return []
-                else:
-                    key = f"http::{response.status}::{retailer['name']}"
-                    if key not in self._warned:
-                        self._logger.warning("Failed to fetch data from %s: HTTP %s", retailer['name'], response.status)
-                        self._warned.add(key)
-                    return []
-        except asyncio.TimeoutError:
+            response = await http_response_cache.get(http_clients.client("scraper"), search_url, headers=headers, timeout=10)
+            if response.status_code == 200:
+                html = response.content
+                products = await self._parse_retailer_html(retailer, html, query)
+                
+                # Filter by price range if specified
+                if price_min is not None:
+                    products = [p for p in products if p["price"] >= price_min]
+                if price_max is not None:
+                    products = [p for p in products if p["price"] <= price_max]
+                
+                # Add retailer-specific information
+                for product in products:
+                    product["retailer"] = retailer["name"]
+                    product["currency"] = "INR"
+                    product["deliveryTime"] = f"{random.randint(3, 15)} days"
+                    product["warranty"] = f"{random.randint(1, 5)} year warranty"
+                    product["returnPolicy"] = f"{random.randint(7, 30)} days return"
+                
+                return products
+            elif response.status_code == 403:
+                key = f"403::{retailer['name']}"
+                if key not in self._warned:
+                    self._logger.warning("Access forbidden for %s: HTTP %s", retailer['name'], response.status_code)
+                    self._warned.add(key)
+                return []
+            elif response.status_code == 404:
+                key = f"404::{retailer['name']}"
+                if key not in self._warned:
+                    self._logger.info("Page not found for %s: HTTP %s", retailer['name'], response.status_code)
+                    self._warned.add(key)
+                return []
+            else:
+                key = f"http::{response.status_code}::{retailer['name']}"
+                if key not in self._warned:
+                    self._logger.warning("Failed to fetch data from %s: HTTP %s", retailer['name'], response.status_code)
+                    self._warned.add(key)
+                return []
+        except httpx.TimeoutException:
             key = f"timeout::{retailer['name']}"
             if key not in self._warned:
                 self._logger.warning("Timeout fetching products from %s", retailer['name'])
                 self._warned.add(key)
             return []
-        except aiohttp.ClientConnectorError as e:
+        except httpx.ConnectError as e:
             key = f"conn::{retailer['name']}"
             if key not in self._warned:
                 self._logger.warning("Connection error fetching products from %s: %s", retailer['name'], e)
@@ -178,160 +178,51 @@ class IndianEcommerceService:
             # Default search pattern
             return f"{base_url}/search?q={query_encoded}"
     
-    async def _parse_retailer_html(self, retailer: Dict, html: str, query: str) -> List[Dict[str, Any]]:
-        """Parse HTML to extract product information using BeautifulSoup"""
+    async def _parse_retailer_html(self, retailer: Dict, html: bytes, query: str) -> List[Dict[str, Any]]:
+        """Parse HTML to extract product information; the parsing itself runs in a worker process"""
         products = []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            # Urban Ladder and Pepperfry have specific selectors, other retailers use generic ones
+            layout = retailer.get("layout", "generic")
+            items = await html_parse_executor.run(parse_retailer_products, html, RETAILER_SELECTORS[layout])
             
-            # Different selectors for different retailers
-            if "urbanladder.com" in retailer["url"]:
-                # Urban Ladder specific selectors
-                product_elements = soup.find_all('div', class_='product')
-                
-                for elem in product_elements:
-                    name_elem = elem.find('div', class_='product-title')
-                    price_elem = elem.find('span', class_='price')
-                    image_elem = elem.find('img')
-                    
-                    if name_elem and price_elem:
-                        # Extract price (remove currency symbols and commas)
-                        price_str = re.sub(r'[^\d,]', '', price_elem.get_text())
-                        price = int(price_str.replace(',', '')) if price_str else 0
-                        
-                        product = {
-                            "id": f"{retailer['name'].replace(' ', '_')}_{len(products)+1}",
-                            "name": name_elem.get_text(strip=True),
-                            "brand": retailer["name"],
-                            "price": price,
-                            "originalPrice": price * 1.2 if price > 0 else 0,  # Assume 20% higher original price
-                            "rating": round(random.uniform(3.5, 5.0), 1),
-                            "reviews": random.randint(10, 500),
-                            "image": image_elem['data-src'] if image_elem and image_elem.get('data-src') else 
-                                   image_elem.get('src', '') if image_elem else '',
-                            "category": self._get_category_from_query(query),
-                            "style": random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
-                            "colors": ["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#00000"],
-                            "dimensions": {
-                                "width": random.randint(50, 200),
-                                "height": random.randint(50, 200),
-                                "depth": random.randint(30, 100)
-                            },
-                            "inStock": random.choice([True, False]),
-                            "discount": random.randint(5, 30),
-                            "isWishlisted": False,
-                            "tags": ["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"]
-                        }
-                        
-                        products.append(product)
-                        
-            elif "pepperfry.com" in retailer["url"]:
-                # Pepperfry specific selectors
-                product_elements = soup.find_all('div', class_='productContainer')
+            for item in items:
+                # Extract price (remove currency symbols and commas)
+                price_str = re.sub(r'[^\d,]', '', item["price_text"])
+                price = int(price_str.replace(',', '')) if price_str else 0
                 
-                for elem in product_elements:
-                    name_elem = elem.find('div', class_='productTitle')
-                    price_elem = elem.find('span', class_='finalPrice')
-                    image_elem = elem.find('img')
-                    
-                    if name_elem and price_elem:
-                        # Extract price (remove currency symbols and commas)
-                        price_str = re.sub(r'[^\d,]', '', price_elem.get_text())
-                        price = int(price_str.replace(',', '')) if price_str else 0
-                        
-                        product = {
-                            "id": f"{retailer['name'].replace(' ', '_')}_{len(products)+1}",
-                            "name": name_elem.get_text(strip=True),
-                            "brand": retailer["name"],
-                            "price": price,
-                            "originalPrice": price * 1.2 if price > 0 else 0,
-                            "rating": round(random.uniform(3.5, 5.0), 1),
-                            "reviews": random.randint(10, 500),
-                            "image": image_elem['data-src'] if image_elem and image_elem.get('data-src') else 
-                                   image_elem.get('src', '') if image_elem else '',
-                            "category": self._get_category_from_query(query),
-                            "style": random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
-                            "colors": ["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#000000"],
-                            "dimensions": {
-                                "width": random.randint(50, 200),
-                                "height": random.randint(50, 200),
-                                "depth": random.randint(30, 100)
-                            },
-                            "inStock": random.choice([True, False]),
-                            "discount": random.randint(5, 30),
-                            "isWishlisted": False,
-                            "tags": ["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"]
-                        }
-                        
-                        products.append(product)
-            
-            else:
-                # Generic parsing for other retailers
-                # Look for product containers with common class names
-                product_selectors = [
-                    'div.product', 'div.product-item', 'div.product-card', 
-                    'div.item', 'div.card', 'div.list-item'
-                ]
+                if layout == "generic":
+                    # Fallback to random price when the page has none
+                    original_price = price * 1.2 if price > 0 else random.randint(6000, 60000)
+                    price = price if price > 0 else random.randint(5000, 50000)
+                else:
+                    original_price = price * 1.2 if price > 0 else 0  # Assume 20% higher original price
                 
-                product_elements = []
-                for selector in product_selectors:
-                    elements = soup.select(selector)
-                    if elements:
-                        product_elements = elements
-                        break
+                product = {
+                    "id": f"{retailer['name'].replace(' ', '_')}_{len(products)+1}",
+                    "name": item["name"],
+                    "brand": retailer["name"],
+                    "price": price,
+                    "originalPrice": original_price,
+                    "rating": round(random.uniform(3.5, 5.0), 1),
+                    "reviews": random.randint(10, 500),
+                    "image": item["image"],
+                    "category": self._get_category_from_query(query),
+                    "style": random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
+                    "colors": ["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#000000"],
+                    "dimensions": {
+                        "width": random.randint(50, 200),
+                        "height": random.randint(50, 200),
+                        "depth": random.randint(30, 100)
+                    },
+                    "inStock": random.choice([True, False]),
+                    "discount": random.randint(5, 30),
+                    "isWishlisted": False,
+                    "tags": ["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"]
+                }
                 
-                for elem in product_elements[:10]:  # Limit to first 10 products
-                    # Try to find product name
-                    name_selectors = ['h3', 'h4', 'h5', '.title', '.name', '.product-title', '.product-name']
-                    name_elem = None
-                    for selector in name_selectors:
-                        name_elem = elem.select_one(selector)
-                        if name_elem:
-                            break
-                    
-                    # Try to find product price
-                    price_selectors = ['.price', '.cost', '.amount', '.value']
-                    price_elem = None
-                    for selector in price_selectors:
-                        price_elem = elem.select_one(selector)
-                        if price_elem:
-                            break
-                    
-                    # Try to find product image
-                    image_elem = elem.select_one('img')
-                    
-                    if name_elem and price_elem:
-                        # Extract price (remove currency symbols and commas)
-                        price_text = price_elem.get_text()
-                        price_str = re.sub(r'[^\d,]', '', price_text)
-                        price = int(price_str.replace(',', '')) if price_str else 0
-                        
-                        product = {
-                            "id": f"{retailer['name'].replace(' ', '_')}_{len(products)+1}",
-                            "name": name_elem.get_text(strip=True)[:100],  # Limit name length
-                            "brand": retailer["name"],
-                            "price": price if price > 0 else random.randint(5000, 50000),  # Fallback to random price
-                            "originalPrice": price * 1.2 if price > 0 else random.randint(6000, 60000),
-                            "rating": round(random.uniform(3.5, 5.0), 1),
-                            "reviews": random.randint(10, 500),
-                            "image": image_elem['data-src'] if image_elem and image_elem.get('data-src') else 
-                                   image_elem.get('src', '') if image_elem else '',
-                            "category": self._get_category_from_query(query),
-                            "style": random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
-                            "colors": ["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#00000"],
-                            "dimensions": {
-                                "width": random.randint(50, 200),
-                                "height": random.randint(50, 200),
-                                "depth": random.randint(30, 100)
-                            },
-                            "inStock": random.choice([True, False]),
-                            "discount": random.randint(5, 30),
-                            "isWishlisted": False,
-                            "tags": ["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"]
-                        }
-                        
-                        products.append(product)
+                products.append(product)
             
             # Return empty list if no products found
             # No mock data generation
@@ -1,13 +1,15 @@
-import requests
+import asyncio
+import httpx
 import os
 import logging
-import time
 import re
 from typing import Optional, Dict, Any
 import base64
 import io
 from PIL import Image
 
+from http_clients import http_clients
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -299,7 +301,7 @@ class InteriorAIService:
         else:
             return "bedroom, kitchen, bathroom"
     
-    def _make_request(self, model: str, prompt: str, **kwargs) -> Optional[bytes]:
+    async def _make_request(self, model: str, prompt: str, **kwargs) -> Optional[bytes]:
         """
         Make API request to Hugging Face model with better error handling
         """
@@ -334,7 +336,7 @@ class InteriorAIService:
             logger.info(f"Making request to model: {model}")
             logger.info(f"Prompt: {prompt[:100]}...")
             
-            response = requests.post(
+            response = await http_clients.client().post(
                 url, 
                 headers=self._get_headers(), 
                 json=payload, 
@@ -366,14 +368,14 @@ class InteriorAIService:
                 logger.error(f"API error {response.status_code}: {response.text[:200]}")
                 return None
                 
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             logger.warning(f"Request to {model} timed out")
             return None
         except Exception as e:
             logger.error(f"Error with model {model}: {str(e)}")
             return None
     
-    def generate_interior_design(
+    async def generate_interior_design(
         self,
         prompt: str,
         style: str = "auto",
@@ -407,22 +409,24 @@ class InteriorAIService:
         
         for i, model in enumerate(models_to_try):
             logger.info(f"Trying model {i+1}/{len(models_to_try)}: {model}")
-            result = self._make_request(model, enhanced_prompt, **kwargs)
+            result = await self._make_request(model, enhanced_prompt, **kwargs)
             if result:
                 logger.info(f"✅ Successfully generated image with model: {model}")
                 logger.info(f"Final prompt used: {enhanced_prompt}")
                 return result
             
+            if i == len(models_to_try) - 1:
+                break
             # Wait a bit before trying next model (longer wait for rate limits)
             wait_time = 3 if i == 0 else 5  # Wait longer for subsequent models
             logger.info(f"Waiting {wait_time} seconds before trying next model...")
-            time.sleep(wait_time)
+            await asyncio.sleep(wait_time)
         
         logger.error("❌ All models failed to generate image")
         logger.error(f"Attempted prompt: {enhanced_prompt}")
         return None
     
-    def generate_architecture_design(
+    async def generate_architecture_design(
         self, 
         prompt: str, 
         building_type: str = "residential",
@@ -458,12 +462,12 @@ class InteriorAIService:
         models_to_try = self.primary_models + [self.secondary_model] + self.fallback_models
         
         for model in models_to_try:
-            result = self._make_request(model, enhanced_prompt, **kwargs)
+            result = await self._make_request(model, enhanced_prompt, **kwargs)
             if result:
                 logger.info(f"✅ Successfully generated architecture with model: {model}")
                 return result
             
-            time.sleep(2)
+            await asyncio.sleep(2)
         
         logger.error("All models failed to generate architecture image")
         return None
@@ -476,7 +480,7 @@ class InteriorAIService:
         """Get list of available room types"""
         return list(self.room_contexts.keys())
 
-    def generate_texture(self, prompt: str, **kwargs) -> Optional[bytes]:
+    async def generate_texture(self, prompt: str, **kwargs) -> Optional[bytes]:
         """
         Generate a texture image from a text description.
         """
@@ -489,7 +493,7 @@ class InteriorAIService:
         # Use a model good for textures
         model = "stabilityai/stable-diffusion-xl-base-1.0"
 
-        result = self._make_request(model, enhanced_prompt, **kwargs)
+        result = await self._make_request(model, enhanced_prompt, **kwargs)
 
         if result:
             logger.info(f"✅ Successfully generated texture with model: {model}")
@@ -1,6 +1,4 @@
 
-import asyncio
-import aiohttp
 from typing import List, Dict, Any, Optional
 from fastapi import HTTPException
 import random
@@ -8,15 +6,22 @@ from datetime import datetime, timedelta
 import json
 import re
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
 import logging
 from dataclasses import dataclass
 from enum import Enum
+from fan_out import fan_out
+from http_cache import http_response_cache
+from http_clients import http_clients
+from memory_cache import BoundedCache
+from html_parsing import RETAILER_SELECTORS, html_parse_executor, parse_retailer_products
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Recent actions (and viewed prices) kept per tracked user profile
+MAX_TRACKED_ACTIONS = 200
+
 class ProductCategory(Enum):
     FURNITURE = "furniture"
     LIGHTING = "lighting"
@@ -72,10 +77,9 @@ class Product:
 
 class InteriorDesignEcommerceService:
     def __init__(self):
-        self.session = None
         self.retailers = [
-            {"name": "Urban Ladder", "url": "https://www.urbanladder.com", "api": None, "categories": ["furniture", "lighting", "home-decor"]},
-            {"name": "Pepperfry", "url": "https://www.pepperfry.com", "api": None, "categories": ["furniture", "lighting", "home-decor", "kitchen", "bathroom"]},
+            {"name": "Urban Ladder", "url": "https://www.urbanladder.com", "layout": "urbanladder", "api": None, "categories": ["furniture", "lighting", "home-decor"]},
+            {"name": "Pepperfry", "url": "https://www.pepperfry.com", "layout": "pepperfry", "api": None, "categories": ["furniture", "lighting", "home-decor", "kitchen", "bathroom"]},
             {"name": "Nilkamal", "url": "https://www.nilkamal.com", "api": None, "categories": ["furniture", "materials"]},
             {"name": "Godrej Interio", "url": "https://www.godrejinterio.com", "api": None, "categories": ["furniture", "materials", "home-decor"]},
             {"name": "Wood Street", "url": "https://www.woodstreet.co.in", "api": None, "categories": ["furniture", "home-decor"]},
@@ -86,8 +90,8 @@ class InteriorDesignEcommerceService:
             {"name": "Ambient CG", "url": "https://ambientcg.com", "api": None, "categories": ["architectural", "materials"]},
             {"name": "Architectural Digest Store", "url": "https://www.architecturaldigeststore.com", "api": None, "categories": ["home-decor", "lighting", "furniture"]},
             {"name": "Design Within Reach", "url": "https://www.dwr.com", "api": None, "categories": ["furniture", "lighting", "home-decor"]},
-            {"name": "Amazon India", "url": "https://www.amazon.in", "api": None, "categories": ["furniture", "lighting", "materials", "home-decor", "tools"]},
-            {"name": "Flipkart", "url": "https://www.flipkart.com", "api": None, "categories": ["furniture", "lighting", "home-decor", "tools"]},
+            {"name": "Amazon India", "url": "https://www.amazon.in", "layout": "amazon", "api": None, "categories": ["furniture", "lighting", "materials", "home-decor", "tools"]},
+            {"name": "Flipkart", "url": "https://www.flipkart.com", "layout": "flipkart", "api": None, "categories": ["furniture", "lighting", "home-decor", "tools"]},
             {"name": "Tata CLiQ", "url": "https://www.tatacliq.com", "api": None, "categories": ["furniture", "home-decor", "lighting"]},
             {"name": "Myntra", "url": "https://www.myntra.com", "api": None, "categories": ["home-decor", "lighting", "furniture"]},
             {"name": "Ajio", "url": "https://www.ajio.com", "api": None, "categories": ["home-decor", "lighting"]},
@@ -97,49 +101,45 @@ class InteriorDesignEcommerceService:
         
         # Mock trending products
         self.trending_products = []
-        # Mock user behavior data for personalization
-        self.user_behavior_data = {}
+        # Mock user behavior data for personalization; profiles idle for a week are dropped
+        self.user_behavior_data = BoundedCache("user_behavior", max_entries=10000, ttl=7 * 24 * 3600)
         # Mock price history data
-        self.price_history = {}
+        self.price_history = BoundedCache("price_history", max_entries=5000, ttl=24 * 3600)
         # Real-time update tracking
         self.last_updated = datetime.now()
         # Cache for performance
-        self.cache = {}
         self.cache_timeout = 300  # 5 minutes cache
+        self.cache = BoundedCache("interior_ecommerce", max_entries=200, ttl=self.cache_timeout)
+        # Upper bound for one search across retailers; stragglers are cancelled
+        self.search_deadline = 12.0
         
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        # Requests go through the shared clients, so there is nothing to open or close
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
+        pass
     
     def _get_cache_key(self, query: str, category: str = None, price_min: int = None, 
                       price_max: int = None, style: str = None, retailer: str = None) -> str:
         """Generate a cache key for the given parameters"""
         return f"{query}_{category}_{price_min}_{price_max}_{style}_{retailer}"
     
-    def _is_cache_valid(self, timestamp: datetime) -> bool:
-        """Check if cache is still valid"""
-        return (datetime.now() - timestamp).seconds < self.cache_timeout
-    
     async def search_products(self, query: str, category: str = None, price_min: int = None, 
                               price_max: int = None, style: str = None, retailer: str = None, 
                               page: int = 1, per_page: int = 30) -> List[Product]:
         """Search products across all Indian retailers with real-time data"""
         cache_key = self._get_cache_key(query, category, price_min, price_max, style, retailer)
         
-        if cache_key in self.cache:
-            cached_data, timestamp = self.cache[cache_key]
-            if self._is_cache_valid(timestamp):
-                logger.info(f"Cache hit for key: {cache_key}")
-                start_idx = (page - 1) * per_page
-                end_idx = start_idx + per_page
-                paginated_products = cached_data[start_idx:end_idx]
-                return paginated_products
+        cached_data = self.cache.get(cache_key)
+        if cached_data is not None:
+            logger.info(f"Cache hit for key: {cache_key}")
+            start_idx = (page - 1) * per_page
+            end_idx = start_idx + per_page
+            paginated_products = cached_data[start_idx:end_idx]
+            return paginated_products
         
-        tasks = []
+        calls = []
         
         filtered_retailers = self.retailers
         if category:
@@ -148,13 +148,13 @@ class InteriorDesignEcommerceService:
         for retailer_info in filtered_retailers:
             if retailer and retailer_info["name"].lower() != retailer.lower():
                 continue
-            tasks.append(self._search_retailer(retailer_info, query, category, price_min, price_max, style))
+            calls.append((retailer_info["name"], lambda retailer_info=retailer_info: self._search_retailer(retailer_info, query, category, price_min, price_max, style)))
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        outcome = await fan_out(calls, deadline=self.search_deadline, label="interior_ecommerce")
         
         all_products = []
-        for result in results:
-            if not isinstance(result, Exception) and result:
+        for result in outcome.values():
+            if result:
                 all_products.extend(result)
         
         filtered_products = self._filter_products(all_products, price_min, price_max, style)
@@ -167,7 +167,7 @@ class InteriorDesignEcommerceService:
         
         await self._update_trending_products(paginated_products)
         
-        self.cache[cache_key] = (filtered_products, datetime.now())
+        self.cache.set(cache_key, filtered_products)
         
         return paginated_products
     
@@ -183,9 +183,6 @@ class InteriorDesignEcommerceService:
     async def _fetch_real_retailer_products(self, retailer: Dict, query: str, category: str, 
                                            price_min: int, price_max: int, style: str) -> List[Product]:
         """Fetch real products from retailer using web scraping or API"""
-        if not self.session:
-            return []
-        
         search_url = await self._construct_search_url(retailer, query, category)
         
         if not search_url:
@@ -201,45 +198,45 @@ class InteriorDesignEcommerceService:
                 'Referer': retailer["url"]
             }
             
-            async with self.session.get(search_url, headers=headers) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    products = await self._parse_retailer_html(retailer, html, query, category)
-                    
-                    if price_min is not None:
-                        products = [p for p in products if p.price >= price_min]
-                    if price_max is not None:
-                        products = [p for p in products if p.price <= price_max]
-                    
-                    if style:
-                        products = [p for p in products if style.lower() in p.style.lower()]
-                    
-                    for product in products:
-                        product.retailer = retailer["name"]
-                        product.currency = "INR"
-                        product.delivery_time = f"{random.randint(3, 15)} days"
-                        product.warranty = f"{random.randint(1, 5)} year warranty"
-                        product.return_policy = f"{random.randint(7, 30)} days return"
-                        product.last_updated = datetime.now()
-                        product.shipping_cost = random.uniform(0, 2000) if random.random() > 0.3 else 0
-                        product.estimated_delivery = f"{random.randint(3, 10)} business days"
-                        product.customer_rating_breakdown = {
-                            "5_star": random.randint(40, 80),
-                            "4_star": random.randint(10, 30),
-                            "3_star": random.randint(5, 15),
-                            "2_star": random.randint(1, 8),
-                            "1_star": random.randint(0, 5)
-                        }
-                        product.verified_reviews = self._generate_mock_verified_reviews()
-                        product.price_history = self._generate_mock_price_history(product.price)
-                        product.related_products = [f"related_{i}" for i in range(3)]
-                        product.trending_score = random.uniform(0, 10)
-                        product.personalization_score = random.uniform(0, 10)
-                    
-                    return products
-                else:
-                    logger.error(f"Failed to fetch data from {retailer['name']}: HTTP {response.status}")
-                    return []
+            response = await http_response_cache.get(http_clients.client("scraper"), search_url, headers=headers)
+            if response.status_code == 200:
+                html = response.content
+                products = await self._parse_retailer_html(retailer, html, query, category)
+                
+                if price_min is not None:
+                    products = [p for p in products if p.price >= price_min]
+                if price_max is not None:
+                    products = [p for p in products if p.price <= price_max]
+                
+                if style:
+                    products = [p for p in products if style.lower() in p.style.lower()]
+                
+                for product in products:
+                    product.retailer = retailer["name"]
+                    product.currency = "INR"
+                    product.delivery_time = f"{random.randint(3, 15)} days"
+                    product.warranty = f"{random.randint(1, 5)} year warranty"
+                    product.return_policy = f"{random.randint(7, 30)} days return"
+                    product.last_updated = datetime.now()
+                    product.shipping_cost = random.uniform(0, 2000) if random.random() > 0.3 else 0
+                    product.estimated_delivery = f"{random.randint(3, 10)} business days"
+                    product.customer_rating_breakdown = {
+                        "5_star": random.randint(40, 80),
+                        "4_star": random.randint(10, 30),
+                        "3_star": random.randint(5, 15),
+                        "2_star": random.randint(1, 8),
+                        "1_star": random.randint(0, 5)
+                    }
+                    product.verified_reviews = self._generate_mock_verified_reviews()
+                    product.price_history = self._generate_mock_price_history(product.price)
+                    product.related_products = [f"related_{i}" for i in range(3)]
+                    product.trending_score = random.uniform(0, 10)
+                    product.personalization_score = random.uniform(0, 10)
+                
+                return products
+            else:
+                logger.error(f"Failed to fetch data from {retailer['name']}: HTTP {response.status_code}")
+                return []
         except Exception as e:
             logger.error(f"Error fetching products from {retailer['name']}: {e}")
             return []
@@ -320,269 +317,69 @@ class InteriorDesignEcommerceService:
                 url += f"&category={category}"
             return url
     
-    async def _parse_retailer_html(self, retailer: Dict, html: str, query: str, category: str) -> List[Product]:
-        """Parse HTML to extract product information using BeautifulSoup"""
+    def _build_product(self, retailer: Dict, index: int, name: str, price: float, original_price: float,
+                       image: str, query: str, category: str) -> Product:
+        """Product from scraped name/price/image, with the remaining fields mocked"""
+        return Product(
+            id=f"{retailer['name'].replace(' ', '_')}_{index}",
+            name=name,
+            brand=retailer["name"],
+            price=price,
+            original_price=original_price,
+            rating=round(random.uniform(3.5, 5.0), 1),
+            reviews=random.randint(10, 500),
+            image=image,
+            category=category or self._get_category_from_query(query),
+            style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial", "Scandinavian", "Minimalist"]),
+            colors=["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#000000"],
+            dimensions={
+                "width": random.randint(50, 200),
+                "height": random.randint(50, 200),
+                "depth": random.randint(30, 100)
+            },
+            in_stock=random.choice([True, False]),
+            discount=random.randint(5, 30),
+            is_wishlisted=False,
+            tags=["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"],
+            material=random.choice(["Wood", "Metal", "Glass", "Fabric", "Plastic"]),
+            designer=random.choice(["Local Artisan", "International Designer", "In-house", "Unknown"]),
+            design_style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
+            sustainability_rating=round(random.uniform(3.0, 5.0), 1),
+            certified_eco_friendly=random.choice([True, False]),
+            stock_quantity=random.randint(0, 50),
+            availability_status="in_stock" if random.choice([True, False]) else "out_of_stock"
+        )
+    
+    async def _parse_retailer_html(self, retailer: Dict, html: bytes, query: str, category: str) -> List[Product]:
+        """Parse HTML to extract product information; the parsing itself runs in a worker process"""
         products = []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            if "urbanladder.com" in retailer["url"]:
-                product_elements = soup.find_all('div', class_='product')
-                
-                for elem in product_elements:
-                    name_elem = elem.find('div', class_='product-title')
-                    price_elem = elem.find('span', class_='price')
-                    image_elem = elem.find('img')
-                    
-                    if name_elem and price_elem:
-                        price_str = re.sub(r'[^\d,]', '', price_elem.get_text())
-                        price = float(price_str.replace(',', '')) if price_str else 0
-                        
-                        product = Product(
-                            id=f"{retailer['name'].replace(' ', '_')}_{len(products)+1}",
-                            name=name_elem.get_text(strip=True),
-                            brand=retailer["name"],
-                            price=price,
-                            original_price=price * 1.2 if price > 0 else 0,
-                            rating=round(random.uniform(3.5, 5.0), 1),
-                            reviews=random.randint(10, 500),
-                            image=image_elem['data-src'] if image_elem and image_elem.get('data-src') else 
-                                  image_elem.get('src', '') if image_elem else '',
-                            category=category or self._get_category_from_query(query),
-                            style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial", "Scandinavian", "Minimalist"]),
-                            colors=["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#00000"],
-                            dimensions={
-                                "width": random.randint(50, 200),
-                                "height": random.randint(50, 200),
-                                "depth": random.randint(30, 100)
-                            },
-                            in_stock=random.choice([True, False]),
-                            discount=random.randint(5, 30),
-                            is_wishlisted=False,
-                            tags=["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"],
-                            material=random.choice(["Wood", "Metal", "Glass", "Fabric", "Plastic"]),
-                            designer=random.choice(["Local Artisan", "International Designer", "In-house", "Unknown"]),
-                            design_style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
-                            sustainability_rating=round(random.uniform(3.0, 5.0), 1),
-                            certified_eco_friendly=random.choice([True, False]),
-                            stock_quantity=random.randint(0, 50),
-                            availability_status="in_stock" if random.choice([True, False]) else "out_of_stock"
-                        )
-                        
-                        products.append(product)
-                        
-            elif "pepperfry.com" in retailer["url"]:
-                product_elements = soup.find_all('div', class_='productContainer')
-                
-                for elem in product_elements:
-                    name_elem = elem.find('div', class_='productTitle')
-                    price_elem = elem.find('span', class_='finalPrice')
-                    image_elem = elem.find('img')
-                    
-                    if name_elem and price_elem:
-                        price_str = re.sub(r'[^\d,]', '', price_elem.get_text())
-                        price = float(price_str.replace(',', '')) if price_str else 0
-                        
-                        product = Product(
-                            id=f"{retailer['name'].replace(' ', '_')}_{len(products)+1}",
-                            name=name_elem.get_text(strip=True),
-                            brand=retailer["name"],
-                            price=price,
-                            original_price=price * 1.2 if price > 0 else 0,
-                            rating=round(random.uniform(3.5, 5.0), 1),
-                            reviews=random.randint(10, 500),
-                            image=image_elem['data-src'] if image_elem and image_elem.get('data-src') else 
-                                  image_elem.get('src', '') if image_elem else '',
-                            category=category or self._get_category_from_query(query),
-                            style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial", "Scandinavian", "Minimalist"]),
-                            colors=["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#000"],
-                            dimensions={
-                                "width": random.randint(50, 200),
-                                "height": random.randint(50, 200),
-                                "depth": random.randint(30, 100)
-                            },
-                            in_stock=random.choice([True, False]),
-                            discount=random.randint(5, 30),
-                            is_wishlisted=False,
-                            tags=["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"],
-                            material=random.choice(["Wood", "Metal", "Glass", "Fabric", "Plastic"]),
-                            designer=random.choice(["Local Artisan", "International Designer", "In-house", "Unknown"]),
-                            design_style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
-                            sustainability_rating=round(random.uniform(3.0, 5.0), 1),
-                            certified_eco_friendly=random.choice([True, False]),
-                            stock_quantity=random.randint(0, 50),
-                            availability_status="in_stock" if random.choice([True, False]) else "out_of_stock"
-                        )
-                        
-                        products.append(product)
+            # Retailers without a specific layout use the generic product selectors
+            layout = retailer.get("layout", "generic")
+            items = await html_parse_executor.run(parse_retailer_products, html, RETAILER_SELECTORS[layout])
             
-            elif "amazon.in" in retailer["url"]:
-                product_elements = soup.find_all('div', {'data-component-type': 's-search-result'})
+            for item in items:
+                price_str = re.sub(r'[^\d,]', '', item["price_text"])
+                price = float(price_str.replace(',', '')) if price_str else 0
                 
-                for elem in product_elements[:10]:
-                    name_elem = elem.find('span', class_='a-text-normal') or elem.find('h2', class_='a-size-mini')
-                    price_elem = elem.find('span', class_='a-price-whole') or elem.find('span', class_='a-offscreen')
-                    image_elem = elem.find('img', class_='s-image')
-                    
-                    if name_elem and price_elem:
-                        price_text = price_elem.get_text()
-                        price_str = re.sub(r'[^\d,]', '', price_text)
-                        price = float(price_str.replace(',', '')) if price_str else 0
-                        
-                        product = Product(
-                            id=f"{retailer['name'].replace(' ', '_')}_{len(products)+1}",
-                            name=name_elem.get_text(strip=True)[:100],
-                            brand=retailer["name"],
-                            price=price if price > 0 else random.randint(5000, 50000),
-                            original_price=price * 1.2 if price > 0 else random.randint(6000, 60000),
-                            rating=round(random.uniform(3.5, 5.0), 1),
-                            reviews=random.randint(10, 500),
-                            image=image_elem['src'] if image_elem else '',
-                            category=category or self._get_category_from_query(query),
-                            style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial", "Scandinavian", "Minimalist"]),
-                            colors=["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#00000"],
-                            dimensions={
-                                "width": random.randint(50, 200),
-                                "height": random.randint(50, 200),
-                                "depth": random.randint(30, 100)
-                            },
-                            in_stock=random.choice([True, False]),
-                            discount=random.randint(5, 30),
-                            is_wishlisted=False,
-                            tags=["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"],
-                            material=random.choice(["Wood", "Metal", "Glass", "Fabric", "Plastic"]),
-                            designer=random.choice(["Local Artisan", "International Designer", "In-house", "Unknown"]),
-                            design_style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
-                            sustainability_rating=round(random.uniform(3.0, 5.0), 1),
-                            certified_eco_friendly=random.choice([True, False]),
-                            stock_quantity=random.randint(0, 50),
-                            availability_status="in_stock" if random.choice([True, False]) else "out_of_stock"
-                        )
-                        
-                        if product.original_price > product.price:
-                            product.discount = int(((product.original_price - product.price) / product.original_price) * 100)
-                        
-                        products.append(product)
-            
-            elif "flipkart.com" in retailer["url"]:
-                product_elements = soup.find_all('div', class_='_1AtVbE')
-                
-                for elem in product_elements[:10]:
-                    name_elem = elem.find('div', class_='_4rR01T') or elem.find('a', class_='IRpwTa')
-                    price_elem = elem.find('div', class_='_30jeq3')
-                    image_elem = elem.find('img', class_='_396cs4')
-                    
-                    if name_elem and price_elem:
-                        price_text = price_elem.get_text()
-                        price_str = re.sub(r'[^\d,]', '', price_text)
-                        price = float(price_str.replace(',', '')) if price_str else 0
-                        
-                        product = Product(
-                            id=f"{retailer['name'].replace(' ', '_')}_{len(products)+1}",
-                            name=name_elem.get_text(strip=True)[:100],
-                            brand=retailer["name"],
-                            price=price if price > 0 else random.randint(5000, 50000),
-                            original_price=price * 1.2 if price > 0 else random.randint(6000, 60000),
-                            rating=round(random.uniform(3.5, 5.0), 1),
-                            reviews=random.randint(10, 500),
-                            image=image_elem['src'] if image_elem else '',
-                            category=category or self._get_category_from_query(query),
-                            style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial", "Scandinavian", "Minimalist"]),
-                            colors=["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#00000"],
-                            dimensions={
-                                "width": random.randint(50, 200),
-                                "height": random.randint(50, 200),
-                                "depth": random.randint(30, 100)
-                            },
-                            in_stock=random.choice([True, False]),
-                            discount=random.randint(5, 30),
-                            is_wishlisted=False,
-                            tags=["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"],
-                            material=random.choice(["Wood", "Metal", "Glass", "Fabric", "Plastic"]),
-                            designer=random.choice(["Local Artisan", "International Designer", "In-house", "Unknown"]),
-                            design_style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
-                            sustainability_rating=round(random.uniform(3.0, 5.0), 1),
-                            certified_eco_friendly=random.choice([True, False]),
-                            stock_quantity=random.randint(0, 50),
-                            availability_status="in_stock" if random.choice([True, False]) else "out_of_stock"
-                        )
-                        
-                        if product.original_price > product.price:
-                            product.discount = int(((product.original_price - product.price) / product.original_price) * 10)
-                        
-                        products.append(product)
-            
-            else:
-                product_selectors = [
-                    'div.product', 'div.product-item', 'div.product-card', 
-                    'div.item', 'div.card', 'div.list-item'
-                ]
-                
-                product_elements = []
-                for selector in product_selectors:
-                    elements = soup.select(selector)
-                    if elements:
-                        product_elements = elements
-                        break
+                if layout in ("urbanladder", "pepperfry"):
+                    product = self._build_product(
+                        retailer, len(products) + 1, item["name"],
+                        price, price * 1.2 if price > 0 else 0,
+                        item["image"], query, category
+                    )
+                else:
+                    product = self._build_product(
+                        retailer, len(products) + 1, item["name"],
+                        price if price > 0 else random.randint(5000, 50000),
+                        price * 1.2 if price > 0 else random.randint(6000, 60000),
+                        item["image"], query, category
+                    )
+                    if product.original_price > product.price:
+                        product.discount = int(((product.original_price - product.price) / product.original_price) * 100)
                 
-                for elem in product_elements[:10]:
-                    name_selectors = ['h3', 'h4', 'h5', '.title', '.name', '.product-title', '.product-name']
-                    name_elem = None
-                    for selector in name_selectors:
-                        name_elem = elem.select_one(selector)
-                        if name_elem:
-                            break
-                    
-                    price_selectors = ['.price', '.cost', '.amount', '.value']
-                    price_elem = None
-                    for selector in price_selectors:
-                        price_elem = elem.select_one(selector)
-                        if price_elem:
-                            break
-                    
-                    image_elem = elem.select_one('img')
-                    
-                    if name_elem and price_elem:
-                        price_text = price_elem.get_text()
-                        price_str = re.sub(r'[^\d,]', '', price_text)
-                        price = float(price_str.replace(',', '')) if price_str else 0
-                        
-                        product = Product(
-                            id=f"{retailer['name'].replace(' ', '_')}_{len(products)+1}",
-                            name=name_elem.get_text(strip=True)[:100],
-                            brand=retailer["name"],
-                            price=price if price > 0 else random.randint(5000, 50000),
-                            original_price=price * 1.2 if price > 0 else random.randint(6000, 60000),
-                            rating=round(random.uniform(3.5, 5.0), 1),
-                            reviews=random.randint(10, 500),
-                            image=image_elem['data-src'] if image_elem and image_elem.get('data-src') else 
-                                  image_elem.get('src', '') if image_elem else '',
-                            category=category or self._get_category_from_query(query),
-                            style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial", "Scandinavian", "Minimalist"]),
-                            colors=["#8B4513", "#2F4F4F", "#696969", "#FFFFFF", "#00000"],
-                            dimensions={
-                                "width": random.randint(50, 200),
-                                "height": random.randint(50, 200),
-                                "depth": random.randint(30, 100)
-                            },
-                            in_stock=random.choice([True, False]),
-                            discount=random.randint(5, 30),
-                            is_wishlisted=False,
-                            tags=["bestseller", "premium"] if random.choice([True, False]) else ["new-arrival"],
-                            material=random.choice(["Wood", "Metal", "Glass", "Fabric", "Plastic"]),
-                            designer=random.choice(["Local Artisan", "International Designer", "In-house", "Unknown"]),
-                            design_style=random.choice(["Modern", "Traditional", "Contemporary", "Industrial"]),
-                            sustainability_rating=round(random.uniform(3.0, 5.0), 1),
-                            certified_eco_friendly=random.choice([True, False]),
-                            stock_quantity=random.randint(0, 50),
-                            availability_status="in_stock" if random.choice([True, False]) else "out_of_stock"
-                        )
-                        
-                        if product.original_price > product.price:
-                            product.discount = int(((product.original_price - product.price) / product.original_price) * 100)
-                        
-                        products.append(product)
+                products.append(product)
             
             if not products:
                 for i in range(3):
@@ -801,8 +598,8 @@ class InteriorDesignEcommerceService:
         all_products = await self.get_featured_products()
         
         # Simulate user behavior by adjusting personalization scores based on user preferences
-        if user_id in self.user_behavior_data:
-            user_prefs = self.user_behavior_data[user_id]
+        user_prefs = self.user_behavior_data.get(user_id)
+        if user_prefs is not None:
             for product in all_products:
                 # Increase score for products matching user preferences
                 if product.category in user_prefs.get("categories", []):
@@ -851,8 +648,8 @@ class InteriorDesignEcommerceService:
                     
                     product.personalization_score = similarity_score
         
-        if user_id in self.user_behavior_data:
-            user_prefs = self.user_behavior_data[user_id]
+        user_prefs = self.user_behavior_data.get(user_id)
+        if user_prefs is not None:
             for product in all_products:
                 if product.category in user_prefs.get("categories", []):
                     product.personalization_score = (product.personalization_score or 0) + 15
@@ -1481,11 +1278,9 @@ class InteriorDesignEcommerceService:
     async def track_user_behavior(self, user_id: str, action: str, product_id: str = None, metadata: Dict[str, Any] = None) -> bool:
         """Track user behavior for personalization"""
         try:
-            if not hasattr(self, 'user_behavior_data'):
-                self.user_behavior_data = {}
-            
-            if user_id not in self.user_behavior_data:
-                self.user_behavior_data[user_id] = {
+            profile = self.user_behavior_data.get(user_id)
+            if profile is None:
+                profile = {
                     "user_id": user_id,
                     "actions": [],
                     "preferences": {
@@ -1504,9 +1299,11 @@ class InteriorDesignEcommerceService:
                 "timestamp": datetime.now().isoformat()
             }
             
-            self.user_behavior_data[user_id]["actions"].append(action_data)
+            profile["actions"].append(action_data)
+            # Only the most recent actions are kept so a busy profile stays bounded
+            del profile["actions"][:-MAX_TRACKED_ACTIONS]
             
-            user_prefs = self.user_behavior_data[user_id]["preferences"]
+            user_prefs = profile["preferences"]
             
             if action == "view_product" and product_id:
                 category = metadata.get("category") if metadata else None
@@ -1525,6 +1322,7 @@ class InteriorDesignEcommerceService:
                 
                 if price:
                     user_prefs["price_ranges"].append(price)
+                    del user_prefs["price_ranges"][:-MAX_TRACKED_ACTIONS]
             
             elif action == "add_to_cart" and product_id:
                 pass
@@ -1532,7 +1330,9 @@ class InteriorDesignEcommerceService:
             elif action == "purchase" and product_id:
                 pass
             
-            self.user_behavior_data[user_id]["last_updated"] = datetime.now()
+            profile["last_updated"] = datetime.now()
+            # Re-store so the profile's size is re-measured and its TTL restarts
+            self.user_behavior_data.set(user_id, profile)
             
             return True
         except Exception as e:
@@ -1541,7 +1341,8 @@ class InteriorDesignEcommerceService:
     
     async def get_personalized_insights(self, user_id: str) -> Dict[str, Any]:
         """Get personalized insights based on user behavior"""
-        if not hasattr(self, 'user_behavior_data') or user_id not in self.user_behavior_data:
+        user_data = self.user_behavior_data.get(user_id)
+        if user_data is None:
             return {
                 "user_id": user_id,
                 "insufficient_data": True,
@@ -1552,7 +1353,6 @@ class InteriorDesignEcommerceService:
                 ]
             }
         
-        user_data = self.user_behavior_data[user_id]
         preferences = user_data["preferences"]
         
         insights = {
@@ -0,0 +1,118 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    """Same notion of a word character as \\w in re"""
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over a fixed set of keyword phrases.
+
+    Built once, it finds every keyword occurring in a text in a single pass
+    over the text, however many keywords there are. Goto and failure links
+    are folded into one transition table per state at build time, storing
+    only the transitions that differ from the root's, so scanning is one or
+    two dict lookups per character. Matching is case-sensitive; keywords
+    are lower-cased at build time and callers pass lower-cased text.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword})
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for keyword in self.keywords:
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto.append({})
+                    outputs.append(())
+                    goto[state][ch] = nxt
+                state = nxt
+            outputs[state] = (keyword,)
+
+        # Breadth-first so a state's failure target is complete before the state itself
+        root = goto[0]
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [{} for _ in goto]
+        delta[0] = root
+        queue = deque()
+        for nxt in root.values():
+            queue.append(nxt)
+            delta[nxt] = dict(goto[nxt])
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                fallback = delta[fail[state]].get(ch, root.get(ch, 0))
+                fail[nxt] = fallback if fallback != nxt else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+                # Inherit the failure state's transitions (already pruned against the root)
+                inherited = dict(delta[fail[nxt]]) if fail[nxt] else {}
+                inherited.update(goto[nxt])
+                delta[nxt] = inherited
+                queue.append(nxt)
+        self._delta = delta
+        self._outputs = outputs
+
+    def _scan(self, text: str):
+        """Yield (end index, matched keywords) for every position where some keyword ends"""
+        delta, outputs = self._delta, self._outputs
+        root = delta[0]
+        state = 0
+        for index, ch in enumerate(text):
+            nxt = delta[state].get(ch)
+            state = nxt if nxt is not None else root.get(ch, 0)
+            if outputs[state]:
+                yield index, outputs[state]
+
+    def find(self, text: str) -> Set[str]:
+        """Every keyword occurring anywhere in text"""
+        found = set()
+        for _, matched in self._scan(text):
+            found.update(matched)
+        return found
+
+    def contains_any(self, text: str) -> bool:
+        """Whether any keyword occurs in text, stopping at the first one"""
+        for _ in self._scan(text):
+            return True
+        return False
+
+    def _word_matches(self, text: str):
+        """Yield keywords whose occurrence is bounded by non-word characters on both sides"""
+        last = len(text) - 1
+        for end, matched in self._scan(text):
+            if end < last and _is_word_char(text[end + 1]):
+                continue
+            for keyword in matched:
+                start = end - len(keyword) + 1
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    yield keyword
+
+    def find_words(self, text: str) -> Set[str]:
+        """Keywords occurring as whole words, i.e. what r"\\b(kw1|kw2|...)\\b" would match"""
+        return set(self._word_matches(text))
+
+    def find_all(self, text: str) -> Tuple[Set[str], Set[str]]:
+        """find() and find_words() together from one scan of text"""
+        found, words = set(), set()
+        last = len(text) - 1
+        for end, matched in self._scan(text):
+            found.update(matched)
+            if end < last and _is_word_char(text[end + 1]):
+                continue
+            for keyword in matched:
+                start = end - len(keyword) + 1
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    words.add(keyword)
+        return found, words
+
+    def contains_word(self, text: str) -> bool:
+        """Whether any keyword occurs as a whole word"""
+        for _ in self._word_matches(text):
+            return True
+        return False
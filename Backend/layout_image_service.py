@@ -6,7 +6,6 @@ Generates floor plan images based on text descriptions using state-of-the-art di
 import os
 import io
 import base64
-import requests
 from typing import Dict, List, Any, Optional
 from pydantic import BaseModel
 from enum import Enum
@@ -14,6 +13,7 @@ import json
 from PIL import Image
 import asyncio
 import aiohttp
+from http_clients import http_clients
 
 class RoomType(str, Enum):
     LIVING_ROOM = "living_room"
@@ -168,41 +168,41 @@ class LayoutImageService:
             # Try models in order of preference
             models_to_try = [self.primary_model] + self.fallback_models
             
-            async with aiohttp.ClientSession() as session:
-                for model_name in models_to_try:
-                    print(f"Trying model: {model_name}")
-                    
-                    image_bytes = await self._query_hf_model(model_name, prompt, session)
-                    
-                    if image_bytes:
-                        try:
-                            # Verify image is valid
-                            image = Image.open(io.BytesIO(image_bytes))
-                            
-                            # Convert to base64 for frontend
-                            buffered = io.BytesIO()
-                            image.save(buffered, format="PNG")
-                            img_base64 = base64.b64encode(buffered.getvalue()).decode()
-                            
-                            return {
-                                "success": True,
-                                "image_data": f"data:image/png;base64,{img_base64}",
-                                "model_used": model_name,
-                                "prompt_used": prompt,
-                                "image_dimensions": {
-                                    "width": image.width,
-                                    "height": image.height
-                                },
-                                "layout_analysis": self._analyze_generated_layout(request, prompt),
-                                "message": "Floor plan image generated successfully"
-                            }
-                            
-                        except Exception as img_error:
-                            print(f"Error processing image from {model_name}: {str(img_error)}")
-                            continue
-                    
-                    # Wait a bit before trying next model to avoid rate limits
-                    await asyncio.sleep(1)
+            session = http_clients.aiohttp_session()
+            for model_name in models_to_try:
+                print(f"Trying model: {model_name}")
+                
+                image_bytes = await self._query_hf_model(model_name, prompt, session)
+                
+                if image_bytes:
+                    try:
+                        # Verify image is valid
+                        image = Image.open(io.BytesIO(image_bytes))
+                        
+                        # Convert to base64 for frontend
+                        buffered = io.BytesIO()
+                        image.save(buffered, format="PNG")
+                        img_base64 = base64.b64encode(buffered.getvalue()).decode()
+                        
+                        return {
+                            "success": True,
+                            "image_data": f"data:image/png;base64,{img_base64}",
+                            "model_used": model_name,
+                            "prompt_used": prompt,
+                            "image_dimensions": {
+                                "width": image.width,
+                                "height": image.height
+                            },
+                            "layout_analysis": self._analyze_generated_layout(request, prompt),
+                            "message": "Floor plan image generated successfully"
+                        }
+                        
+                    except Exception as img_error:
+                        print(f"Error processing image from {model_name}: {str(img_error)}")
+                        continue
+                
+                # Wait a bit before trying next model to avoid rate limits
+                await asyncio.sleep(1)
             
             # If all models failed
             return {
@@ -268,18 +268,18 @@ class LayoutImageService:
         
         model_status = {}
         
-        async with aiohttp.ClientSession() as session:
-            for model_name in [self.primary_model] + self.fallback_models:
-                api_url = f"https://router.huggingface.co/hf-inference/models/{model_name}"
-                
-                try:
-                    async with session.get(api_url, headers=self.headers) as response:
-                        if response.status == 200:
-                            model_status[model_name] = "available"
-                        else:
-                            model_status[model_name] = f"unavailable (status: {response.status})"
-                except Exception as e:
-                    model_status[model_name] = f"error: {str(e)}"
+        session = http_clients.aiohttp_session()
+        for model_name in [self.primary_model] + self.fallback_models:
+            api_url = f"https://router.huggingface.co/hf-inference/models/{model_name}"
+            
+            try:
+                async with session.get(api_url, headers=self.headers) as response:
+                    if response.status == 200:
+                        model_status[model_name] = "available"
+                    else:
+                        model_status[model_name] = f"unavailable (status: {response.status})"
+            except Exception as e:
+                model_status[model_name] = f"error: {str(e)}"
         
         return {
             "models": model_status,
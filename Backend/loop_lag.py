@@ -0,0 +1,94 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Dict
+
+# How often the monitor checks in, and how late a check-in must be to count as a stall (seconds)
+LOOP_LAG_INTERVAL = float(os.getenv("LOOP_LAG_INTERVAL", "0.05"))
+LOOP_LAG_THRESHOLD = float(os.getenv("LOOP_LAG_THRESHOLD", "0.1"))
+# Recent lag samples kept for percentiles
+LOOP_LAG_WINDOW = 1200
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop responsiveness. A ticker task sleeps for `interval`
+    and records how much later than that it actually woke up; anything
+    blocking the loop (time.sleep, synchronous HTTP, heavy CPU work) shows
+    up as lag. Usable as an async context manager around a block of work,
+    or started once for the lifetime of the app.
+    """
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL, threshold: float = LOOP_LAG_THRESHOLD):
+        self.interval = interval
+        self.threshold = threshold
+        self._task: asyncio.Task | None = None
+        self._samples = deque(maxlen=LOOP_LAG_WINDOW)
+        self.max_lag = 0.0
+        self.stalls = 0
+        self.last_stall_at: float | None = None
+
+    async def _tick(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._record(max(0.0, loop.time() - expected))
+
+    def _record(self, lag: float):
+        self._samples.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+        if lag > self.threshold:
+            self.stalls += 1
+            self.last_stall_at = time.time()
+            print(f"Event loop blocked for {lag * 1000:.0f} ms (threshold {self.threshold * 1000:.0f} ms)")
+
+    def start(self):
+        """Begin sampling on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._tick(), name="loop-lag-monitor")
+
+    async def stop(self):
+        """Stop sampling; recorded stats are kept"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def __aenter__(self):
+        self.start()
+        # Let the ticker take its first timestamp before the measured work starts
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # One more tick so a stall at the very end of the block is still observed
+        await asyncio.sleep(self.interval * 2)
+        await self.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Lag percentiles and stall counters"""
+        ordered = sorted(self._samples)
+
+        def percentile(p: float) -> float:
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 2) if ordered else 0.0
+
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "samples": len(ordered),
+            "p50_lag_ms": percentile(50),
+            "p99_lag_ms": percentile(99),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "stalls": self.stalls,
+            "last_stall_at": self.last_stall_at,
+        }
+
+
+# Global instance, started in the app lifespan
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,209 @@
+import asyncio
+import os
+import sys
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+# Defaults for a cache that does not set its own bounds
+MEMORY_CACHE_MAX_ENTRIES = int(os.getenv("MEMORY_CACHE_MAX_ENTRIES", "1000"))
+MEMORY_CACHE_MAX_BYTES = int(os.getenv("MEMORY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# How often the sweeper drops expired entries from every cache (seconds)
+MEMORY_CACHE_SWEEP_INTERVAL = float(os.getenv("MEMORY_CACHE_SWEEP_INTERVAL", "60"))
+
+_MISSING = object()
+
+# Every live BoundedCache, so the sweeper and the metrics endpoint can find them
+_registry: "weakref.WeakSet[BoundedCache]" = weakref.WeakSet()
+
+
+def approx_size(value: Any, _seen: set | None = None) -> int:
+    """
+    Rough deep size of a value in bytes: containers, dataclasses/objects and
+    their contents are walked, shared objects are counted once.
+    """
+    seen = _seen if _seen is not None else set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value, 64)
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+    if isinstance(value, dict):
+        return size + sum(approx_size(k, seen) + approx_size(v, seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + sum(approx_size(item, seen) for item in value)
+    if hasattr(value, "__dict__"):
+        size += approx_size(vars(value), seen)
+    for name in getattr(type(value), "__slots__", ()):
+        size += approx_size(getattr(value, name, None), seen)
+    return size
+
+
+class BoundedCache:
+    """
+    In-process LRU cache with a TTL and both an entry and a byte budget.
+
+    Expired entries are dropped when read and by sweep(), which the shared
+    CacheSweeper calls periodically for every live cache; once either budget
+    is exceeded the least recently used entries are evicted on write. Entry
+    sizes are estimated with approx_size() (or the given sizeof) when stored,
+    so a value mutated in place should be set() again to be re-measured.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = MEMORY_CACHE_MAX_ENTRIES,
+        max_bytes: int = MEMORY_CACHE_MAX_BYTES,
+        ttl: float | None = None,
+        sizeof: Callable[[Any], int] = approx_size,
+    ):
+        self.name = name
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.sizeof = sizeof
+        # key -> (expires_at or None, size, value), least recently used first
+        self._entries: "OrderedDict[Hashable, Tuple[float | None, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0}
+        _registry.add(self)
+
+    def _drop(self, key: Hashable) -> Any:
+        _, size, value = self._entries.pop(key)
+        self._bytes -= size
+        return value
+
+    def _live(self, key: Hashable) -> Tuple[float | None, int, Any] | None:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is not None and time.time() >= entry[0]:
+            self._drop(key)
+            self.stats["expired"] += 1
+            return None
+        return entry
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if it is missing or expired"""
+        entry = self._live(key)
+        if entry is None:
+            self.stats["misses"] += 1
+            return default
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry[2]
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = _MISSING):
+        """Store a value for ttl seconds (the cache default if omitted, None for no expiry)"""
+        ttl = self.ttl if ttl is _MISSING else ttl
+        if key in self._entries:
+            self._drop(key)
+        size = self.sizeof(value)
+        self._entries[key] = (time.time() + ttl if ttl is not None else None, size, value)
+        self._bytes += size
+        # Never evict the entry just written, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+            self.stats["evictions"] += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Remove and return a value"""
+        if self._live(key) is None:
+            return default
+        return self._drop(key)
+
+    def sweep(self) -> int:
+        """Drop every expired entry; returns how many were removed"""
+        now = time.time()
+        expired = [key for key, (expires_at, _, _) in self._entries.items() if expires_at is not None and now >= expires_at]
+        for key in expired:
+            self._drop(key)
+        self.stats["expired"] += len(expired)
+        return len(expired)
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def keys(self) -> list:
+        """Snapshot of the stored keys, least recently used first (expired ones included until swept)"""
+        return list(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self._live(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Size, budgets and hit/miss/eviction counters"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_s": self.ttl,
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+def memory_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Stats of every live BoundedCache, keyed by name (numbered when names repeat)"""
+    board: Dict[str, Dict[str, Any]] = {}
+    for cache in sorted(_registry, key=lambda c: c.name):
+        name, n = cache.name, 1
+        while name in board:
+            n += 1
+            name = f"{cache.name}#{n}"
+        board[name] = cache.get_stats()
+    return board
+
+
+class CacheSweeper:
+    """Background task that periodically sweeps expired entries out of every BoundedCache"""
+
+    def __init__(self, interval: float = MEMORY_CACHE_SWEEP_INTERVAL):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+        self.sweeps = 0
+        self.swept = 0
+
+    def sweep_all(self) -> int:
+        removed = sum(cache.sweep() for cache in list(_registry))
+        self.sweeps += 1
+        self.swept += removed
+        return removed
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.sweep_all()
+
+    def start(self):
+        """Begin sweeping on the running loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="memory-cache-sweeper")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_s": self.interval,
+            "sweeps": self.sweeps,
+            "swept": self.swept,
+        }
+
+
+# Global instance, started in the app lifespan
+cache_sweeper = CacheSweeper()
@@ -1,4 +1,4 @@
-import requests
+import asyncio
 import os
 import logging
 import time
@@ -6,6 +6,8 @@ import json
 import re
 from typing import Optional, Dict, Any, List, Tuple
 
+from http_clients import backoff_delay, http_clients
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -376,7 +378,7 @@ class MultiAIService:
         else:
             return base_negative
     
-    def _try_huggingface(self, prompt: str, negative_prompt: str, **kwargs) -> Optional[bytes]:
+    async def _try_huggingface(self, prompt: str, negative_prompt: str, **kwargs) -> Optional[bytes]:
         """
         Try Hugging Face API
         """
@@ -438,7 +440,8 @@ class MultiAIService:
                 
                     logger.info(f"Trying Hugging Face model: {model}")
                     logger.info(f"Parameters: {parameters}")
-                    response = requests.post(url, headers=headers, json=payload, timeout=180)  # Increased timeout for better model
+                    response = await http_clients.client().post(url, headers=headers, json=payload, timeout=180)  # Increased timeout for better model
+                    retry_after = None
                     
                     if response.status_code == 200:
                         content_length = len(response.content)
@@ -455,17 +458,17 @@ class MultiAIService:
                         break
                     elif response.status_code == 429:
                         logger.warning(f"Rate limit hit for {model}")
-                        time.sleep(10)  # Wait longer for rate limits
+                        retry_after = response.headers.get("Retry-After")
                     elif response.status_code == 503:
                         logger.info(f"Model {model} is loading")
-                        time.sleep(15)  # Wait longer for model loading
+                        retry_after = response.headers.get("Retry-After")
                     else:
                         logger.warning(f"HF API error {response.status_code} for {model}: {response.text[:500]}")
-                        # For other errors, wait before retrying
-                        time.sleep(5)
                     
                     if attempt < max_retries - 1:
-                        time.sleep(5)  # Wait between retries
+                        # Rate limits and cold models get a longer backoff; never block the event loop
+                        base = 5.0 if response.status_code in (429, 503) else 2.0
+                        await asyncio.sleep(backoff_delay(attempt, base=base, retry_after=retry_after))
                 
                 # If we get here, this model failed, continue to next model
                 continue
@@ -476,7 +479,7 @@ class MultiAIService:
         
         return None
     
-    def _try_replicate(self, prompt: str, negative_prompt: str, **kwargs) -> Optional[bytes]:
+    async def _try_replicate(self, prompt: str, negative_prompt: str, **kwargs) -> Optional[bytes]:
         """
         Try Replicate API (if available)
         """
@@ -488,7 +491,7 @@ class MultiAIService:
         logger.info("Replicate provider not implemented yet")
         return None
     
-    def generate_interior_image(
+    async def generate_interior_image(
         self,
         prompt: str,
         style: str = "auto",
@@ -517,7 +520,7 @@ class MultiAIService:
         for provider_name, provider_func in providers_to_try:
             if self.providers[provider_name]["enabled"]:
                 logger.info(f"🔄 Trying {provider_name} provider...")
-                result = provider_func(enhanced_prompt, negative_prompt, **kwargs)
+                result = await provider_func(enhanced_prompt, negative_prompt, **kwargs)
                 if result:
                     logger.info(f"✅ Successfully generated image with {provider_name}")
                     return result, False
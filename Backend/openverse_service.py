@@ -1,6 +1,7 @@
 import httpx
 from fastapi import HTTPException
 from typing import Dict, List, Any
+from http_clients import http_clients
 
 OPENVERSE_API_URL = "https://api.openverse.engineering/v1/images/"
 
@@ -8,7 +9,6 @@ class OpenverseService:
     def __init__(self):
         # Always enabled (no API key required)
         self.enabled = True
-        self.client = httpx.AsyncClient(timeout=15.0)
 
     async def search_photos(
         self,
@@ -89,5 +89,7 @@ class OpenverseService:
         results = data.get("results") or []
         return [self.format_photo(item) for item in results]
 
-    async def close(self):
-        await self.client.aclose()
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client()
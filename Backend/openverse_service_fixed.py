@@ -1,6 +1,7 @@
 import httpx
 from fastapi import HTTPException
 from typing import Dict, List, Any
+from http_clients import http_clients
 
 # Fixed: Updated to new Openverse API URL
 OPENVERSE_API_URL = "https://api.openverse.org/v1/images/"
@@ -9,10 +10,6 @@ class OpenverseService:
     def __init__(self):
         # Always enabled (no API key required)
         self.enabled = True
-        self.client = httpx.AsyncClient(
-            timeout=15.0,
-            follow_redirects=True  # Follow redirects automatically
-        )
 
     async def search_photos(
         self,
@@ -97,5 +94,7 @@ class OpenverseService:
         results = data.get("results") or []
         return [self.format_photo(item) for item in results]
 
-    async def close(self):
-        await self.client.aclose()
\ No newline at end of file
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client("redirects")
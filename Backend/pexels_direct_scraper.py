@@ -5,9 +5,11 @@ Scrapes Pexels website directly without API key for unlimited free access
 import httpx
 import asyncio
 import random
-import re
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from http_cache import http_response_cache
+from http_clients import http_clients
+from rate_limiter import scraper_rate_limiter
+from html_parsing import html_parse_executor, parse_pexels_search, precompile_selectors
 
 class PexelsDirectScraper:
     """
@@ -17,11 +19,16 @@ class PexelsDirectScraper:
     
     def __init__(self):
         self.base_url = "https://www.pexels.com"
-        self.session = httpx.AsyncClient(
-            timeout=20.0,
-            follow_redirects=True,
-            http2=True
-        )
+        
+        # Result page selectors; photo articles first, bare photo links as fallback
+        self.selectors = {
+            "photos": ["article[class*='Photo']"],
+            "fallback_photos": ["a[href*='/photo/']"],
+            "image": ["img"],
+            "photo_link": ["a[href*='/photo/']"],
+            "photographer": ["a[href*='/@']"],
+        }
+        precompile_selectors(self.selectors)
         
         # Design-focused search terms
         self.design_terms = [
@@ -73,19 +80,25 @@ class PexelsDirectScraper:
             # Fetch page with retry
             for attempt in range(3):
                 try:
-                    response = await self.session.get(
+                    # Shared per-domain budget, spent only when the request leaves the cache;
+                    # slows down further after every 403/429
+                    response = await http_response_cache.get(
+                        self.session,
                         url,
                         headers=self._get_headers(),
-                        timeout=15.0
+                        timeout=15.0,
+                        before_send=lambda: scraper_rate_limiter.acquire(self.base_url),
                     )
+                    if response.extensions.get("from_cache") != "fresh":
+                        await scraper_rate_limiter.record_response(
+                            self.base_url, response.status_code, response.headers.get("Retry-After")
+                        )
                     
                     if response.status_code == 200:
                         break
                     elif response.status_code == 429:
-                        # Rate limited, wait and retry
-                        wait_time = 5 * (attempt + 1)
-                        print(f"Rate limited, waiting {wait_time}s...")
-                        await asyncio.sleep(wait_time)
+                        # Rate limited; the limiter holds the next attempt back
+                        print("Rate limited, backing off...")
                         continue
                     else:
                         print(f"Pexels returned {response.status_code}")
@@ -97,85 +110,45 @@ class PexelsDirectScraper:
                         continue
                     raise e
             
-            # Parse the HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Parse the HTML in a worker process
+            parsed = await html_parse_executor.run(parse_pexels_search, response.content, per_page * 2, self.selectors)
             images = []
             
-            # Find photo articles - Pexels uses article tags for photos
-            photo_elements = soup.find_all('article', class_=re.compile(r'Photo'))
-            
-            if not photo_elements:
-                # Try alternative selectors
-                photo_elements = soup.find_all('a', href=re.compile(r'/photo/'))
-            
-            for element in photo_elements[:per_page * 2]:
-                try:
-                    # Find image tag
-                    img = element.find('img')
-                    if not img:
-                        continue
-                    
-                    # Get image URL
-                    img_url = img.get('src') or img.get('data-src') or img.get('data-lazy-src')
-                    if not img_url or 'placeholder' in img_url.lower():
-                        continue
-                    
-                    # Skip very small images
-                    if any(x in img_url for x in ['w=50', 'h=50', 'auto=compress&cs=tinysrgb&dpr=1&w=50']):
-                        continue
-                    
-                    # Get higher quality version
-                    if 'auto=compress' in img_url:
-                        # Replace with higher quality parameters
-                        img_url = re.sub(r'w=\d+', 'w=1200', img_url)
-                        img_url = re.sub(r'h=\d+', 'h=800', img_url)
-                    
-                    # Get alt text/title
-                    alt_text = img.get('alt', '')
-                    title = alt_text or f"{query.title()} Design"
-                    
-                    # Get photographer info if available
-                    photographer = ""
-                    photo_link = element.find('a', href=re.compile(r'/photo/'))
-                    if photo_link:
-                        # Extract photographer from URL or nearby text
-                        photographer_elem = element.find('a', href=re.compile(r'/@'))
-                        if photographer_elem:
-                            photographer = photographer_elem.get_text(strip=True)
-                    
-                    # Create formatted image object
-                    formatted_img = {
-                        "id": f"pexels_direct_{abs(hash(img_url)) % 1000000}",
-                        "width": 1200,
-                        "height": 800,
-                        "url": img_url,
-                        "photographer": photographer or "Pexels",
-                        "photographer_url": "",
-                        "photographer_id": 0,
-                        "avg_color": "#f5f5f5",
-                        "src": {
-                            "original": img_url,
-                            "large2x": img_url,
-                            "large": img_url,
-                            "medium": img_url,
-                            "small": img_url,
-                            "portrait": img_url,
-                            "landscape": img_url,
-                            "tiny": img_url
-                        },
-                        "alt": alt_text,
-                        "image": img_url,
-                        "title": title,
-                        "author": photographer or "Pexels",
-                        "likes": random.randint(50, 500),
-                        "saves": random.randint(10, 100)
-                    }
-                    
-                    images.append(formatted_img)
-                    
-                except Exception as e:
-                    print(f"Error parsing Pexels photo: {e}")
-                    continue
+            for item in parsed:
+                img_url = item["image"]
+                alt_text = item["alt"]
+                title = alt_text or f"{query.title()} Design"
+                photographer = item["photographer"]
+                
+                # Create formatted image object
+                formatted_img = {
+                    "id": f"pexels_direct_{abs(hash(img_url)) % 1000000}",
+                    "width": 1200,
+                    "height": 800,
+                    "url": img_url,
+                    "photographer": photographer or "Pexels",
+                    "photographer_url": "",
+                    "photographer_id": 0,
+                    "avg_color": "#f5f5f5",
+                    "src": {
+                        "original": img_url,
+                        "large2x": img_url,
+                        "large": img_url,
+                        "medium": img_url,
+                        "small": img_url,
+                        "portrait": img_url,
+                        "landscape": img_url,
+                        "tiny": img_url
+                    },
+                    "alt": alt_text,
+                    "image": img_url,
+                    "title": title,
+                    "author": photographer or "Pexels",
+                    "likes": random.randint(50, 500),
+                    "saves": random.randint(10, 100)
+                }
+                
+                images.append(formatted_img)
             
             print(f"Pexels Direct: Found {len(images)} images")
             return images[:per_page]
@@ -184,9 +157,10 @@ class PexelsDirectScraper:
             print(f"Pexels Direct scraping error: {e}")
             return []
     
-    async def close(self):
-        """Close the HTTP session"""
-        await self.session.aclose()
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Shared scraping client from the process-wide registry"""
+        return http_clients.client("scraper")
 
 # Global instance
 pexels_direct_scraper = PexelsDirectScraper()
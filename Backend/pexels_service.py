@@ -4,6 +4,7 @@ import random
 from fastapi import HTTPException, Query
 from dotenv import load_dotenv
 from typing import Dict, List, Any, Optional
+from http_clients import http_clients
 
 load_dotenv()
 
@@ -27,8 +28,6 @@ class PexelsService:
         if not self.enabled:
             print(f"Pexels disabled - using placeholder/demo API key")
         self.headers = {"Authorization": self.api_key} if self.enabled else {}
-        # Create a shared client for better performance
-        self.client = httpx.AsyncClient(timeout=15.0)
     
     async def search_photos(
         self,
@@ -132,6 +131,7 @@ class PexelsService:
             formatted_data.append(self.format_photo_data(photo))
         return formatted_data
     
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
\ No newline at end of file
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client()
@@ -2,6 +2,7 @@ import httpx
 from fastapi import HTTPException
 from typing import Dict, List, Any
 from architecture_design_service import architecture_design_service
+from http_clients import http_clients
 
 PICSUM_LIST_URL = "https://picsum.photos/v2/list"
 
@@ -9,7 +10,6 @@ class PicsumService:
     def __init__(self):
         # Always enabled (no API key required)
         self.enabled = True
-        self.client = httpx.AsyncClient(timeout=15.0)
 
     async def search_photos(
         self,
@@ -145,5 +145,7 @@ class PicsumService:
                 formatted_data.append(self.format_photo_data(photo))
         return formatted_data
 
-    async def close(self):
-        await self.client.aclose()
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client()
@@ -5,10 +5,11 @@ Scrapes Pixabay website directly without API key
 import httpx
 import asyncio
 import random
-import re
-import json
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+from http_cache import http_response_cache
+from http_clients import http_clients
+from rate_limiter import scraper_rate_limiter
+from html_parsing import html_parse_executor, parse_pixabay_search, precompile_selectors
 
 class PixabayDirectScraper:
     """
@@ -18,11 +19,13 @@ class PixabayDirectScraper:
     
     def __init__(self):
         self.base_url = "https://pixabay.com"
-        self.session = httpx.AsyncClient(
-            timeout=20.0,
-            follow_redirects=True,
-            http2=True
-        )
+        
+        # Result page selectors; JSON-LD metadata first, lazy-loaded images as fallback
+        self.selectors = {
+            "ld_json": ["script[type='application/ld+json']"],
+            "lazy_images": ["img[data-lazy]"],
+        }
+        precompile_selectors(self.selectors)
         
     def _get_headers(self) -> Dict[str, str]:
         """Get realistic browser headers"""
@@ -65,94 +68,60 @@ class PixabayDirectScraper:
             print(f"Pixabay Direct: Scraping {url}")
             
             # Fetch page
-            response = await self.session.get(
+            # Shared per-domain budget, spent only when the request leaves the cache;
+            # slows down further after every 403/429
+            response = await http_response_cache.get(
+                self.session,
                 url,
                 params=params,
                 headers=self._get_headers(),
-                timeout=15.0
+                timeout=15.0,
+                before_send=lambda: scraper_rate_limiter.acquire(self.base_url),
             )
+            if response.extensions.get("from_cache") != "fresh":
+                await scraper_rate_limiter.record_response(
+                    self.base_url, response.status_code, response.headers.get("Retry-After")
+                )
             
             if response.status_code != 200:
                 print(f"Pixabay returned {response.status_code}")
                 return []
             
-            # Parse HTML
-            soup = BeautifulSoup(response.text, 'html.parser')
+            # Parse HTML in a worker process. Pixabay embeds data in script tags
+            # as JSON; lazy-loaded img tags are used if that finds nothing
+            parsed = await html_parse_executor.run(parse_pixabay_search, response.content, per_page, self.selectors)
             images = []
             
-            # Find image containers
-            # Pixabay embeds data in script tags as JSON
-            script_tags = soup.find_all('script', type='application/ld+json')
-            
-            for script in script_tags:
-                try:
-                    data = json.loads(script.string)
-                    if isinstance(data, dict) and data.get('@type') == 'ImageObject':
-                        img_url = data.get('contentUrl') or data.get('url')
-                        if img_url:
-                            formatted_img = {
-                                "id": f"pixabay_direct_{abs(hash(img_url)) % 1000000}",
-                                "width": 1200,
-                                "height": 800,
-                                "url": img_url,
-                                "photographer": data.get('author', {}).get('name', 'Pixabay'),
-                                "photographer_url": "",
-                                "photographer_id": 0,
-                                "avg_color": "#f5f5f5",
-                                "src": {
-                                    "original": img_url,
-                                    "large2x": img_url,
-                                    "large": img_url,
-                                    "medium": img_url,
-                                    "small": img_url,
-                                    "portrait": img_url,
-                                    "landscape": img_url,
-                                    "tiny": img_url
-                                },
-                                "alt": data.get('name', query),
-                                "image": img_url,
-                                "title": data.get('name', f"{query.title()} Design"),
-                                "author": data.get('author', {}).get('name', 'Pixabay'),
-                                "likes": random.randint(50, 500),
-                                "saves": random.randint(10, 100)
-                            }
-                            images.append(formatted_img)
-                except:
-                    continue
-            
-            # Fallback: Try img tags if JSON parsing failed
-            if not images:
-                img_tags = soup.find_all('img', {'data-lazy': True})
-                for img in img_tags[:per_page]:
-                    img_url = img.get('data-lazy')
-                    if img_url and 'cdn.pixabay.com' in img_url:
-                        formatted_img = {
-                            "id": f"pixabay_direct_{abs(hash(img_url)) % 1000000}",
-                            "width": 1200,
-                            "height": 800,
-                            "url": img_url,
-                            "photographer": "Pixabay",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": "#f5f5f5",
-                            "src": {
-                                "original": img_url,
-                                "large2x": img_url,
-                                "large": img_url,
-                                "medium": img_url,
-                                "small": img_url,
-                                "portrait": img_url,
-                                "landscape": img_url,
-                                "tiny": img_url
-                            },
-                            "alt": img.get('alt', query),
-                            "image": img_url,
-                            "title": img.get('alt', f"{query.title()} Design"),
-                            "author": "Pixabay",
-                            "likes": random.randint(50, 500),
-                            "saves": random.randint(10, 100)
-                        }
-                        images.append(formatted_img)
+            for item in parsed:
+                img_url = item["image"]
+                author = item["author"] or "Pixabay"
+                formatted_img = {
+                    "id": f"pixabay_direct_{abs(hash(img_url)) % 1000000}",
+                    "width": 1200,
+                    "height": 800,
+                    "url": img_url,
+                    "photographer": author,
+                    "photographer_url": "",
+                    "photographer_id": 0,
+                    "avg_color": "#f5f5f5",
+                    "src": {
+                        "original": img_url,
+                        "large2x": img_url,
+                        "large": img_url,
+                        "medium": img_url,
+                        "small": img_url,
+                        "portrait": img_url,
+                        "landscape": img_url,
+                        "tiny": img_url
+                    },
+                    "alt": item["alt"] if item["alt"] is not None else query,
+                    "image": img_url,
+                    "title": item["alt"] if item["alt"] is not None else f"{query.title()} Design",
+                    "author": author,
+                    "likes": random.randint(50, 500),
+                    "saves": random.randint(10, 100)
+                }
+                images.append(formatted_img)
             
             print(f"Pixabay Direct: Found {len(images)} images")
             return images[:per_page]
@@ -161,9 +130,10 @@ class PixabayDirectScraper:
             print(f"Pixabay Direct scraping error: {e}")
             return []
     
-    async def close(self):
-        """Close the HTTP session"""
-        await self.session.aclose()
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Shared scraping client from the process-wide registry"""
+        return http_clients.client("scraper")
 
 # Global instance
 pixabay_direct_scraper = PixabayDirectScraper()
@@ -3,6 +3,7 @@ import httpx
 from fastapi import HTTPException
 from dotenv import load_dotenv
 from typing import Dict, List, Any
+from http_clients import http_clients
 
 load_dotenv()
 
@@ -13,7 +14,6 @@ class PixabayService:
     def __init__(self):
         self.api_key = PIXABAY_API_KEY
         self.base_url = PIXABAY_API_URL
-        self.client = httpx.AsyncClient(timeout=15.0)
         self.enabled = bool(self.api_key and self.api_key != "your_pixabay_api_key_here")
     
     async def search_photos(
@@ -149,6 +149,7 @@ class PixabayService:
             formatted_data.append(self.format_photo_data(photo))
         return formatted_data
     
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
\ No newline at end of file
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client()
@@ -0,0 +1,160 @@
+import asyncio
+import itertools
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set, Tuple
+
+# Maximum number of page prefetches running at once across all queries
+PREFETCH_MAX_CONCURRENCY = int(os.getenv("PREFETCH_MAX_CONCURRENCY", "4"))
+
+# Number of (client, query) scroll positions remembered for cancellation
+PREFETCH_TRACKED_QUERIES = 1024
+
+
+class PrefetchScheduler:
+    """
+    Bounded background prefetcher for infinite-scroll pages.
+
+    Each (query, page, per_page) is fetched at most once while in flight, no
+    matter how many requests ask for it. A fixed pool of workers caps global
+    concurrency and always picks the page closest to what the client is
+    currently viewing. Each page remembers which clients asked for it; when
+    a client requests a later page of the same query, prefetches that every
+    one of those clients has scrolled past are cancelled. Requests without a
+    client id never give up their pages.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[str, int, int], Awaitable[bool]],
+        max_concurrency: int = PREFETCH_MAX_CONCURRENCY,
+        normalize_query: Callable[[str], str] = lambda query: query,
+    ):
+        self.fetch_page = fetch_page
+        self.normalize_query = normalize_query
+        self.max_concurrency = max(1, max_concurrency)
+        self._queue: asyncio.PriorityQueue | None = None
+        self._workers = []
+        self._sequence = itertools.count()
+        self._queued: Dict[Tuple[str, int, int], str] = {}
+        self._running: Dict[Tuple[str, int, int], asyncio.Task] = {}
+        self._wanted_by: Dict[Tuple[str, int, int], Set[Hashable]] = {}
+        self._positions: Dict[Tuple[Hashable, str, int], int] = {}
+        self.stats = {
+            "scheduled": 0,
+            "deduplicated": 0,
+            "completed": 0,
+            "empty": 0,
+            "failed": 0,
+            "cancelled": 0,
+        }
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)
+            ]
+
+    def schedule(self, query: str, current_page: int, per_page: int, pages_ahead: int = 3, client: Hashable = None) -> int:
+        """Queue the pages after current_page for a client; returns how many new fetches were queued"""
+        self._ensure_workers()
+        normalized = self.normalize_query(query)
+        if client is not None:
+            self._move_position(client, normalized, current_page, per_page)
+
+        queued = 0
+        for page in range(current_page + 1, current_page + pages_ahead + 1):
+            key = (normalized, page, per_page)
+            self._wanted_by.setdefault(key, set()).add(client)
+            if key in self._queued or key in self._running:
+                self.stats["deduplicated"] += 1
+                continue
+            # Next page first, further pages after
+            priority = page - current_page
+            self._queued[key] = query
+            self._queue.put_nowait((priority, next(self._sequence), key))
+            self.stats["scheduled"] += 1
+            queued += 1
+        return queued
+
+    def _move_position(self, client: Hashable, query: str, current_page: int, per_page: int):
+        """Record the client's page and drop prefetches no client still needs"""
+        position_key = (client, query, per_page)
+        if current_page <= self._positions.get(position_key, 0):
+            return
+        self._positions.pop(position_key, None)
+        self._positions[position_key] = current_page
+        if len(self._positions) > PREFETCH_TRACKED_QUERIES:
+            # Forget the least recently advanced client
+            del self._positions[next(iter(self._positions))]
+
+        for key, clients in list(self._wanted_by.items()):
+            if key[0] != query or key[2] != per_page or client not in clients:
+                continue
+            if key[1] > current_page:
+                if key in self._queued:
+                    # Re-queue with the priority relative to the new position; the
+                    # stale entry is skipped once this one has been picked up
+                    self._queue.put_nowait((key[1] - current_page, next(self._sequence), key))
+                continue
+            clients.discard(client)
+            if clients:
+                continue  # Another client has not scrolled past it yet
+            del self._wanted_by[key]
+            if self._queued.pop(key, None) is not None:
+                self.stats["cancelled"] += 1
+            elif key in self._running:
+                self._running[key].cancel()
+
+    async def _worker(self):
+        while True:
+            _, _, key = await self._queue.get()
+            query = self._queued.pop(key, None)
+            if query is None:
+                continue  # Cancelled while waiting in the queue
+
+            task = asyncio.create_task(self.fetch_page(query, key[1], key[2]))
+            self._running[key] = task
+            try:
+                await asyncio.wait({task})
+            except asyncio.CancelledError:
+                task.cancel()
+                raise
+            finally:
+                self._running.pop(key, None)
+                self._wanted_by.pop(key, None)
+
+            if task.cancelled():
+                self.stats["cancelled"] += 1
+            elif task.exception() is not None:
+                print(f"Prefetch of page {key[1]} for query '{query}' failed: {task.exception()}")
+                self.stats["failed"] += 1
+            elif task.result():
+                self.stats["completed"] += 1
+            else:
+                self.stats["empty"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """In-flight and queued counts plus lifetime counters"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "queued": len(self._queued),
+            "running": len(self._running),
+            "tracked_queries": len(self._positions),
+            **self.stats,
+        }
+
+    async def close(self):
+        """Cancel the workers and any running prefetches"""
+        for task in self._running.values():
+            task.cancel()
+        for worker in self._workers:
+            worker.cancel()
+        if self._workers:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._queue = None
+        self._queued.clear()
+        self._running.clear()
+        self._wanted_by.clear()
@@ -0,0 +1,204 @@
+import math
+import os
+import time
+from collections import deque
+from typing import Any, Dict, List
+
+# Weight of the newest sample in the exponentially weighted moving averages
+HEALTH_EWMA_ALPHA = 0.2
+
+# Consecutive failures (or a single 429/403) that open a provider's circuit
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("PROVIDER_CIRCUIT_FAILURES", "3"))
+CIRCUIT_BASE_COOLDOWN = float(os.getenv("PROVIDER_CIRCUIT_COOLDOWN", "30"))
+CIRCUIT_MAX_COOLDOWN = 600.0
+
+# Bounds for per-provider timeouts derived from observed latency (seconds)
+MIN_PROVIDER_TIMEOUT = 0.5
+MAX_PROVIDER_TIMEOUT = 5.0
+
+# Recent latencies kept per provider for percentile estimates
+LATENCY_WINDOW = 50
+
+# Yield assumed for a provider with no calls yet when sizing the fan-out
+UNSEEN_YIELD_PROBABILITY = 0.5
+
+
+class ProviderStats:
+    """Rolling health statistics for a single image provider"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.empty_results = 0
+        self.timeouts = 0
+        self.cancelled = 0  # Lost a hedged race; says nothing about the provider's health
+        self.rate_limited = 0  # HTTP 429
+        self.forbidden = 0  # HTTP 403
+        self.ewma_latency: float | None = None
+        # Start optimistic so unseen providers get traffic and earn real stats
+        self.success_rate = 1.0
+        self.empty_rate = 0.0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.consecutive_failures = 0
+        self.circuit_open_until = 0.0
+        self.circuit_opens = 0
+
+    def _update_rates(self, success: bool, empty: bool):
+        self.success_rate += HEALTH_EWMA_ALPHA * ((1.0 if success else 0.0) - self.success_rate)
+        self.empty_rate += HEALTH_EWMA_ALPHA * ((1.0 if empty else 0.0) - self.empty_rate)
+
+    def _record_latency(self, latency: float):
+        self.latencies.append(latency)
+        if self.ewma_latency is None:
+            self.ewma_latency = latency
+        else:
+            self.ewma_latency += HEALTH_EWMA_ALPHA * (latency - self.ewma_latency)
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """Latency at the given percentile (0-100) over the recent window"""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, max(0, math.ceil(percentile / 100 * len(ordered)) - 1))
+        return ordered[index]
+
+    @property
+    def yield_probability(self) -> float:
+        """Estimated chance that a call returns usable results"""
+        return self.success_rate * (1.0 - self.empty_rate)
+
+    def is_available(self, now: float | None = None) -> bool:
+        return (now or time.time()) >= self.circuit_open_until
+
+    def open_circuit(self):
+        # Back off exponentially with each consecutive trip
+        cooldown = min(CIRCUIT_MAX_COOLDOWN, CIRCUIT_BASE_COOLDOWN * (2 ** self.circuit_opens))
+        self.circuit_open_until = time.time() + cooldown
+        self.circuit_opens += 1
+
+
+class ProviderHealthTracker:
+    """
+    Tracks latency, success, empty-result and rate-limit statistics for every
+    image provider and uses them to rank providers, size the fan-out and pick
+    per-provider timeouts. Failing providers are cooled down by a circuit
+    breaker.
+    """
+
+    def __init__(self, provider_names: List[str]):
+        self.providers: Dict[str, ProviderStats] = {name: ProviderStats(name) for name in provider_names}
+
+    def _stats(self, name: str) -> ProviderStats:
+        if name not in self.providers:
+            self.providers[name] = ProviderStats(name)
+        return self.providers[name]
+
+    def record_success(self, name: str, latency: float, result_count: int):
+        """Record a completed call; an empty result counts as a soft failure"""
+        stats = self._stats(name)
+        stats.requests += 1
+        stats._record_latency(latency)
+        empty = result_count == 0
+        if empty:
+            stats.empty_results += 1
+        else:
+            stats.successes += 1
+            stats.consecutive_failures = 0
+            stats.circuit_opens = 0
+        stats._update_rates(success=True, empty=empty)
+
+    def record_failure(self, name: str, latency: float, status_code: int | None = None, timed_out: bool = False):
+        """Record a failed call; 429/403 open the circuit immediately"""
+        stats = self._stats(name)
+        stats.requests += 1
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        if timed_out:
+            stats.timeouts += 1
+            stats._record_latency(latency)
+        if status_code == 429:
+            stats.rate_limited += 1
+        elif status_code == 403:
+            stats.forbidden += 1
+        stats._update_rates(success=False, empty=False)
+
+        if status_code in (403, 429) or stats.consecutive_failures >= CIRCUIT_FAILURE_THRESHOLD:
+            stats.open_circuit()
+            print(f"Circuit opened for provider {name} until {time.ctime(stats.circuit_open_until)}")
+
+    def record_cancelled(self, name: str):
+        """Record a call abandoned because another provider answered first"""
+        self._stats(name).cancelled += 1
+
+    def is_available(self, name: str) -> bool:
+        return self._stats(name).is_available()
+
+    def score(self, name: str) -> float:
+        """Expected useful results per second of waiting"""
+        stats = self._stats(name)
+        latency = stats.ewma_latency if stats.ewma_latency is not None else 1.0
+        return stats.yield_probability / (0.1 + latency)
+
+    def rank(self, names: List[str], include_unavailable: bool = False) -> List[str]:
+        """Providers ordered best first, skipping those with an open circuit"""
+        now = time.time()
+        candidates = [
+            name for name in names
+            if include_unavailable or self._stats(name).is_available(now)
+        ]
+        return sorted(candidates, key=self.score, reverse=True)
+
+    def fan_out_width(self, ranked: List[str], target: float = 0.95, max_width: int = 5) -> int:
+        """Smallest number of top providers whose combined chance of a usable result reaches target"""
+        miss_probability = 1.0
+        for width, name in enumerate(ranked[:max_width], start=1):
+            stats = self._stats(name)
+            yield_probability = stats.yield_probability if stats.requests else UNSEEN_YIELD_PROBABILITY
+            miss_probability *= 1.0 - yield_probability
+            if 1.0 - miss_probability >= target:
+                return width
+        return min(len(ranked), max_width)
+
+    def timeout_for(self, name: str, default: float) -> float:
+        """Per-provider timeout: 1.5x the observed p90 latency, within fixed bounds"""
+        p90 = self._stats(name).latency_percentile(90)
+        if p90 is None:
+            return default
+        return max(MIN_PROVIDER_TIMEOUT, min(MAX_PROVIDER_TIMEOUT, p90 * 1.5))
+
+    def hedge_delay(self, name: str, default: float) -> float:
+        """How long to wait on a provider before hedging: its observed p90 latency"""
+        p90 = self._stats(name).latency_percentile(90)
+        if p90 is None:
+            return default
+        return max(MIN_PROVIDER_TIMEOUT, min(MAX_PROVIDER_TIMEOUT, p90))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Live scoreboard of every provider, best first"""
+        now = time.time()
+        board = {}
+        for name in self.rank(list(self.providers), include_unavailable=True):
+            stats = self.providers[name]
+            p50 = stats.latency_percentile(50)
+            p90 = stats.latency_percentile(90)
+            board[name] = {
+                "score": round(self.score(name), 3),
+                "available": stats.is_available(now),
+                "circuit_cooldown_remaining": round(max(0.0, stats.circuit_open_until - now), 1),
+                "requests": stats.requests,
+                "successes": stats.successes,
+                "failures": stats.failures,
+                "empty_results": stats.empty_results,
+                "timeouts": stats.timeouts,
+                "cancelled": stats.cancelled,
+                "rate_limited_429": stats.rate_limited,
+                "forbidden_403": stats.forbidden,
+                "success_rate": round(stats.success_rate, 3),
+                "empty_rate": round(stats.empty_rate, 3),
+                "ewma_latency_ms": round(stats.ewma_latency * 1000, 1) if stats.ewma_latency is not None else None,
+                "p50_latency_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p90_latency_ms": round(p90 * 1000, 1) if p90 is not None else None,
+            }
+        return board
@@ -0,0 +1,249 @@
+import asyncio
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Tuple
+from urllib.parse import urlparse
+
+# Slowest a penalised bucket may refill: one request per this many seconds
+MAX_BACKOFF_INTERVAL = 30.0
+# Share bucket state between uvicorn workers through SQLite instead of process memory
+RATE_LIMIT_SHARED_STATE = os.getenv("RATE_LIMIT_SHARED_STATE", "false").lower() in ("1", "true", "yes")
+RATE_LIMIT_DB_PATH = os.getenv("RATE_LIMIT_DB_PATH", os.path.join(os.path.dirname(__file__), "rate_limits.db"))
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Sustained requests per second and how many may go out back to back"""
+    rate: float
+    burst: int = 1
+
+    @classmethod
+    def every(cls, seconds: float, burst: int = 1) -> "RateLimit":
+        return cls(rate=1.0 / seconds, burst=burst)
+
+
+@dataclass
+class BucketState:
+    tokens: float
+    updated: float
+    # Consecutive 403/429 responses not yet worked off; each one halves the refill rate
+    blocked_count: int = 0
+    blocked_until: float = 0.0
+
+
+def limiter_key(url_or_domain: str) -> str:
+    """Normalise a URL or host so "https://www.houzz.com/x" and "houzz.com" share a bucket"""
+    host = urlparse(url_or_domain).netloc if "://" in url_or_domain else url_or_domain
+    host = host.lower().split(":")[0]
+    return host[4:] if host.startswith("www.") else host
+
+
+class MemoryBucketStore:
+    """Bucket state in process memory"""
+
+    def __init__(self):
+        self._states: Dict[str, BucketState] = {}
+
+    async def update(self, key: str, change: Callable[[BucketState | None], Tuple[BucketState, Any]]) -> Any:
+        state, result = change(self._states.get(key))
+        self._states[key] = state
+        return result
+
+    async def load(self, key: str) -> BucketState | None:
+        return self._states.get(key)
+
+
+class SqliteBucketStore:
+    """
+    Bucket state in a SQLite table so several worker processes draw from the
+    same budget. Each update runs in a BEGIN IMMEDIATE transaction, which
+    serialises the read-modify-write across processes.
+    """
+
+    def __init__(self, path: str = RATE_LIMIT_DB_PATH):
+        self.path = path
+        self._ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        if not self._ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    key TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    blocked_count INTEGER NOT NULL DEFAULT 0,
+                    blocked_until REAL NOT NULL DEFAULT 0
+                )
+                """
+            )
+            self._ready = True
+        return conn
+
+    def _update(self, key: str, change) -> Any:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated, blocked_count, blocked_until FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            state, result = change(BucketState(*row) if row else None)
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated, blocked_count, blocked_until) VALUES (?, ?, ?, ?, ?)",
+                (key, state.tokens, state.updated, state.blocked_count, state.blocked_until),
+            )
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _load(self, key: str) -> BucketState | None:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated, blocked_count, blocked_until FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            return BucketState(*row) if row else None
+        finally:
+            conn.close()
+
+    async def update(self, key: str, change) -> Any:
+        return await asyncio.to_thread(self._update, key, change)
+
+    async def load(self, key: str) -> BucketState | None:
+        return await asyncio.to_thread(self._load, key)
+
+
+class DomainRateLimiter:
+    """
+    Token bucket per domain. Each bucket refills at its RateLimit.rate and
+    holds up to `burst` tokens. Waiters on the same domain queue on a FIFO
+    lock, so they are served in arrival order and never stampede together
+    when the bucket refills. A 403/429 reported through record_response()
+    empties the bucket and halves its refill rate, honouring Retry-After;
+    each later success recovers one step.
+    """
+
+    def __init__(self, limits: Dict[str, RateLimit], default: RateLimit | None = None, store=None):
+        self.limits = {limiter_key(key): limit for key, limit in limits.items()}
+        self.default = default
+        self.store = store or (SqliteBucketStore() if RATE_LIMIT_SHARED_STATE else MemoryBucketStore())
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._waiting: Dict[str, int] = {}
+        self.stats: Dict[str, Dict[str, float]] = {}
+
+    def _limit(self, key: str) -> RateLimit | None:
+        return self.limits.get(key, self.default)
+
+    def _stats(self, key: str) -> Dict[str, float]:
+        return self.stats.setdefault(key, {"acquired": 0, "waited": 0, "wait_total_s": 0.0, "blocked_responses": 0})
+
+    @staticmethod
+    def _effective_rate(limit: RateLimit, state: BucketState) -> float:
+        return max(1.0 / MAX_BACKOFF_INTERVAL, limit.rate / (2 ** state.blocked_count))
+
+    def _take(self, limit: RateLimit, now: float):
+        def change(state: BucketState | None) -> Tuple[BucketState, float]:
+            if state is None:
+                state = BucketState(tokens=float(limit.burst), updated=now)
+            rate = self._effective_rate(limit, state)
+            state.tokens = min(float(limit.burst), state.tokens + max(0.0, now - state.updated) * rate)
+            state.updated = now
+            if now < state.blocked_until:
+                return state, state.blocked_until - now
+            if state.tokens >= 1.0:
+                state.tokens -= 1.0
+                return state, 0.0
+            return state, (1.0 - state.tokens) / rate
+        return change
+
+    async def acquire(self, domain: str):
+        """Wait until a request to domain is allowed; unknown domains pass unless a default is set"""
+        key = limiter_key(domain)
+        limit = self._limit(key)
+        if limit is None:
+            return
+        stats = self._stats(key)
+        started = time.monotonic()
+        self._waiting[key] = self._waiting.get(key, 0) + 1
+        try:
+            async with self._locks.setdefault(key, asyncio.Lock()):
+                while True:
+                    wait = await self.store.update(key, self._take(limit, time.time()))
+                    if wait <= 0:
+                        break
+                    await asyncio.sleep(wait)
+        finally:
+            self._waiting[key] -= 1
+        waited = time.monotonic() - started
+        stats["acquired"] += 1
+        if waited > 0.001:
+            stats["waited"] += 1
+            stats["wait_total_s"] += waited
+
+    async def record_response(self, domain: str, status_code: int, retry_after: str | None = None):
+        """Adapt the domain's budget to a response: back off on 403/429, recover on success"""
+        key = limiter_key(domain)
+        limit = self._limit(key)
+        if limit is None:
+            return
+        now = time.time()
+        blocked = status_code in (403, 429)
+        if blocked:
+            self._stats(key)["blocked_responses"] += 1
+
+        def change(state: BucketState | None) -> Tuple[BucketState, None]:
+            if state is None:
+                state = BucketState(tokens=float(limit.burst), updated=now)
+            if blocked:
+                state.blocked_count += 1
+                state.tokens = 0.0
+                state.updated = now
+                try:
+                    cooldown = float(retry_after) if retry_after else 1.0 / self._effective_rate(limit, state)
+                except ValueError:
+                    cooldown = 1.0 / self._effective_rate(limit, state)
+                state.blocked_until = max(state.blocked_until, now + min(cooldown, MAX_BACKOFF_INTERVAL))
+            elif 200 <= status_code < 400 and state.blocked_count:
+                state.blocked_count -= 1
+            return state, None
+
+        await self.store.update(key, change)
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """Configured limits, live bucket state and wait counters per domain"""
+        board = {}
+        for key in sorted(set(self.limits) | set(self.stats)):
+            limit = self._limit(key)
+            state = await self.store.load(key)
+            board[key] = {
+                "rate_per_s": round(limit.rate, 3) if limit else None,
+                "burst": limit.burst if limit else None,
+                "tokens": round(state.tokens, 2) if state else None,
+                "blocked_count": state.blocked_count if state else 0,
+                "effective_rate_per_s": round(self._effective_rate(limit, state), 3) if limit and state else None,
+                "waiting": self._waiting.get(key, 0),
+                **self.stats.get(key, {}),
+            }
+        return board
+
+
+# Polite budgets for the scraped design sites, shared by every scraper in the process
+SCRAPER_RATE_LIMITS = {
+    "unsplash.com": RateLimit.every(2.0, burst=2),
+    "houzz.com": RateLimit.every(3.0, burst=2),
+    "architecturaldigest.com": RateLimit.every(3.0, burst=2),
+    "pexels.com": RateLimit.every(1.5, burst=2),
+    "pixabay.com": RateLimit.every(2.0, burst=2),
+}
+
+# Global instance
+scraper_rate_limiter = DomainRateLimiter(SCRAPER_RATE_LIMITS)
@@ -3,14 +3,13 @@ import random
 from typing import Dict, List, Any
 from fastapi import HTTPException
 from urllib.parse import quote
+from http_clients import http_clients
 
 class RawpixelService:
     def __init__(self):
         # Rawpixel free CC0 images API - no API key required!
         self.base_url = "https://www.rawpixel.com/api/v1/search"
         self.enabled = True  # Always enabled since it's free
-        # Create a shared client for better performance
-        self.client = httpx.AsyncClient(timeout=15.0)
     
     async def search_photos(
         self,
@@ -167,6 +166,7 @@ class RawpixelService:
         
         return formatted_data
     
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client()
@@ -3,22 +3,40 @@ import shutil
 import os
 import logging
 import time
-import asyncio
 import base64
 import json
+import secrets
 from contextlib import asynccontextmanager
+from typing import Any
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-import requests
+from fastapi.responses import JSONResponse, StreamingResponse
+import httpx
 from groq import Groq
 from hybrid_service import HybridImageService
-from database import init_db
+from fan_out import get_fan_out_stats
+from html_parsing import html_parse_executor
+from http_cache import http_response_cache
+from http_clients import http_clients
+from loop_lag import loop_lag_monitor
+from memory_cache import cache_sweeper, memory_cache_stats
+from rate_limiter import scraper_rate_limiter
+from database import (
+    init_db,
+    init_pool,
+    close_pool,
+    get_pool_stats,
+    start_write_behind,
+    stop_write_behind,
+    get_write_queue_stats,
+    encode_json,
+)
 from app.routers.vision_router import vision_router
 from floor_plan_service import generate_floor_plan
 from interior_ai_service import interior_ai_service
 from indian_ecommerce_service import IndianEcommerceService
 from interior_design_ecommerce_service import InteriorDesignEcommerceService
 from cache_service import CacheService
+from cache_warmup import FeedWarmup
 from app.routers.shops_router import router as shops_router
 from vastu_service import vastu_service, VastuRequest
 from groq_vastu_service import (
@@ -54,11 +72,12 @@ if os.environ.get("HUGGING_FACE_API_TOKEN"):
     print(f"Token length: {len(token)} characters")
     print(f"Token starts with: {token[:10]}...")
 
-# Initialize the hybrid service
-hybrid_service = HybridImageService()
+cache_service = CacheService()
+# Initialize the hybrid service; with a shared cache backend (CACHE_BACKEND=redis) feed pages
+# cached by one worker are served by all of them
+hybrid_service = HybridImageService(shared_cache=cache_service if cache_service.shared else None)
 indian_ecommerce_service = IndianEcommerceService()
 interior_design_ecommerce_service = InteriorDesignEcommerceService()
-cache_service = CacheService()
 
 
 @asynccontextmanager
@@ -70,13 +89,61 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"Database initialization failed: {e}")
         # Continue without failing - database is not critical for basic functionality
+    try:
+        pool = await init_pool()
+        print(f"Database connection pool opened ({pool.reader_count} readers, 1 writer)")
+    except Exception as e:
+        print(f"Database connection pool failed to open: {e}")
+        # Helpers fall back to one-off connections when the pool is not open
+    try:
+        await start_write_behind()
+        print("Database write-behind queue started")
+    except Exception as e:
+        print(f"Database write-behind queue failed to start: {e}")
+    try:
+        await http_clients.start()
+        print("Shared HTTP clients opened")
+    except Exception as e:
+        print(f"Shared HTTP clients failed to open: {e}")
+        # Clients are also created on first use
+    loop_lag_monitor.start()
+    cache_sweeper.start()
+    # Warm the feed cache in the background; /ready reports not ready until it is done or out of budget
+    feed_warmup.start()
     yield
     # Shutdown
+    await feed_warmup.stop()
+    await loop_lag_monitor.stop()
+    await cache_sweeper.stop()
     try:
         await hybrid_service.close()
         print("Services closed successfully")
     except Exception as e:
         print(f"Error closing services: {e}")
+    try:
+        await cache_service.close()
+    except Exception as e:
+        print(f"Error closing cache backend: {e}")
+    try:
+        await http_clients.close()
+        print("Shared HTTP clients closed")
+    except Exception as e:
+        print(f"Error closing shared HTTP clients: {e}")
+    try:
+        await stop_write_behind()
+        print("Database write-behind queue flushed")
+    except Exception as e:
+        print(f"Error flushing database write-behind queue: {e}")
+    try:
+        await close_pool()
+        print("Database connection pool closed")
+    except Exception as e:
+        print(f"Error closing database connection pool: {e}")
+    try:
+        html_parse_executor.shutdown()
+        print("HTML parsing workers stopped")
+    except Exception as e:
+        print(f"Error stopping HTML parsing workers: {e}")
 
 
 # Initialize Groq client for vision analysis
@@ -135,7 +202,7 @@ async def get_places(
             "apiKey": GEOAPIFY_API_KEY,
         }
 
-        resp = requests.get(url, params=params, timeout=10)
+        resp = await http_clients.client().get(url, params=params, timeout=10)
         if resp.status_code == 403:
             raise HTTPException(
                 status_code=403,
@@ -166,9 +233,9 @@ async def get_places(
         return {"results": results, "count": len(results)}
     except HTTPException:
         raise
-    except requests.Timeout:
+    except httpx.TimeoutException:
         raise HTTPException(status_code=504, detail="Geoapify request timed out")
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=502, detail=f"Geoapify request failed: {str(e)}"
         )
@@ -176,6 +243,14 @@ async def get_places(
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.get("/ready")
+async def readiness_check(response: Response):
+    """Readiness probe: 503 until the startup feed cache warm-up has finished or used up its budget"""
+    if not feed_warmup.ready:
+        response.status_code = 503
+    return {"ready": feed_warmup.ready, "warmup": feed_warmup.get_stats()}
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint for monitoring"""
@@ -192,6 +267,83 @@ async def health_check():
     }
 
 
+@app.get("/metrics/database")
+async def get_database_metrics():
+    """SQLite connection pool and write-behind queue metrics"""
+    return {"pool": get_pool_stats(), "write_queue": get_write_queue_stats()}
+
+
+@app.get("/metrics/cache")
+async def get_cache_metrics():
+    """Feed image cache hit/miss counters per key type, the scraped page cache and the in-memory caches"""
+    return {
+        "image_cache": hybrid_service.get_cache_stats(),
+        "prefetch": hybrid_service.prefetch_scheduler.get_stats(),
+        "coalescing": hybrid_service.get_coalescing_stats(),
+        "http_responses": await http_response_cache.get_stats(),
+        "memory": memory_cache_stats(),
+        "sweeper": cache_sweeper.get_stats(),
+        "cache_service": cache_service.get_stats(),
+    }
+
+
+# /cache/warm fans out pages x queries provider searches, so it is capped and kept off the public API:
+# callers must send CACHE_WARM_TOKEN as X-Admin-Token, or come from loopback when no token is configured
+CACHE_WARM_MAX_QUERIES = int(os.getenv("CACHE_WARM_MAX_QUERIES", "10"))
+CACHE_WARM_TOKEN = os.getenv("CACHE_WARM_TOKEN")
+LOOPBACK_HOSTS = {"127.0.0.1", "::1", "localhost"}
+
+
+def require_cache_admin(request: Request):
+    """Reject /cache/warm callers without the admin token (or, with none configured, from off the host)"""
+    if CACHE_WARM_TOKEN:
+        if not secrets.compare_digest(request.headers.get("x-admin-token", ""), CACHE_WARM_TOKEN):
+            raise HTTPException(status_code=403, detail="Cache warm-up requires a valid X-Admin-Token")
+    elif not request.client or request.client.host not in LOOPBACK_HOSTS:
+        raise HTTPException(status_code=403, detail="Cache warm-up is only available from localhost")
+
+
+@app.post("/cache/warm")
+async def warm_feed_cache(
+    request: Request,
+    queries: list[str] | None = Query(
+        None, description="Feed queries to warm (as passed to /feed); defaults to the unfiltered feed"
+    ),
+    pages: int = Query(3, ge=1, le=20, description="Warm pages 1..pages of each query"),
+    per_page: int = Query(60, ge=1, le=100, description="Page size used by /feed"),
+):
+    """Fetch and cache the first pages of the given feed queries, returning warm coverage"""
+    require_cache_admin(request)
+    if queries and len(queries) > CACHE_WARM_MAX_QUERIES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {CACHE_WARM_MAX_QUERIES} queries can be warmed per request",
+        )
+    combined = [build_feed_query(query) for query in (queries or [""])]
+    return await cache_service.pre_cache_next_pages(hybrid_service, combined, range(1, pages + 1), per_page)
+
+
+@app.get("/metrics/providers")
+async def get_provider_metrics():
+    """Live image provider scoreboard (latency, success/empty rates, 429/403 counts, circuit state) and hedging counters"""
+    return {
+        "providers": hybrid_service.get_provider_scoreboard(),
+        "hedging": hybrid_service.get_hedge_stats(),
+    }
+
+
+@app.get("/metrics/concurrency")
+async def get_concurrency_metrics():
+    """Fan-out counters per call site, HTML parsing pool, shared HTTP clients, event loop lag and scraper budgets"""
+    return {
+        "fan_out": get_fan_out_stats(),
+        "html_parsing": html_parse_executor.get_stats(),
+        "http_clients": http_clients.get_stats(),
+        "event_loop": loop_lag_monitor.get_stats(),
+        "scraper_rate_limits": await scraper_rate_limiter.get_stats(),
+    }
+
+
 @app.post("/floor-plan")
 async def create_floor_plan(request: Request):
     try:
@@ -201,13 +353,117 @@ async def create_floor_plan(request: Request):
         if not prompt:
             raise HTTPException(status_code=400, detail="Prompt not provided")
 
-        image_bytes = generate_floor_plan(prompt, model)
+        image_bytes = await generate_floor_plan(prompt, model)
 
         return Response(content=image_bytes, media_type="image/png")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+# Design terms used when the feed is requested without any specific filters
+DEFAULT_FEED_TERMS = [
+    "architecture",
+    "interior design",
+    "modern interior",
+    "minimalist design",
+    "scandinavian interior",
+    "industrial design",
+    "luxury home",
+    "contemporary architecture",
+    "residential design",
+    "commercial architecture",
+    "kitchen design",
+    "bathroom design",
+    "living room",
+    "bedroom design",
+    "office interior",
+    "restaurant design",
+]
+
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered by database.encode_json (orjson when installed).
+
+    Returning it from an endpoint skips FastAPI's jsonable_encoder pass over
+    every feed item, which costs far more than encoding the page itself.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return encode_json(content)
+
+
+def build_feed_query(
+    query: str,
+    style: str | None = None,
+    room_type: str | None = None,
+    layout_type: str | None = None,
+    lighting: str | None = None,
+    palette_mode: str | None = None,
+    colors: str | None = None,
+    materials: str | None = None,
+) -> str:
+    """Build the combined provider query from the feed filters"""
+    filter_terms = []
+    if style and style.lower() != "all":
+        filter_terms.append(style)
+    if query:
+        filter_terms.append(query)
+    if room_type:
+        filter_terms.append(room_type)
+    if layout_type:
+        filter_terms.append(layout_type)
+    if lighting:
+        filter_terms.append(lighting)
+    if palette_mode:
+        filter_terms.append(palette_mode)
+    if colors:
+        filter_terms.extend(colors.split(","))
+    if materials:
+        filter_terms.extend(materials.split(","))
+
+    # Add default design terms if no specific query or minimal query
+    if not filter_terms or (
+        len(filter_terms) == 1
+        and filter_terms[0].lower()
+        in ["", " ", "design", "architecture", "interior"]
+    ):
+        filter_terms.extend(DEFAULT_FEED_TERMS)
+    elif not any(
+        term.lower()
+        in [
+            "design",
+            "architecture",
+            "interior",
+            "home",
+            "room",
+            "kitchen",
+            "bathroom",
+            "living",
+            "bedroom",
+            "office",
+        ]
+        for term in filter_terms
+    ):
+        # If the query doesn't contain design-related terms, add some
+        filter_terms.extend(["interior design", "architecture"])
+
+    return " ".join(filter_terms)
+
+
+
+def feed_client_id(request: Request) -> str:
+    """Who is scrolling, for per-client prefetch cancellation: X-Client-Id if sent, else address and user agent"""
+    client_id = request.headers.get("x-client-id")
+    if client_id:
+        return client_id
+    host = request.client.host if request.client else ""
+    return f"{host}|{request.headers.get('user-agent', '')}"
+
+# Startup warm-up of the unfiltered feed (the same query /feed and /feed/mobile build with no filters)
+feed_warmup = FeedWarmup(cache_service, hybrid_service, [build_feed_query("")])
+
+
 @app.get("/feed/mobile")
 async def get_mobile_feed(
     query: str = Query("", description="Search query for images"),
@@ -229,71 +485,10 @@ async def get_mobile_feed(
 ):
     """Mobile-optimized feed endpoint with faster loading and smaller images"""
     try:
-        # Build combined query with all filters (same as regular feed)
-        filter_terms = []
-        if style and style.lower() != "all":
-            filter_terms.append(style)
-        if query:
-            filter_terms.append(query)
-        if room_type:
-            filter_terms.append(room_type)
-        if layout_type:
-            filter_terms.append(layout_type)
-        if lighting:
-            filter_terms.append(lighting)
-        if palette_mode:
-            filter_terms.append(palette_mode)
-        if colors:
-            filter_terms.extend(colors.split(","))
-        if materials:
-            filter_terms.extend(materials.split(","))
-
-        # Add default design terms if no specific query or minimal query
-        if not filter_terms or (
-            len(filter_terms) == 1
-            and filter_terms[0].lower()
-            in ["", " ", "design", "architecture", "interior"]
-        ):
-            filter_terms.extend(
-                [
-                    "architecture",
-                    "interior design",
-                    "modern interior",
-                    "minimalist design",
-                    "scandinavian interior",
-                    "industrial design",
-                    "luxury home",
-                    "contemporary architecture",
-                    "residential design",
-                    "commercial architecture",
-                    "kitchen design",
-                    "bathroom design",
-                    "living room",
-                    "bedroom design",
-                    "office interior",
-                    "restaurant design",
-                ]
-            )
-        elif not any(
-            term.lower()
-            in [
-                "design",
-                "architecture",
-                "interior",
-                "home",
-                "room",
-                "kitchen",
-                "bathroom",
-                "living",
-                "bedroom",
-                "office",
-            ]
-            for term in filter_terms
-        ):
-            # If the query doesn't contain design-related terms, add some
-            filter_terms.extend(["interior design", "architecture"])
-
-        combined = " ".join(filter_terms)
+        # Build combined query with all filters
+        combined = build_feed_query(
+            query, style, room_type, layout_type, lighting, palette_mode, colors, materials
+        )
         print(
             f"Mobile feed endpoint called with query: '{query}', style: {style}, combined: '{combined}'"
         )
@@ -316,14 +511,14 @@ async def get_mobile_feed(
         # Always indicate there's more to prevent "No more designs to load" - this ensures infinite scroll continues
         has_more = True
 
-        return {
+        return FastJSONResponse({
             "results": result,
             "page": page,
             "per_page": per_page,
             "has_more": has_more,
             "query": combined,
             "mobile_optimized": True,
-        }
+        })
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
@@ -332,6 +527,7 @@ async def get_mobile_feed(
 
 @app.get("/feed")
 async def get_feed(
+    request: Request,
     query: str = Query("", description="Search query for images"),
     style: str | None = Query(
         None, description="Optional style to bias results (e.g., Modern, Minimalist)"
@@ -352,70 +548,9 @@ async def get_feed(
 ):
     try:
         # Build combined query with all filters
-        filter_terms = []
-        if style and style.lower() != "all":
-            filter_terms.append(style)
-        if query:
-            filter_terms.append(query)
-        if room_type:
-            filter_terms.append(room_type)
-        if layout_type:
-            filter_terms.append(layout_type)
-        if lighting:
-            filter_terms.append(lighting)
-        if palette_mode:
-            filter_terms.append(palette_mode)
-        if colors:
-            filter_terms.extend(colors.split(","))
-        if materials:
-            filter_terms.extend(materials.split(","))
-
-        # Add default design terms if no specific query or minimal query
-        if not filter_terms or (
-            len(filter_terms) == 1
-            and filter_terms[0].lower()
-            in ["", " ", "design", "architecture", "interior"]
-        ):
-            filter_terms.extend(
-                [
-                    "architecture",
-                    "interior design",
-                    "modern interior",
-                    "minimalist design",
-                    "scandinavian interior",
-                    "industrial design",
-                    "luxury home",
-                    "contemporary architecture",
-                    "residential design",
-                    "commercial architecture",
-                    "kitchen design",
-                    "bathroom design",
-                    "living room",
-                    "bedroom design",
-                    "office interior",
-                    "restaurant design",
-                ]
-            )
-        elif not any(
-            term.lower()
-            in [
-                "design",
-                "architecture",
-                "interior",
-                "home",
-                "room",
-                "kitchen",
-                "bathroom",
-                "living",
-                "bedroom",
-                "office",
-            ]
-            for term in filter_terms
-        ):
-            # If the query doesn't contain design-related terms, add some
-            filter_terms.extend(["interior design", "architecture"])
-
-        combined = " ".join(filter_terms)
+        combined = build_feed_query(
+            query, style, room_type, layout_type, lighting, palette_mode, colors, materials
+        )
         print(
             f"Feed endpoint called with query: '{query}', style: {style}, room_type: {room_type}, layout_type: {layout_type}, combined: '{combined}'"
         )
@@ -436,26 +571,70 @@ async def get_feed(
 
         print(f"Feed endpoint returning {len(result)} results")
 
-        # Start background task to cache next few pages
-        asyncio.create_task(hybrid_service.cache_next_pages(combined, page, per_page))
+        # Queue the next few pages for background prefetching (deduplicated per query)
+        hybrid_service.schedule_prefetch(combined, page, per_page, client=feed_client_id(request))
 
         # Return a response that includes pagination info for infinite scrolling
         # Always indicate there's more to prevent "No more designs to load" - this ensures infinite scroll continues
         has_more = True
 
-        return {
+        return FastJSONResponse({
             "results": result,
             "page": page,
             "per_page": per_page,
             "has_more": has_more,
             "query": combined,
-        }
+        })
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 
+@app.get("/feed/stream")
+async def stream_feed(
+    request: Request,
+    query: str = Query("", description="Search query for images"),
+    style: str | None = Query(
+        None, description="Optional style to bias results (e.g., Modern, Minimalist)"
+    ),
+    room_type: str | None = Query(None, description="Room type filter"),
+    layout_type: str | None = Query(None, description="Layout type filter"),
+    lighting: str | None = Query(None, description="Lighting filter"),
+    palette_mode: str | None = Query(None, description="Palette mode filter"),
+    colors: str | None = Query(None, description="Colors filter (comma-separated)"),
+    materials: str | None = Query(
+        None, description="Materials filter (comma-separated)"
+    ),
+    page: int = Query(1, ge=1, description="Page number"),
+    per_page: int = Query(60, ge=1, le=100, description="Number of items per page"),
+):
+    """Progressive feed: NDJSON frames with image batches as each provider completes,
+    followed by a summary frame"""
+    combined = build_feed_query(
+        query, style, room_type, layout_type, lighting, palette_mode, colors, materials
+    )
+
+    async def frames():
+        try:
+            async for frame in hybrid_service.stream_photos_aggregated(
+                combined, page, per_page
+            ):
+                if frame["type"] == "summary":
+                    frame.update(
+                        {"page": page, "per_page": per_page, "has_more": True, "query": combined}
+                    )
+                yield encode_json(frame) + b"\n"
+        except Exception as e:
+            logger.error(f"Streaming feed failed: {e}")
+            yield encode_json({"type": "error", "detail": str(e)}) + b"\n"
+            return
+        # Queue the next few pages for background prefetching (deduplicated per query)
+        hybrid_service.schedule_prefetch(combined, page, per_page, client=feed_client_id(request))
+
+    return StreamingResponse(frames(), media_type="application/x-ndjson")
+
+
 @app.post("/upload")
 async def upload_design(
     file: UploadFile = File(..., description="Image file to upload"),
@@ -481,6 +660,7 @@ async def upload_design(
 
 @app.get("/design-feed")
 async def get_design_feed(
+    request: Request,
     query: str = Query("", description="Search query for images"),
     style: str | None = Query(
         None, description="Optional style to bias results (e.g., Modern, Minimalist)"
@@ -501,70 +681,9 @@ async def get_design_feed(
 ):
     try:
         # Build combined query with all filters
-        filter_terms = []
-        if style and style.lower() != "all":
-            filter_terms.append(style)
-        if query:
-            filter_terms.append(query)
-        if room_type:
-            filter_terms.append(room_type)
-        if layout_type:
-            filter_terms.append(layout_type)
-        if lighting:
-            filter_terms.append(lighting)
-        if palette_mode:
-            filter_terms.append(palette_mode)
-        if colors:
-            filter_terms.extend(colors.split(","))
-        if materials:
-            filter_terms.extend(materials.split(","))
-
-        # Add default design terms if no specific query or minimal query
-        if not filter_terms or (
-            len(filter_terms) == 1
-            and filter_terms[0].lower()
-            in ["", " ", "design", "architecture", "interior"]
-        ):
-            filter_terms.extend(
-                [
-                    "architecture",
-                    "interior design",
-                    "modern interior",
-                    "minimalist design",
-                    "scandinavian interior",
-                    "industrial design",
-                    "luxury home",
-                    "contemporary architecture",
-                    "residential design",
-                    "commercial architecture",
-                    "kitchen design",
-                    "bathroom design",
-                    "living room",
-                    "bedroom design",
-                    "office interior",
-                    "restaurant design",
-                ]
-            )
-        elif not any(
-            term.lower()
-            in [
-                "design",
-                "architecture",
-                "interior",
-                "home",
-                "room",
-                "kitchen",
-                "bathroom",
-                "living",
-                "bedroom",
-                "office",
-            ]
-            for term in filter_terms
-        ):
-            # If the query doesn't contain design-related terms, add some
-            filter_terms.extend(["interior design", "architecture"])
-
-        combined = " ".join(filter_terms)
+        combined = build_feed_query(
+            query, style, room_type, layout_type, lighting, palette_mode, colors, materials
+        )
 
         if use_aggregated:
             # Use the new aggregated search for unlimited designs
@@ -582,20 +701,20 @@ async def get_design_feed(
 
         print(f"Feed endpoint returning {len(result)} results")
 
-        # Start background task to cache next few pages
-        asyncio.create_task(hybrid_service.cache_next_pages(combined, page, per_page))
+        # Queue the next few pages for background prefetching (deduplicated per query)
+        hybrid_service.schedule_prefetch(combined, page, per_page, client=feed_client_id(request))
 
         # Return a response that includes pagination info for infinite scrolling
         # Always indicate there's more to prevent "No more designs to load" - this ensures infinite scroll continues
         has_more = True
 
-        return {
+        return FastJSONResponse({
             "results": result,
             "page": page,
             "per_page": per_page,
             "has_more": has_more,
             "query": combined,
-        }
+        })
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
@@ -633,7 +752,7 @@ async def generate_interior_design(request: Request):
         try:
             from multi_ai_service import multi_ai_service
 
-            image_bytes, used_placeholder = multi_ai_service.generate_interior_image(
+            image_bytes, used_placeholder = await multi_ai_service.generate_interior_image(
                 prompt=prompt,
                 style=style,
                 room_type=room_type,
@@ -648,7 +767,7 @@ async def generate_interior_design(request: Request):
 
         # Fallback to original service
         logger.info("🔄 Falling back to original interior AI service...")
-        image_bytes = interior_ai_service.generate_interior_design(
+        image_bytes = await interior_ai_service.generate_interior_design(
             prompt=prompt,
             style=style,
             room_type=room_type,
@@ -702,7 +821,7 @@ async def generate_architecture_design(request: Request):
         steps = data.get("steps", 50)
         guidance_scale = data.get("guidance_scale", 7.5)
 
-        image_bytes = interior_ai_service.generate_architecture_design(
+        image_bytes = await interior_ai_service.generate_architecture_design(
             prompt=prompt,
             building_type=building_type,
             architectural_style=architectural_style,
@@ -1166,7 +1285,7 @@ async def generate_texture(request: Request):
         if not prompt:
             raise HTTPException(status_code=400, detail="Prompt not provided")
 
-        image_bytes = interior_ai_service.generate_texture(prompt)
+        image_bytes = await interior_ai_service.generate_texture(prompt)
 
         return Response(content=image_bytes, media_type="image/png")
     except Exception as e:
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test script for CacheService and its pluggable backends
+"""
+import asyncio
+import sys
+import os
+import tempfile
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from cache_backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend, decode_value, encode_value
+from cache_service import CacheService
+
+FEED_PAGE = [{"id": "pexels_1", "url": "https://example.com/1.jpg", "tags": ["modern", "kitchen"], "width": 1200}]
+
+
+async def _exercise(service: CacheService):
+    """Round trip, multi-get/-set, namespaces and invalidation on any backend"""
+    assert await service.set("page_1", FEED_PAGE, namespace="feed")
+    assert await service.set_many({"page_2": FEED_PAGE, "page_3": []}, expiry=60, namespace="feed")
+    assert await service.set("page_1", {"other": True}, namespace="shops")
+
+    assert await service.get("page_1", namespace="feed") == FEED_PAGE
+    found = await service.get_many(["page_1", "page_2", "page_3", "page_9"], namespace="feed")
+    assert set(found) == {"page_1", "page_2", "page_3"} and found["page_3"] == []
+
+    assert await service.invalidate("feed") == 3
+    assert await service.get_many(["page_1", "page_2"], namespace="feed") == {}
+    assert await service.get("page_1", namespace="shops") == {"other": True}
+
+    assert await service.delete("page_1", namespace="shops")
+    assert await service.get("page_1", namespace="shops") is None
+    return service.get_stats()
+
+
+def test_memory_backend():
+    """The in-process backend supports the full interface, including expiry"""
+    async def check():
+        service = CacheService(MemoryCacheBackend("test_cache_service"))
+        stats = await _exercise(service)
+        await service.set("short", 1, expiry=0.05)
+        await asyncio.sleep(0.06)
+        await service.clear_expired()
+        return stats, await service.get("short")
+
+    stats, expired = asyncio.run(check())
+    print(f"Stats: {stats}")
+    assert expired is None
+    assert stats["hits"] == 5 and stats["misses"] == 4
+    assert stats["backend"]["backend"] == "memory"
+
+
+def test_backend_failures_are_misses():
+    """A backend that is down degrades to misses instead of raising"""
+    class DownBackend(CacheBackend):
+        async def get_many(self, keys):
+            raise ConnectionError("connection refused")
+
+        async def set_many(self, items, ttl):
+            raise ConnectionError("connection refused")
+
+    async def check():
+        service = CacheService(DownBackend())
+        return await service.get("k"), await service.set("k", 1), service.get_stats()
+
+    value, stored, stats = asyncio.run(check())
+    assert value is None and stored is False
+    assert stats["errors"] == 2 and stats["misses"] == 1
+
+
+def test_serialization_round_trip():
+    """Values survive the binary encoding used by the Redis backend"""
+    value = {"images": FEED_PAGE, "total": 3, "ratio": 0.5, "next": None}
+    assert decode_value(encode_value(value)) == value
+
+
+def test_redis_backend_shares_entries_between_workers():
+    """Two services (as in two workers) on one Redis see each other's writes, in one round trip per batch"""
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def check():
+        server = fakeredis.FakeServer()
+        worker_a = CacheService(RedisCacheBackend(client=fakeredis.FakeAsyncRedis(server=server), prefix="test"))
+        worker_b = CacheService(RedisCacheBackend(client=fakeredis.FakeAsyncRedis(server=server), prefix="test"))
+
+        stats = await _exercise(worker_a)
+        await worker_a.set_many({f"page_{page}": FEED_PAGE for page in range(10)}, namespace="feed")
+        shared = await worker_b.get_many([f"page_{page}" for page in range(10)], namespace="feed")
+        return stats, shared, worker_b.get_stats()
+
+    stats, shared, reader_stats = asyncio.run(check())
+    assert stats["backend"]["backend"] == "redis"
+    assert len(shared) == 10 and shared["page_0"] == FEED_PAGE
+    assert reader_stats["backend"]["round_trips"] == 1
+
+
+def test_feed_pages_shared_between_workers():
+    """With a shared backend, a feed page cached by one worker is served to another without touching SQLite"""
+    fakeredis = pytest.importorskip("fakeredis")
+    import database
+    from hybrid_service import HybridImageService
+
+    async def check():
+        server = fakeredis.FakeServer()
+        worker_a, worker_b = (
+            HybridImageService(shared_cache=CacheService(RedisCacheBackend(client=fakeredis.FakeAsyncRedis(server=server), prefix="test")))
+            for _ in range(2)
+        )
+        for page in range(1, 4):
+            await worker_a._store_page("unlimited", "aggregated", "Modern Kitchen", page, [{**FEED_PAGE[0], "id": f"p{page}"}])
+
+        # Worker B gets an empty database of its own, so every hit below came from the shared tier
+        database.DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "worker_b.db")
+        await database.init_db()
+        cached = await worker_b._get_cached_page("kitchen modern", 2, ("aggregated",))
+        shared_stats = worker_b.shared_cache.get_stats()
+        assert cached is not None and cached[0][0]["id"] == "p2" and cached[1] < 60
+        assert shared_stats["hits"] == 1 and shared_stats["backend"]["round_trips"] == 1
+        assert worker_b._recall_page("aggregated:kitchen modern", 2, 60) is not None
+
+        # A page range is fetched in one round trip and then served from memory
+        results = await worker_b.get_extended_cached_results("modern kitchen", 1, 3, 20)
+        assert [item["id"] for item in results] == ["p1", "p2", "p3"]
+        return worker_b.shared_cache.get_stats()["backend"]["round_trips"]
+
+    original_path = database.DATABASE_PATH
+    database.DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "worker_a.db")
+    try:
+        asyncio.run(database.init_db())
+        assert asyncio.run(check()) == 2
+    finally:
+        database.DATABASE_PATH = original_path
+
+
+def test_pre_cache_next_pages_reports_coverage():
+    """Warming fetches every page through the image service with bounded concurrency and reports coverage"""
+    class FakeImageService:
+        def __init__(self):
+            self.running = 0
+            self.peak = 0
+            self.cached = {("modern kitchen", 1)}
+
+        async def warm_page(self, query, page, per_page):
+            if (query, page) in self.cached:
+                return True, per_page
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            await asyncio.sleep(0.02)
+            self.running -= 1
+            if query == "broken":
+                raise RuntimeError("all providers failed")
+            return False, 0 if page == 3 else per_page
+
+    async def check():
+        service = CacheService(MemoryCacheBackend("test_pre_cache"))
+        images = FakeImageService()
+        report = await service.pre_cache_next_pages(
+            images, ["modern kitchen", "broken"], range(1, 4), per_page=20, max_concurrency=2
+        )
+        return report, images.peak, service.get_stats()["last_warm"]
+
+    report, peak, last = asyncio.run(check())
+    print(f"Warm report: {report}")
+    assert peak == 2
+    assert report["pages"] == 6 and report["already_cached"] == 1 and report["warmed"] == 1
+    assert report["empty"] == 1 and report["failed"] == 3
+    assert report["coverage"] == 2 / 6
+    assert report["per_query"] == {"modern kitchen": "2/3", "broken": "0/3"}
+    assert last == report
+
+
+if __name__ == "__main__":
+    print("Testing cache service...")
+    test_memory_backend()
+    test_backend_failures_are_misses()
+    test_serialization_round_trip()
+    test_pre_cache_next_pages_reports_coverage()
+    print("✅ Cache service tests passed")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script for the startup feed cache warm-up
+"""
+import asyncio
+import sys
+import os
+import tempfile
+import time
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import database
+from cache_backends import MemoryCacheBackend
+from cache_service import CacheService
+from cache_warmup import FeedWarmup
+
+
+class SlowImageService:
+    """Stands in for HybridImageService.warm_page with a fixed fetch latency"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.warmed = []
+
+    async def warm_page(self, query, page, per_page):
+        await asyncio.sleep(self.delay)
+        self.warmed.append((query, page))
+        return False, per_page
+
+
+async def _with_temp_database(check):
+    original_path = database.DATABASE_PATH
+    database.DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "cache.db")
+    try:
+        await database.init_db()
+        return await check()
+    finally:
+        database.DATABASE_PATH = original_path
+
+
+def test_popular_queries_from_recent_cache_rows():
+    """Queries with the most cached pages across aggregated/prefetch keys come first; trending rows are ignored"""
+    async def check():
+        pages = {"aggregated:kitchen modern": [1, 2], "prefetch:kitchen modern": [3, 4], "aggregated:loft": [1, 2, 3], "trending:": [1, 2, 3, 4, 5]}
+        await database.cache_images_batch([
+            {"provider": "aggregated", "query": key, "page": page, "data": [{"id": page}]}
+            for key, numbers in pages.items() for page in numbers
+        ])
+        assert await database.get_popular_cached_queries(limit=5) == ["kitchen modern", "loft"]
+        assert await database.get_popular_cached_queries(limit=1) == ["kitchen modern"]
+
+    asyncio.run(_with_temp_database(check))
+
+
+def test_warmup_covers_default_and_popular_queries():
+    """The default query and popular ones (deduplicated by normalized key) are warmed, then the app is ready"""
+    async def check():
+        await database.cache_images("aggregated", "aggregated:bedroom scandinavian", 1, [{"id": 1}])
+        await database.cache_images("aggregated", "aggregated:architecture design interior", 1, [{"id": 1}])
+        images = SlowImageService(0.01)
+        warmup = FeedWarmup(
+            CacheService(MemoryCacheBackend("test_warmup")), images, ["interior design architecture"],
+            pages=2, budget=5, enabled=True,
+        )
+        assert not warmup.ready
+        warmup.start()
+        assert await warmup.wait(5)
+        return images.warmed, warmup.get_stats()
+
+    warmed, stats = asyncio.run(_with_temp_database(check))
+    print(f"Warm-up stats: {stats}")
+    assert stats["ready"] and stats["report"]["coverage"] == 1.0
+    assert sorted(warmed) == [
+        ("bedroom scandinavian", 1), ("bedroom scandinavian", 2),
+        ("interior design architecture", 1), ("interior design architecture", 2),
+    ]
+
+
+def test_warmup_respects_time_budget():
+    """A slow upstream cannot hold readiness back past the budget"""
+    async def check():
+        warmup = FeedWarmup(
+            CacheService(MemoryCacheBackend("test_warmup_budget")), SlowImageService(5.0), ["modern kitchen"],
+            pages=3, popular_queries=0, budget=0.2, enabled=True,
+        )
+        started = time.monotonic()
+        warmup.start()
+        await warmup.wait(2)
+        return time.monotonic() - started, warmup.get_stats()
+
+    elapsed, stats = asyncio.run(check())
+    assert stats["ready"] and elapsed < 1.0
+    assert stats["report"]["unfinished"] == 3 and stats["report"]["coverage"] == 0.0
+
+
+if __name__ == "__main__":
+    print("Testing feed warm-up...")
+    test_popular_queries_from_recent_cache_rows()
+    test_warmup_covers_default_and_popular_queries()
+    test_warmup_respects_time_budget()
+    print("✅ Feed warm-up tests passed")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Test script for the pooled database layer and write-behind queue
+"""
+import asyncio
+import json
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import database
+from hybrid_service import cache_query_key
+
+
+async def _with_temp_database(check):
+    """Run a check against a throwaway database with the pool and queue running"""
+    original_path = database.DATABASE_PATH
+    database.DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "cache.db")
+    try:
+        await database.init_db()
+        await database.init_pool(readers=2)
+        await database.start_write_behind()
+        try:
+            await check()
+        finally:
+            await database.stop_write_behind()
+            await database.close_pool()
+    finally:
+        database.DATABASE_PATH = original_path
+
+
+def test_pool_serves_concurrent_reads():
+    """Concurrent reads share the pooled reader connections"""
+    async def check():
+        await database.cache_images("unlimited", "modern kitchen", 1, [{"id": "a"}])
+        await database._write_queue.flush()
+        results = await asyncio.gather(*[
+            database.get_cached_images("unlimited", "modern kitchen", 1) for _ in range(10)
+        ])
+        assert all(result == [{"id": "a"}] for result in results)
+
+        stats = database.get_pool_stats()
+        print(f"Pool stats: {stats}")
+        assert stats["open"] and stats["readers_total"] == 2
+        assert stats["readers_idle"] == 2
+        assert stats["reader_acquires"] >= 10
+
+    asyncio.run(_with_temp_database(check))
+
+
+def test_pool_readers_single_writer_and_pragmas():
+    """Readers are borrowed side by side, even during a write; writes are serialized and roll back on error"""
+    async def count(db, where: str = "") -> int:
+        async with db.execute(f"SELECT COUNT(*) FROM items {where}") as cursor:
+            return (await cursor.fetchone())[0]
+
+    async def check():
+        pool = database.SQLiteConnectionPool(os.path.join(tempfile.mkdtemp(), "pool.db"), readers=2)
+        await pool.open()
+        try:
+            for db in [pool._writer, *pool._reader_connections]:
+                async with db.execute("PRAGMA journal_mode") as cursor:
+                    assert (await cursor.fetchone())[0] == "wal"
+                async with db.execute("PRAGMA synchronous") as cursor:
+                    assert (await cursor.fetchone())[0] == 1  # NORMAL
+                async with db.execute("PRAGMA busy_timeout") as cursor:
+                    assert (await cursor.fetchone())[0] == 5000
+
+            async with pool.writer() as db:
+                await db.execute("CREATE TABLE items (id INTEGER)")
+                await db.execute("INSERT INTO items VALUES (1)")
+                await db.commit()
+
+            # Both readers can be held at once; a third borrower waits for one to come back
+            release = asyncio.Event()
+
+            async def hold_reader():
+                async with pool.reader() as db:
+                    assert await count(db) == 1
+                    await release.wait()
+
+            holders = [asyncio.create_task(hold_reader()) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            assert pool.get_stats()["readers_idle"] == 0
+            assert sum(task.done() for task in holders) == 0 and pool.stats["reader_acquires"] == 2
+            release.set()
+            await asyncio.wait_for(asyncio.gather(*holders), 1.0)
+            assert pool.get_stats()["readers_idle"] == 2 and pool.stats["reader_acquires"] == 3
+
+            # Concurrent writers take turns on the single connection
+            active, overlaps = 0, 0
+
+            async def write(value: int):
+                nonlocal active, overlaps
+                async with pool.writer() as db:
+                    active += 1
+                    overlaps += active > 1
+                    await db.execute("INSERT INTO items VALUES (?)", (value,))
+                    await asyncio.sleep(0.01)
+                    await db.commit()
+                    active -= 1
+
+            await asyncio.gather(*[write(value) for value in range(2, 7)])
+            assert overlaps == 0
+
+            # Under WAL a reader is not blocked by an open write and sees only committed rows
+            async with pool.writer() as db:
+                await db.execute("INSERT INTO items VALUES (7)")
+                assert pool.get_stats()["writer_busy"]
+                async with pool.reader() as reader:
+                    assert await count(reader) == 6
+                await db.commit()
+
+            # A failing block is rolled back and leaves the writer usable
+            try:
+                async with pool.writer() as db:
+                    await db.execute("INSERT INTO items VALUES (99)")
+                    raise RuntimeError("write failed")
+            except RuntimeError:
+                pass
+            async with pool.writer() as db:
+                await db.commit()
+            async with pool.reader() as db:
+                assert await count(db) == 7 and await count(db, "WHERE id = 99") == 0
+            stats = pool.get_stats()
+            assert stats["writer_acquires"] == 9 and not stats["writer_busy"]
+        finally:
+            await pool.close()
+        assert not pool.is_open
+
+    asyncio.run(check())
+
+
+def test_write_behind_batches_and_flushes():
+    """Queued writes are readable before the flush and persisted after it"""
+    async def check():
+        for page in range(1, 6):
+            assert await database.cache_images("aggregated", "loft", page, [{"id": page}])
+        for _ in range(20):
+            assert await database.record_analytics_event("view")
+        recorded_by = datetime.now()
+
+        # Still queued, but served from the pending overlay
+        assert (await database.get_cached_images_for_keys(["loft"], 3))[1] == [{"id": 3}]
+
+        await asyncio.sleep(0.1)
+        flushed = await database._write_queue.flush()
+        assert flushed == 25
+        assert database.get_write_queue_stats()["depth"] == 0
+        assert await database.get_cached_images("aggregated", "loft", 5) == [{"id": 5}]
+
+        summary = await database.get_analytics_summary()
+        assert summary["view"]["events"] == 20
+        # Events keep the time they were recorded, not the time the queue flushed them
+        async with database._read_connection() as db:
+            async with db.execute("SELECT MAX(created_at) FROM analytics_metrics") as cursor:
+                assert datetime.fromisoformat((await cursor.fetchone())[0]) <= recorded_by
+
+    asyncio.run(_with_temp_database(check))
+
+
+def test_write_behind_retries_failed_flushes():
+    """A transient failure is retried; a row that keeps failing is dropped alone and reported by table"""
+    async def check():
+        queue = database.WriteBehindQueue(max_retries=3, retry_backoff=0.2)
+        await queue.start()
+        try:
+            late_sql = "INSERT INTO late_metrics (value) VALUES (?)"
+            assert queue.enqueue(database.ANALYTICS_INSERT_SQL, ("view", 1, None, None, datetime.now()))
+            assert queue.enqueue(late_sql, (1,))
+            flush = asyncio.create_task(queue.flush())
+            while queue.stats["retries"] == 0:
+                await asyncio.sleep(0.01)
+            # The table appears while the flush is backing off
+            async with database._write_connection() as db:
+                await db.execute("CREATE TABLE late_metrics (value INTEGER)")
+                await db.commit()
+            assert await flush == 2
+            assert queue.stats["flushed_rows"] == 2 and queue.stats["failed_rows"] == 0
+
+            assert queue.enqueue(database.ANALYTICS_INSERT_SQL, ("view", 1, None, None, datetime.now()))
+            assert queue.enqueue("INSERT INTO missing_metrics (value) VALUES (?)", (1,))
+            await queue.flush()
+            stats = queue.get_stats()
+            print(f"Write-behind stats after failures: {stats}")
+            assert stats["failed_rows"] == 1 and stats["lost_rows_by_table"] == {"missing_metrics": 1}
+            assert stats["flushed_rows"] == 3
+            summary = await database.get_analytics_summary()
+            assert summary["view"]["events"] == 2
+        finally:
+            await queue.stop()
+
+    asyncio.run(_with_temp_database(check))
+
+
+def test_feed_keys_ignore_word_order_and_case():
+    """Filter combinations differing only in word order or case read the same image_cache row"""
+    async def check():
+        key = cache_query_key("Modern Kitchen, minimalist", "aggregated")
+        assert key == "aggregated:kitchen minimalist modern"
+        await database.cache_images("aggregated", key, 1, [{"id": "shared"}])
+        await database._write_queue.flush()
+
+        for query in ("minimalist kitchen modern", "KITCHEN,  Modern minimalist", "modern kitchen minimalist"):
+            hit = await database.get_cached_images_for_keys([cache_query_key(query, "aggregated")], 1)
+            assert hit is not None and hit[0] == key and hit[1] == [{"id": "shared"}]
+
+        # Keys are tried in the caller's order; unknown keys are skipped
+        await database.cache_images("prefetch", cache_query_key("kitchen modern minimalist", "prefetch"), 1, [{"id": "prefetched"}])
+        await database._write_queue.flush()
+        keys = [cache_query_key("loft", "aggregated"), cache_query_key("modern minimalist kitchen", "prefetch"), key]
+        hit = await database.get_cached_images_for_keys(keys, 1)
+        assert hit[0] == "prefetch:kitchen minimalist modern" and hit[1] == [{"id": "prefetched"}]
+        assert await database.get_cached_images_for_keys([cache_query_key("loft", "aggregated")], 1) is None
+
+    asyncio.run(_with_temp_database(check))
+
+
+def test_payload_codecs_round_trip_and_read_legacy_rows():
+    """Every codec/compression combination decodes; header-less JSON text rows still read"""
+    page = [{"id": index, "title": f"Loft {index}", "src": {"large": f"https://cdn.example.com/{index}.jpg"}} for index in range(300)]
+    codecs = ["json"] + (["msgpack"] if database.MSGPACK_AVAILABLE else [])
+    for codec in codecs:
+        for value in (page, page[:1], {"analysis": "ok", "score": 0.5}):
+            encoded = database.encode_payload(value, codec)
+            assert database.decode_payload(encoded) == value
+            assert json.loads(database.payload_json(encoded)) == value
+    compressed = database.encode_payload(page)
+    assert compressed[0] & (database.PAYLOAD_ZLIB | database.PAYLOAD_ZSTD)
+    assert len(compressed) < len(json.dumps(page)) / 4
+    assert database.decode_payload(json.dumps(page)) == page
+    assert database.payload_json(json.dumps(page[:1])) == json.dumps(page[:1]).encode()
+
+
+def test_vision_and_chat_payloads_served_encoded():
+    """Vision and chat rows come back as values or as JSON bytes, new and legacy rows alike"""
+    async def check():
+        analysis = {"style": "Scandinavian", "confidence": 0.9}
+        messages = [{"role": "user", "content": "Warm lighting ideas?"}]
+        await database.cache_vision_analysis("hash", analysis)
+        await database._write_queue.flush()
+        await database.save_chat_history("session", messages)
+        assert await database.get_cached_vision_analysis("hash") == analysis
+        assert json.loads(await database.get_cached_vision_analysis("hash", encoded=True)) == analysis
+        assert await database.get_chat_history("session") == messages
+
+        async with database._write_connection() as db:
+            await db.execute("UPDATE chat_history SET message_data = ?", (json.dumps(messages),))
+            await db.commit()
+        assert await database.get_chat_history("session", encoded=True) == json.dumps(messages).encode()
+
+    asyncio.run(_with_temp_database(check))
+
+
+if __name__ == "__main__":
+    print("Testing pooled database layer...")
+    test_pool_serves_concurrent_reads()
+    test_pool_readers_single_writer_and_pragmas()
+    print("✅ Pool tests passed")
+    test_write_behind_batches_and_flushes()
+    test_write_behind_retries_failed_flushes()
+    print("✅ Write-behind test passed")
+    test_feed_keys_ignore_word_order_and_case()
+    print("✅ Feed cache key test passed")
+    test_payload_codecs_round_trip_and_read_legacy_rows()
+    test_vision_and_chat_payloads_served_encoded()
+    print("✅ Payload codec tests passed")
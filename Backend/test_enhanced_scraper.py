@@ -50,8 +50,5 @@ async def test_enhanced_scraper():
 
     print("\nTest completed!")
 
-    # Close the scraper
-    await enhanced_design_scraper.close()
-
 if __name__ == "__main__":
     asyncio.run(test_enhanced_scraper())
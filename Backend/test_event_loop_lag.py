@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Event loop lag check for I/O-bound handlers: every upstream call is answered by a
+slow in-process transport, and the run fails if any handler blocks the loop
+longer than the loop lag threshold.
+"""
+import asyncio
+import json
+import sys
+import os
+import time
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+import floor_plan_service
+import geoapify_service
+from app.routers.shops_router import router as shops_router
+from astrology_api_service import ProkeralaAstrologyService
+from http_clients import http_clients
+from interior_ai_service import InteriorAIService
+from loop_lag import LoopLagMonitor
+from multi_ai_service import MultiAIService
+
+# Simulated upstream latency; long enough that a blocking client would stall the loop
+UPSTREAM_DELAY = 0.2
+LAG_THRESHOLD = 0.1
+FAKE_IMAGE = b"\x89PNG" + b"\0" * 2048
+_cold_models_warmed = {}
+
+
+async def _slow_upstream(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(UPSTREAM_DELAY)
+    host, path = request.url.host, request.url.path
+    if host == "api.geoapify.com":
+        return httpx.Response(200, json={"features": [{"properties": {"name": "Shop", "lat": 1.0, "lon": 2.0}}]})
+    if host == "api.prokerala.com":
+        if path == "/token":
+            return httpx.Response(200, json={"access_token": "token"})
+        return httpx.Response(200, json={"data": {"soorya_rasi": {"name": "Leo"}}})
+    if "FLUX" in path:
+        return httpx.Response(503)
+    if "stable-diffusion-3.5-large" in path and not _cold_models_warmed.get(path):
+        # Cold model on the first call: exercises the retry backoff path
+        _cold_models_warmed[path] = True
+        return httpx.Response(503, headers={"Retry-After": "0"})
+    return httpx.Response(200, content=FAKE_IMAGE)
+
+
+def test_io_handlers_do_not_block_event_loop():
+    """Geoapify, Prokerala and Hugging Face paths keep the loop responsive while waiting on upstreams"""
+    async def check():
+        app = FastAPI()
+        app.include_router(shops_router)
+
+        astrology = ProkeralaAstrologyService()
+        astrology.client_id, astrology.client_secret = "id", "secret"
+        interior = InteriorAIService()
+        interior.api_token = "test"
+        multi = MultiAIService()
+        multi.hf_token = "test"
+        multi.providers["huggingface"]["enabled"] = True
+
+        async with http_clients.transport_override(httpx.MockTransport(_slow_upstream)):
+            async with LoopLagMonitor(interval=0.01, threshold=LAG_THRESHOLD) as monitor:
+                async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as api:
+                    shops, geocode, chart, floor_plan, interior_image, multi_image = await asyncio.gather(
+                        api.get("/api/shops", params={"lat": 12.9, "lon": 77.6}),
+                        api.get("/api/geocode", params={"text": "Bengaluru"}),
+                        astrology.get_birth_chart("1990-01-01", "10:30", "Bengaluru"),
+                        floor_plan_service.generate_floor_plan("two bedroom apartment"),
+                        interior.generate_interior_design("cozy reading nook"),
+                        multi.generate_interior_image("bright kitchen"),
+                    )
+
+        stats = monitor.get_stats()
+        print(f"Event loop lag: {json.dumps(stats)}")
+        assert shops.status_code == 200 and shops.json()["count"] == 1
+        assert geocode.status_code == 200
+        assert chart["data"]["soorya_rasi"]["name"] == "Leo"
+        assert floor_plan == FAKE_IMAGE
+        assert interior_image == FAKE_IMAGE
+        assert multi_image == (FAKE_IMAGE, False)
+        assert stats["stalls"] == 0, f"A handler blocked the event loop for {stats['max_lag_ms']} ms"
+
+    _cold_models_warmed.clear()
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(geoapify_service, "GEOAPIFY_API_KEY", "test")
+        patch.setattr(floor_plan_service, "API_TOKEN", "test")
+        asyncio.run(check())
+
+
+def test_places_route_does_not_block_event_loop():
+    """The /places proxy in routes.py keeps the loop responsive while Geoapify is slow"""
+    with pytest.MonkeyPatch.context() as patch:
+        # routes builds every service at import time; the vision service refuses to start without a Groq key
+        patch.setenv("GROQ_API_KEY", os.getenv("GROQ_API_KEY") or "test")
+        routes = pytest.importorskip("routes")
+        patch.setattr(routes, "GEOAPIFY_API_KEY", "test")
+
+        app = FastAPI()
+        app.add_api_route("/places", routes.get_places)
+
+        async def check():
+            async with http_clients.transport_override(httpx.MockTransport(_slow_upstream)):
+                async with LoopLagMonitor(interval=0.01, threshold=LAG_THRESHOLD) as monitor:
+                    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as api:
+                        responses = await asyncio.gather(*(
+                            api.get("/places", params={"lat": 12.9, "lon": 77.6}) for _ in range(3)
+                        ))
+            return responses, monitor.get_stats()
+
+        responses, stats = asyncio.run(check())
+
+    print(f"Event loop lag (/places): {json.dumps(stats)}")
+    assert all(response.status_code == 200 and response.json()["count"] == 1 for response in responses)
+    assert stats["stalls"] == 0, f"/places blocked the event loop for {stats['max_lag_ms']} ms"
+
+
+def test_monitor_detects_blocking_call():
+    """A synchronous sleep inside a coroutine is reported as a stall"""
+    async def check():
+        async with LoopLagMonitor(interval=0.01, threshold=LAG_THRESHOLD) as monitor:
+            await asyncio.sleep(0.02)
+            time.sleep(LAG_THRESHOLD * 2)
+        return monitor.get_stats()
+
+    stats = asyncio.run(check())
+    assert stats["stalls"] >= 1
+    assert stats["max_lag_ms"] >= LAG_THRESHOLD * 1000
+
+
+if __name__ == "__main__":
+    print("Testing event loop lag...")
+    test_io_handlers_do_not_block_event_loop()
+    test_places_route_does_not_block_event_loop()
+    test_monitor_detects_blocking_call()
+    print("✅ Event loop lag tests passed")
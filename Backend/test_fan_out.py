@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the structured-concurrency fan-out helper
+"""
+import asyncio
+import sys
+import os
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fan_out import FanOutStream, fan_out, get_fan_out_stats
+
+
+def _call(delay, value=None, error=None, finished=None):
+    async def call():
+        await asyncio.sleep(delay)
+        if error:
+            raise error
+        if finished is not None:
+            finished.append(value)
+        return value
+    return call
+
+
+def test_fan_out_min_results_cancels_the_rest():
+    """Once enough calls answered, the slower ones are cancelled before returning"""
+    finished = []
+
+    async def check():
+        outcome = await fan_out([
+            ("fast", _call(0.01, ["a"], finished=finished)),
+            ("empty", _call(0.005, [], finished=finished)),
+            ("broken", _call(0.005, error=ValueError("boom"))),
+            ("slow", _call(1.0, ["b"], finished=finished)),
+        ], min_results=1, label="test_min_results")
+        # Give a leaked task the chance to finish if it had not been cancelled
+        await asyncio.sleep(0.05)
+        return outcome
+
+    outcome = asyncio.run(check())
+    assert outcome.results == {"fast": ["a"], "empty": []}
+    assert isinstance(outcome.errors["broken"], ValueError)
+    assert outcome.cancelled == ["slow"] and not outcome.timed_out
+    assert finished == [[], ["a"]]
+
+    stats = get_fan_out_stats()["test_min_results"]
+    print(f"Fan-out stats: {stats}")
+    assert stats["tasks_started"] == 4 and stats["cancelled_after_enough"] == 1
+    assert stats["orphaned"] == 0
+
+
+def test_fan_out_deadline_keeps_finished_results():
+    """Calls still running at the deadline are cancelled; finished ones are kept"""
+    outcome = asyncio.run(fan_out([
+        ("fast", _call(0.01, ["a"])),
+        ("hung", _call(5.0, ["b"])),
+    ], deadline=0.1, label="test_deadline"))
+    assert outcome.timed_out
+    assert outcome.values() == [["a"]] and outcome.cancelled == ["hung"]
+    assert get_fan_out_stats()["test_deadline"]["deadline_hits"] == 1
+
+
+def test_fan_out_stream_yields_as_calls_finish():
+    """Results arrive in completion order; leaving early cancels the rest with the given message"""
+    reasons = []
+
+    def _slow():
+        async def call():
+            try:
+                await asyncio.sleep(1.0)
+            except asyncio.CancelledError as e:
+                reasons.append(e.args[0] if e.args else None)
+                raise
+        return call
+
+    async def check():
+        seen = []
+        async with FanOutStream([
+            ("slow", _slow()),
+            ("fast", _call(0.01, ["a"])),
+            ("broken", _call(0.005, error=ValueError("boom"))),
+            ("second", _call(0.02, ["b"])),
+        ], label="test_stream", cancel_message="enough", deadline_message="late") as stream:
+            async for name, value in stream:
+                seen.append((name, value))
+                if len(seen) == 2:
+                    break
+        assert seen == [("fast", ["a"]), ("second", ["b"])]
+        assert isinstance(stream.errors["broken"], ValueError)
+        assert stream.cancelled == ["slow"] and not stream.timed_out
+
+        async with FanOutStream([("slow", _slow()), ("fast", _call(0.01, ["a"]))], deadline=0.1,
+                                label="test_stream", cancel_message="enough", deadline_message="late") as stream:
+            assert [name async for name, _ in stream] == ["fast"]
+        assert stream.timed_out and stream.cancelled == ["slow"]
+
+    asyncio.run(check())
+    assert reasons == ["enough", "late"]
+    stats = get_fan_out_stats()["test_stream"]
+    assert stats["cancelled_after_enough"] == 1 and stats["cancelled_by_deadline"] == 1
+    assert stats["deadline_hits"] == 1 and stats["failed"] == 1
+
+
+if __name__ == "__main__":
+    print("Testing fan-out helper...")
+    test_fan_out_min_results_cancels_the_rest()
+    test_fan_out_deadline_keeps_finished_results()
+    test_fan_out_stream_yields_as_calls_finish()
+    print("✅ Fan-out tests passed")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the FeedImage record and compact feed page storage
+"""
+import asyncio
+import json
+import sys
+import os
+import tempfile
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import database
+from feed_image import FEED_PAGE_FORMAT, FeedImage, pack_page, unpack_page
+from picsum_service import PicsumService
+from unlimited_design_service import unlimited_design_service
+
+
+def test_formatter_output_round_trips():
+    """Provider dicts, odd shapes included, come back unchanged from the wire and row forms"""
+    items = asyncio.run(unlimited_design_service.search_images("modern kitchen", 1, 5))
+    items.append(PicsumService().format_photo_data({"id": "237", "width": 3000, "height": 2000}))
+    items += [
+        {"id": 1, "image": "x", "src": {"large": "l"}, "category": "kitchens"},
+        {"image": "https://cdn.example.com/a.jpg", "title": "Loft", "tags": []},
+        {"id": 2, "src": None},
+    ]
+    for item in items:
+        image = FeedImage.from_wire(item)
+        assert image.to_wire() == item
+        assert FeedImage.from_row(json.loads(json.dumps(image.to_row()))).to_wire() == item
+    assert unpack_page(json.loads(json.dumps(pack_page(items)))) == items
+
+
+def test_src_is_stored_as_a_template():
+    """One URL for every size, or a shared prefix with the per-size parts, instead of eight strings"""
+    single = FeedImage.from_wire(asyncio.run(unlimited_design_service.search_images("loft", 1, 1))[0])
+    assert single.src_parts is None and single.src_prefix.startswith("https://picsum.photos/seed/")
+    sized = FeedImage.from_wire({"id": 7, "src": {
+        size: f"https://picsum.photos/id/7/{width}/600" for size, width in zip(
+            ("original", "large2x", "large", "medium", "small", "portrait", "landscape", "tiny"),
+            (1200, 1200, 800, 400, 400, 800, 800, 200),
+        )
+    }})
+    assert sized.src_prefix == "https://picsum.photos/id/7/" and sized.src_suffix == "00/600"
+    assert sized.src["tiny"] == "https://picsum.photos/id/7/200/600"
+
+
+def test_image_cache_stores_rows_and_reads_legacy_pages():
+    """Pages go to SQLite as FeedImage rows; rows written as plain lists are still readable"""
+    async def check():
+        items = await unlimited_design_service.search_images("modern kitchen", 2, 10)
+        await database.cache_images("aggregated", "aggregated:kitchen modern", 2, items)
+        await database.cache_images("aggregated", "aggregated:loft", 1, [{"id": "legacy"}])
+        async with database._write_connection() as db:
+            await db.execute("UPDATE image_cache SET data = ? WHERE query = ?", (json.dumps([{"id": "legacy"}]), "aggregated:loft"))
+            await db.commit()
+            async with db.execute("SELECT data FROM image_cache WHERE query = ?", ("aggregated:kitchen modern",)) as cursor:
+                stored = database.decode_payload((await cursor.fetchone())[0])
+        assert stored["format"] == FEED_PAGE_FORMAT and len(stored["rows"]) == 10
+        assert len(json.dumps(stored)) < len(json.dumps(items)) * 0.6
+        assert await database.get_cached_images("aggregated", "aggregated:kitchen modern", 2) == items
+        assert (await database.get_cached_images_for_keys(["aggregated:loft"], 1))[1] == [{"id": "legacy"}]
+
+    original_path = database.DATABASE_PATH
+    database.DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "cache.db")
+    try:
+        asyncio.run(database.init_db())
+        asyncio.run(check())
+    finally:
+        database.DATABASE_PATH = original_path
+
+
+if __name__ == "__main__":
+    print("Testing FeedImage...")
+    test_formatter_output_round_trips()
+    test_src_is_stored_as_a_template()
+    test_image_cache_stores_rows_and_reads_legacy_pages()
+    print("✅ FeedImage tests passed")
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test script for the process-pool HTML parsers
+"""
+import asyncio
+import sys
+import os
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from html_parsing import (
+    PARSER_BACKENDS,
+    RETAILER_SELECTORS,
+    HtmlParseExecutor,
+    css_to_xpath,
+    parse_houzz_page,
+    parse_pexels_search,
+    parse_pixabay_search,
+    parse_retailer_products,
+    parse_unsplash_page,
+    run_parser,
+)
+from benchmark_html_parsing import FIXTURE_CASES, load_fixture
+
+UNSPLASH_HTML = b"""
+<figure><a href="/photos/1"><img data-test="photo-grid-image" alt="Loft"
+  src="https://images.unsplash.com/photo-1?w=400&q=80"><span class="photo-credit">Ana</span></a></figure>
+<figure><img data-test="photo-grid-image" src="https://images.unsplash.com/thumb-2?w=32&q=80"></figure>
+"""
+
+HOUZZ_HTML = b"""
+<img class="hz-photo" src="data:image/gif;base64,xx" data-src="//st.hzcdn.com/a.jpg" alt="Kitchen">
+<img class="hz-photo" src="/relative.jpg">
+"""
+
+PEXELS_HTML = b"""
+<article class="PhotoItem"><a href="/photo/1/"><img src="https://images.pexels.com/1.jpeg?auto=compress&w=600&h=400" alt="Sofa"></a>
+  <a href="/@maria">Maria</a></article>
+"""
+
+PIXABAY_HTML = b"""
+<script type="application/ld+json">{"@type": "ImageObject", "contentUrl": "https://cdn.pixabay.com/a.jpg", "name": "Hall"}</script>
+<script type="application/ld+json">not json</script>
+"""
+
+RETAILER_HTML = b"""
+<div class="productContainer"><div class="productTitle"> Teak Bed </div><span class="finalPrice">Rs 12,499</span>
+  <img data-src="https://ii1.pepperfry.com/bed.jpg"></div>
+<div class="productContainer"><div class="productTitle">No price</div></div>
+"""
+
+
+def test_parsers_extract_compact_results():
+    """Each site parser keeps the selection rules of the scraper it came from, on every backend"""
+    for backend in PARSER_BACKENDS:
+        unsplash = run_parser(parse_unsplash_page, UNSPLASH_HTML, 10, FIXTURE_CASES["unsplash_search.html"][1][1], backend=backend)
+        assert unsplash == [{
+            "image": "https://images.unsplash.com/photo-1?w=800&q=80",
+            "alt": "Loft",
+            "permalink": "https://images.unsplash.com/photo-1?w=800&q=80",
+            "photographer": "Ana",
+        }]
+
+        houzz = run_parser(parse_houzz_page, HOUZZ_HTML, 10, FIXTURE_CASES["houzz_photos.html"][1][1], backend=backend)
+        assert houzz == [{"image": "https://st.hzcdn.com/a.jpg", "alt": "Kitchen"}]
+
+        pexels = run_parser(parse_pexels_search, PEXELS_HTML, 10, FIXTURE_CASES["pexels_search.html"][1][1], backend=backend)
+        assert pexels[0]["image"] == "https://images.pexels.com/1.jpeg?auto=compress&w=1200&h=800"
+        assert pexels[0]["photographer"] == "Maria"
+
+        pixabay = run_parser(parse_pixabay_search, PIXABAY_HTML, 10, FIXTURE_CASES["pixabay_search.html"][1][1], backend=backend)
+        assert pixabay == [{"image": "https://cdn.pixabay.com/a.jpg", "alt": "Hall", "author": None}]
+
+        products = run_parser(parse_retailer_products, RETAILER_HTML, RETAILER_SELECTORS["pepperfry"], backend=backend)
+        assert products == [
+            {"name": "Teak Bed", "price_text": "Rs 12,499", "image": "https://ii1.pepperfry.com/bed.jpg"}
+        ]
+
+
+def test_backends_agree_on_fixture_pages():
+    """The lxml fast path returns exactly what BeautifulSoup returns on the (synthetic) fixture pages"""
+    assert css_to_xpath("figure img") == ".//figure//img"
+    assert css_to_xpath("a[href*='/@']") == ".//a[contains(@href, '/@')]"
+
+    for name, (parser, args) in FIXTURE_CASES.items():
+        html = load_fixture(name)
+        fast = run_parser(parser, html, *args, backend="lxml")
+        assert fast, name
+        assert fast == run_parser(parser, html, *args, backend="bs4"), name
+
+
+def test_executor_parses_in_worker_process():
+    """Parses run in the pool and are counted in the metrics"""
+    async def check():
+        executor = HtmlParseExecutor(workers=1)
+        try:
+            results = await asyncio.gather(*[
+                executor.run(parse_houzz_page, HOUZZ_HTML, 10, FIXTURE_CASES["houzz_photos.html"][1][1]) for _ in range(5)
+            ])
+            assert all(result == [{"image": "https://st.hzcdn.com/a.jpg", "alt": "Kitchen"}] for result in results)
+
+            # lxml rejects an empty document; BeautifulSoup takes over
+            assert await executor.run(parse_retailer_products, b"", RETAILER_SELECTORS["generic"]) == []
+            return executor.get_stats()
+        finally:
+            executor.shutdown()
+
+    stats = asyncio.run(check())
+    print(f"Parse stats: {stats}")
+    assert stats["parsed"] == 6 and stats["failed"] == 0
+    assert stats["backend_counts"] == {"lxml": 5, "bs4": 1} and stats["backend_fallbacks"] == 1
+    assert stats["queue_depth"] == 0 and stats["max_queue_depth"] == 5
+    assert stats["parse_ms_p50"] is not None
+
+
+if __name__ == "__main__":
+    print("Testing HTML parsing executor...")
+    test_parsers_extract_compact_results()
+    test_backends_agree_on_fixture_pages()
+    test_executor_parses_in_worker_process()
+    print("✅ HTML parsing tests passed")
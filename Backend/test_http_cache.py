@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Test script for the on-disk conditional-GET response cache
+"""
+import asyncio
+import sys
+import os
+import tempfile
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from http_cache import HttpResponseCache
+
+PAGE = b"<html><body>" + b"<img src='https://example.com/a.jpg'>" * 200 + b"</body></html>"
+
+
+def _origin(seen):
+    """Origin that honours If-None-Match and serves max-age only under /fresh"""
+    def handle(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        headers = {"etag": '"v1"', "content-type": "text/html"}
+        if request.url.path == "/fresh":
+            headers["cache-control"] = "max-age=60"
+        if request.url.path == "/nostore":
+            headers["cache-control"] = "no-store"
+        return httpx.Response(200, headers=headers, content=PAGE)
+    return handle
+
+
+def test_revalidation_freshness_and_persistence():
+    """Stale pages are revalidated with their ETag; fresh ones skip the network; entries survive a restart"""
+    async def check(path):
+        seen = []
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_origin(seen))) as client:
+            cache = HttpResponseCache(path)
+            first = await cache.get(client, "https://example.com/search", params={"q": "sofa"})
+            second = await cache.get(client, "https://example.com/search", params={"q": "sofa"})
+            fresh_first = await cache.get(client, "https://example.com/fresh")
+            fresh_second = await cache.get(client, "https://example.com/fresh")
+            await cache.get(client, "https://example.com/nostore")
+
+            # A new instance (as after a restart) still revalidates from disk
+            restarted = HttpResponseCache(path)
+            third = await restarted.get(client, "https://example.com/search", params={"q": "sofa"})
+            return seen, first, second, fresh_first, fresh_second, third, await cache.get_stats()
+
+    with tempfile.TemporaryDirectory() as directory:
+        seen, first, second, fresh_first, fresh_second, third, stats = asyncio.run(check(os.path.join(directory, "http.db")))
+
+    print(f"Stats: {stats}")
+    assert first.content == second.content == third.content == PAGE
+    assert "from_cache" not in first.extensions
+    assert second.extensions["from_cache"] == "revalidated"
+    assert seen[1].headers["if-none-match"] == '"v1"'
+    assert fresh_second.extensions["from_cache"] == "fresh" and fresh_second.content == fresh_first.content
+    # search, search (304), fresh, nostore, search after restart (304); the fresh hit never left the process
+    assert len(seen) == 5
+    assert stats["revalidated"] == 1 and stats["fresh_hits"] == 1
+    assert stats["entries"] == 2
+    assert stats["stored_bytes"] < 2 * len(PAGE) / 5
+
+
+def test_size_based_eviction():
+    """Least recently used pages are evicted once the stored bytes exceed the budget"""
+    async def check(path):
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_origin([]))) as client:
+            probe = HttpResponseCache(path)
+            await probe.get(client, "https://example.com/probe")
+            entry_size = (await probe.get_stats())["stored_bytes"]
+
+            cache = HttpResponseCache(path, max_bytes=entry_size * 2)
+            for page in range(4):
+                await cache.get(client, f"https://example.com/page/{page}")
+            return await cache.get_stats()
+
+    with tempfile.TemporaryDirectory() as directory:
+        stats = asyncio.run(check(os.path.join(directory, "http.db")))
+
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 3
+    assert stats["stored_bytes"] <= stats["max_bytes"]
+
+
+def test_before_send_runs_only_for_network_requests():
+    """A rate limiter passed as before_send is not spent on fresh hits, but is on misses and revalidations"""
+    async def check(path):
+        sends = []
+
+        async def before_send():
+            sends.append(1)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(_origin([]))) as client:
+            cache = HttpResponseCache(path)
+            miss = await cache.get(client, "https://example.com/fresh", before_send=before_send)
+            fresh = await cache.get(client, "https://example.com/fresh", before_send=before_send)
+            assert len(sends) == 1 and "from_cache" not in miss.extensions
+            assert fresh.extensions["from_cache"] == "fresh"
+
+            await cache.get(client, "https://example.com/search", before_send=before_send)
+            revalidated = await cache.get(client, "https://example.com/search", before_send=before_send)
+            assert revalidated.extensions["from_cache"] == "revalidated"
+            return len(sends)
+
+    with tempfile.TemporaryDirectory() as directory:
+        assert asyncio.run(check(os.path.join(directory, "http.db"))) == 3
+
+
+if __name__ == "__main__":
+    print("Testing HTTP response cache...")
+    test_revalidation_freshness_and_persistence()
+    test_size_based_eviction()
+    test_before_send_runs_only_for_network_requests()
+    print("✅ HTTP response cache tests passed")
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared HTTP client registry
+"""
+import asyncio
+import sys
+import os
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+
+from http_clients import DnsCache, HttpClientRegistry, SharedTransport
+
+
+async def _start_slow_server(delay: float):
+    """Keep-alive HTTP/1.1 server on localhost that records peak concurrency"""
+    state = {"active": 0, "peak": 0, "connections": 0}
+
+    async def handle(reader, writer):
+        state["connections"] += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+                await asyncio.sleep(delay)
+                state["active"] -= 1
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1], state
+
+
+def test_per_host_limit_and_dns_cache():
+    """Requests to one host never exceed the per-host cap and reuse resolved addresses"""
+    async def check():
+        server, port, state = await _start_slow_server(0.05)
+        dns_cache = DnsCache(ttl=60)
+        transport = SharedTransport(dns_cache, max_per_host=2)
+        async with server, httpx.AsyncClient(transport=transport) as client:
+            responses = await asyncio.gather(*(client.get(f"http://localhost:{port}/") for _ in range(6)))
+            stats = transport.get_stats()
+            print(f"Server: {state}, transport: {stats}, dns: {dns_cache.get_stats()}")
+
+            assert [r.text for r in responses] == ["ok"] * 6
+            assert state["peak"] == 2
+            assert state["connections"] == 2
+            assert stats["host_waits"] > 0
+            assert stats["in_flight_by_host"] == {}
+
+            await dns_cache.resolve("localhost", port)
+            assert dns_cache.get_stats()["hits"] >= 1
+
+    asyncio.run(check())
+
+
+def test_registry_reuses_and_reopens_clients():
+    """Profiles share one transport that close() shuts once, leaving the registry usable again"""
+    async def check():
+        registry = HttpClientRegistry()
+        await registry.start()
+        quick = registry.client("quick")
+        assert registry.client("quick") is quick
+        assert registry.client("scraper")._transport._transport is quick._transport._transport
+        assert registry.aiohttp_session() is registry.aiohttp_session()
+
+        pool_closes = []
+        shared = registry._transport
+        close_pool = shared.aclose
+
+        async def counting_aclose():
+            pool_closes.append(1)
+            await close_pool()
+
+        shared.aclose = counting_aclose
+        await registry.close()
+        assert quick.is_closed
+        # The clients' handles leave the pool alone; the registry closes it once
+        assert len(pool_closes) == 1
+        reopened = registry.client("quick")
+        assert reopened is not quick and not reopened.is_closed
+        await registry.close()
+
+    asyncio.run(check())
+
+
+def test_pool_errors_surface_as_httpx_errors():
+    """Connection failures and timeouts from the owned pool raise httpx's exceptions, as httpx's transport would"""
+    async def check():
+        server, port, _ = await _start_slow_server(0.5)
+        transport = SharedTransport(DnsCache(ttl=60))
+        async with server, httpx.AsyncClient(transport=transport) as client:
+            try:
+                await client.get(f"http://127.0.0.1:{port}/", timeout=0.05)
+                raise AssertionError("expected a read timeout")
+            except httpx.ReadTimeout:
+                pass
+            server.close()
+            await server.wait_closed()
+            try:
+                await client.get(f"http://127.0.0.1:{port}/")
+                raise AssertionError("expected a connect error")
+            except httpx.ConnectError:
+                pass
+            assert transport.get_stats()["in_flight_by_host"] == {}
+
+    asyncio.run(check())
+
+
+if __name__ == "__main__":
+    print("Testing shared HTTP clients...")
+    test_per_host_limit_and_dns_cache()
+    test_registry_reuses_and_reopens_clients()
+    test_pool_errors_surface_as_httpx_errors()
+    print("✅ Shared HTTP client tests passed")
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test script for the Aho-Corasick keyword matcher used by image categorization
+"""
+import random
+import re
+import sys
+import os
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from keyword_matcher import KeywordMatcher
+from image_categorization_service import image_categorization_service
+
+
+def test_matches_substring_and_word_semantics():
+    """find() agrees with `in` per keyword and find_words() with the \\b alternation, overlaps included"""
+    keywords = ["he", "she", "his", "hers", "living room", "room", "art", "wall art", "a"]
+    matcher = KeywordMatcher(keywords)
+    word_pattern = re.compile(r"\b(" + "|".join(re.escape(k) for k in keywords) + r")\b")
+    rng = random.Random(7)
+    alphabet = ["he", "rs", "s", "i", " ", "living", "room", "wall", "art", "_", "-", "a", "x"]
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 12)))
+        assert matcher.find(text) == {k for k in keywords if k in text}, text
+        assert matcher.contains_any(text) == any(k in text for k in keywords), text
+        expected_words = {k for k in keywords if re.search(r"\b" + re.escape(k) + r"\b", text)}
+        assert matcher.find_words(text) == expected_words, text
+        assert matcher.contains_word(text) == bool(word_pattern.search(text)), text
+
+
+def test_categorize_keeps_category_order():
+    """When several categories match, the one declared first in valid_categories wins"""
+    service = image_categorization_service
+    image = {"image": "https://example.com/a.jpg", "title": "Bedroom lamp in a modern kitchen", "tags": []}
+    first = next(c for c, kws in service.valid_categories.items() if any(k.lower() in image["title"].lower() for k in kws))
+    assert service.categorize_image(image) == first
+    assert service.is_valid_design_image({"image": "https://example.com/a.jpg", "title": "Selfie with my dog", "tags": []}) is False
+
+
+def test_classify_is_memoized_by_image_identity():
+    """classify() is computed once per image; the wrappers and a re-titled copy stay consistent"""
+    service = image_categorization_service
+    image = {"id": "memo-1", "image": "https://example.com/p/1.jpg", "title": "Scandinavian living room", "alt": "photo", "tags": []}
+    first = service.classify(image)
+    assert first.valid and first.category == "living_rooms" and "living room" in first.keywords
+    assert service.classify(dict(image)) is first
+    assert service.enhance_image_metadata(image) == first.apply(image) and first.apply(image) is not image
+    assert service.enhance_image_metadata(image)["alt"] != "photo"
+    retitled = service.classify({**image, "title": "Puppy on the beach"})
+    assert not retitled.valid and retitled.category is None
+    assert retitled.apply(image) is image
+
+
+def test_classify_batch_matches_per_item_results():
+    """classify_batch() gives the per-item results in order, duplicates and unkeyed items included"""
+    service = image_categorization_service
+    service.classification_cache.clear()
+    page = [
+        {"id": "b1", "image": "https://example.com/p/1.jpg", "title": "Minimalist bedroom", "tags": []},
+        {"id": "b2", "image": "https://example.com/p/2.jpg", "title": "Selfie at the beach", "tags": []},
+        {"id": "b1", "image": "https://example.com/p/1.jpg", "title": "Minimalist bedroom", "tags": []},
+        {"title": "Marble bathroom vanity", "tags": []},
+        {"id": "b3", "image": "https://example.com/kitchen/3.jpg", "title": "Photo", "tags": []},
+    ]
+    batch = service.classify_batch(page)
+    service.classification_cache.clear()
+    assert batch == [service.classify(item) for item in page]
+    assert [c.valid for c in batch] == [True, False, True, True, True]
+    assert batch[0] is batch[2]
+    kept = service.filter_design_images(page, limit=2, enhance=True)
+    assert [item.get("id") for item in kept] == ["b1", "b1"] and kept[0] is not page[0]
+    assert service.filter_design_images(page)[0] is page[0]
+
+
+if __name__ == "__main__":
+    print("Testing keyword matcher...")
+    test_matches_substring_and_word_semantics()
+    test_categorize_keeps_category_order()
+    test_classify_is_memoized_by_image_identity()
+    test_classify_batch_matches_per_item_results()
+    print("✅ Keyword matcher tests passed")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the bounded in-memory LRU/TTL cache and its sweeper
+"""
+import asyncio
+import sys
+import os
+import time
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from memory_cache import BoundedCache, CacheSweeper, approx_size, memory_cache_stats
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    """The least recently used entries go once either the entry or the byte budget is exceeded"""
+    cache = BoundedCache("test_entries", max_entries=3)
+    for key in "abc":
+        cache.set(key, key)
+    cache.get("a")
+    cache.set("d", "d")
+    assert "b" not in cache and "a" in cache and len(cache) == 3
+
+    item = ["x" * 1000]
+    sized = BoundedCache("test_bytes", max_bytes=approx_size(item) * 2 + 10)
+    for key in range(5):
+        sized.set(key, ["x" * 1000])
+    stats = sized.get_stats()
+    print(f"Stats: {stats}")
+    assert stats["entries"] == 2 and stats["bytes"] <= stats["max_bytes"]
+    assert stats["evictions"] == 3
+    assert sized.get(4) == item and sized.get(0) is None
+
+    # Overwriting an entry replaces its size rather than adding to it
+    sized.set(4, ["y"])
+    assert sized.get_stats()["bytes"] < approx_size(item) + 200
+
+
+def test_ttl_expiry_and_sweeper():
+    """Expired entries are misses on read and are removed by the sweeper without being read"""
+    async def check():
+        cache = BoundedCache("test_ttl", ttl=0.05)
+        cache.set("short", 1)
+        cache.set("forever", 2, ttl=None)
+        cache.set("read_later", 3)
+        assert cache.get("short") == 1
+
+        sweeper = CacheSweeper(interval=0.02)
+        sweeper.start()
+        await asyncio.sleep(0.1)
+        await sweeper.stop()
+        return cache, sweeper.get_stats()
+
+    cache, sweeper_stats = asyncio.run(check())
+    assert len(cache) == 1 and cache.get("forever") == 2
+    assert cache.get("read_later") is None
+    assert cache.get_stats()["expired"] == 2
+    assert sweeper_stats["swept"] >= 2 and not sweeper_stats["running"]
+    assert "test_ttl" in memory_cache_stats()
+
+
+def test_memory_stays_flat_under_churn():
+    """A long stream of distinct keys never grows the cache past its budgets"""
+    cache = BoundedCache("test_churn", max_entries=100, max_bytes=64 * 1024, ttl=60)
+    started = time.monotonic()
+    for key in range(20000):
+        cache.set(f"query:{key}", [{"id": key, "url": f"https://example.com/{key}.jpg"}])
+        cache.get(f"query:{key // 2}")
+    stats = cache.get_stats()
+    print(f"Churn: {time.monotonic() - started:.2f}s, {stats}")
+    assert stats["entries"] <= 100 and stats["bytes"] <= 64 * 1024
+
+
+def test_feed_page_cache_keeps_stored_at_for_swr():
+    """Feed pages live in a registered BoundedCache and report their age since they were first stored"""
+    from hybrid_service import FEED_CACHE_HARD_TTL, HybridImageService
+
+    service = HybridImageService()
+    page = [{"id": index, "image": f"https://cdn.example.com/{index}.jpg"} for index in range(50)]
+    service._remember_page("aggregated:loft", 1, page, stored_at=time.time() - 600)
+    data, age = service._recall_page("aggregated:loft", 1, FEED_CACHE_HARD_TTL)
+    assert data is page and 599 <= age <= 601
+    # Too old for the caller, and past the hard TTL it is never stored
+    assert service._recall_page("aggregated:loft", 1, 300) is None
+    service._remember_page("aggregated:old", 1, page, stored_at=time.time() - FEED_CACHE_HARD_TTL - 1)
+    assert service._recall_page("aggregated:old", 1, float("inf")) is None
+
+    stats = service.page_cache.get_stats()
+    assert stats["entries"] == 1 and 0 < stats["bytes"] <= stats["max_bytes"]
+    assert "feed_pages" in memory_cache_stats()
+
+
+if __name__ == "__main__":
+    print("Testing memory cache...")
+    test_lru_eviction_by_entries_and_bytes()
+    test_ttl_expiry_and_sweeper()
+    test_memory_stays_flat_under_churn()
+    test_feed_page_cache_keeps_stored_at_for_swr()
+    print("✅ Memory cache tests passed")
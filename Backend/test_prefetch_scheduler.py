@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test script for the infinite-scroll prefetch scheduler
+"""
+import asyncio
+import sys
+import os
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from prefetch_scheduler import PrefetchScheduler
+
+
+def test_prefetch_dedup_priority_and_cancellation():
+    """Identical requests share fetches, nearer pages go first, pages every client passed are dropped"""
+    fetched_pages = []
+
+    async def fetch_page(query, page, per_page):
+        fetched_pages.append(page)
+        await asyncio.sleep(0.01)
+        return True
+
+    async def check():
+        scheduler = PrefetchScheduler(fetch_page, max_concurrency=1, normalize_query=str.lower)
+        try:
+            # Two clients scrolling the same query, ten requests, only queue three fetches
+            for request in range(10):
+                scheduler.schedule("Modern Kitchen", 1, 20, pages_ahead=3, client=request % 2)
+            # Both clients move on to page 3 before the queue drains
+            scheduler.schedule("modern kitchen", 3, 20, pages_ahead=3, client=0)
+            scheduler.schedule("modern kitchen", 3, 20, pages_ahead=3, client=1)
+            await asyncio.sleep(0.2)
+            stats = scheduler.get_stats()
+            print(f"Fetched pages: {fetched_pages}, stats: {stats}")
+        finally:
+            await scheduler.close()
+
+        assert fetched_pages == [4, 5, 6]
+        assert stats["scheduled"] == 5
+        assert stats["cancelled"] == 2
+        assert stats["completed"] == 3
+
+    asyncio.run(check())
+
+
+def test_prefetch_keeps_pages_other_clients_need():
+    """One client scrolling ahead does not cancel pages another client is about to view"""
+    fetched_pages = []
+
+    async def fetch_page(query, page, per_page):
+        fetched_pages.append(page)
+        await asyncio.sleep(0.01)
+        return True
+
+    async def check():
+        scheduler = PrefetchScheduler(fetch_page, max_concurrency=1)
+        try:
+            scheduler.schedule("loft", 1, 20, pages_ahead=2, client="reader")
+            scheduler.schedule("loft", 1, 20, pages_ahead=2)
+            scheduler.schedule("loft", 1, 20, pages_ahead=2, client="scroller")
+            scheduler.schedule("loft", 5, 20, pages_ahead=2, client="scroller")
+            # The anonymous request still wants pages 2 and 3 after "reader" moves on too
+            scheduler.schedule("loft", 4, 20, pages_ahead=1, client="reader")
+            await asyncio.sleep(0.2)
+            return scheduler.get_stats()
+        finally:
+            await scheduler.close()
+
+    stats = asyncio.run(check())
+    assert sorted(fetched_pages) == [2, 3, 5, 6, 7]
+    assert stats["cancelled"] == 0
+
+
+if __name__ == "__main__":
+    print("Testing prefetch scheduler...")
+    test_prefetch_dedup_priority_and_cancellation()
+    test_prefetch_keeps_pages_other_clients_need()
+    print("✅ Prefetch scheduler test passed")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Test script for provider health tracking and adaptive routing
+"""
+import asyncio
+import sys
+import os
+import tempfile
+import time
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import database
+from hybrid_service import HybridImageService, HEDGE_DEFAULT_DELAY
+from provider_health import ProviderHealthTracker, MAX_PROVIDER_TIMEOUT
+
+
+class FakeProvider:
+    """Answers every search with `count` design images after `delay` seconds"""
+
+    def __init__(self, name: str, delay: float, count: int = 20):
+        self.name, self.delay, self.count = name, delay, count
+        self.calls = 0
+        self.called_at = []
+
+    async def search_photos(self, query, page, per_page):
+        self.calls += 1
+        self.called_at.append(time.perf_counter())
+        await asyncio.sleep(self.delay)
+        return [
+            {"id": f"{self.name}-{query}-{index}", "image": f"https://cdn.example.com/{self.name}/{index}.jpg",
+             "title": "Modern kitchen interior", "alt": "Modern kitchen interior design"}
+            for index in range(self.count)
+        ]
+
+    search_images = search_photos
+
+
+def _hybrid_service(*providers: FakeProvider) -> HybridImageService:
+    """A HybridImageService routing only to the given fake providers"""
+    service = HybridImageService()
+    service.providers = [(provider.name, provider) for provider in providers]
+    service.provider_health = ProviderHealthTracker([provider.name for provider in providers])
+    return service
+
+
+def _with_temp_database(check):
+    original_path = database.DATABASE_PATH
+    database.DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "cache.db")
+    try:
+        asyncio.run(database.init_db())
+        return asyncio.run(check())
+    finally:
+        database.DATABASE_PATH = original_path
+
+
+def test_ranking_fan_out_and_circuit_breaker():
+    """Fast, productive providers rank first; rate-limited ones are cooled down"""
+    health = ProviderHealthTracker(["fast", "slow", "empty", "limited"])
+    for _ in range(10):
+        health.record_success("fast", 0.2, 20)
+        health.record_success("slow", 4.0, 20)
+        health.record_success("empty", 0.1, 0)
+    health.record_failure("limited", 0.1, status_code=429)
+
+    ranked = health.rank(["fast", "slow", "empty", "limited"])
+    print(f"Ranked: {ranked}")
+    assert ranked[0] == "fast"
+    assert "limited" not in ranked
+    assert not health.is_available("limited")
+
+    # A reliable leader alone is enough to reach the target yield
+    assert health.fan_out_width(ranked) == 1
+    assert health.timeout_for("fast", 2.0) < 1.0
+    assert health.timeout_for("slow", 2.0) == MAX_PROVIDER_TIMEOUT
+    assert health.timeout_for("unseen", 2.0) == 2.0
+    assert health.hedge_delay("fast", 0.8) == 0.5
+    assert health.hedge_delay("unseen", 0.8) == 0.8
+
+    # Losing a hedged race is not held against the provider
+    health.record_cancelled("fast")
+    assert health.rank(["fast"]) == ["fast"]
+
+    board = health.snapshot()
+    assert board["limited"]["rate_limited_429"] == 1
+    assert board["limited"]["circuit_cooldown_remaining"] > 0
+    assert board["fast"]["cancelled"] == 1 and board["fast"]["failures"] == 0
+
+
+def test_stream_full_page_does_not_open_circuits():
+    """Providers still running when a streamed page fills lost a race, not a deadline"""
+    service = _hybrid_service(
+        FakeProvider("unlimited", 0.0),
+        FakeProvider("pexels_direct", 0.5),
+        FakeProvider("rawpixel", 0.5),
+    )
+
+    async def check():
+        for query in ("loft", "kitchen", "bedroom"):
+            frames = [frame async for frame in service.stream_photos_aggregated(query, 1, 20, timeout=2.0)]
+            assert frames[-1]["type"] == "summary" and frames[-1]["total"] == 20
+
+    _with_temp_database(check)
+    board = service.get_provider_scoreboard()
+    print(f"Scoreboard after streaming: {board}")
+    for name in ("pexels_direct", "rawpixel"):
+        assert board[name]["available"] and board[name]["failures"] == 0 and board[name]["timeouts"] == 0
+        assert board[name]["cancelled"] == 3
+
+
+def test_aggregation_leaves_out_multi_site_scrapers():
+    """enhanced_scraper and web_scraping are never raced by aggregation"""
+    unlimited, direct, others = HybridImageService()._aggregation_groups()
+    assert [name for name, _ in unlimited] == ["unlimited"]
+    assert [name for name, _ in direct] == ["pexels_direct", "pixabay_direct"]
+    names = [name for name, _ in others]
+    assert names[:3] == ["rawpixel", "openverse", "wikimedia"]
+    assert not {"enhanced_scraper", "web_scraping", "picsum"} & set(names)
+
+
+def _settle_latency(service: HybridImageService, name: str, latency: float):
+    """Give a provider a latency history so its p90 (and hedge delay) is `latency`"""
+    for _ in range(10):
+        service.provider_health.record_success(name, latency, 20)
+
+
+def test_hedge_fires_after_p90_and_cancels_the_loser():
+    """A primary slower than its p90 is hedged; the hedge wins and the primary is cancelled, not failed"""
+    slow, fast = FakeProvider("slow", 2.0), FakeProvider("fast", 0.05)
+    service = _hybrid_service(slow, fast)
+    _settle_latency(service, "slow", 0.5)
+
+    started = time.perf_counter()
+    winner, results = asyncio.run(service._hedged_search([("slow", slow), ("fast", fast)], "loft", 1, 20, deadline=3.0))
+    elapsed = time.perf_counter() - started
+    print(f"Hedged search won by {winner} in {elapsed:.2f}s")
+    assert winner == "fast" and len(results) == 20
+    # The hedge waits for the primary's p90 before firing, then answers well before the primary would have
+    assert fast.called_at[0] - slow.called_at[0] >= 0.5
+    assert elapsed < 1.0
+
+    assert service.hedge_stats["hedges_fired"] == 1 and service.hedge_stats["hedge_wins"] == 1
+    assert service.hedge_stats["losers_cancelled"] == 1
+    board = service.get_provider_scoreboard()
+    assert board["slow"]["cancelled"] == 1
+    assert board["slow"]["failures"] == 0 and board["slow"]["timeouts"] == 0 and board["slow"]["available"]
+
+
+def test_primary_answering_before_p90_is_not_hedged():
+    """No hedge is fired when the primary answers within its p90"""
+    primary, backup = FakeProvider("primary", 0.05), FakeProvider("backup", 0.05)
+    service = _hybrid_service(primary, backup)
+    _settle_latency(service, "primary", 0.5)
+
+    winner, _ = asyncio.run(service._hedged_search([("primary", primary), ("backup", backup)], "loft", 1, 20, deadline=3.0))
+    assert winner == "primary" and backup.calls == 0
+    assert service.hedge_stats["primary_wins"] == 1 and service.hedge_stats["hedges_fired"] == 0
+
+
+def test_hedged_search_gives_up_at_the_deadline():
+    """Past the deadline every request is cancelled as a timeout and nothing is returned"""
+    first, second = FakeProvider("first", 5.0), FakeProvider("second", 5.0)
+    service = _hybrid_service(first, second)
+
+    started = time.perf_counter()
+    outcome = asyncio.run(service._hedged_search([("first", first), ("second", second)], "loft", 1, 20, deadline=HEDGE_DEFAULT_DELAY + 0.3))
+    elapsed = time.perf_counter() - started
+    assert outcome is None and elapsed < HEDGE_DEFAULT_DELAY + 1.0
+    assert second.calls == 1
+    assert service.hedge_stats["no_result"] == 1 and service.hedge_stats["losers_cancelled"] == 2
+    board = service.get_provider_scoreboard()
+    for name in ("first", "second"):
+        assert board[name]["timeouts"] == 1 and board[name]["cancelled"] == 0
+
+
+def test_hedge_moves_on_when_the_primary_comes_back_empty():
+    """An empty answer is not a win: the next candidate is tried straight away"""
+    empty, full = FakeProvider("empty", 0.05, count=0), FakeProvider("full", 0.05)
+    service = _hybrid_service(empty, full)
+
+    winner, results = asyncio.run(service._hedged_search([("empty", empty), ("full", full)], "loft", 1, 20, deadline=3.0))
+    assert winner == "full" and len(results) == 20
+    assert full.called_at[0] - empty.called_at[0] < HEDGE_DEFAULT_DELAY
+    assert service.hedge_stats["hedges_fired"] == 0 and service.hedge_stats["primary_wins"] == 1
+
+
+if __name__ == "__main__":
+    print("Testing provider health tracker...")
+    test_ranking_fan_out_and_circuit_breaker()
+    test_stream_full_page_does_not_open_circuits()
+    test_aggregation_leaves_out_multi_site_scrapers()
+    test_hedge_fires_after_p90_and_cancels_the_loser()
+    test_primary_answering_before_p90_is_not_hedged()
+    test_hedged_search_gives_up_at_the_deadline()
+    test_hedge_moves_on_when_the_primary_comes_back_empty()
+    print("✅ Provider health test passed")
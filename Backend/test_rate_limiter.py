@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script for the per-domain token bucket rate limiter
+"""
+import asyncio
+import sys
+import os
+import tempfile
+import time
+
+# Add the Backend directory to the path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from rate_limiter import DomainRateLimiter, MemoryBucketStore, RateLimit, SqliteBucketStore
+
+
+def test_burst_then_steady_rate_in_arrival_order():
+    """A burst goes out at once; later requests are spaced by the rate and served first come, first served"""
+    async def check():
+        limiter = DomainRateLimiter({"example.com": RateLimit(rate=20.0, burst=2)}, store=MemoryBucketStore())
+        started = time.monotonic()
+        served = []
+
+        async def request(index):
+            await limiter.acquire("https://www.example.com/search")
+            served.append((index, time.monotonic() - started))
+
+        await asyncio.gather(*(request(i) for i in range(6)))
+        # Unknown domains are not limited
+        await asyncio.wait_for(limiter.acquire("other.org"), 0.01)
+        return served, await limiter.get_stats()
+
+    served, stats = asyncio.run(check())
+    print(f"Served: {served}, stats: {stats}")
+    assert [index for index, _ in served] == list(range(6))
+    assert served[1][1] < 0.02
+    # Four requests beyond the burst at 20/s take at least ~0.2s
+    assert served[-1][1] >= 0.18
+    assert stats["example.com"]["acquired"] == 6
+    assert stats["example.com"]["waited"] == 4
+
+
+def test_blocked_responses_back_off_and_recover():
+    """A 429 empties the bucket and halves the rate; successes work the penalty off"""
+    async def check():
+        limiter = DomainRateLimiter({"example.com": RateLimit(rate=10.0, burst=5)}, store=MemoryBucketStore())
+        await limiter.acquire("example.com")
+        await limiter.record_response("example.com", 429, retry_after="0.3")
+        blocked = (await limiter.get_stats())["example.com"]
+
+        started = time.monotonic()
+        await limiter.acquire("example.com")
+        waited = time.monotonic() - started
+
+        await limiter.record_response("example.com", 200)
+        recovered = (await limiter.get_stats())["example.com"]
+        return blocked, waited, recovered
+
+    blocked, waited, recovered = asyncio.run(check())
+    assert blocked["blocked_count"] == 1
+    assert blocked["effective_rate_per_s"] == 5.0
+    assert blocked["blocked_responses"] == 1
+    assert waited >= 0.28
+    assert recovered["blocked_count"] == 0
+
+
+def test_sqlite_store_shares_budget_between_limiters():
+    """Two limiters (as in two workers) on the same SQLite file draw from one bucket"""
+    async def check(path):
+        limits = {"example.com": RateLimit(rate=5.0, burst=2)}
+        worker_a = DomainRateLimiter(limits, store=SqliteBucketStore(path))
+        worker_b = DomainRateLimiter(limits, store=SqliteBucketStore(path))
+        await worker_a.acquire("example.com")
+        await worker_a.acquire("example.com")
+        started = time.monotonic()
+        await worker_b.acquire("example.com")
+        return time.monotonic() - started
+
+    with tempfile.TemporaryDirectory() as directory:
+        waited = asyncio.run(check(os.path.join(directory, "limits.db")))
+    assert waited >= 0.15
+
+
+if __name__ == "__main__":
+    print("Testing rate limiter...")
+    test_burst_then_steady_rate_in_arrival_order()
+    test_blocked_responses_back_off_and_recover()
+    test_sqlite_store_shares_budget_between_limiters()
+    print("✅ Rate limiter tests passed")
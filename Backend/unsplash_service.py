@@ -3,6 +3,7 @@ import httpx
 from fastapi import HTTPException
 from dotenv import load_dotenv
 from typing import Dict, List, Any
+from http_clients import http_clients
 
 load_dotenv()
 
@@ -33,7 +34,6 @@ class UnsplashService:
                           self.access_key not in placeholder_access_keys and
                           self.secret_key not in placeholder_secret_keys)
         self.headers = {"Authorization": f"Client-ID {self.access_key}"} if self.enabled else {}
-        self.client = httpx.AsyncClient(timeout=15.0)
         print(f"Unsplash service enabled: {self.enabled}")
         if not self.enabled:
             print(f"Unsplash disabled - using placeholder/demo API keys")
@@ -182,6 +182,7 @@ class UnsplashService:
             formatted_data.append(self.format_photo_data(photo))
         return formatted_data
     
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
\ No newline at end of file
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client()
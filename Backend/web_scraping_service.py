@@ -1,8 +1,6 @@
 import os
 import httpx
-import asyncio
 import random
-import time
 from typing import Dict, List, Any, Optional
 from fastapi import HTTPException
 from urllib.parse import urlencode
@@ -11,6 +9,9 @@ import re
 
 # Import the image categorization service
 from image_categorization_service import image_categorization_service
+from http_clients import http_clients
+from memory_cache import BoundedCache
+from rate_limiter import DomainRateLimiter, RateLimit
 # Removed unused import: from fast_cache_service import fast_cache_service
 
 
@@ -21,7 +22,6 @@ class WebScrapingService:
     """
     
     def __init__(self):
-        self.session = httpx.AsyncClient(timeout=30.0, follow_redirects=True)
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
@@ -31,15 +31,15 @@ class WebScrapingService:
         self.unsplash_secret_key = os.getenv("UNSPLASH_SECRET_KEY")
         self.pexels_api_key = os.getenv("PEXELS_API_KEY")
         
-        # Initialize rate limiting
-        self.rate_limiters = {
-            "unsplash": {"last_request": 0, "min_interval": 1.0},  # 1 second between requests
-            "pexels": {"last_request": 0, "min_interval": 1.0},     # 1 second between requests
-        }
+        # Token bucket per API host: 1 request per second sustained, backing off on 403/429
+        self.rate_limiter = DomainRateLimiter({
+            "api.unsplash.com": RateLimit.every(1.0),
+            "api.pexels.com": RateLimit.every(1.0),
+        })
         
         # Initialize cache for storing requests temporarily
-        self.cache = {}
         self.cache_timeout = 300  # 5 minutes cache timeout
+        self.cache = BoundedCache("web_scraping", max_entries=500, ttl=self.cache_timeout)
         
         # Validate available services
         self.unsplash_enabled = bool(self.unsplash_access_key and 
@@ -58,24 +58,6 @@ class WebScrapingService:
         """
         return f"{provider}:{query}:{page}:{per_page}"
     
-    def _is_cache_valid(self, timestamp: float) -> bool:
-        """
-        Check if cache entry is still valid
-        """
-        return (time.time() - timestamp) < self.cache_timeout
-
-    async def _rate_limit(self, service_name: str):
-        """
-        Implement rate limiting to avoid hitting API limits
-        """
-        if service_name in self.rate_limiters:
-            limiter = self.rate_limiters[service_name]
-            elapsed = time.time() - limiter["last_request"]
-            if elapsed < limiter["min_interval"]:
-                wait_time = limiter["min_interval"] - elapsed
-                await asyncio.sleep(wait_time)
-            limiter["last_request"] = time.time()
-
     async def scrape_unsplash_by_tags(self, tags: List[str], page: int = 1, per_page: int = 20) -> List[Dict[str, Any]]:
         """
         Scrape Unsplash using public collections and search endpoints through API
@@ -88,14 +70,13 @@ class WebScrapingService:
         cache_key = self._get_cache_key("unsplash", query, page, per_page)
         
         # Check if results are cached
-        if cache_key in self.cache:
-            cached_result, timestamp = self.cache[cache_key]
-            if self._is_cache_valid(timestamp):
-                print(f"Returning cached results for Unsplash query: {query}, page: {page}")
-                return cached_result
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            print(f"Returning cached results for Unsplash query: {query}, page: {page}")
+            return cached_result
         
         # Apply rate limiting
-        await self._rate_limit("unsplash")
+        await self.rate_limiter.acquire("api.unsplash.com")
         
         try:
             # Use Unsplash API for better reliability
@@ -109,6 +90,7 @@ class WebScrapingService:
             
             headers = {"Authorization": f"Client-ID {self.unsplash_access_key}"}
             response = await self.session.get(base_url, headers=headers, params=params)
+            await self.rate_limiter.record_response(base_url, response.status_code, response.headers.get("Retry-After"))
             
             if response.status_code == 200:
                 data = response.json()
@@ -118,7 +100,7 @@ class WebScrapingService:
                     results.append(formatted_item)
                 
                 # Cache the results
-                self.cache[cache_key] = (results, time.time())
+                self.cache.set(cache_key, results)
                 return results
             else:
                 print(f"Unsplash API error: {response.status_code} - {response.text}")
@@ -157,10 +139,7 @@ class WebScrapingService:
             all_results.extend(pexels_results)
         
         # Filter results to only include valid design images
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
+        filtered_results = image_categorization_service.filter_design_images(all_results)
         
         # Shuffle results to avoid source bias
         random.shuffle(filtered_results)
@@ -180,14 +159,13 @@ class WebScrapingService:
         cache_key = self._get_cache_key("pexels", query, page, per_page)
         
         # Check if results are cached
-        if cache_key in self.cache:
-            cached_result, timestamp = self.cache[cache_key]
-            if self._is_cache_valid(timestamp):
-                print(f"Returning cached results for Pexels query: {query}, page: {page}")
-                return cached_result
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            print(f"Returning cached results for Pexels query: {query}, page: {page}")
+            return cached_result
         
         # Apply rate limiting
-        await self._rate_limit("pexels")
+        await self.rate_limiter.acquire("api.pexels.com")
         
         try:
             base_url = "https://api.pexels.com/v1/search"
@@ -200,6 +178,7 @@ class WebScrapingService:
             
             headers = {"Authorization": self.pexels_api_key}
             response = await self.session.get(base_url, headers=headers, params=params)
+            await self.rate_limiter.record_response(base_url, response.status_code, response.headers.get("Retry-After"))
             
             if response.status_code == 200:
                 data = response.json()
@@ -209,7 +188,7 @@ class WebScrapingService:
                     results.append(formatted_item)
                 
                 # Cache the results
-                self.cache[cache_key] = (results, time.time())
+                self.cache.set(cache_key, results)
                 return results
             else:
                 print(f"Pexels API error: {response.status_code} - {response.text}")
@@ -278,6 +257,36 @@ class WebScrapingService:
             "saves": 0   # Placeholder
         }
 
+    def _format_picsum_item(self, item: Dict[str, Any], image_id: str, caption: str) -> Dict[str, Any]:
+        """Format a Picsum list item, served through its seed URLs, to match frontend expectations"""
+        seed = f"https://picsum.photos/seed/{item.get('id')}"
+        return {
+            "id": image_id,
+            "width": item.get("width", 800),
+            "height": item.get("height", 600),
+            "url": f"https://picsum.photos/id/{item.get('id')}/info",
+            "photographer": "",
+            "photographer_url": "",
+            "photographer_id": 0,
+            "avg_color": item.get("avg_color", "#ffffff"),
+            "src": {
+                "original": f"{seed}/1200/900",
+                "large2x": f"{seed}/1200/900",
+                "large": f"{seed}/1000/750",
+                "medium": f"{seed}/800/600",
+                "small": f"{seed}/400/300",
+                "portrait": f"{seed}/600/800",
+                "landscape": f"{seed}/800/600",
+                "tiny": f"{seed}/200/150"
+            },
+            "alt": caption,
+            "image": f"{seed}/800/600",
+            "title": caption,
+            "author": "",
+            "likes": 0,
+            "saves": 0
+        }
+
     async def scrape_by_category(self, category: str, page: int = 1, per_page: int = 20) -> List[Dict[str, Any]]:
         """
         Scrape images by category (interior design, architecture, etc.)
@@ -315,460 +324,262 @@ class WebScrapingService:
         cache_key = self._get_cache_key("picsum_only", query, page, per_page)
         
         # Check if results are cached
-        if cache_key in self.cache:
-            cached_result, timestamp = self.cache[cache_key]
-            if self._is_cache_valid(timestamp):
-                print(f"Returning cached results for Picsum-only query: {query}, page: {page}")
-                return cached_result
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            print(f"Returning cached results for Picsum-only query: {query}, page: {page}")
+            return cached_result
         
         all_results = []
         processed_urls = set()
         
         try:
-            import httpx
             # Fetch from Picsum which is very reliable and fast - this avoids rate limits
             # Use a larger limit to ensure we have enough results for infinite scroll
             picsum_limit = per_page * 2  # Get double the requested amount to ensure we always have enough
             picsum_url = f"https://picsum.photos/v2/list?page={page % 10 + 1}&limit={picsum_limit}"  # Cycle through pages to avoid repetition
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{random.randint(1000, 9999)}",  # Include random number to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{random.randint(1000, 9999)}",  # Include random number to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
-        # Filter all results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter all results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
         
         try:
-            import httpx
             # Use Picsum with a more sophisticated approach to generate unique content across pages
             # Generate a seed based on query and page to ensure variety
             seed = hash(query + str(page)) % 10000
             picsum_limit = per_page * 3  # Get 3x the requested amount to ensure we always have enough
             picsum_url = f"https://picsum.photos/v2/list?page={page % 5 + 1}&limit={picsum_limit}&seed={seed}"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
-        # Filter all results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter all results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
         
         try:
-            import httpx
             # Fetch from Picsum which is very reliable and fast - this avoids rate limits
             # Use a larger limit to ensure we have enough results for infinite scroll
             picsum_limit = per_page * 2  # Get double the requested amount to ensure we always have enough
             # Use a seed based on query and page to ensure variety across pages
             seed = hash(query + str(page)) % 10000
             picsum_url = f"https://picsum.photos/v2/list?page={page % 5 + 1}&limit={picsum_limit}&seed={seed}"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
-        # Filter all results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter all results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
         
         try:
-            import httpx
             # Use Picsum with a seed based on query and page to ensure variety
             seed = hash(query + str(page)) % 10000
             picsum_limit = per_page * 2  # Get extra to compensate for filtering
             picsum_url = f"https://picsum.photos/v2/list?page={page % 5 + 1}&limit={picsum_limit}&seed={seed}"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
-        # Filter all results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter all results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
         
         try:
-            import httpx
             # Fetch from Picsum which is very reliable and fast - this avoids rate limits
             # Use a larger limit to ensure we have enough results for infinite scroll
             picsum_limit = per_page * 3  # Get triple the requested amount to ensure we always have enough
             # Generate a seed based on query and page to ensure variety across pages
             seed = hash(query + str(page)) % 10000
             picsum_url = f"https://picsum.photos/v2/list?page={page % 10 + 1}&limit={picsum_limit}&seed={seed}"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
-        # Filter all results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter all results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
         
         try:
-            import httpx
             # Use Picsum with a consistent approach to generate unique content across pages
             # Generate a seed based on query and page to ensure variety
             seed = hash(query + str(page)) % 10000
             picsum_limit = per_page * 3  # Get extra to compensate for filtering
             picsum_url = f"https://picsum.photos/v2/list?page={page % 5 + 1}&limit={picsum_limit}&seed={seed}"  # Cycle through pages with seed for variety
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
-        # Filter all results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter all results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
         
         try:
-            import httpx
             # Use Picsum with a more sophisticated approach to generate unique content across pages
             # Generate a seed based on query and page to ensure variety
             seed = hash(query + str(page)) % 10000
             picsum_limit = per_page * 3  # Get extra to compensate for filtering
             picsum_url = f"https://picsum.photos/v2/list?page={page % 5 + 1}&limit={picsum_limit}&seed={seed}"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Filter results to ensure they match design categories with early exit
-                    filtered_results = []
-                    for result in all_results:
-                        if image_categorization_service.is_valid_design_image(result):
-                            filtered_results.append(result)
-                            # Early exit if we have enough results
-                            if len(filtered_results) >= per_page:
-                                break
-                    
-                    # Cache the results
-                    final_results = filtered_results[:per_page] if filtered_results else []
-                    self.cache[cache_key] = (final_results, time.time())
-                    
-                    print(f"Got {len(final_results)} results from Picsum-only for page {page}")
-                    return final_results
-                else:
-                    print(f"Picsum API error: {response.status_code} - {response.text}")
-                    return []
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Filter results to ensure they match design categories, stopping at per_page
+                filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
+                
+                # Cache the results
+                final_results = filtered_results[:per_page] if filtered_results else []
+                self.cache.set(cache_key, final_results)
+                
+                print(f"Got {len(final_results)} results from Picsum-only for page {page}")
+                return final_results
+            else:
+                print(f"Picsum API error: {response.status_code} - {response.text}")
+                return []
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
             return []
         
         try:
-            import httpx
             # Use a sophisticated approach to generate unique images across pages
             # Generate a seed based on query and page to ensure variety
             seed = hash(query + str(page)) % 10000
@@ -777,242 +588,137 @@ class WebScrapingService:
             picsum_limit = per_page * 3  # Get triple the requested amount to compensate for filtering
             picsum_url = f"https://picsum.photos/v2/list?page={page % 5 + 1}&limit={picsum_limit}&seed={seed}"
             
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                
+                # Process each item
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
                     
-                    # Process each item
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        
-                        # Use the unique ID as primary key for deduplication
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            # Only add if it's a valid design image
-                            if image_categorization_service.is_valid_design_image(formatted_item):
-                                all_results.append(formatted_item)
-                                processed_urls.add(image_key)
-                        
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+                    # Use the unique ID as primary key for deduplication
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        # Only add if it's a valid design image
+                        if image_categorization_service.classify(formatted_item).valid:
+                            all_results.append(formatted_item)
+                            processed_urls.add(image_key)
+                    
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
             
-        # Filter results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
         
         try:
-            import httpx
             # Fetch from Picsum which is very reliable and fast - this avoids rate limits
             # Use a larger limit to ensure we have enough results for infinite scroll
             picsum_limit = per_page * 3  # Get triple the requested amount to ensure we always have enough
             # Use a seed based on query and page to ensure variety across pages
             seed = hash(query + str(page)) % 10000
             picsum_url = f"https://picsum.photos/v2/list?page={page % 5 + 1}&limit={picsum_limit}&seed={seed}"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
-        # Filter all results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter all results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
         
         try:
-            import httpx
             # Use a more sophisticated approach to generate unique images across pages
             # Generate a seed based on query and page to ensure variety
             seed = hash(query + str(page)) % 10000
             picsum_limit = per_page * 3  # Get extra to compensate for filtering
             picsum_url = f"https://picsum.photos/v2/list?page={page % 10 + 1}&limit={picsum_limit}&seed={seed}"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
-        # Filter all results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter all results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
         
         # First, try to get results from non-rate-limited sources (like Picsum which is fast and free)
         try:
-            import httpx
             # Fetch from Picsum which is very reliable and fast - this avoids rate limits
             # Use a consistent page calculation to ensure we can support infinite scroll
             # Instead of cycling through pages, use a more sophisticated approach to generate unique content
             picsum_page = (page - 1) % 10 + 1  # This ensures we cycle through 10 different pages
             picsum_url = f"https://picsum.photos/v2/list?page={picsum_page}&limit={per_page}"  # Use consistent page calculation
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}",  # Include page number in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}",  # Include page number in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
@@ -1069,62 +775,34 @@ class WebScrapingService:
                 
                 # Try alternative with Picsum first (no rate limits)
                 try:
-                    import httpx
                     # Vary the seed based on the query to get different images for different terms
                     seed = hash(" ".join(alt_query)) % 10000
                     picsum_url = f"https://picsum.photos/v2/list?page={page % 5 + 1}&limit={per_page // 2}&seed={seed}"
-                    async with httpx.AsyncClient(timeout=10.0) as client:
-                        response = await client.get(picsum_url)
-                        if response.status_code == 200:
-                            picsum_data = response.json()
-                            for item in picsum_data:
-                                formatted_item = {
-                                    "id": f"picsum_{item.get('id', 'unknown')}",
-                                    "width": item.get("width", 800),
-                                    "height": item.get("height", 600),
-                                    "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                                    "photographer": "",
-                                    "photographer_url": "",
-                                    "photographer_id": 0,
-                                    "avg_color": item.get("avg_color", "#ffffff"),
-                                    "src": {
-                                        "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                        "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                        "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                        "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                        "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                        "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                        "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                        "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                                    },
-                                    "alt": f"{' '.join(alt_query).title()} #{item.get('id')}",  # Removed "Design" suffix
-                                    "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                    "title": f"{' '.join(alt_query).title()} #{item.get('id')}",  # Removed "Design" suffix
-                                    "author": "",
-                                    "likes": 0,
-                                    "saves": 0
-                                }
-                                # Only add if the image matches our design criteria
-                                if image_categorization_service.is_valid_design_image(formatted_item):
-                                    image_key = formatted_item["id"]
-                                    if image_key and image_key not in processed_urls:
-                                        all_results.append(formatted_item)
-                                        processed_urls.add(image_key)
+                    client = http_clients.client("quick")
+                    response = await client.get(picsum_url)
+                    if response.status_code == 200:
+                        picsum_data = response.json()
+                        for item in picsum_data:
+                            formatted_item = self._format_picsum_item(
+                                item,
+                                f"picsum_{item.get('id', 'unknown')}",
+                                f"{' '.join(alt_query).title()} #{item.get('id')}",  # Removed "Design" suffix
+                            )
+                            # Only add if the image matches our design criteria
+                            if image_categorization_service.classify(formatted_item).valid:
+                                image_key = formatted_item["id"]
+                                if image_key and image_key not in processed_urls:
+                                    all_results.append(formatted_item)
+                                    processed_urls.add(image_key)
                 except Exception as e:
                     print(f"Error fetching from Picsum with alternative query: {e}")
         
-        # Filter all results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter all results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
 
@@ -1135,83 +813,55 @@ class WebScrapingService:
         cache_key = self._get_cache_key("picsum_only", query, page, per_page)
         
         # Check if results are cached
-        if cache_key in self.cache:
-            cached_result, timestamp = self.cache[cache_key]
-            if self._is_cache_valid(timestamp):
-                print(f"Returning cached results for Picsum-only query: {query}, page: {page}")
-                return cached_result
+        cached_result = self.cache.get(cache_key)
+        if cached_result is not None:
+            print(f"Returning cached results for Picsum-only query: {query}, page: {page}")
+            return cached_result
         
         all_results = []
         processed_urls = set()
         
         try:
-            import httpx
             # Fetch from Picsum which is very reliable and fast - this avoids rate limits
             # Use a larger limit to ensure we have enough results for infinite scroll
             picsum_limit = per_page * 3  # Get triple the requested amount to ensure we always have enough
             # Use a seed based on query and page to ensure variety across pages
             seed = hash(query + str(page)) % 10000
             picsum_url = f"https://picsum.photos/v2/list?page={page % 5 + 1}&limit={picsum_limit}&seed={seed}"
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(picsum_url)
-                if response.status_code == 200:
-                    picsum_data = response.json()
-                    for item in picsum_data:
-                        # Format Picsum data to match our expected format
-                        formatted_item = {
-                            "id": f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
-                            "width": item.get("width", 800),
-                            "height": item.get("height", 600),
-                            "url": f"https://picsum.photos/id/{item.get('id')}/info",
-                            "photographer": "",
-                            "photographer_url": "",
-                            "photographer_id": 0,
-                            "avg_color": item.get("avg_color", "#ffffff"),
-                            "src": {
-                                "original": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large2x": f"https://picsum.photos/seed/{item.get('id')}/1200/900",
-                                "large": f"https://picsum.photos/seed/{item.get('id')}/1000/750",
-                                "medium": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "small": f"https://picsum.photos/seed/{item.get('id')}/400/300",
-                                "portrait": f"https://picsum.photos/seed/{item.get('id')}/600/800", 
-                                "landscape": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                                "tiny": f"https://picsum.photos/seed/{item.get('id')}/200/150"
-                            },
-                            "alt": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "image": f"https://picsum.photos/seed/{item.get('id')}/800/600",
-                            "title": f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
-                            "author": "",
-                            "likes": 0,
-                            "saves": 0
-                        }
-                        image_key = formatted_item["id"]
-                        if image_key and image_key not in processed_urls:
-                            all_results.append(formatted_item)
-                            processed_urls.add(image_key)
-                    # Always prioritize Picsum since it has no rate limits
-                    print(f"Got {len(all_results)} results from Picsum for page {page}")
+            client = http_clients.client("quick")
+            response = await client.get(picsum_url)
+            if response.status_code == 200:
+                picsum_data = response.json()
+                for item in picsum_data:
+                    # Format Picsum data to match our expected format
+                    formatted_item = self._format_picsum_item(
+                        item,
+                        f"picsum_{item.get('id', 'unknown')}_{page}_{seed}",  # Include page number and seed in ID to prevent duplicates across pages
+                        f"{' '.join(query.split()[:3]).title()} Design #{item.get('id')} Page {page} Seed {seed}",  # Create more contextually relevant captions
+                    )
+                    image_key = formatted_item["id"]
+                    if image_key and image_key not in processed_urls:
+                        all_results.append(formatted_item)
+                        processed_urls.add(image_key)
+                # Always prioritize Picsum since it has no rate limits
+                print(f"Got {len(all_results)} results from Picsum for page {page}")
         except Exception as e:
             print(f"Error fetching from Picsum: {e}")
         
-        # Filter results to ensure they match design categories with early exit
-        filtered_results = []
-        for result in all_results:
-            if image_categorization_service.is_valid_design_image(result):
-                filtered_results.append(result)
-                # Early exit if we have enough results
-                if len(filtered_results) >= per_page:
-                    break
+        # Filter results to ensure they match design categories, stopping at per_page
+        filtered_results = image_categorization_service.filter_design_images(all_results, limit=per_page)
         
         # Cache the results
         final_results = filtered_results[:per_page] if filtered_results else []
-        self.cache[cache_key] = (final_results, time.time())
+        self.cache.set(cache_key, final_results)
         
         return final_results
     
-    async def close(self):
-        """Close the HTTP client"""
-        await self.session.aclose()
+    @property
+    def session(self) -> httpx.AsyncClient:
+        """Shared scraping client from the process-wide registry"""
+        return http_clients.client("scraper")
 
 
 # Global instance
-web_scraping_service = WebScrapingService()
\ No newline at end of file
+web_scraping_service = WebScrapingService()
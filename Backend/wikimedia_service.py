@@ -2,6 +2,7 @@ import httpx
 from fastapi import HTTPException
 from typing import Dict, List, Any
 import urllib.parse
+from http_clients import http_clients
 
 WIKIMEDIA_API_URL = "https://commons.wikimedia.org/w/api.php"
 
@@ -9,7 +10,6 @@ class WikimediaService:
     def __init__(self):
         # Always enabled (no API key required)
         self.enabled = True
-        self.client = httpx.AsyncClient(timeout=15.0)
         self.base_url = WIKIMEDIA_API_URL
 
     async def search_photos(
@@ -129,6 +129,7 @@ class WikimediaService:
             formatted_data.append(self.format_photo_data(photo))
         return formatted_data
 
-    async def close(self):
-        """Close the HTTP client"""
-        await self.client.aclose()
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client from the process-wide registry"""
+        return http_clients.client()